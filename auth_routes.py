@@ -6,15 +6,25 @@ This module provides endpoints for credential management:
 - /auth/validate: Check if a token is valid
 - /auth/refresh: Refresh an existing token (not implemented yet)
 - /auth/logout: Revoke a token
+
+Authenticated clients and validation results are cached per token, so
+repeated checks of the same token are answered locally until the cache entry
+expires, and all cached clients share one upstream connection pool.
 """
 
+import hashlib
+import hmac
+import json
 import logging
+import os
 from functools import wraps
 from typing import Any, Callable, Dict, Optional, Tuple, Union
 
 from flask import Blueprint, current_app, jsonify, request
+from requests.adapters import HTTPAdapter
 
-from fogis_api_client.public_api_client import FogisLoginError, PublicApiClient
+from fogis_api_client.gateway import TTLCache, auth
+from fogis_api_client.public_api_client import PublicApiClient
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -23,6 +33,141 @@ logger = logging.getLogger(__name__)
 auth_bp = Blueprint("auth", __name__, url_prefix="/auth")
 
 
+class AuthCache:
+    """
+    Cache of authenticated clients and token validation results.
+
+    Entries are keyed by a fingerprint of the token (or of the login
+    credentials), never by the secret itself. Valid results live for ``ttl``
+    seconds, invalid ones only for ``invalid_ttl`` seconds so a token that
+    was rejected by mistake recovers quickly.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 300.0, invalid_ttl: float = 30.0, pool_maxsize: int = 10):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of tokens remembered
+            ttl: Seconds a client and a positive validation are reused
+            invalid_ttl: Seconds a negative validation is reused
+            pool_maxsize: Connections kept open per upstream host
+        """
+        self.invalid_ttl = invalid_ttl
+        self.clients: TTLCache[PublicApiClient] = TTLCache(max_entries, ttl)
+        self.validations: TTLCache[bool] = TTLCache(max_entries, ttl)
+        self.logins: TTLCache[Any] = TTLCache(max_entries, ttl)
+        # Per-process key, so fingerprints cannot be matched against known tokens offline
+        self._key = os.urandom(32)
+        self._adapter = HTTPAdapter(pool_maxsize=pool_maxsize)
+
+    def fingerprint(self, token: Any) -> str:
+        """
+        Compute the cache key for a token.
+
+        Args:
+            token: Token (cookie dict) or credentials
+
+        Returns:
+            str: Keyed hash of the token's canonical JSON form
+        """
+        payload = json.dumps(token, sort_keys=True, default=str).encode("utf-8")
+        return hmac.new(self._key, payload, hashlib.sha256).hexdigest()
+
+    def _share_connections(self, client: PublicApiClient) -> PublicApiClient:
+        client.session.mount("https://", self._adapter)
+        client.session.mount("http://", self._adapter)
+        return client
+
+    def _client_for_token(self, key: str, token: Any) -> PublicApiClient:
+        client = self.clients.get(key)
+        if client is None:
+            client = self._share_connections(PublicApiClient(cookies=token))
+            self.clients.set(key, client)
+        return client
+
+    def login(self, username: str, password: str) -> Any:
+        """
+        Log in, reusing the token of an earlier login with the same credentials while it is valid.
+
+        Args:
+            username: FOGIS username
+            password: FOGIS password
+
+        Returns:
+            The session cookies to use as token
+
+        Raises:
+            FogisLoginError: If login fails
+        """
+        login_key = self.fingerprint({"username": username, "password": password})
+        token = self.logins.get(login_key)
+        if token is not None and self.validations.get(self.fingerprint(token)):
+            return token
+
+        client = self._share_connections(PublicApiClient(username=username, password=password))
+        token = client.login()
+        if token:
+            key = self.fingerprint(token)
+            self.clients.set(key, client)
+            self.validations.set(key, True)
+            self.logins.set(login_key, token)
+        return token
+
+    def validate(self, token: Any) -> bool:
+        """
+        Check whether a token is valid, asking FOGIS only if there is no live cached answer.
+
+        Args:
+            token: Session cookies
+
+        Returns:
+            bool: True if the token is valid
+        """
+        key = self.fingerprint(token)
+        is_valid = self.validations.get(key)
+        if is_valid is not None:
+            return is_valid
+
+        is_valid = bool(self._client_for_token(key, token).validate_cookies())
+        if is_valid:
+            self.validations.set(key, True)
+        else:
+            self.validations.set(key, False, ttl=self.invalid_ttl)
+            self.clients.pop(key)
+        return is_valid
+
+    def forget(self, token: Any) -> None:
+        """
+        Drop everything cached for a token.
+
+        Args:
+            token: Session cookies
+        """
+        key = self.fingerprint(token)
+        self.clients.pop(key)
+        self.validations.pop(key)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dict[str, Any]: Statistics of the client, validation and login caches
+        """
+        return {"clients": self.clients.stats(), "validations": self.validations.stats(), "logins": self.logins.stats()}
+
+
+def get_auth_cache() -> AuthCache:
+    """
+    Get the authentication cache of the current Flask app, creating it if needed.
+
+    Returns:
+        AuthCache: The app's authentication cache
+    """
+    return current_app.extensions.setdefault("fogis_auth_cache", AuthCache())
+
+
 def get_client_from_app() -> Optional[PublicApiClient]:
     """
     Get the PublicApiClient instance from the Flask app.
@@ -47,7 +192,8 @@ def require_json(f: Callable) -> Callable:
     @wraps(f)
     def decorated_function(*args, **kwargs):
         if not request.is_json:
-            return jsonify({"error": "Content-Type must be application/json"}), 415
+            body, status = auth.NOT_JSON
+            return jsonify(body), status
         return f(*args, **kwargs)
 
     return decorated_function
@@ -68,38 +214,8 @@ def login() -> Union[Dict[str, Any], Tuple[Dict[str, Any], int]]:
     Returns:
         JSON response with authentication status and cookies if successful
     """
-    data = request.json
-
-    # Validate request data
-    if not data or "username" not in data or "password" not in data:
-        return (
-            jsonify({"success": False, "error": "Missing required fields: username and password"}),
-            400,
-        )
-
-    username = data["username"]
-    password = data["password"]
-
-    try:
-        # Create a new client instance with the provided credentials
-        client = PublicApiClient(username=username, password=password)
-
-        # Perform login
-        cookies = client.login()
-
-        if not cookies:
-            return jsonify({"success": False, "error": "Login failed: No cookies returned"}), 401
-
-        # Return the cookies as the authentication token
-        return jsonify({"success": True, "message": "Login successful", "token": cookies})
-
-    except FogisLoginError as e:
-        logger.error(f"Login failed: {e}")
-        return jsonify({"success": False, "error": f"Login failed: {str(e)}"}), 401
-
-    except Exception as e:
-        logger.error(f"Unexpected error during login: {e}")
-        return jsonify({"success": False, "error": f"Unexpected error: {str(e)}"}), 500
+    body, status = auth.login(get_auth_cache(), request.json)
+    return jsonify(body), status
 
 
 @auth_bp.route("/validate", methods=["POST"])
@@ -120,29 +236,8 @@ def validate() -> Union[Dict[str, Any], Tuple[Dict[str, Any], int]]:
     Returns:
         JSON response with validation status
     """
-    data = request.json
-
-    # Validate request data
-    if not data or "token" not in data:
-        return jsonify({"success": False, "error": "Missing required field: token"}), 400
-
-    token = data["token"]
-
-    try:
-        # Create a new client instance with the provided token (cookies)
-        client = PublicApiClient(cookies=token)
-
-        # Validate the cookies
-        is_valid = client.validate_cookies()
-
-        if is_valid:
-            return jsonify({"success": True, "valid": True, "message": "Token is valid"})
-        else:
-            return jsonify({"success": True, "valid": False, "message": "Token is invalid or expired"})
-
-    except Exception as e:
-        logger.error(f"Unexpected error during token validation: {e}")
-        return jsonify({"success": False, "error": f"Unexpected error: {str(e)}"}), 500
+    body, status = auth.validate(get_auth_cache(), request.json)
+    return jsonify(body), status
 
 
 @auth_bp.route("/logout", methods=["POST"])
@@ -151,8 +246,8 @@ def logout() -> Union[Dict[str, Any], Tuple[Dict[str, Any], int]]:
     """
     Logout endpoint to invalidate a token (cookies).
 
-    This is a client-side operation as the FOGIS API doesn't provide a logout endpoint.
-    The client should discard the token after calling this endpoint.
+    The FOGIS API doesn't provide a logout endpoint, so this only drops the token from
+    the gateway's cache. The client should discard the token after calling this endpoint.
 
     Request body:
         {
@@ -166,19 +261,8 @@ def logout() -> Union[Dict[str, Any], Tuple[Dict[str, Any], int]]:
     Returns:
         JSON response with logout status
     """
-    data = request.json
-
-    # Validate request data
-    if not data or "token" not in data:
-        return jsonify({"success": False, "error": "Missing required field: token"}), 400
-
-    # No server-side action is needed as the token should be discarded by the client
-    return jsonify(
-        {
-            "success": True,
-            "message": "Logout successful. Please discard the token on the client side.",
-        }
-    )
+    body, status = auth.logout(get_auth_cache(), request.json)
+    return jsonify(body), status
 
 
 @auth_bp.route("/refresh", methods=["POST"])
@@ -202,48 +286,38 @@ def refresh() -> Union[Dict[str, Any], Tuple[Dict[str, Any], int]]:
     Returns:
         JSON response with refresh status and new token if successful
     """
-    data = request.json
-
-    # Validate request data
-    if not data or "token" not in data:
-        return jsonify({"success": False, "error": "Missing required field: token"}), 400
+    body, status = auth.refresh(get_auth_cache(), request.json)
+    return jsonify(body), status
 
-    token = data["token"]
 
-    try:
-        # Create a new client instance with the provided token (cookies)
-        client = PublicApiClient(cookies=token)
-
-        # Validate the cookies
-        is_valid = client.validate_cookies()
-
-        if is_valid:
-            # For now, just return the same token as it's still valid
-            # In the future, we could implement a proper refresh mechanism
-            return jsonify({"success": True, "message": "Token is still valid", "token": token})
-        else:
-            return (
-                jsonify(
-                    {
-                        "success": False,
-                        "error": "Token is invalid or expired. Please login again.",
-                        "valid": False,
-                    }
-                ),
-                401,
-            )
+def auth_cache_from_env() -> AuthCache:
+    """
+    Create an authentication cache configured by the AUTH_CACHE_SIZE, AUTH_CACHE_TTL
+    and AUTH_CACHE_INVALID_TTL environment variables.
 
-    except Exception as e:
-        logger.error(f"Unexpected error during token refresh: {e}")
-        return jsonify({"success": False, "error": f"Unexpected error: {str(e)}"}), 500
+    Returns:
+        AuthCache: The configured cache
+    """
+    return AuthCache(
+        max_entries=int(os.environ.get("AUTH_CACHE_SIZE", "1024")),
+        ttl=float(os.environ.get("AUTH_CACHE_TTL", "300")),
+        invalid_ttl=float(os.environ.get("AUTH_CACHE_INVALID_TTL", "30")),
+    )
 
 
-def register_auth_routes(app):
+def register_auth_routes(app, auth_cache: Optional[AuthCache] = None):
     """
     Register the authentication routes with the Flask app.
 
+    The cache can be tuned with the AUTH_CACHE_SIZE, AUTH_CACHE_TTL and
+    AUTH_CACHE_INVALID_TTL environment variables.
+
     Args:
         app: The Flask application instance
+        auth_cache: Optional cache to use instead of one configured from the environment
     """
+    if auth_cache is None:
+        auth_cache = auth_cache_from_env()
+    app.extensions["fogis_auth_cache"] = auth_cache
     app.register_blueprint(auth_bp)
     logger.info("Registered authentication routes")
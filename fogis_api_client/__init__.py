@@ -9,6 +9,7 @@ from fogis_api_client.api_contracts import (
     validate_request,
     validate_response,
 )
+from fogis_api_client.client_pool import ClientPoolError, FogisClientPool
 from fogis_api_client.event_types import EVENT_TYPES
 from fogis_api_client.logging_config import (
     SensitiveFilter,
@@ -19,10 +20,12 @@ from fogis_api_client.logging_config import (
     set_log_level,
 )
 from fogis_api_client.match_list_filter import MatchListFilter
+from fogis_api_client.match_snapshot import MatchListSnapshot, write_match_snapshot
 
 # Import from the public API client for backward compatibility
 from fogis_api_client.public_api_client import FogisAPIRequestError, FogisDataError, FogisLoginError
 from fogis_api_client.public_api_client import PublicApiClient as FogisApiClient
+from fogis_api_client.session_store import FileSessionStore, MemorySessionStore, SessionStore
 from fogis_api_client.types import (
     CookieDict,
     EventDict,
@@ -44,6 +47,16 @@ __all__ = [
     "FogisAPIRequestError",
     "FogisDataError",
     "EVENT_TYPES",
+    # Shared match list snapshots
+    "MatchListSnapshot",
+    "write_match_snapshot",
+    # Session persistence
+    "SessionStore",
+    "FileSessionStore",
+    "MemorySessionStore",
+    # Multi-account client pool
+    "FogisClientPool",
+    "ClientPoolError",
     # Type definitions
     "CookieDict",
     "EventDict",
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Production server for the FOGIS API gateway.
+
+``python fogis_api_gateway.py`` runs Flask's single-process development
+server. This entry point runs the gateway on gunicorn (installed with the
+``gateway`` extra) instead: a pre-fork server with a number of worker
+processes, each serving requests on a pool of threads, so throughput scales
+with the cores available.
+
+The app is imported once in the master process before it forks, so workers
+start quickly and share its memory. Nothing logs in to FOGIS at import: after
+the fork each worker calls the app module's ``init_worker`` to create its own
+clients, so no session or connection is shared between processes, and to
+start the warm-up. Caches, the client pool and admission limits are per
+worker.
+
+On SIGTERM gunicorn stops accepting connections, lets in-flight requests
+finish for up to ``--graceful-timeout`` seconds and then calls the app
+module's ``shutdown_worker`` in each worker before it exits. Threaded workers
+call the module's ``begin_shutdown`` as soon as the signal arrives, so
+requests that would never finish on their own, like event streams, end
+before the server starts waiting.
+
+ASGI apps, such as ``fogis_api_gateway_asgi:app``, are served with uvicorn's
+gunicorn worker, one event loop per process.
+
+Usage:
+    fogis-gateway-serve [options]
+    python -m fogis_api_client.cli.serve [options]
+
+Options:
+    --app MODULE:APP        App to serve (default: GATEWAY_APP or fogis_api_gateway:app)
+    --bind HOST:PORT        Address to listen on (default: GATEWAY_BIND or 0.0.0.0:8080)
+    --workers N             Worker processes (default: GATEWAY_WORKERS or the number of cores)
+    --threads N             Threads per worker (default: GATEWAY_THREADS or 8)
+    --graceful-timeout S    Seconds in-flight requests may take after SIGTERM (default:
+                            GATEWAY_GRACEFUL_TIMEOUT or 30)
+"""
+
+import argparse
+import importlib
+import inspect
+import logging
+import os
+import signal
+import sys
+from types import ModuleType
+from typing import Any, Dict, List, Optional, Tuple
+
+from fogis_api_client.gateway.handoff import on_signal
+
+try:
+    from gunicorn.app.base import BaseApplication
+except ImportError:
+    # gunicorn is optional; see the gateway extra
+    BaseApplication = None
+
+logger = logging.getLogger(__name__)
+
+ASGI_WORKER = "uvicorn.workers.UvicornWorker"
+
+
+def load_app(target: str) -> Tuple[ModuleType, Any]:
+    """
+    Import the app to serve.
+
+    Args:
+        target: ``module:attribute``, e.g. ``fogis_api_gateway:app``
+
+    Returns:
+        The app's module and the app
+    """
+    module_name, _, attribute = target.partition(":")
+    # The gateway modules live in the project root, which is where the server is started
+    if os.getcwd() not in sys.path:
+        sys.path.insert(0, os.getcwd())
+    module = importlib.import_module(module_name)
+    return module, getattr(module, attribute or "app")
+
+
+def is_asgi(app: Any) -> bool:
+    """Whether an app is an ASGI application rather than a WSGI one."""
+    return inspect.iscoroutinefunction(app) or inspect.iscoroutinefunction(getattr(app, "__call__", None))
+
+
+def server_options(args: argparse.Namespace, module: ModuleType, app: Any) -> Dict[str, Any]:
+    """
+    Build the gunicorn settings for an app.
+
+    Args:
+        args: Parsed command line arguments
+        module: The app's module, whose ``init_worker``, ``begin_shutdown`` and ``shutdown_worker``
+            are called if defined
+        app: The app
+
+    Returns:
+        Dict[str, Any]: gunicorn settings
+    """
+
+    def post_fork(server: Any, worker: Any) -> None:
+        init_worker = getattr(module, "init_worker", None)
+        if init_worker is not None:
+            init_worker()
+
+    def post_worker_init(worker: Any) -> None:
+        # uvicorn workers replace the signal handlers while serving; the ASGI app hooks them itself
+        begin_shutdown = getattr(module, "begin_shutdown", None)
+        if begin_shutdown is not None and not is_asgi(app):
+            on_signal(signal.SIGTERM, begin_shutdown)
+
+    def worker_exit(server: Any, worker: Any) -> None:
+        shutdown_worker = getattr(module, "shutdown_worker", None)
+        if shutdown_worker is not None:
+            shutdown_worker()
+
+    return {
+        "bind": args.bind,
+        "workers": args.workers,
+        "threads": args.threads,
+        "worker_class": ASGI_WORKER if is_asgi(app) else "gthread",
+        "preload_app": True,
+        "graceful_timeout": args.graceful_timeout,
+        "post_fork": post_fork,
+        "post_worker_init": post_worker_init,
+        "worker_exit": worker_exit,
+    }
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parse command line arguments, with defaults from the environment.
+
+    Args:
+        argv: Arguments, the process's by default
+
+    Returns:
+        argparse.Namespace: The arguments
+    """
+    parser = argparse.ArgumentParser(description="Serve the FOGIS API gateway with a pre-fork server")
+    parser.add_argument("--app", default=os.environ.get("GATEWAY_APP", "fogis_api_gateway:app"), help="MODULE:APP to serve")
+    parser.add_argument("--bind", default=os.environ.get("GATEWAY_BIND", "0.0.0.0:8080"), help="HOST:PORT to listen on")
+    parser.add_argument(
+        "--workers", type=int, default=int(os.environ.get("GATEWAY_WORKERS", os.cpu_count() or 1)), help="Worker processes"
+    )
+    parser.add_argument("--threads", type=int, default=int(os.environ.get("GATEWAY_THREADS", "8")), help="Threads per worker")
+    parser.add_argument(
+        "--graceful-timeout",
+        type=float,
+        default=float(os.environ.get("GATEWAY_GRACEFUL_TIMEOUT", "30")),
+        help="Seconds in-flight requests may take after SIGTERM",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Run the production server.
+
+    Args:
+        argv: Command line arguments, the process's by default
+    """
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    args = parse_args(argv)
+    if BaseApplication is None:
+        sys.exit("gunicorn is not installed; install the gateway extra: pip install 'fogis-api-client-timmyBird[gateway]'")
+
+    # The app sizes its stream and admission limits to the threads it is served on
+    os.environ["GATEWAY_THREADS"] = str(args.threads)
+    module, app = load_app(args.app)
+    options = server_options(args, module, app)
+
+    class GatewayApplication(BaseApplication):
+        def load_config(self) -> None:
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self) -> Any:
+            return app
+
+    logger.info(f"Serving {args.app} on {args.bind} with {args.workers} workers ({options['worker_class']})")
+    GatewayApplication().run()
+
+
+if __name__ == "__main__":
+    main()
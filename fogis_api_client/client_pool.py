@@ -0,0 +1,390 @@
+"""
+Pool of authenticated FOGIS clients for many referee accounts.
+
+A service acting on behalf of many referees would otherwise need one
+independent :class:`PublicApiClient` per account, each with its own
+connection pool and no coordination between them. :class:`FogisClientPool`
+manages all of them in one process:
+
+* clients are created and logged in lazily, with a cap on concurrent logins
+* all clients share one HTTP connection pool (cookies stay per account)
+* when the global request limit is reached, waiting requests are served
+  round-robin across accounts, so one busy account cannot starve the others
+* idle sessions are evicted least-recently-used first
+* every account has its own request, login and latency metrics
+
+Examples:
+    >>> pool = FogisClientPool(max_sessions=200, max_concurrent_requests=32)
+    >>> pool.add_account("referee1", "password1")
+    >>> matches = pool.call("referee1", lambda client: client.fetch_matches_list_json())
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, TypeVar
+
+from requests.adapters import HTTPAdapter
+
+from fogis_api_client.public_api_client import PublicApiClient
+from fogis_api_client.session_store import SessionStore
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class ClientPoolError(Exception):
+    """Exception raised when the client pool cannot serve a request."""
+
+    pass
+
+
+class FairScheduler:
+    """
+    Counting semaphore that hands out free slots round-robin across keys.
+
+    While slots are available they are granted immediately. Once all slots
+    are taken, waiters queue per key and every released slot goes to the
+    next key in turn, rather than to whoever happens to be first in line.
+    """
+
+    def __init__(self, max_concurrent: int) -> None:
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        self._lock = threading.Lock()
+        self._available = max_concurrent
+        self._waiters: "OrderedDict[str, Deque[threading.Event]]" = OrderedDict()
+
+    def acquire(self, key: str, timeout: Optional[float] = None) -> bool:
+        """
+        Acquire a slot for ``key``.
+
+        Args:
+            key: The key (account) the slot is for
+            timeout: Seconds to wait for a slot, or None to wait forever
+
+        Returns:
+            bool: True if a slot was acquired, False on timeout
+        """
+        with self._lock:
+            if self._available > 0 and not self._waiters:
+                self._available -= 1
+                return True
+            granted = threading.Event()
+            self._waiters.setdefault(key, deque()).append(granted)
+
+        if granted.wait(timeout):
+            return True
+
+        with self._lock:
+            queue = self._waiters.get(key)
+            if queue is not None and granted in queue:
+                queue.remove(granted)
+                if not queue:
+                    del self._waiters[key]
+                return False
+        # The slot was handed to us just as the wait timed out
+        return True
+
+    def release(self) -> None:
+        """Release a slot, handing it to the next waiting key if there is one."""
+        with self._lock:
+            if not self._waiters:
+                self._available += 1
+                return
+            key, queue = self._waiters.popitem(last=False)
+            granted = queue.popleft()
+            if queue:
+                # Move the key to the back of the rotation
+                self._waiters[key] = queue
+            granted.set()
+
+    @property
+    def waiting(self) -> int:
+        """Number of callers currently waiting for a slot."""
+        with self._lock:
+            return sum(len(queue) for queue in self._waiters.values())
+
+
+class _PooledClient(PublicApiClient):
+    """PublicApiClient whose logins are limited by the pool."""
+
+    def __init__(self, pool: "FogisClientPool", **kwargs: Any) -> None:
+        self._pool = pool
+        super().__init__(**kwargs)
+
+    def _login_locked(self):
+        # Called with this client's auth lock held, so the lock order is always
+        # client lock -> pool login slot and cannot deadlock.
+        if self._check_existing_authentication() is not None:
+            return super()._login_locked()
+        with self._pool._login_slots:
+            result = super()._login_locked()
+        self._pool._record_login(self.username)
+        return result
+
+
+class _PoolEntry:
+    """A client together with its usage bookkeeping."""
+
+    def __init__(self, client: PublicApiClient) -> None:
+        self.client = client
+        self.in_flight = 0
+        self.last_used = time.monotonic()
+
+
+def _new_metrics() -> Dict[str, Any]:
+    return {
+        "requests": 0,
+        "failures": 0,
+        "logins": 0,
+        "evictions": 0,
+        "total_time": 0.0,
+        "total_wait": 0.0,
+        "last_used": None,
+    }
+
+
+class FogisClientPool:
+    """
+    Lazily authenticated clients for many FOGIS accounts, sharing one connection pool.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = 100,
+        max_concurrent_logins: int = 4,
+        max_concurrent_requests: int = 16,
+        session_store: Optional[SessionStore] = None,
+        pool_connections: int = 4,
+    ) -> None:
+        """
+        Initialize the client pool.
+
+        Args:
+            max_sessions: Maximum number of live client sessions kept in memory
+            max_concurrent_logins: Maximum number of logins running at the same time
+            max_concurrent_requests: Maximum number of requests in flight across all accounts
+            session_store: Optional store used to persist sessions, so evicted accounts
+                can come back without logging in again
+            pool_connections: Number of hosts to keep connection pools for
+        """
+        if max_sessions < 1:
+            raise ValueError("max_sessions must be at least 1")
+
+        self.max_sessions = max_sessions
+        self.session_store = session_store
+
+        self._adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=max_concurrent_requests)
+        self._login_slots = threading.BoundedSemaphore(max_concurrent_logins)
+        self._scheduler = FairScheduler(max_concurrent_requests)
+
+        self._lock = threading.Lock()
+        self._credentials: Dict[str, str] = {}
+        self._entries: "OrderedDict[str, _PoolEntry]" = OrderedDict()
+        self._metrics: Dict[str, Dict[str, Any]] = {}
+
+    def add_account(self, username: str, password: str) -> None:
+        """
+        Register an account. No login happens until the account is first used.
+
+        Args:
+            username: FOGIS username
+            password: FOGIS password
+        """
+        with self._lock:
+            self._credentials[username] = password
+            self._metrics.setdefault(username, _new_metrics())
+
+    def remove_account(self, username: str) -> None:
+        """
+        Forget an account and drop its session.
+
+        Args:
+            username: FOGIS username
+        """
+        with self._lock:
+            self._credentials.pop(username, None)
+            if username in self._entries:
+                self._drop_locked(username)
+            self._metrics.pop(username, None)
+
+    @property
+    def accounts(self) -> List[str]:
+        """All registered account names."""
+        with self._lock:
+            return list(self._credentials)
+
+    @property
+    def active_sessions(self) -> int:
+        """Number of clients currently held in memory."""
+        with self._lock:
+            return len(self._entries)
+
+    def _create_client(self, username: str) -> PublicApiClient:
+        client = _PooledClient(self, username=username, password=self._credentials[username], session_store=self.session_store)
+        # Share connections (not cookies) between all accounts
+        client.session.mount("https://", self._adapter)
+        client.session.mount("http://", self._adapter)
+        return client
+
+    def _checkout(self, username: str) -> _PoolEntry:
+        with self._lock:
+            if username not in self._credentials:
+                raise ClientPoolError(f"Unknown account: {username}")
+            entry = self._entries.get(username)
+            if entry is None:
+                entry = _PoolEntry(self._create_client(username))
+                self._entries[username] = entry
+                self._evict_locked()
+            else:
+                self._entries.move_to_end(username)
+            entry.in_flight += 1
+            entry.last_used = time.monotonic()
+            return entry
+
+    def _checkin(self, username: str, entry: _PoolEntry, elapsed: float, wait: float, failed: bool) -> None:
+        with self._lock:
+            entry.in_flight -= 1
+            entry.last_used = time.monotonic()
+            metrics = self._metrics.get(username)
+            if metrics is not None:
+                metrics["requests"] += 1
+                metrics["failures"] += int(failed)
+                metrics["total_time"] += elapsed
+                metrics["total_wait"] += wait
+                metrics["last_used"] = time.time()
+            self._evict_locked()
+
+    def _evict_locked(self) -> None:
+        """Evict least recently used idle sessions above the session limit."""
+        excess = len(self._entries) - self.max_sessions
+        if excess <= 0:
+            return
+        for username in [name for name, entry in self._entries.items() if entry.in_flight == 0][:excess]:
+            self._drop_locked(username)
+
+    def _drop_locked(self, username: str) -> None:
+        entry = self._entries.pop(username)
+        # Do not close the session: that would close the shared adapter too
+        entry.client.stop_token_refresh()
+        entry.client.stop_session_keeper()
+        if username in self._metrics:
+            self._metrics[username]["evictions"] += 1
+        logger.debug(f"Dropped session for {username}")
+
+    def _record_login(self, username: str) -> None:
+        with self._lock:
+            metrics = self._metrics.get(username)
+            if metrics is not None:
+                metrics["logins"] += 1
+
+    def evict_idle(self, max_idle: float) -> int:
+        """
+        Evict every session that has been idle for at least ``max_idle`` seconds.
+
+        Args:
+            max_idle: Idle time in seconds
+
+        Returns:
+            int: Number of sessions evicted
+        """
+        cutoff = time.monotonic() - max_idle
+        with self._lock:
+            idle = [name for name, entry in self._entries.items() if entry.in_flight == 0 and entry.last_used <= cutoff]
+            for username in idle:
+                self._drop_locked(username)
+        return len(idle)
+
+    def close(self) -> None:
+        """Drop all sessions and close the shared connection pool."""
+        with self._lock:
+            for username in list(self._entries):
+                self._drop_locked(username)
+        self._adapter.close()
+
+    @contextmanager
+    def client(self, username: str, timeout: Optional[float] = None) -> Iterator[PublicApiClient]:
+        """
+        Borrow the client for an account, waiting for a fair request slot first.
+
+        Args:
+            username: FOGIS username
+            timeout: Seconds to wait for a request slot, or None to wait forever
+
+        Yields:
+            PublicApiClient: The account's client, logged in lazily on first use
+
+        Raises:
+            ClientPoolError: If the account is unknown or no slot became free in time
+        """
+        if username not in self._credentials:
+            raise ClientPoolError(f"Unknown account: {username}")
+
+        queued = time.monotonic()
+        if not self._scheduler.acquire(username, timeout):
+            raise ClientPoolError(f"Timed out waiting for a request slot for {username}")
+        started = time.monotonic()
+        failed = True
+        entry = None
+        try:
+            entry = self._checkout(username)
+            yield entry.client
+            failed = False
+        finally:
+            if entry is not None:
+                self._checkin(username, entry, time.monotonic() - started, started - queued, failed)
+            self._scheduler.release()
+
+    def call(self, username: str, operation: Callable[[PublicApiClient], T], timeout: Optional[float] = None) -> T:
+        """
+        Run an operation with an account's client.
+
+        Args:
+            username: FOGIS username
+            operation: Callable receiving the client, e.g. ``lambda c: c.fetch_matches_list_json()``
+            timeout: Seconds to wait for a request slot, or None to wait forever
+
+        Returns:
+            The operation's return value
+        """
+        with self.client(username, timeout=timeout) as client:
+            return operation(client)
+
+    def metrics(self, username: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get per-account metrics.
+
+        Args:
+            username: Return metrics for this account only
+
+        Returns:
+            Dict[str, Any]: For each account: requests, failures, logins, evictions,
+                average latency and queue wait in seconds, last use and whether a
+                session is currently held
+
+        Raises:
+            ClientPoolError: If the account is unknown
+        """
+        with self._lock:
+            if username is not None and username not in self._metrics:
+                raise ClientPoolError(f"Unknown account: {username}")
+            names = [username] if username is not None else list(self._metrics)
+            result = {}
+            for name in names:
+                metrics = self._metrics[name]
+                requests = metrics["requests"]
+                result[name] = {
+                    "requests": requests,
+                    "failures": metrics["failures"],
+                    "logins": metrics["logins"],
+                    "evictions": metrics["evictions"],
+                    "avg_latency": metrics["total_time"] / requests if requests else 0.0,
+                    "avg_queue_wait": metrics["total_wait"] / requests if requests else 0.0,
+                    "last_used": metrics["last_used"],
+                    "active": name in self._entries,
+                }
+        return result[username] if username is not None else result
@@ -1,5 +1,7 @@
 import json
 import logging
+import threading
+import time
 import warnings
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Union, cast
@@ -109,9 +111,11 @@ class FogisApiClient:
         password (Optional[str]): FOGIS password if provided
         session (requests.Session): HTTP session for making requests
         cookies (Optional[CookieDict]): Session cookies for authentication
+        session_validity_window (float): Seconds a validated session is trusted without re-checking
     """
 
     BASE_URL: str = "https://fogis.svenskfotboll.se/mdk"  # Define base URL as a class constant
+    SESSION_VALIDITY_WINDOW: float = 300.0
     logger: logging.Logger = logging.getLogger("fogis_api_client.api")
 
     def __init__(
@@ -119,6 +123,7 @@ class FogisApiClient:
         username: Optional[str] = None,
         password: Optional[str] = None,
         cookies: Optional[CookieDict] = None,
+        session_validity_window: Optional[float] = None,
     ) -> None:
         """
         Initializes the FogisApiClient with either login credentials or session cookies.
@@ -134,6 +139,8 @@ class FogisApiClient:
             password: FOGIS password. Required if cookies are not provided.
             cookies: Session cookies for authentication.
                 If provided, username and password are not required.
+            session_validity_window: Seconds a validated session is trusted before it is
+                probed again (default: SESSION_VALIDITY_WINDOW). Use 0 to probe before every request.
 
         Raises:
             ValueError: If neither valid credentials nor cookies are provided
@@ -150,6 +157,13 @@ class FogisApiClient:
         self.password: Optional[str] = password
         self.session: requests.Session = requests.Session()
         self.cookies: Optional[CookieDict] = None
+        self.session_validity_window: float = (
+            self.SESSION_VALIDITY_WINDOW if session_validity_window is None else session_validity_window
+        )
+
+        # When the session was last confirmed valid, shared by all threads using this client
+        self._session_validated_at: Optional[float] = None
+        self._session_lock = threading.Lock()
 
         # If cookies are provided, use them directly
         if cookies:
@@ -305,6 +319,7 @@ class FogisApiClient:
                     CookieDict,
                     {key: value for key, value in self.session.cookies.items()},
                 )
+                self._mark_session_valid()
                 self.logger.info("Login successful")
                 return self.cookies
             else:
@@ -1168,14 +1183,56 @@ class FogisApiClient:
             # Check if we're still logged in by looking for login form or redirect
             if "Logga in" in response.text or "login" in response.url.lower():
                 self.logger.info("Cookies are no longer valid - redirected to login")
+                self.invalidate_session()
                 return False
 
             self.logger.debug("Session cookies are valid")
+            self._mark_session_valid()
             return True
         except Exception as e:
             self.logger.info(f"Cookie validation failed: {str(e)}")
+            self.invalidate_session()
             return False
 
+    def _mark_session_valid(self) -> None:
+        """Record that the current session was just confirmed to be valid."""
+        self._session_validated_at = time.monotonic()
+
+    def invalidate_session(self) -> None:
+        """
+        Forget that the current session was validated.
+
+        The next API request will probe the session again before using it.
+        """
+        self._session_validated_at = None
+
+    def _session_recently_validated(self) -> bool:
+        validated_at = self._session_validated_at
+        return validated_at is not None and time.monotonic() - validated_at < self.session_validity_window
+
+    def _ensure_session_valid(self) -> bool:
+        """
+        Check the session, probing FOGIS only if it was not validated recently.
+
+        Concurrent callers share a single probe: the first one validates the
+        session while the others wait and then reuse the result.
+
+        Returns:
+            bool: True if the session can be used, False if it has expired
+        """
+        if self._session_recently_validated():
+            return True
+        with self._session_lock:
+            if self._session_recently_validated():
+                return True
+            return self.validate_cookies()
+
+    @staticmethod
+    def _is_login_redirect(response: requests.Response) -> bool:
+        """Check whether a response is FOGIS redirecting an expired session to the login page."""
+        url = getattr(response, "url", None)
+        return isinstance(url, str) and "Login.aspx" in url
+
     def get_cookies(self) -> Optional[CookieDict]:
         """
         Returns the current session cookies.
@@ -1575,10 +1632,14 @@ class FogisApiClient:
 
         # Validate session cookies before making the request (skip for test users)
         elif (
-            not (self.username and isinstance(self.username, str) and "test" in self.username) and not self.validate_cookies()
+            not (self.username and isinstance(self.username, str) and "test" in self.username)
+            and not self._ensure_session_valid()
         ):
             self.logger.info("Session cookies have expired. Re-authenticating...")
             try:
+                # Clear the expired cookies, otherwise login() just returns them
+                self.cookies = None
+                self.session.cookies.clear()
                 self.login()
             except FogisLoginError as e:
                 self.logger.error(f"Re-authentication failed: {e}")
@@ -1614,7 +1675,11 @@ class FogisApiClient:
                 self.logger.error(error_msg)
                 raise ValueError(error_msg)
 
+            if self._is_login_redirect(response):
+                # Handled like a 401 below: re-authenticate and retry once
+                raise requests.exceptions.HTTPError("Redirected to the login page", response=response)
             response.raise_for_status()
+            self._mark_session_valid()
 
             # Parse the response JSON
             try:
@@ -1676,19 +1741,23 @@ class FogisApiClient:
                 return response_json
 
         except requests.exceptions.HTTPError as e:
-            # Handle 401 Unauthorized errors with automatic re-authentication
-            if e.response and e.response.status_code == 401:
+            # Handle 401 Unauthorized errors and login redirects with automatic re-authentication.
+            # A requests.Response is falsy for error statuses, so compare against None explicitly.
+            if e.response is not None and (e.response.status_code == 401 or self._is_login_redirect(e.response)):
                 self.logger.warning(
                     f"Received 401 Unauthorized error. Session may have expired. Attempting re-authentication..."
                 )
+                self.invalidate_session()
                 try:
                     # Clear existing cookies and re-authenticate
                     self.cookies = None
                     self.session.cookies.clear()
                     self.login()
 
-                    # Retry the original request once after re-authentication
+                    # Retry the original request once after re-authentication, with the new cookies
                     self.logger.info("Re-authentication successful. Retrying original request...")
+                    if self.cookies:
+                        api_headers["Cookie"] = "; ".join([f"{key}={value}" for key, value in self.cookies.items()])
                     if method.upper() == "POST":
                         response = self.session.post(url, json=payload, headers=api_headers)
                     elif method.upper() == "GET":
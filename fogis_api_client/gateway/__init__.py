@@ -0,0 +1,16 @@
+"""
+Shared infrastructure for the FOGIS API gateway.
+
+The routes themselves live in ``fogis_api_gateway.py`` (Flask),
+``fogis_api_gateway_asgi.py`` (ASGI) and ``auth_routes.py``; this package
+holds the building blocks they use, such as caches and the client pool, and
+the logic behind the routes that both gateways share (``service`` and
+``auth``).
+"""
+
+from fogis_api_client.gateway.cache import TTLCache
+from fogis_api_client.gateway.pool import GatewayClientPool
+from fogis_api_client.gateway.response_cache import ResponseCache
+from fogis_api_client.gateway.responses import JsonBody, json_response
+
+__all__ = ["TTLCache", "GatewayClientPool", "ResponseCache", "JsonBody", "json_response"]
@@ -0,0 +1,369 @@
+"""
+Admission control and load shedding for the gateway.
+
+When FOGIS slows down, every request holds its thread (or, in the ASGI
+gateway, its connection) for longer, and without a limit they pile up until
+the container runs out of memory. :class:`AdmissionController` bounds the
+requests in flight per route class, lets a few more wait in a short queue and
+rejects the rest at once, so callers get a quick ``503`` with ``Retry-After``
+instead of a timeout.
+
+Reads and writes have separate limits, so event reporting always has
+capacity left however many reads are waiting. The limits only reserve
+anything if together they fit what the server can work on at once (its
+request threads, or in the ASGI gateway its upstream executors), which
+:func:`split_capacity` takes care of for the defaults. Callers that send an API token
+in the ``Authorization`` header can additionally be limited to a number of
+requests in flight or queued each, so one busy integration cannot take all
+the capacity.
+"""
+
+import asyncio
+import hashlib
+import os
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager, suppress
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Iterator, Optional
+
+from fogis_api_client.gateway.mdk_proxy import MDK_PREFIX, WRITE_METHODS
+
+READ = "read"
+WRITE = "write"
+
+# Routes that never call FOGIS per request, or that hold their connection open (the change feed)
+EXEMPT_PATHS = frozenset({"/", "/hello", "/health", "/ready", "/debug", "/api/swagger.json", "/matches/stream"})
+
+
+class AdmissionError(Exception):
+    """Exception raised when the gateway sheds a request."""
+
+    status = 503
+
+
+class GatewaySaturatedError(AdmissionError):
+    """Exception raised when a route class and its wait queue are full."""
+
+    status = 503
+
+
+class CallerQuotaError(AdmissionError):
+    """Exception raised when a caller has too many requests in flight."""
+
+    status = 429
+
+
+def route_class(method: str, path: str) -> Optional[str]:
+    """
+    Classify a request for admission control.
+
+    Args:
+        method: HTTP method
+        path: Request path
+
+    Returns:
+        Optional[str]: WRITE for changes to a match (including proxied FOGIS write methods),
+            READ for other FOGIS calls, or None for routes that are not admission controlled
+    """
+    if path in EXEMPT_PATHS or path.startswith("/api/docs"):
+        return None
+    if path.startswith(MDK_PREFIX):
+        return WRITE if path[len(MDK_PREFIX) :] in WRITE_METHODS else READ
+    if method not in ("GET", "HEAD", "OPTIONS") and path.startswith("/match/"):
+        return WRITE
+    return READ
+
+
+def caller_key(token: Optional[str]) -> Optional[str]:
+    """
+    Key a caller's quota by its API token without keeping the token itself.
+
+    Args:
+        token: The ``Authorization`` header, if any
+
+    Returns:
+        Optional[str]: A hash of the token, or None for anonymous callers
+    """
+    if not token:
+        return None
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()[:16]
+
+
+class _Waiter:
+    __slots__ = ("caller", "wake", "granted", "queued_at")
+
+    def __init__(self, caller: Optional[str], wake: Callable[[], None]) -> None:
+        self.caller = caller
+        self.wake = wake
+        self.granted = False
+        self.queued_at = time.monotonic()
+
+
+class AdmissionController:
+    """
+    Bounded in-flight requests per route class with a short FIFO wait queue and per-caller quotas.
+    """
+
+    def __init__(
+        self,
+        limits: Dict[str, int],
+        queue_size: int = 64,
+        queue_timeout: float = 2.0,
+        caller_limit: int = 0,
+    ) -> None:
+        """
+        Initialize the controller.
+
+        Args:
+            limits: Maximum requests in flight by route class, e.g. ``{READ: 64, WRITE: 16}``
+            queue_size: Maximum requests waiting per route class; more are shed at once
+            queue_timeout: Seconds a request waits for capacity before it is shed
+            caller_limit: Maximum requests in flight or waiting per API token, 0 for no quota
+        """
+        if any(limit < 1 for limit in limits.values()):
+            raise ValueError("limits must be at least 1")
+        self.limits = dict(limits)
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.caller_limit = caller_limit
+        self._lock = threading.Lock()
+        self._in_flight = {name: 0 for name in limits}
+        self._queues: Dict[str, Deque[_Waiter]] = {name: deque() for name in limits}
+        self._callers: Dict[str, int] = {}
+        self._stats = {
+            name: {
+                "admitted": 0,
+                "queued_total": 0,
+                "peak_queued": 0,
+                "shed_queue_full": 0,
+                "shed_timeout": 0,
+                "shed_quota": 0,
+                "max_wait": 0.0,
+            }
+            for name in limits
+        }
+
+    def _enter(self, name: str, caller: Optional[str], wake: Callable[[], None]) -> Optional[_Waiter]:
+        # Admits the request, queues it (returning its waiter) or raises
+        stats = self._stats[name]
+        with self._lock:
+            if caller is not None and self.caller_limit and self._callers.get(caller, 0) >= self.caller_limit:
+                stats["shed_quota"] += 1
+                raise CallerQuotaError(f"Too many requests in flight for this API token (limit {self.caller_limit})")
+            queue = self._queues[name]
+            if self._in_flight[name] < self.limits[name] and not queue:
+                waiter = None
+                self._in_flight[name] += 1
+                stats["admitted"] += 1
+            elif len(queue) < self.queue_size:
+                waiter = _Waiter(caller, wake)
+                queue.append(waiter)
+                stats["queued_total"] += 1
+                stats["peak_queued"] = max(stats["peak_queued"], len(queue))
+            else:
+                stats["shed_queue_full"] += 1
+                raise GatewaySaturatedError(f"Gateway is saturated: too many {name} requests")
+            if caller is not None:
+                self._callers[caller] = self._callers.get(caller, 0) + 1
+            return waiter
+
+    def _claim(self, name: str, waiter: _Waiter) -> None:
+        # Called when a queued request stops waiting; raises unless it was granted capacity meanwhile
+        with self._lock:
+            stats = self._stats[name]
+            stats["max_wait"] = max(stats["max_wait"], time.monotonic() - waiter.queued_at)
+            if waiter.granted:
+                return
+            self._queues[name].remove(waiter)
+            self._forget(waiter.caller)
+            stats["shed_timeout"] += 1
+        raise GatewaySaturatedError(f"Gateway is saturated: no {name} capacity within {self.queue_timeout:g}s")
+
+    def _forget(self, caller: Optional[str]) -> None:
+        # Called with the lock held
+        if caller is None:
+            return
+        remaining = self._callers[caller] - 1
+        if remaining:
+            self._callers[caller] = remaining
+        else:
+            del self._callers[caller]
+
+    def acquire(self, name: Optional[str], caller: Optional[str] = None) -> None:
+        """
+        Wait for capacity in a route class, from a request thread.
+
+        Args:
+            name: Route class, or None for requests that are not admission controlled
+            caller: Caller key from :func:`caller_key`, or None
+
+        Raises:
+            GatewaySaturatedError: If the queue is full or no capacity became free in time
+            CallerQuotaError: If the caller is at its quota
+        """
+        if name is None:
+            return
+        event = threading.Event()
+        waiter = self._enter(name, caller, event.set)
+        if waiter is not None:
+            event.wait(self.queue_timeout)
+            self._claim(name, waiter)
+
+    async def acquire_async(self, name: Optional[str], caller: Optional[str] = None) -> None:
+        """
+        Wait for capacity in a route class, from an asyncio event loop.
+
+        Args:
+            name: Route class, or None for requests that are not admission controlled
+            caller: Caller key from :func:`caller_key`, or None
+
+        Raises:
+            GatewaySaturatedError: If the queue is full or no capacity became free in time
+            CallerQuotaError: If the caller is at its quota
+        """
+        if name is None:
+            return
+        loop = asyncio.get_running_loop()
+        granted = loop.create_future()
+
+        def wake() -> None:
+            loop.call_soon_threadsafe(lambda: granted.done() or granted.set_result(None))
+
+        waiter = self._enter(name, caller, wake)
+        if waiter is None:
+            return
+        try:
+            await asyncio.wait({granted}, timeout=self.queue_timeout)
+        except asyncio.CancelledError:
+            # The client went away while waiting; give back any capacity granted meanwhile
+            with suppress(GatewaySaturatedError):
+                self._claim(name, waiter)
+                self.release(name, caller)
+            raise
+        self._claim(name, waiter)
+
+    def release(self, name: Optional[str], caller: Optional[str] = None) -> None:
+        """
+        Give back the capacity taken by :meth:`acquire` and admit the next waiting request.
+
+        Args:
+            name: Route class passed to :meth:`acquire`
+            caller: Caller key passed to :meth:`acquire`
+        """
+        if name is None:
+            return
+        with self._lock:
+            self._forget(caller)
+            self._in_flight[name] -= 1
+            queue = self._queues[name]
+            while queue and self._in_flight[name] < self.limits[name]:
+                waiter = queue.popleft()
+                waiter.granted = True
+                self._in_flight[name] += 1
+                self._stats[name]["admitted"] += 1
+                waiter.wake()
+
+    @contextmanager
+    def admit(self, name: Optional[str], caller: Optional[str] = None) -> Iterator[None]:
+        """
+        Hold capacity in a route class for the duration of a ``with`` block.
+
+        Args:
+            name: Route class, or None for requests that are not admission controlled
+            caller: Caller key from :func:`caller_key`, or None
+        """
+        self.acquire(name, caller)
+        try:
+            yield
+        finally:
+            self.release(name, caller)
+
+    @asynccontextmanager
+    async def admit_async(self, name: Optional[str], caller: Optional[str] = None) -> AsyncIterator[None]:
+        """
+        Hold capacity in a route class for the duration of an ``async with`` block.
+
+        Args:
+            name: Route class, or None for requests that are not admission controlled
+            caller: Caller key from :func:`caller_key`, or None
+        """
+        await self.acquire_async(name, caller)
+        try:
+            yield
+        finally:
+            self.release(name, caller)
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Get admission metrics.
+
+        Returns:
+            Dict[str, Any]: Per route class the limit, requests in flight and queued, the peak
+                queue depth, admitted and queued totals, shed counts by reason and the longest
+                wait; plus the number of callers with requests and the caller limit
+        """
+        with self._lock:
+            classes = {
+                name: dict(
+                    self._stats[name],
+                    limit=self.limits[name],
+                    in_flight=self._in_flight[name],
+                    queued=len(self._queues[name]),
+                    shed=sum(self._stats[name][reason] for reason in ("shed_queue_full", "shed_timeout", "shed_quota")),
+                )
+                for name in self.limits
+            }
+            return {
+                "classes": classes,
+                "queue_size": self.queue_size,
+                "queue_timeout": self.queue_timeout,
+                "callers": len(self._callers),
+                "caller_limit": self.caller_limit,
+            }
+
+
+def split_capacity(capacity: int) -> Dict[str, int]:
+    """
+    Divide the requests a server can work on at once between reads and writes.
+
+    A quarter, and at least one, is held back for writes, so reads can never
+    take all of it.
+
+    Args:
+        capacity: Requests the server can work on at the same time, e.g. its request threads
+
+    Returns:
+        Dict[str, int]: In-flight limits by route class, adding up to ``capacity`` (at least 2)
+    """
+    writes = max(1, capacity // 4)
+    return {READ: max(1, capacity - writes), WRITE: writes}
+
+
+def admission_from_env(limits: Dict[str, int], queue_size: int = 64) -> Optional[AdmissionController]:
+    """
+    Create the gateway's admission controller from the environment.
+
+    ``GATEWAY_ADMISSION=0`` turns admission control off. ``GATEWAY_MAX_READS`` and
+    ``GATEWAY_MAX_WRITES`` override the in-flight limits, ``GATEWAY_ADMISSION_QUEUE`` and
+    ``GATEWAY_ADMISSION_QUEUE_TIMEOUT`` the wait queue, and ``GATEWAY_CALLER_LIMIT`` sets the
+    per-token quota.
+
+    Args:
+        limits: Default in-flight limits by route class, see :func:`split_capacity`
+        queue_size: Default number of requests per route class that may wait for capacity
+
+    Returns:
+        Optional[AdmissionController]: The controller, or None when turned off
+    """
+    if os.environ.get("GATEWAY_ADMISSION", "1") != "1":
+        return None
+    return AdmissionController(
+        limits={
+            READ: int(os.environ.get("GATEWAY_MAX_READS", limits[READ])),
+            WRITE: int(os.environ.get("GATEWAY_MAX_WRITES", limits[WRITE])),
+        },
+        queue_size=int(os.environ.get("GATEWAY_ADMISSION_QUEUE", queue_size)),
+        queue_timeout=float(os.environ.get("GATEWAY_ADMISSION_QUEUE_TIMEOUT", "2")),
+        caller_limit=int(os.environ.get("GATEWAY_CALLER_LIMIT", "0")),
+    )
@@ -0,0 +1,271 @@
+"""
+Asyncio front end for the FOGIS API client.
+
+The ASGI gateway keeps every downstream request as a coroutine, so thousands
+of requests waiting on slow upstream calls cost no threads. With httpx
+installed (part of the ``gateway`` extra), ``MatchWebMetoder.aspx`` reads and
+raw protocol calls are sent from the event loop by an ``httpx.AsyncClient``,
+so upstream concurrency is not tied to a thread pool either. They carry the
+``requests`` session's cookies and headers, and cookies FOGIS sets come back
+into that session, so both clients share one login. Logging in, renewing a
+rejected session and the remaining calls (writes, filtered match lists, the
+``/auth`` routes) stay on the thread-safe ``requests``-based client, run on
+small bounded executors.
+
+Identical calls that are in flight at the same time are coalesced into one.
+Writes have limits and an executor of their own, so event reporting is never
+stuck behind a backlog of slow reads.
+"""
+
+import asyncio
+import functools
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from fogis_api_client.public_api_client import FogisAPIRequestError, PublicApiClient, WebMethodCall
+
+try:
+    import httpx
+except ImportError:
+    # httpx is optional; see the gateway extra. Without it every upstream call runs on the executors
+    httpx = None
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncFogisClient:
+    """
+    Calls FOGIS from asyncio with bounded upstream concurrency.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 32,
+        max_write_concurrency: int = 8,
+        native: Optional[bool] = None,
+        timeout: float = 30.0,
+        http_transport: Any = None,
+    ) -> None:
+        """
+        Initialize the adapter.
+
+        Args:
+            max_concurrency: Maximum number of upstream reads running at the same time
+            max_write_concurrency: Maximum number of upstream writes running at the same time
+            native: Send reads with httpx from the event loop; defaults to whether httpx is installed
+            timeout: Seconds an httpx request may take
+            http_transport: httpx transport to send with instead of the network, e.g. ``httpx.MockTransport``
+        """
+        if max_concurrency < 1 or max_write_concurrency < 1:
+            raise ValueError("max_concurrency and max_write_concurrency must be at least 1")
+        if native and httpx is None:
+            raise ValueError("The asyncio transport needs httpx: pip install 'fogis-api-client-timmyBird[gateway]'")
+        self.max_concurrency = max_concurrency
+        self.max_write_concurrency = max_write_concurrency
+        self.native = httpx is not None if native is None else native
+        self.timeout = timeout
+        self._http_transport = http_transport
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="fogis-upstream")
+        self._write_executor = ThreadPoolExecutor(max_workers=max_write_concurrency, thread_name_prefix="fogis-upstream-write")
+        self._in_flight: Dict[Hashable, "asyncio.Future[Any]"] = {}
+        self._stats = {"calls": 0, "coalesced": 0, "writes": 0, "requests": 0, "reauthentications": 0}
+        # The httpx client, limits and login lock belong to the event loop they were created on
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._http: Any = None
+        self._read_slots: Optional[asyncio.Semaphore] = None
+        self._write_slots: Optional[asyncio.Semaphore] = None
+        self._login_lock: Optional[asyncio.Lock] = None
+
+    async def run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Run a blocking call on the upstream executor.
+
+        Args:
+            func: The blocking callable
+            *args: Positional arguments for ``func``
+            **kwargs: Keyword arguments for ``func``
+
+        Returns:
+            The call's return value
+        """
+        self._stats["calls"] += 1
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    async def write(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Run a blocking call that changes data in FOGIS on the write executor.
+
+        Args:
+            func: The blocking callable
+            *args: Positional arguments for ``func``
+            **kwargs: Keyword arguments for ``func``
+
+        Returns:
+            The call's return value
+        """
+        self._stats["writes"] += 1
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._write_executor, functools.partial(func, *args, **kwargs))
+
+    async def call(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        """
+        Run a blocking call, sharing the result with identical calls already in flight.
+
+        Args:
+            key: Identifies the call; concurrent calls with the same key run once
+            func: The blocking callable
+
+        Returns:
+            The call's return value
+        """
+        return await self.call_async(key, lambda: self.run(func))
+
+    async def call_async(self, key: Hashable, load: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await a coroutine, sharing the result with identical calls already in flight.
+
+        Args:
+            key: Identifies the call; concurrent calls with the same key run once
+            load: Returns the coroutine, e.g. one of ``read`` or ``post``
+
+        Returns:
+            The coroutine's result
+        """
+        future = self._in_flight.get(key)
+        if future is not None:
+            self._stats["coalesced"] += 1
+            return await asyncio.shield(future)
+
+        future = asyncio.ensure_future(load())
+        self._in_flight[key] = future
+        future.add_done_callback(lambda _: self._in_flight.pop(key, None) if self._in_flight.get(key) is future else None)
+        # Shielded, so one caller disconnecting does not cancel the call for the others
+        return await asyncio.shield(future)
+
+    def _client(self) -> Any:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            limits = httpx.Limits(max_connections=self.max_concurrency + self.max_write_concurrency)
+            # Cookies live in each API client's session; the shared httpx client must never keep any
+            no_cookies = CookieJar(DefaultCookiePolicy(allowed_domains=[]))
+            self._http = httpx.AsyncClient(
+                transport=self._http_transport, limits=limits, timeout=self.timeout, cookies=no_cookies
+            )
+            self._read_slots = asyncio.Semaphore(self.max_concurrency)
+            self._write_slots = asyncio.Semaphore(self.max_write_concurrency)
+            self._login_lock = asyncio.Lock()
+        return self._http
+
+    async def _send(self, api: PublicApiClient, url: str, body: bytes) -> Any:
+        client = self._client()
+        # The session's own jar, so cookies FOGIS renews reach the requests-based client too
+        cookies = httpx.Cookies(api.session.cookies)
+        request = client.build_request("POST", url, content=body, headers={**api.session.headers, **api.api_headers()})
+        cookies.set_cookie_header(request)
+        response = await client.send(request, follow_redirects=False)
+        cookies.extract_cookies(response)
+        return response
+
+    async def post(self, api: PublicApiClient, method: str, body: bytes, write: bool = False) -> Any:
+        """
+        POST a JSON body to a ``MatchWebMetoder.aspx`` method with the client's session.
+
+        Logs in first if the client has no session, and renews a rejected
+        session once, both on the executor.
+
+        Args:
+            api: The FOGIS API client whose session is used
+            method: Method name, e.g. ``GetMatchhandelselista``
+            body: JSON request body
+            write: Whether the call changes data, so it counts against the write limit
+
+        Returns:
+            httpx.Response: FOGIS's response, read in full
+
+        Raises:
+            FogisAPIRequestError: If the request fails
+        """
+        self._client()
+        if not api.is_authenticated():
+            async with self._login_lock:
+                if not api.is_authenticated():
+                    await self.run(api.login)
+
+        url = f"{api.BASE_URL}/MatchWebMetoder.aspx/{method}"
+        self._stats["requests"] += 1
+        async with self._write_slots if write else self._read_slots:
+            try:
+                generation = api.auth_generation
+                response = await self._send(api, url, body)
+                if api.is_session_rejected(response.status_code, response.headers.get("Location", "")):
+                    logger.warning("Session was rejected, attempting to refresh authentication")
+                    self._stats["reauthentications"] += 1
+                    if not await self.run(api.reauthenticate, generation):
+                        raise FogisAPIRequestError("Authentication refresh failed")
+                    response = await self._send(api, url, body)
+                response.raise_for_status()
+            except httpx.HTTPError as e:
+                raise FogisAPIRequestError(f"Request failed: {e}")
+        return response
+
+    async def read(self, api: PublicApiClient, call: WebMethodCall) -> Any:
+        """
+        Make a ``MatchWebMetoder.aspx`` read and decode it as the client's own fetch methods do.
+
+        Args:
+            api: The FOGIS API client whose session is used
+            call: The read, e.g. ``api.team_players_call(team_id)``
+
+        Returns:
+            The decoded data
+
+        Raises:
+            FogisAPIRequestError: If the request fails or the response is not JSON
+        """
+        response = await self.post(api, call.method, json.dumps(call.payload).encode("utf-8"))
+        if response.status_code != 200:
+            raise FogisAPIRequestError(f"Failed to fetch {call.what}: {response.status_code}")
+        try:
+            return call.decode(json.loads(response.content))
+        except json.JSONDecodeError as e:
+            raise FogisAPIRequestError(f"Failed to parse API response: {e}")
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Get upstream call metrics.
+
+        Returns:
+            Dict[str, Any]: Transport, concurrency limits, executor calls started, coalesced and in flight,
+                writes started, httpx requests sent and sessions renewed
+        """
+        return dict(
+            self._stats,
+            transport="httpx" if self.native else "threads",
+            max_concurrency=self.max_concurrency,
+            max_write_concurrency=self.max_write_concurrency,
+            in_flight=len(self._in_flight),
+        )
+
+    async def aclose(self) -> None:
+        """
+        Close the httpx client's connections, from the event loop that uses them.
+        """
+        if self._http is not None and self._loop is asyncio.get_running_loop():
+            await self._http.aclose()
+            self._http = None
+            self._loop = None
+
+    def close(self, wait: bool = True) -> None:
+        """
+        Shut the executors down.
+
+        Args:
+            wait: Wait for running calls to finish
+        """
+        self._executor.shutdown(wait=wait)
+        self._write_executor.shutdown(wait=wait)
@@ -0,0 +1,126 @@
+"""
+The ``/auth`` routes, shared by the Flask blueprint in ``auth_routes.py`` and the ASGI gateway.
+
+Each handler takes the authentication cache (``auth_routes.AuthCache``) and
+the request's JSON body, and returns the response body and status. They call
+FOGIS when the cache has no answer, so the ASGI gateway runs them on its
+upstream executor.
+"""
+
+import logging
+from typing import Any, Dict, Tuple
+
+from fogis_api_client.public_api_client import FogisLoginError
+
+logger = logging.getLogger(__name__)
+
+Reply = Tuple[Dict[str, Any], int]
+
+NOT_JSON: Reply = ({"error": "Content-Type must be application/json"}, 415)
+MISSING_TOKEN: Reply = ({"success": False, "error": "Missing required field: token"}, 400)
+
+
+def login(auth_cache: Any, data: Any) -> Reply:
+    """
+    Log in with FOGIS and return the session cookies as the token.
+
+    Args:
+        auth_cache: The authentication cache
+        data: Request body with username and password
+
+    Returns:
+        Reply: Response body and status
+    """
+    # Validate request data
+    if not data or "username" not in data or "password" not in data:
+        return {"success": False, "error": "Missing required fields: username and password"}, 400
+
+    try:
+        # Perform login, reusing a still valid session for the same credentials
+        cookies = auth_cache.login(data["username"], data["password"])
+
+        if not cookies:
+            return {"success": False, "error": "Login failed: No cookies returned"}, 401
+
+        # Return the cookies as the authentication token
+        return {"success": True, "message": "Login successful", "token": cookies}, 200
+
+    except FogisLoginError as e:
+        logger.error(f"Login failed: {e}")
+        return {"success": False, "error": f"Login failed: {str(e)}"}, 401
+
+    except Exception as e:
+        logger.error(f"Unexpected error during login: {e}")
+        return {"success": False, "error": f"Unexpected error: {str(e)}"}, 500
+
+
+def validate(auth_cache: Any, data: Any) -> Reply:
+    """
+    Check whether a token (cookies) is still valid.
+
+    Args:
+        auth_cache: The authentication cache
+        data: Request body with the token
+
+    Returns:
+        Reply: Response body and status
+    """
+    if not data or "token" not in data:
+        return MISSING_TOKEN
+
+    try:
+        # Validate the cookies, answered from the cache while a result is live
+        if auth_cache.validate(data["token"]):
+            return {"success": True, "valid": True, "message": "Token is valid"}, 200
+        return {"success": True, "valid": False, "message": "Token is invalid or expired"}, 200
+
+    except Exception as e:
+        logger.error(f"Unexpected error during token validation: {e}")
+        return {"success": False, "error": f"Unexpected error: {str(e)}"}, 500
+
+
+def logout(auth_cache: Any, data: Any) -> Reply:
+    """
+    Forget a token; FOGIS has no logout, so the client should discard the token too.
+
+    Args:
+        auth_cache: The authentication cache
+        data: Request body with the token
+
+    Returns:
+        Reply: Response body and status
+    """
+    if not data or "token" not in data:
+        return MISSING_TOKEN
+
+    # Forget the token locally; it should be discarded by the client as well
+    auth_cache.forget(data["token"])
+    return {"success": True, "message": "Logout successful. Please discard the token on the client side."}, 200
+
+
+def refresh(auth_cache: Any, data: Any) -> Reply:
+    """
+    Return the token again while it is valid; FOGIS has no refresh mechanism.
+
+    Args:
+        auth_cache: The authentication cache
+        data: Request body with the token
+
+    Returns:
+        Reply: Response body and status
+    """
+    if not data or "token" not in data:
+        return MISSING_TOKEN
+
+    token = data["token"]
+    try:
+        # Validate the cookies, answered from the cache while a result is live
+        if auth_cache.validate(token):
+            # For now, just return the same token as it's still valid
+            # In the future, we could implement a proper refresh mechanism
+            return {"success": True, "message": "Token is still valid", "token": token}, 200
+        return {"success": False, "error": "Token is invalid or expired. Please login again.", "valid": False}, 401
+
+    except Exception as e:
+        logger.error(f"Unexpected error during token refresh: {e}")
+        return {"success": False, "error": f"Unexpected error: {str(e)}"}, 500
@@ -0,0 +1,215 @@
+"""
+Concurrent batches of read operations for the gateway's ``POST /batch`` route.
+
+A dashboard that needs a match, its events, its result and both teams' players
+for every match of a week would otherwise make dozens of round trips. A batch
+names each read by its route, either as a route name with parameters::
+
+    {"id": "m1", "route": "match_events", "params": {"match_id": 123}}
+
+or as the path the read would have been sent to::
+
+    {"id": "m1", "route": "/match/123/events"}
+
+The operations run concurrently; each gets its own status, and operations
+still running when the batch timeout expires are reported with status 504.
+"""
+
+import asyncio
+import os
+import re
+from concurrent.futures import Executor
+from concurrent.futures import wait as wait_futures
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Tuple
+
+from fogis_api_client.client_pool import ClientPoolError
+
+# Read routes a batch may contain, with the parameters each takes
+BATCH_ROUTES: Dict[str, str] = {
+    "matches": "/matches",
+    "match": "/match/<match_id>",
+    "match_result": "/match/<match_id>/result",
+    "match_events": "/match/<match_id>/events",
+    "match_officials": "/match/<match_id>/officials",
+    "team_players": "/team/<team_id>/players",
+    "team_officials": "/team/<team_id>/officials",
+}
+
+# Largest number of operations in one batch
+MAX_OPERATIONS = int(os.environ.get("GATEWAY_BATCH_MAX_OPERATIONS", "50"))
+
+# Longest (and default) time a batch may take, in seconds
+MAX_TIMEOUT = float(os.environ.get("GATEWAY_BATCH_TIMEOUT", "30"))
+
+_ROUTE_PARAMS = {name: tuple(re.findall(r"<(\w+)>", path)) for name, path in BATCH_ROUTES.items()}
+_ROUTE_PATTERNS = [
+    (name, re.compile("^" + re.sub(r"<(\w+)>", r"(?P<\1>[^/]+)", path) + "/?$")) for name, path in BATCH_ROUTES.items()
+]
+
+
+class BatchError(Exception):
+    """Exception raised for a malformed batch request."""
+
+    pass
+
+
+class BatchOperation:
+    """
+    One read operation of a batch.
+    """
+
+    def __init__(self, op_id: str, route: str, params: Dict[str, int], error: Optional[str] = None) -> None:
+        """
+        Initialize the operation.
+
+        Args:
+            op_id: Caller's identifier, echoed in the result
+            route: Route name, a key of BATCH_ROUTES
+            params: Route parameters
+            error: Why the operation is invalid, if it is
+        """
+        self.id = op_id
+        self.route = route
+        self.params = params
+        self.error = error
+
+
+def _resolve_route(route: str, params: Dict[str, Any]) -> Tuple[Optional[str], Dict[str, Any]]:
+    # Route names pass through; paths become a route name plus their path parameters
+    if not route.startswith("/"):
+        return (route if route in BATCH_ROUTES else None), params
+    path = route.split("?", 1)[0]
+    for name, pattern in _ROUTE_PATTERNS:
+        found = pattern.match(path)
+        if found:
+            return name, dict(params, **found.groupdict())
+    return None, params
+
+
+def _parse_operation(index: int, raw: Any) -> BatchOperation:
+    if not isinstance(raw, dict):
+        return BatchOperation(str(index), "", {}, "Operation must be an object")
+    op_id = str(raw.get("id", index))
+    route = raw.get("route")
+    params = raw.get("params") or {}
+    if not isinstance(route, str) or not isinstance(params, dict):
+        return BatchOperation(op_id, str(route), {}, "Operation needs a route and an optional params object")
+
+    name, params = _resolve_route(route, params)
+    if name is None:
+        return BatchOperation(op_id, route, {}, f"Unsupported route: {route}")
+
+    values = {}
+    for param in _ROUTE_PARAMS[name]:
+        try:
+            values[param] = int(params[param])
+        except KeyError:
+            return BatchOperation(op_id, name, {}, f"Missing parameter: {param}")
+        except (TypeError, ValueError):
+            return BatchOperation(op_id, name, {}, f"Parameter {param} must be an integer")
+    return BatchOperation(op_id, name, values)
+
+
+def parse_batch(payload: Any) -> Tuple[List[BatchOperation], float]:
+    """
+    Parse a batch request body.
+
+    Invalid individual operations do not fail the batch; they are returned with
+    an error and reported with status 400.
+
+    Args:
+        payload: The decoded JSON body, ``{"operations": [...], "timeout": seconds}``
+
+    Returns:
+        The operations, and the batch timeout in seconds (at most MAX_TIMEOUT)
+
+    Raises:
+        BatchError: If the body is not a batch, is empty or has too many operations
+    """
+    if not isinstance(payload, dict) or not isinstance(payload.get("operations"), list):
+        raise BatchError("Request body must be an object with an operations list")
+    raw_operations = payload["operations"]
+    if not raw_operations:
+        raise BatchError("operations must not be empty")
+    if len(raw_operations) > MAX_OPERATIONS:
+        raise BatchError(f"A batch may contain at most {MAX_OPERATIONS} operations")
+
+    timeout = payload.get("timeout", MAX_TIMEOUT)
+    if isinstance(timeout, bool) or not isinstance(timeout, (int, float)) or timeout <= 0:
+        raise BatchError("timeout must be a positive number of seconds")
+
+    return [_parse_operation(index, raw) for index, raw in enumerate(raw_operations)], min(float(timeout), MAX_TIMEOUT)
+
+
+def _result(op: BatchOperation, status: int, data: Any = None, error: Optional[str] = None) -> Dict[str, Any]:
+    result = {"id": op.id, "route": op.route, "status": status}
+    if error is None:
+        result["data"] = getattr(data, "data", data)  # unwrap cached JsonBody responses
+    else:
+        result["error"] = error
+    return result
+
+
+def _collect(op: BatchOperation, future: Any, pending: Any) -> Dict[str, Any]:
+    # Works for both concurrent.futures.Future and asyncio tasks
+    if op.error is not None:
+        return _result(op, 400, error=op.error)
+    if future in pending:
+        return _result(op, 504, error="Timed out")
+    error = future.exception()
+    if error is None:
+        return _result(op, 200, future.result())
+    if isinstance(error, ClientPoolError):
+        return _result(op, 503, error=str(error))
+    return _result(op, 500, error=str(error))
+
+
+def run_batch(
+    operations: List[BatchOperation],
+    execute: Callable[[str, Mapping[str, int]], Any],
+    executor: Executor,
+    timeout: float,
+) -> List[Dict[str, Any]]:
+    """
+    Run a batch's operations concurrently on an executor.
+
+    Args:
+        operations: Parsed operations
+        execute: Performs one read given its route name and parameters
+        executor: Runs the reads
+        timeout: Seconds to wait for the whole batch
+
+    Returns:
+        List[Dict[str, Any]]: One result per operation, in order, with ``status``
+            and either ``data`` or ``error``
+    """
+    futures = [None if op.error else executor.submit(execute, op.route, op.params) for op in operations]
+    _, pending = wait_futures([future for future in futures if future is not None], timeout=timeout)
+    for future in pending:
+        future.cancel()
+    return [_collect(op, future, pending) for op, future in zip(operations, futures)]
+
+
+async def run_batch_async(
+    operations: List[BatchOperation],
+    execute: Callable[[str, Mapping[str, int]], Awaitable[Any]],
+    timeout: float,
+) -> List[Dict[str, Any]]:
+    """
+    Run a batch's operations concurrently as coroutines.
+
+    Args:
+        operations: Parsed operations
+        execute: Performs one read given its route name and parameters
+        timeout: Seconds to wait for the whole batch
+
+    Returns:
+        List[Dict[str, Any]]: One result per operation, as for :func:`run_batch`
+    """
+    tasks = [None if op.error else asyncio.ensure_future(execute(op.route, op.params)) for op in operations]
+    pending = set()
+    if any(task is not None for task in tasks):
+        _, pending = await asyncio.wait([task for task in tasks if task is not None], timeout=timeout)
+    for task in pending:
+        task.cancel()
+    return [_collect(op, task, pending) for op, task in zip(operations, tasks)]
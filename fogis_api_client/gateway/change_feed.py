@@ -0,0 +1,344 @@
+"""
+Change feed of the match list for the gateway's ``GET /matches/stream`` route.
+
+One background poller fetches the match list at a fixed interval, diffs it
+against the previous list and publishes an ``added``, ``changed`` or
+``removed`` event per match. Subscribers only read the published events, so
+any number of them cost one upstream poll per interval, and the poller only
+runs while somebody is subscribed.
+
+Event IDs are ``<epoch>-<sequence>``, where the epoch identifies this feed
+instance. A subscriber that reconnects with its last event ID gets the events
+it missed, as long as they are still in the feed's history; otherwise, and
+on the first connection, it gets a ``snapshot`` event with the full list.
+
+A thread following the feed is held for as long as its client stays
+connected, so threaded servers cap those subscribers with
+``max_sync_subscribers``; asyncio subscribers hold no thread and are not
+capped. :meth:`MatchFeed.stop` ends every subscription, so streams close
+before a shutting-down process waits for its requests.
+
+The poller belongs to the process: a pre-fork server with W workers that all
+have subscribers polls FOGIS W times per interval.
+"""
+
+import asyncio
+import logging
+import threading
+import uuid
+from collections import deque
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from fogis_api_client.gateway.responses import dumps_json
+
+logger = logging.getLogger(__name__)
+
+# Sent as an SSE comment while there is nothing to report, so proxies keep the connection open
+HEARTBEAT = ": keepalive\n\n"
+
+
+class FeedFullError(Exception):
+    """Exception raised when every thread subscription to the feed is taken."""
+
+    status = 503
+
+
+class FeedEvent(NamedTuple):
+    """One published change."""
+
+    seq: int
+    type: str
+    data: Any
+
+
+class MatchFeed:
+    """
+    Shared poller that turns successive match lists into change events.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[], List[Dict[str, Any]]],
+        interval: float = 60.0,
+        id_field: str = "matchid",
+        history: int = 1000,
+        max_sync_subscribers: Optional[int] = None,
+    ) -> None:
+        """
+        Initialize the feed.
+
+        Args:
+            fetch: Fetches the current match list
+            interval: Seconds between polls
+            id_field: Field that identifies a match
+            history: Number of past events kept for reconnecting subscribers
+            max_sync_subscribers: Most subscriptions from threads at a time, or None for no limit
+        """
+        self.fetch = fetch
+        self.interval = interval
+        self.id_field = id_field
+        self.max_sync_subscribers = max_sync_subscribers
+        self.epoch = uuid.uuid4().hex[:8]
+        self._changed = threading.Condition()
+        self._items: Optional[Dict[Any, Dict[str, Any]]] = None
+        self._events: Deque[FeedEvent] = deque(maxlen=history)
+        self._seq = 0
+        self._subscribers = 0
+        self._sync_subscribers = 0
+        self._async_waiters: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = set()
+        self._poller: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._stats = {"polls": 0, "poll_errors": 0, "events": 0}
+
+    def event_id(self, seq: int) -> str:
+        """The SSE event ID for a sequence number."""
+        return f"{self.epoch}-{seq}"
+
+    def _parse_event_id(self, event_id: Optional[str]) -> Optional[int]:
+        # Only IDs issued by this feed instance can be resumed from
+        if not event_id:
+            return None
+        epoch, _, seq = event_id.partition("-")
+        if epoch != self.epoch or not seq.isdigit():
+            return None
+        return int(seq)
+
+    def diff(self, previous: Dict[Any, Dict[str, Any]], current: Dict[Any, Dict[str, Any]]) -> List[Tuple[str, Any]]:
+        """
+        Compute the changes between two match lists.
+
+        Args:
+            previous: Matches by id before
+            current: Matches by id now
+
+        Returns:
+            List[Tuple[str, Any]]: ``(type, data)`` pairs for added, changed and removed matches
+        """
+        changes = []
+        for match_id, item in current.items():
+            if match_id not in previous:
+                changes.append(("added", item))
+            elif previous[match_id] != item:
+                changes.append(("changed", item))
+        for match_id in previous:
+            if match_id not in current:
+                changes.append(("removed", {self.id_field: match_id}))
+        return changes
+
+    def poll_once(self) -> List[FeedEvent]:
+        """
+        Fetch the match list once and publish its changes.
+
+        The first poll only records the list; subscribers receive it as a snapshot.
+
+        Returns:
+            List[FeedEvent]: The events published by this poll
+        """
+        try:
+            items = self.fetch()
+        except Exception as e:
+            self._stats["poll_errors"] += 1
+            logger.warning(f"Match feed poll failed: {e}")
+            return []
+        self._stats["polls"] += 1
+        current = {item.get(self.id_field): item for item in items if isinstance(item, dict)}
+
+        with self._changed:
+            changes = [] if self._items is None else self.diff(self._items, current)
+            published = []
+            for event_type, data in changes:
+                self._seq += 1
+                published.append(FeedEvent(self._seq, event_type, data))
+            self._events.extend(published)
+            self._stats["events"] += len(published)
+            loaded = self._items is None
+            self._items = current
+            if published or loaded:
+                self._notify()
+        return published
+
+    def _notify(self) -> None:
+        # Called with the lock held
+        self._changed.notify_all()
+        for loop, wake in list(self._async_waiters):
+            try:
+                loop.call_soon_threadsafe(wake.set)
+            except RuntimeError:
+                # The subscriber's event loop has closed
+                self._async_waiters.discard((loop, wake))
+
+    def _collect(self, cursor: Optional[int]) -> Tuple[List[FeedEvent], Optional[int]]:
+        # Called with the lock held. Returns the events after the cursor and the new cursor,
+        # or a snapshot when the cursor cannot be resumed from.
+        if self._items is None:
+            return [], cursor
+        oldest = self._events[0].seq if self._events else self._seq + 1
+        if cursor is None or cursor > self._seq or cursor < oldest - 1:
+            return [FeedEvent(self._seq, "snapshot", list(self._items.values()))], self._seq
+        return [event for event in self._events if event.seq > cursor], self._seq
+
+    def _run(self) -> None:
+        while True:
+            with self._changed:
+                if self._subscribers == 0 or self._stop.is_set():
+                    self._poller = None
+                    return
+            self.poll_once()
+            self._stop.wait(self.interval)
+
+    def _acquire(self) -> None:
+        with self._changed:
+            self._subscribers += 1
+            if self._poller is None and not self._stop.is_set():
+                self._poller = threading.Thread(target=self._run, name="match-feed-poller", daemon=True)
+                self._poller.start()
+
+    def _release(self) -> None:
+        with self._changed:
+            self._subscribers -= 1
+
+    def subscribe(self, last_event_id: Optional[str] = None, heartbeat: float = 15.0) -> "Subscription":
+        """
+        Follow the feed from a thread.
+
+        Args:
+            last_event_id: ID of the last event the subscriber received, to resume after
+            heartbeat: Seconds after which None is yielded if nothing happened
+
+        Returns:
+            Subscription: Iterator of events, or None as a heartbeat, until closed or the feed stops
+
+        Raises:
+            FeedFullError: If ``max_sync_subscribers`` threads are following the feed already
+        """
+        cursor = self._parse_event_id(last_event_id)
+        with self._changed:
+            if self.max_sync_subscribers is not None and self._sync_subscribers >= self.max_sync_subscribers:
+                raise FeedFullError(f"The change feed already has {self._sync_subscribers} subscribers, try again later")
+            self._sync_subscribers += 1
+        self._acquire()
+        return Subscription(self, self._follow(cursor, heartbeat))
+
+    def _follow(self, cursor: Optional[int], heartbeat: float) -> Iterator[Optional[FeedEvent]]:
+        while not self._stop.is_set():
+            with self._changed:
+                events, cursor = self._collect(cursor)
+                if not events and not self._stop.is_set():
+                    self._changed.wait(heartbeat)
+                    events, cursor = self._collect(cursor)
+            if not events and not self._stop.is_set():
+                yield None
+            for event in events:
+                yield event
+
+    def _release_sync(self) -> None:
+        with self._changed:
+            self._sync_subscribers -= 1
+        self._release()
+
+    async def subscribe_async(
+        self, last_event_id: Optional[str] = None, heartbeat: float = 15.0
+    ) -> AsyncIterator[Optional[FeedEvent]]:
+        """
+        Follow the feed from an asyncio event loop without holding a thread.
+
+        Args:
+            last_event_id: ID of the last event the subscriber received, to resume after
+            heartbeat: Seconds after which None is yielded if nothing happened
+
+        Yields:
+            Optional[FeedEvent]: Events, or None as a heartbeat
+        """
+        cursor = self._parse_event_id(last_event_id)
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with self._changed:
+            self._async_waiters.add(waiter)
+        self._acquire()
+        try:
+            while not self._stop.is_set():
+                waiter[1].clear()
+                with self._changed:
+                    events, cursor = self._collect(cursor)
+                for event in events:
+                    yield event
+                if events:
+                    continue
+                try:
+                    await asyncio.wait_for(waiter[1].wait(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield None
+        finally:
+            with self._changed:
+                self._async_waiters.discard(waiter)
+            self._release()
+
+    def format(self, event: Optional[FeedEvent]) -> str:
+        """
+        Format an event, or a heartbeat for None, as a server-sent event.
+
+        Args:
+            event: The event
+
+        Returns:
+            str: The text to send
+        """
+        if event is None:
+            return HEARTBEAT
+        return f"id: {self.event_id(event.seq)}\nevent: {event.type}\ndata: {dumps_json(event.data)}\n\n"
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Get feed metrics.
+
+        Returns:
+            Dict[str, Any]: Subscribers, whether the poller is running, polls, poll errors and events
+        """
+        with self._changed:
+            return dict(
+                self._stats,
+                subscribers=self._subscribers,
+                sync_subscribers=self._sync_subscribers,
+                polling=self._poller is not None,
+                interval=self.interval,
+                matches=None if self._items is None else len(self._items),
+                last_event_id=self.event_id(self._seq),
+            )
+
+    def stop(self) -> None:
+        """Stop the poller for good and end every subscription."""
+        self._stop.set()
+        with self._changed:
+            self._notify()
+
+
+class Subscription:
+    """
+    A thread's subscription to a :class:`MatchFeed`, iterated for its events.
+
+    Closing it, even before it was first iterated, frees its place at once.
+    """
+
+    def __init__(self, feed: MatchFeed, events: Iterator[Optional[FeedEvent]]) -> None:
+        self._feed = feed
+        self._events = events
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def __iter__(self) -> "Subscription":
+        return self
+
+    def __next__(self) -> Optional[FeedEvent]:
+        try:
+            return next(self._events)
+        except StopIteration:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        """Stop following the feed."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._events.close()
+        self._feed._release_sync()
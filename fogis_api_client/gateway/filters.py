@@ -0,0 +1,134 @@
+"""
+Request body mapping for the gateways' ``POST /matches/filter`` route.
+
+The body is validated and mapped onto the :class:`MatchListFilter` builder
+methods, so date ranges and categories are sent to FOGIS instead of being
+applied to the full default date window afterwards. Each field takes the
+builder method's name (``start_date``, ``include_statuses``, ...); the
+original field names (``from_date``, ``to_date``, ``status``,
+``age_category``, ``gender``, ``football_type``) are accepted as aliases of
+the date and include filters.
+
+Enum fields take a value or a list of values, each either the enum value
+(``"installd"``, ``3``) or the member name in any case (``"cancelled"``).
+"""
+
+from datetime import date
+from enum import Enum
+from typing import Any, Dict, List, Mapping, Type
+
+from fogis_api_client.enums import AgeCategory, FootballType, Gender, MatchStatus
+from fogis_api_client.match_list_filter import MatchListFilter
+
+# Legacy field names of POST /matches/filter
+FIELD_ALIASES = {
+    "from_date": "start_date",
+    "to_date": "end_date",
+    "status": "include_statuses",
+    "age_category": "include_age_categories",
+    "gender": "include_genders",
+    "football_type": "include_football_types",
+}
+
+ENUM_FIELDS: Dict[str, Type[Enum]] = {
+    "include_statuses": MatchStatus,
+    "exclude_statuses": MatchStatus,
+    "include_age_categories": AgeCategory,
+    "exclude_age_categories": AgeCategory,
+    "include_genders": Gender,
+    "exclude_genders": Gender,
+    "include_football_types": FootballType,
+    "exclude_football_types": FootballType,
+}
+
+# Names used by existing clients that are not enum member names
+VALUE_ALIASES: Dict[Type[Enum], Dict[str, Enum]] = {
+    MatchStatus: {"upcoming": MatchStatus.NOT_STARTED},
+    FootballType: {"outdoor": FootballType.FOOTBALL, "indoor": FootballType.FUTSAL},
+}
+
+
+class FilterRequestError(Exception):
+    """Exception raised for an invalid match filter request."""
+
+    pass
+
+
+def _parse_date(field: str, value: Any) -> str:
+    try:
+        return date.fromisoformat(value).isoformat()
+    except (TypeError, ValueError):
+        raise FilterRequestError(f"{field} must be a date in YYYY-MM-DD format")
+
+
+def _parse_enum_values(field: str, enum_type: Type[Enum], value: Any) -> List[Enum]:
+    values = value if isinstance(value, list) else [value]
+    if not values:
+        raise FilterRequestError(f"{field} must not be empty")
+    members = []
+    for item in values:
+        text = str(item)
+        member = VALUE_ALIASES.get(enum_type, {}).get(text.lower())
+        if member is None:
+            member = next((m for m in enum_type if text == str(m.value) or text.upper() == m.name), None)
+        if member is None:
+            accepted = ", ".join(m.name.lower() for m in enum_type)
+            raise FilterRequestError(f"Invalid {field} value {item!r}; expected one of: {accepted}")
+        members.append(member)
+    return members
+
+
+def match_filter_from_request(body: Any) -> MatchListFilter:
+    """
+    Build a match list filter from a ``POST /matches/filter`` request body.
+
+    Args:
+        body: The decoded JSON body
+
+    Returns:
+        MatchListFilter: The configured filter
+
+    Raises:
+        FilterRequestError: If the body is not an object, has an unknown field or an invalid value
+    """
+    if body is None:
+        body = {}
+    if not isinstance(body, Mapping):
+        raise FilterRequestError("Request body must be a JSON object")
+
+    fields: Dict[str, Any] = {}
+    for name, value in body.items():
+        field = FIELD_ALIASES.get(name, name)
+        if field not in ENUM_FIELDS and field not in ("start_date", "end_date"):
+            raise FilterRequestError(f"Unknown filter: {name}")
+        if field in fields:
+            raise FilterRequestError(f"{name} is given more than once")
+        fields[field] = value
+
+    match_filter = MatchListFilter()
+    dates = {field: _parse_date(field, fields[field]) for field in ("start_date", "end_date") if field in fields}
+    if len(dates) == 2 and dates["start_date"] > dates["end_date"]:
+        raise FilterRequestError("start_date must not be after end_date")
+    for field, value in dates.items():
+        getattr(match_filter, field)(value)
+
+    for field, enum_type in ENUM_FIELDS.items():
+        if field in fields:
+            getattr(match_filter, field)(_parse_enum_values(field, enum_type, fields[field]))
+    return match_filter
+
+
+def filter_report_headers(report: Mapping[str, List[str]]) -> Dict[str, str]:
+    """
+    Response headers telling the client where each filter was applied.
+
+    Args:
+        report: Builder method names by location, from ``fetch_filtered_matches_with_report``
+
+    Returns:
+        Dict[str, str]: ``X-Filters-Server`` and ``X-Filters-Local`` with comma-separated names
+    """
+    return {
+        "X-Filters-Server": ",".join(report.get("server", [])),
+        "X-Filters-Local": ",".join(report.get("local", [])),
+    }
@@ -0,0 +1,286 @@
+"""
+Graceful shutdown and hand-off of warm state between gateway processes.
+
+When a gateway process stops, :class:`Drain` turns new requests away and
+lets the ones in flight finish, up to a deadline. The process then saves its
+most recently used response cache entries to a snapshot, and the next
+process loads them at start-up, so a deploy does not start with a cold cache.
+
+Snapshots are JSON lines in ``GATEWAY_SNAPSHOT_DIR``, one file per process
+(so the workers of a pre-fork server do not overwrite each other). Each entry
+keeps its remaining freshness as a wall-clock deadline. Loading merges every
+snapshot in the directory, skips entries that expired in between, and removes
+the files.
+
+Sessions are handed off through an encrypted :class:`FileSessionStore` in
+the same directory when ``GATEWAY_SESSION_KEY`` holds a Fernet key. Clients
+save their session there after each login and token refresh, and the
+gateway saves it once more on shutdown (from an idle client when clients
+are pooled), so the next process resumes the
+session instead of logging in again.
+"""
+
+import base64
+import glob
+import json
+import logging
+import os
+import signal
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from fogis_api_client.client_pool import ClientPoolError
+from fogis_api_client.gateway.json_provider import dumps_bytes
+from fogis_api_client.gateway.mdk_proxy import RawResponse
+from fogis_api_client.gateway.pool import GatewayClientPool
+from fogis_api_client.gateway.response_cache import ResponseCache
+from fogis_api_client.gateway.responses import JsonBody
+from fogis_api_client.session_store import FileSessionStore, SessionStore
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_PATTERN = "response-cache-*.jsonl"
+
+
+class Drain:
+    """
+    Counts requests in flight and lets shutdown wait until they have finished.
+    """
+
+    def __init__(self) -> None:
+        self._condition = threading.Condition()
+        self._in_flight = 0
+        self._draining = False
+
+    @property
+    def draining(self) -> bool:
+        """Whether shutdown has begun and new requests are turned away."""
+        return self._draining
+
+    @property
+    def in_flight(self) -> int:
+        """Requests being served."""
+        return self._in_flight
+
+    def enter(self) -> bool:
+        """
+        Count a request that is starting.
+
+        Returns:
+            bool: False, without counting it, if the request should be turned away
+        """
+        with self._condition:
+            if self._draining:
+                return False
+            self._in_flight += 1
+            return True
+
+    def leave(self) -> None:
+        """Count a request that has finished."""
+        with self._condition:
+            self._in_flight -= 1
+            if self._in_flight == 0:
+                self._condition.notify_all()
+
+    def begin(self) -> None:
+        """Start turning new requests away."""
+        with self._condition:
+            self._draining = True
+
+    def wait(self, timeout: float) -> bool:
+        """
+        Wait for the requests in flight to finish.
+
+        Args:
+            timeout: Longest time to wait in seconds
+
+        Returns:
+            bool: True if none are left, False if the deadline passed first
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: self._in_flight == 0, timeout)
+
+
+def on_signal(signum: int, callback: Callable[[], Any]) -> None:
+    """
+    Run a callback when a signal arrives, before the handler installed for it so far.
+
+    The callback runs on a thread of its own rather than in the signal handler,
+    which may have interrupted a thread holding a lock the callback needs.
+
+    Args:
+        signum: The signal
+        callback: Called without arguments
+    """
+    previous = signal.getsignal(signum)
+
+    def handler(number: int, frame: Any) -> None:
+        threading.Thread(target=callback, name="gateway-shutdown", daemon=True).start()
+        if callable(previous):
+            previous(number, frame)
+
+    signal.signal(signum, handler)
+
+
+def _encode_value(value: Any) -> Optional[Dict[str, Any]]:
+    if isinstance(value, JsonBody):
+        return {"json": value.data}
+    if isinstance(value, RawResponse):
+        return {"raw": base64.b64encode(value.body).decode("ascii"), "content_type": value.content_type}
+    return None
+
+
+def _decode_value(record: Dict[str, Any]) -> Any:
+    if "raw" in record:
+        return RawResponse(base64.b64decode(record["raw"]), record["content_type"])
+    return JsonBody(record["json"])
+
+
+def _is_portable_key(key: Hashable) -> bool:
+    return isinstance(key, tuple) and all(isinstance(part, (str, int)) for part in key)
+
+
+class Handoff:
+    """
+    Saves and restores the warm state of a gateway process.
+    """
+
+    def __init__(self, directory: str, max_entries: int = 256, session_store: Optional[SessionStore] = None) -> None:
+        """
+        Initialize the hand-off.
+
+        Args:
+            directory: Directory for snapshots (created if missing)
+            max_entries: Most recently used cache entries saved per process
+            session_store: Store that FOGIS clients persist their sessions in, if any
+        """
+        self.directory = directory
+        self.max_entries = max_entries
+        self.session_store = session_store
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+
+    def save(self, cache: ResponseCache) -> int:
+        """
+        Save the most recently used cache entries to this process's snapshot.
+
+        Args:
+            cache: The response cache
+
+        Returns:
+            int: Number of entries saved
+        """
+        now = time.time()
+        lines = [dumps_bytes({"version": SNAPSHOT_VERSION, "saved_at": now})]
+        for key, value, fresh_for, usable_for, tags in cache.entries(self.max_entries):
+            encoded = _encode_value(value)
+            if encoded is None or not _is_portable_key(key):
+                continue
+            record = {"key": list(key), "fresh_until": now + fresh_for, "stale_until": now + usable_for, "tags": sorted(tags)}
+            try:
+                lines.append(dumps_bytes(dict(record, **encoded)))
+            except (TypeError, ValueError) as e:
+                logger.debug(f"Not saving {key!r} to the snapshot: {e}")
+
+        fd, tmp_path = tempfile.mkstemp(prefix=".snapshot-", dir=self.directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(b"\n".join(lines) + b"\n")
+            os.replace(tmp_path, os.path.join(self.directory, f"response-cache-{os.getpid()}.jsonl"))
+        except OSError as e:
+            logger.warning(f"Could not save the response cache snapshot: {e}")
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            return 0
+        logger.info(f"Saved {len(lines) - 1} response cache entries for the next process")
+        return len(lines) - 1
+
+    def load(self, cache: ResponseCache) -> int:
+        """
+        Load the snapshots left by previous processes into the cache and remove them.
+
+        Args:
+            cache: The response cache
+
+        Returns:
+            int: Number of entries restored
+        """
+        paths = sorted(glob.glob(os.path.join(self.directory, SNAPSHOT_PATTERN)), key=os.path.getmtime)
+        restored = sum(self._load_file(path, cache, time.time()) for path in paths)
+        if restored:
+            logger.info(f"Restored {restored} response cache entries from the previous process")
+        return restored
+
+    def _load_file(self, path: str, cache: ResponseCache, now: float) -> int:
+        try:
+            with open(path, "rb") as f:
+                lines = f.read().splitlines()
+            os.unlink(path)
+            if not lines or json.loads(lines[0]).get("version") != SNAPSHOT_VERSION:
+                return 0
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read response cache snapshot {path}: {e}")
+            return 0
+        restored = 0
+        for line in lines[1:]:
+            try:
+                record = json.loads(line)
+                if record["stale_until"] <= now:
+                    continue
+                fresh_for = max(record["fresh_until"] - now, 0.0)
+                stale_for = record["stale_until"] - now - fresh_for
+                cache.put(tuple(record["key"]), _decode_value(record), fresh_for, record["tags"], stale_for)
+                restored += 1
+            except (KeyError, TypeError, ValueError) as e:
+                logger.debug(f"Skipping a damaged snapshot entry: {e}")
+        return restored
+
+    def save_session(self, client: Any) -> None:
+        """
+        Save a client's current session, including cookies renewed since its last login.
+
+        Args:
+            client: A PublicApiClient created with this hand-off's session store
+        """
+        if self.session_store is not None and client is not None:
+            client.save_session()
+
+    def save_pooled_session(self, pool: GatewayClientPool) -> None:
+        """
+        Save the session of a gateway client pool, whose clients all use the same account.
+
+        Args:
+            pool: Pool of PublicApiClients created with this hand-off's session store
+        """
+        if self.session_store is None:
+            return
+        try:
+            # The most recently returned client holds the newest cookies
+            with pool.lease(timeout=0) as client:
+                client.save_session()
+        except ClientPoolError:
+            logger.warning("Every pooled client is still busy, not saving the session")
+
+
+def handoff_from_env() -> Optional[Handoff]:
+    """
+    Create the hand-off configured by the environment.
+
+    Returns:
+        Optional[Handoff]: The hand-off, or None if GATEWAY_SNAPSHOT_DIR is not set
+    """
+    directory = os.environ.get("GATEWAY_SNAPSHOT_DIR", "")
+    if not directory:
+        return None
+    session_store = None
+    session_key = os.environ.get("GATEWAY_SESSION_KEY", "")
+    if session_key:
+        try:
+            session_store = FileSessionStore(os.path.join(directory, "sessions"), session_key)
+        except (ImportError, ValueError) as e:
+            logger.warning(f"Sessions will not be handed off: {e}")
+    return Handoff(directory, int(os.environ.get("GATEWAY_SNAPSHOT_ENTRIES", "256")), session_store)
@@ -0,0 +1,279 @@
+"""
+Field projection, cursor pagination and streaming for gateway list endpoints.
+
+List routes accept these query parameters:
+
+- ``fields``: comma separated fields to return for each item
+- ``sort_by``: field to order by (default: the item id); ties are broken by id,
+  so the order is stable
+- ``order``: ``asc`` (default) or ``desc``
+- ``limit``: maximum number of items to return
+- ``cursor``: opaque cursor from the ``X-Next-Cursor`` header of the previous page
+
+The sorted view of a list is computed once per cached response body, pages are
+found by bisection, and the page is streamed as a chunked JSON array. Items
+serialised whole are encoded once per cached response body.
+"""
+
+import base64
+import binascii
+import json
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+from urllib.parse import urlencode
+
+from flask import Response, current_app, has_app_context, request
+
+from fogis_api_client.gateway.responses import JSON, VARY, JsonBody, dumps_json, negotiate_media_type, serialise
+
+LIST_QUERY_ARGS = ("fields", "sort_by", "order", "limit", "cursor")
+
+# Items serialised per streamed chunk
+STREAM_BATCH_SIZE = 100
+
+SortKey = Tuple[Tuple[int, Any], Tuple[int, Any]]
+
+
+class ListQueryError(Exception):
+    """Exception raised for invalid list query parameters."""
+
+    pass
+
+
+def is_list_query(args: Optional[Mapping[str, str]] = None) -> bool:
+    """Whether a request (by default the current Flask request) uses any list query parameter."""
+    args = request.args if args is None else args
+    return any(arg in args for arg in LIST_QUERY_ARGS)
+
+
+def _value_key(value: Any) -> Tuple[int, Any]:
+    # Numbers sort numerically, everything else as text, missing values last
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return (0, float(value))
+    if value is None:
+        return (2, "")
+    return (1, str(value))
+
+
+def _sorted_view(items: Sequence[Dict[str, Any]], sort_by: str, id_field: str) -> Tuple[List[Any], List[SortKey]]:
+    keys = [(_value_key(item.get(sort_by)), _value_key(item.get(id_field))) for item in items]
+    order = sorted(range(len(items)), key=keys.__getitem__)
+    return [items[i] for i in order], [keys[i] for i in order]
+
+
+def encode_cursor(sort_by: str, descending: bool, key: SortKey) -> str:
+    """
+    Encode the position after an item as an opaque cursor.
+
+    Args:
+        sort_by: Field the list is ordered by
+        descending: Whether the order is descending
+        key: Sort key of the last item on the page
+
+    Returns:
+        str: URL-safe cursor
+    """
+    raw = json.dumps([sort_by, descending, key], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_value_key(key: Any) -> Tuple[int, Any]:
+    # Only keys _value_key can produce, so a forged cursor cannot make the bisection compare unlike types
+    rank, value = key
+    if type(rank) is int and rank == 0 and isinstance(value, (int, float)) and not isinstance(value, bool):
+        return (0, float(value))
+    if type(rank) is int and rank in (1, 2) and isinstance(value, str):
+        return (rank, value)
+    raise ValueError(f"Invalid sort key: {key!r}")
+
+
+def decode_cursor(cursor: str, sort_by: str, descending: bool) -> SortKey:
+    """
+    Decode a cursor produced by :func:`encode_cursor` for the same ordering.
+
+    Args:
+        cursor: Cursor from a previous page
+        sort_by: Field the list is ordered by
+        descending: Whether the order is descending
+
+    Returns:
+        SortKey: Sort key of the last item on the previous page
+
+    Raises:
+        ListQueryError: If the cursor is malformed or was issued for another ordering
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_sort_by, cursor_descending, key = json.loads(raw)
+        value_key, id_key = key
+        sort_key = (_decode_value_key(value_key), _decode_value_key(id_key))
+    except (binascii.Error, ValueError, TypeError, IndexError):
+        raise ListQueryError("Invalid cursor")
+    if cursor_sort_by != sort_by or cursor_descending != descending:
+        raise ListQueryError("Cursor was issued for a different sort order")
+    return sort_key
+
+
+def paginate(
+    items: Sequence[Any], keys: Sequence[SortKey], limit: Optional[int], after: Optional[SortKey], descending: bool
+) -> Tuple[Sequence[Any], Optional[SortKey]]:
+    """
+    Select the page following a cursor position in a sorted view.
+
+    Args:
+        items: Items in ascending order
+        keys: Sort keys of the items
+        limit: Maximum page size, or None for everything after the cursor
+        after: Sort key of the last item of the previous page
+        descending: Walk the view backwards
+
+    Returns:
+        The page, and the sort key to continue after or None if this is the last page
+    """
+    if not descending:
+        start = 0 if after is None else bisect_right(keys, after)
+        stop = len(items) if limit is None else min(len(items), start + limit)
+        next_key = keys[stop - 1] if stop < len(items) and stop > start else None
+        return items[start:stop], next_key
+
+    stop = len(items) if after is None else bisect_left(keys, after)
+    start = 0 if limit is None else max(0, stop - limit)
+    next_key = keys[start] if start > 0 and stop > start else None
+    return items[start:stop][::-1], next_key
+
+
+def project(item: Any, fields: Optional[Sequence[str]]) -> Any:
+    """
+    Keep only the requested fields of an item.
+
+    Args:
+        item: A list item
+        fields: Fields to keep, or None for all
+
+    Returns:
+        The projected item
+    """
+    if fields is None or not isinstance(item, dict):
+        return item
+    return {field: item[field] for field in fields if field in item}
+
+
+def stream_json_array(
+    items: Sequence[Any], fields: Optional[Sequence[str]] = None, encoded: Optional[Dict[int, str]] = None
+) -> Iterator[str]:
+    """
+    Serialise items as a JSON array, one batch at a time.
+
+    Args:
+        items: Items to serialise
+        fields: Fields to keep for each item, or None for all
+        encoded: Serialised items by ``id()`` of the item, reused and filled in when
+            items are serialised whole, so unchanged items are encoded only once
+
+    Returns:
+        Iterator[str]: Consecutive pieces of the JSON document
+    """
+    # Resolved now: the iterator runs after the request context is gone
+    dumps = current_app.json.dumps if has_app_context() else dumps_json
+    if fields is not None:
+        encoded = None
+
+    def encode(item: Any) -> str:
+        if encoded is None:
+            return dumps(project(item, fields))
+        text = encoded.get(id(item))
+        if text is None:
+            text = encoded[id(item)] = dumps(item)
+        return text
+
+    def generate() -> Iterator[str]:
+        yield "["
+        for start in range(0, len(items), STREAM_BATCH_SIZE):
+            batch = ",".join(encode(item) for item in items[start : start + STREAM_BATCH_SIZE])
+            yield batch if start == 0 else "," + batch
+        yield "]\n"
+
+    return generate()
+
+
+def _parse_limit(value: Optional[str]) -> Optional[int]:
+    if value is None:
+        return None
+    try:
+        limit = int(value)
+    except ValueError:
+        raise ListQueryError("limit must be an integer")
+    if limit < 1:
+        raise ListQueryError("limit must be at least 1")
+    return limit
+
+
+def list_page(
+    body: JsonBody, id_field: str, args: Mapping[str, str], base_url: str, media_type: str = JSON
+) -> Tuple[Union[Iterator[str], bytes], Dict[str, str]]:
+    """
+    Select, project and serialise the page of a list body that a query asks for.
+
+    Args:
+        body: Cached response body holding a list of items
+        id_field: Field that uniquely identifies an item
+        args: Query parameters of the request
+        base_url: URL of the request without its query string, for the Link header
+        media_type: Format of the page, from :func:`negotiate_media_type`
+
+    Returns:
+        The pieces of the JSON array, or the whole page in another format, and
+        ``X-Next-Cursor``/``Link`` headers when there are more items
+
+    Raises:
+        ListQueryError: If a query parameter is invalid
+    """
+    fields_arg = args.get("fields")
+    fields = [field.strip() for field in fields_arg.split(",") if field.strip()] if fields_arg else None
+    sort_by = args.get("sort_by", id_field)
+    order = args.get("order", "asc").lower()
+    if order not in ("asc", "desc"):
+        raise ListQueryError("order must be 'asc' or 'desc'")
+    descending = order == "desc"
+    limit = _parse_limit(args.get("limit"))
+    cursor = args.get("cursor")
+    after = decode_cursor(cursor, sort_by, descending) if cursor else None
+
+    if not isinstance(body.data, list):
+        raise ListQueryError("This resource is not a list")
+    items, keys = body.derived(("sorted", sort_by, id_field), lambda data: _sorted_view(data, sort_by, id_field))
+    page, next_key = paginate(items, keys, limit, after, descending)
+
+    headers = {}
+    if next_key is not None:
+        next_cursor = encode_cursor(sort_by, descending, next_key)
+        query = {key: value for key, value in args.items() if key != "cursor"}
+        query["cursor"] = next_cursor
+        headers["X-Next-Cursor"] = next_cursor
+        headers["Link"] = f'<{base_url}?{urlencode(query)}>; rel="next"'
+    if media_type != JSON:
+        return serialise([project(item, fields) for item in page], media_type), headers
+    # Items of a cached body are the same objects on every request, so their JSON can be reused
+    encoded = body.derived("encoded_items", lambda data: {}) if fields is None else None
+    return stream_json_array(page, fields, encoded), headers
+
+
+def list_response(body: JsonBody, id_field: str) -> Response:
+    """
+    Build a projected, paginated and streamed response for a list body.
+
+    Args:
+        body: Cached response body holding a list of items
+        id_field: Field that uniquely identifies an item
+
+    Returns:
+        Response: A chunked JSON array, or the page in the format the client
+            accepts, with ``X-Next-Cursor`` and a ``Link`` header when there are more items
+
+    Raises:
+        ListQueryError: If a query parameter is invalid
+    """
+    media_type = negotiate_media_type(request.headers.get("Accept"))
+    chunks, headers = list_page(body, id_field, request.args, request.base_url, media_type)
+    headers["Vary"] = VARY
+    return Response(chunks, headers=headers, mimetype=media_type)
@@ -0,0 +1,211 @@
+"""
+Caching reverse proxy for the raw FOGIS ``MatchWebMetoder.aspx`` protocol.
+
+Legacy tools that speak FOGIS's own JSON protocol can point at the gateway
+instead of FOGIS: ``POST /mdk/MatchWebMetoder.aspx/<method>`` is forwarded
+through the gateway's authenticated session, so those tools need no FOGIS
+login of their own.
+
+Responses are passed on as the raw bytes FOGIS sent, without decoding and
+re-encoding the ``d`` envelope. Read methods are cached in the gateway's
+response cache, keyed by method and request body, for the TTL of the
+matching gateway route. Write methods always go to FOGIS and then invalidate
+the cached reads they may have changed: the match they name, shared with the
+gateway's own routes through the ``match:<id>`` tag, and otherwise every
+cached call of the affected read methods and of the gateway routes serving
+the same data, through their ``route:<name>`` tag.
+
+Only the methods listed here are proxied.
+"""
+
+import json
+from typing import Any, Dict, List, Tuple
+
+from fogis_api_client.public_api_client import PublicApiClient
+
+MDK_PREFIX = "/mdk/MatchWebMetoder.aspx/"
+
+# Cached read methods, with the gateway route whose TTL they use
+READ_METHODS: Dict[str, str] = {
+    "GetMatcherAttRapportera": "matches",
+    "GetMatchhandelselista": "match_events",
+    "GetMatchresultatlista": "match_events",
+    "GetMatchdeltagareListaForMatchlag": "team_players",
+    "GetMatchlagledareListaForMatchlag": "team_officials",
+}
+
+# Read methods whose request names a single match
+MATCH_READS = frozenset({"GetMatchhandelselista", "GetMatchresultatlista"})
+
+# The gateway route serving the same data as each read method
+JSON_ROUTES: Dict[str, str] = {
+    "GetMatcherAttRapportera": "matches",
+    "GetMatchhandelselista": "match_events",
+    "GetMatchresultatlista": "match_result",
+    "GetMatchdeltagareListaForMatchlag": "team_players",
+    "GetMatchlagledareListaForMatchlag": "team_officials",
+}
+
+# Write payloads that name their match inside a list of items instead of at the top level
+NESTED_MATCH_LISTS = ("matchresultatListaJSON",)
+
+# Write methods, with the read methods whose responses they may change
+WRITE_METHODS: Dict[str, Tuple[str, ...]] = {
+    "SparaMatchhandelse": ("GetMatchhandelselista", "GetMatchresultatlista"),
+    "RaderaMatchhandelse": ("GetMatchhandelselista", "GetMatchresultatlista"),
+    "ClearMatchEvents": ("GetMatchhandelselista", "GetMatchresultatlista"),
+    "SparaMatchresultatLista": ("GetMatchresultatlista", "GetMatcherAttRapportera"),
+    "SparaMatchGodkannDomarrapport": ("GetMatcherAttRapportera",),
+    "SparaMatchdeltagare": ("GetMatchdeltagareListaForMatchlag",),
+    "SparaMatchlagledare": ("GetMatchlagledareListaForMatchlag",),
+}
+
+DEFAULT_CONTENT_TYPE = "application/json; charset=utf-8"
+
+
+def route_tag(route: str) -> str:
+    """
+    Get the tag every cached response of a gateway read route carries.
+
+    Args:
+        route: Route name, e.g. ``team_players``
+
+    Returns:
+        str: The tag, ``route:<name>``
+    """
+    return f"route:{route}"
+
+
+class MdkProxyError(Exception):
+    """Raised when a proxied call is not accepted."""
+
+    status = 400
+
+
+class UnknownMethodError(MdkProxyError):
+    """Raised for a method the proxy does not forward."""
+
+    status = 404
+
+
+class RawResponse:
+    """The bytes and content type of an upstream response, passed on untouched."""
+
+    def __init__(self, body: bytes, content_type: str = DEFAULT_CONTENT_TYPE) -> None:
+        self.body = body
+        self.content_type = content_type
+
+
+class MdkCall:
+    """
+    A parsed call to a ``MatchWebMetoder.aspx`` method.
+    """
+
+    def __init__(self, method: str, body: bytes) -> None:
+        """
+        Parse a call.
+
+        Args:
+            method: Method name from the request path
+            body: JSON request body, forwarded as is
+
+        Raises:
+            UnknownMethodError: If the method is not proxied
+            MdkProxyError: If the body is not a JSON object
+        """
+        if method not in READ_METHODS and method not in WRITE_METHODS:
+            raise UnknownMethodError(f"Method {method} is not proxied")
+        try:
+            payload = json.loads(body) if body else {}
+        except ValueError:
+            raise MdkProxyError("Request body must be JSON")
+        if not isinstance(payload, dict):
+            raise MdkProxyError("Request body must be a JSON object")
+        self.method = method
+        self.body = body or b"{}"
+        self.payload: Dict[str, Any] = payload
+
+    @property
+    def is_read(self) -> bool:
+        """Whether the response may be cached."""
+        return self.method in READ_METHODS
+
+    @property
+    def route(self) -> str:
+        """The gateway route whose TTL a read uses."""
+        return READ_METHODS[self.method]
+
+    @property
+    def match_id(self) -> Any:
+        """The match the call names, at the top level or in all items of a nested list, or None."""
+        match_id = self.payload.get("matchid")
+        if match_id is not None:
+            return match_id
+        for field in NESTED_MATCH_LISTS:
+            items = self.payload.get(field)
+            if not isinstance(items, list):
+                continue
+            match_ids = [item.get("matchid") for item in items if isinstance(item, dict)]
+            if match_ids and all(other == match_ids[0] for other in match_ids):
+                return match_ids[0]
+        return None
+
+    @property
+    def key(self) -> Tuple[str, str, str]:
+        """Response cache key; bodies that differ only in layout or key order share it."""
+        return ("mdk", self.method, json.dumps(self.payload, sort_keys=True, separators=(",", ":")))
+
+    @property
+    def tags(self) -> List[str]:
+        """Tags of a cached read response."""
+        tags = [f"mdk:{self.method}"]
+        if self.method == "GetMatcherAttRapportera":
+            tags.append("matches")
+        if self.match_id is not None:
+            tags.append(f"match:{self.match_id}")
+        return tags
+
+    def invalidates(self) -> List[str]:
+        """
+        Get the tags of the cached reads a write may have changed.
+
+        Returns:
+            List[str]: The named match and the match list when the call names a match,
+                and the affected read methods and their gateway routes not already covered by those
+        """
+        match_id = self.match_id
+        tags = []
+        if match_id is not None:
+            tags += [f"match:{match_id}", "matches"]
+        for read in WRITE_METHODS[self.method]:
+            named = read in MATCH_READS or read == "GetMatcherAttRapportera"
+            if match_id is None or not named:
+                tags += [f"mdk:{read}", route_tag(JSON_ROUTES[read])]
+        return tags
+
+    def forward(self, api: PublicApiClient) -> RawResponse:
+        """
+        Send the call to FOGIS with an authenticated client.
+
+        Args:
+            api: The FOGIS API client whose session is used
+
+        Returns:
+            RawResponse: The response bytes and content type
+        """
+        response = api.post_match_web_method(self.method, self.body)
+        return RawResponse(response.content, response.headers.get("Content-Type", DEFAULT_CONTENT_TYPE))
+
+    async def forward_async(self, upstream: Any, api: PublicApiClient) -> RawResponse:
+        """
+        Send the call to FOGIS from asyncio, with the client's session.
+
+        Args:
+            upstream: The gateway's fogis_api_client.gateway.async_client.AsyncFogisClient
+            api: The FOGIS API client whose session is used
+
+        Returns:
+            RawResponse: The response bytes and content type
+        """
+        response = await upstream.post(api, self.method, self.body, write=not self.is_read)
+        return RawResponse(response.content, response.headers.get("Content-Type", DEFAULT_CONTENT_TYPE))
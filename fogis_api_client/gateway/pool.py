@@ -0,0 +1,211 @@
+"""
+Fixed-size pool of API clients for the gateway's request threads.
+
+A single ``requests.Session`` shared by every Flask worker thread serialises
+on its connection pool and cookie jar. The pool hands each request its own
+client for the duration of the request instead; clients are created lazily up
+to the pool size and share one connection pool between them.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Generic, Iterator, List, Optional, TypeVar
+
+from requests.adapters import HTTPAdapter
+
+from fogis_api_client.client_pool import ClientPoolError
+
+logger = logging.getLogger(__name__)
+
+C = TypeVar("C")
+
+
+class GatewayClientPool(Generic[C]):
+    """
+    Checkout/checkin pool of clients with a bounded wait and saturation metrics.
+    """
+
+    def __init__(self, factory: Callable[[], C], size: int = 4, checkout_timeout: float = 30.0) -> None:
+        """
+        Initialize the pool.
+
+        Args:
+            factory: Creates a new client; called at most ``size`` times
+            size: Maximum number of clients
+            checkout_timeout: Default seconds to wait for a free client
+        """
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        self.size = size
+        self.checkout_timeout = checkout_timeout
+        self._factory = factory
+        self._adapter = HTTPAdapter(pool_maxsize=size)
+        self._condition = threading.Condition()
+        self._idle: Deque[C] = deque()
+        self._created = 0
+        self._in_use = 0
+        self._waiting = 0
+
+        self._peak_in_use = 0
+        self._checkouts = 0
+        self._saturated = 0
+        self._timeouts = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def _create(self) -> C:
+        client = self._factory()
+        session = getattr(client, "session", None)
+        if session is not None:
+            # One connection pool for all clients; each keeps its own cookies
+            session.mount("https://", self._adapter)
+            session.mount("http://", self._adapter)
+        return client
+
+    def prefill(self, prepare: Optional[Callable[[C], Any]] = None) -> int:
+        """
+        Create the clients that do not exist yet, so no request pays for creating one.
+
+        Args:
+            prepare: Called with each new client before it becomes available, e.g. to log in
+
+        Returns:
+            int: Number of clients created
+
+        Raises:
+            Exception: The first error raised by the factory or ``prepare``; clients
+                created before it are still added to the pool
+        """
+        with self._condition:
+            missing = self.size - self._created
+            self._created += missing
+
+        created: List[C] = []
+        try:
+            for _ in range(missing):
+                created.append(self._create())
+            for client in created:
+                if prepare is not None:
+                    prepare(client)
+        finally:
+            with self._condition:
+                self._created -= missing - len(created)
+                self._idle.extend(created)
+                self._condition.notify_all()
+        return len(created)
+
+    def checkout(self, timeout: Optional[float] = None) -> C:
+        """
+        Take a client out of the pool, creating one if the pool is not full yet.
+
+        Args:
+            timeout: Seconds to wait for a free client, defaults to ``checkout_timeout``
+
+        Returns:
+            A client that must be given back with :meth:`checkin`
+
+        Raises:
+            ClientPoolError: If no client became free in time
+        """
+        timeout = self.checkout_timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+        client: Optional[C] = None
+        create = False
+
+        with self._condition:
+            self._waiting += 1
+            try:
+                waited = False
+                while True:
+                    if self._idle:
+                        client = self._idle.pop()
+                        break
+                    if self._created < self.size:
+                        self._created += 1
+                        create = True
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise ClientPoolError(f"No API client became free within {timeout:g}s")
+                    if not waited:
+                        self._saturated += 1
+                        waited = True
+                    self._condition.wait(remaining)
+            finally:
+                self._waiting -= 1
+
+            wait = time.monotonic() - started
+            self._in_use += 1
+            self._peak_in_use = max(self._peak_in_use, self._in_use)
+            self._checkouts += 1
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+
+        if create:
+            try:
+                client = self._create()
+            except Exception:
+                with self._condition:
+                    self._created -= 1
+                    self._in_use -= 1
+                    self._condition.notify()
+                raise
+        return client  # type: ignore[return-value]
+
+    def checkin(self, client: C) -> None:
+        """
+        Give a client back to the pool.
+
+        Args:
+            client: A client obtained from :meth:`checkout`
+        """
+        with self._condition:
+            self._idle.append(client)
+            self._in_use -= 1
+            self._condition.notify()
+
+    @contextmanager
+    def lease(self, timeout: Optional[float] = None) -> Iterator[C]:
+        """
+        Borrow a client for the duration of a ``with`` block.
+
+        Args:
+            timeout: Seconds to wait for a free client, defaults to ``checkout_timeout``
+
+        Yields:
+            A client from the pool
+        """
+        client = self.checkout(timeout)
+        try:
+            yield client
+        finally:
+            self.checkin(client)
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Get pool saturation metrics.
+
+        Returns:
+            Dict[str, Any]: Size, clients created, in use and idle, waiting threads,
+                peak use, checkouts, how many had to wait or timed out, and wait times
+        """
+        with self._condition:
+            return {
+                "size": self.size,
+                "created": self._created,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "waiting": self._waiting,
+                "utilization": self._in_use / self.size,
+                "peak_in_use": self._peak_in_use,
+                "checkouts": self._checkouts,
+                "saturated_checkouts": self._saturated,
+                "timeouts": self._timeouts,
+                "avg_wait": self._total_wait / self._checkouts if self._checkouts else 0.0,
+                "max_wait": self._max_wait,
+            }
@@ -0,0 +1,431 @@
+"""
+Read-through cache for gateway responses.
+
+Each entry is fresh for its route's TTL and may then be served stale for a
+further grace period while one background thread reloads it
+(stale-while-revalidate). Concurrent misses for the same key share a single
+upstream load, and entries carry tags (such as ``match:123``) so a write can
+invalidate exactly the responses it affects.
+
+``get`` loads with a blocking callable; ``get_async`` loads with a coroutine
+and waits without holding a thread, for the ASGI gateway. Both share the same
+entries and loads.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Seconds each gateway read route stays fresh unless overridden
+DEFAULT_ROUTE_TTLS = {
+    "matches": 60.0,
+    "match": 300.0,
+    "match_events": 30.0,
+    "team_players": 3600.0,
+    "team_officials": 3600.0,
+}
+
+
+def route_ttls() -> Dict[str, float]:
+    """
+    Get the freshness of each gateway read route.
+
+    Returns:
+        Dict[str, float]: TTL in seconds per route, overridable with e.g. GATEWAY_CACHE_TTL_MATCHES
+    """
+    return {
+        route: float(os.environ.get(f"GATEWAY_CACHE_TTL_{route.upper()}", ttl)) for route, ttl in DEFAULT_ROUTE_TTLS.items()
+    }
+
+
+class _Entry:
+    """A cached value with its freshness deadlines and tags."""
+
+    def __init__(self, value: Any, ttl: float, stale_ttl: float, tags: Set[str]) -> None:
+        now = time.monotonic()
+        self.value = value
+        self.fresh_until = now + ttl
+        self.stale_until = self.fresh_until + stale_ttl
+        self.tags = tags
+
+
+class _Load:
+    """An upstream load in progress that other callers can wait for."""
+
+    def __init__(self, tags: Set[str]) -> None:
+        self.tags = tags
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+        # Set when the key is invalidated mid-load, so the result is not stored
+        self.invalidated = False
+        self._callbacks: List[Callable[[], None]] = []
+        self._callbacks_lock = threading.Lock()
+
+    def add_done_callback(self, callback: Callable[[], None]) -> None:
+        """Call ``callback`` once the load is done, right away if it already is."""
+        with self._callbacks_lock:
+            if not self.done.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def finish(self) -> None:
+        """Mark the load done and wake everyone waiting for it."""
+        with self._callbacks_lock:
+            self.done.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+    async def wait_async(self) -> None:
+        """Wait for the load from asyncio, without holding a thread."""
+        loop = asyncio.get_running_loop()
+        done = loop.create_future()
+        self.add_done_callback(lambda: loop.call_soon_threadsafe(_resolve, done))
+        await done
+
+
+def _resolve(future: "asyncio.Future[None]") -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class ResponseCache:
+    """
+    Bounded read-through cache with stale-while-revalidate and tag invalidation.
+    """
+
+    def __init__(self, max_entries: int = 512, stale_ttl: float = 60.0) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached responses
+            stale_ttl: Default seconds an expired entry may still be served while it is refreshed
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.stale_ttl = stale_ttl
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._loads: Dict[Hashable, _Load] = {}
+        self._tags: Dict[str, Set[Hashable]] = {}
+        # Loads running as asyncio tasks, see get_async
+        self._tasks: Set["asyncio.Task[None]"] = set()
+        self._stats = {"hits": 0, "stale_hits": 0, "misses": 0, "coalesced": 0, "refreshes": 0, "invalidations": 0}
+
+    def get(
+        self,
+        key: Hashable,
+        loader: Callable[[], Any],
+        ttl: float,
+        tags: Iterable[str] = (),
+        stale_ttl: Optional[float] = None,
+    ) -> Any:
+        """
+        Get a cached value, loading it with ``loader`` when needed.
+
+        Args:
+            key: Cache key
+            loader: Fetches the value from upstream
+            ttl: Seconds the loaded value is fresh
+            tags: Tags used to invalidate the entry
+            stale_ttl: Seconds an expired value may be served while it is refreshed,
+                defaults to the cache's stale_ttl
+
+        Returns:
+            The cached or freshly loaded value
+
+        Raises:
+            Exception: Whatever the loader raised, when there is no usable cached value
+        """
+        stale_ttl = self.stale_ttl if stale_ttl is None else stale_ttl
+        tags = set(tags)
+        found, value, load, owner = self._lookup(key, tags)
+        if found:
+            if load is not None:
+                threading.Thread(
+                    target=self._load,
+                    args=(key, load, loader, ttl, stale_ttl, tags),
+                    name="fogis-cache-refresh",
+                    daemon=True,
+                ).start()
+            return value
+
+        if owner:
+            self._load(key, load, loader, ttl, stale_ttl, tags)
+        else:
+            load.done.wait()
+        if load.error is not None:
+            raise load.error
+        return load.value
+
+    async def get_async(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: float,
+        tags: Iterable[str] = (),
+        stale_ttl: Optional[float] = None,
+    ) -> Any:
+        """
+        Get a cached value from asyncio, loading it with the coroutine ``loader`` returns when needed.
+
+        Behaves like get: stale values are refreshed in the background (as a
+        task rather than a thread) and concurrent misses share one load, also
+        with callers of get.
+
+        Args:
+            key: Cache key
+            loader: Returns a coroutine that fetches the value from upstream
+            ttl: Seconds the loaded value is fresh
+            tags: Tags used to invalidate the entry
+            stale_ttl: Seconds an expired value may be served while it is refreshed,
+                defaults to the cache's stale_ttl
+
+        Returns:
+            The cached or freshly loaded value
+
+        Raises:
+            Exception: Whatever the loader raised, when there is no usable cached value
+        """
+        stale_ttl = self.stale_ttl if stale_ttl is None else stale_ttl
+        tags = set(tags)
+        found, value, load, owner = self._lookup(key, tags)
+        if found:
+            if load is not None:
+                self._start_async_load(key, load, loader, ttl, stale_ttl, tags)
+            return value
+
+        if owner:
+            # Shielded, so the caller disconnecting does not cancel the load for the others waiting on it
+            await asyncio.shield(self._start_async_load(key, load, loader, ttl, stale_ttl, tags))
+        else:
+            await load.wait_async()
+        if load.error is not None:
+            raise load.error
+        return load.value
+
+    def _lookup(self, key: Hashable, tags: Set[str]) -> Tuple[bool, Any, Optional[_Load], bool]:
+        # Returns whether a usable value was found and that value, with the load the caller must run
+        # (a refresh of a stale value, or the load of a miss) or the load of a miss to wait for
+        with self._lock:
+            entry = self._entries.get(key)
+            now = time.monotonic()
+            if entry is not None and now < entry.fresh_until:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return True, entry.value, None, False
+            if entry is not None and now < entry.stale_until:
+                self._entries.move_to_end(key)
+                self._stats["stale_hits"] += 1
+                if key in self._loads:
+                    return True, entry.value, None, False
+                load = self._loads[key] = _Load(tags)
+                self._stats["refreshes"] += 1
+                return True, entry.value, load, True
+
+            load = self._loads.get(key)
+            if load is not None:
+                self._stats["coalesced"] += 1
+                return False, None, load, False
+            load = self._loads[key] = _Load(tags)
+            self._stats["misses"] += 1
+            return False, None, load, True
+
+    def peek(self, key: Hashable) -> Any:
+        """
+        Get a fresh cached value without ever loading or waiting.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The value if it is cached and fresh, otherwise None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() >= entry.fresh_until:
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry.value
+
+    def put(self, key: Hashable, value: Any, ttl: float, tags: Iterable[str] = (), stale_ttl: Optional[float] = None) -> None:
+        """
+        Store a value without loading it, such as one handed over by a previous process.
+
+        Args:
+            key: Cache key
+            value: The value
+            ttl: Seconds the value is fresh
+            tags: Tags used to invalidate the entry
+            stale_ttl: Seconds the value may be served after that while it is refreshed,
+                defaults to the cache's stale_ttl
+        """
+        stale_ttl = self.stale_ttl if stale_ttl is None else stale_ttl
+        with self._lock:
+            self._store_locked(key, _Entry(value, ttl, stale_ttl, set(tags)))
+
+    def entries(self, limit: Optional[int] = None) -> List[Tuple[Hashable, Any, float, float, Set[str]]]:
+        """
+        Get the entries that can still be served, most recently used first.
+
+        Args:
+            limit: Most entries to return
+
+        Returns:
+            List of key, value, seconds it stays fresh (negative once stale),
+            seconds it can still be served, and tags
+        """
+        now = time.monotonic()
+        with self._lock:
+            usable = [
+                (key, entry.value, entry.fresh_until - now, entry.stale_until - now, set(entry.tags))
+                for key, entry in reversed(self._entries.items())
+                if entry.stale_until > now
+            ]
+        return usable[:limit] if limit is not None else usable
+
+    def _load(
+        self, key: Hashable, load: _Load, loader: Callable[[], Any], ttl: float, stale_ttl: float, tags: Set[str]
+    ) -> None:
+        try:
+            load.value = loader()
+        except Exception as e:
+            load.error = e
+            logger.warning(f"Loading {key!r} for the response cache failed: {e}")
+        self._finish_load(key, load, ttl, stale_ttl, tags)
+
+    def _start_async_load(
+        self,
+        key: Hashable,
+        load: _Load,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: float,
+        stale_ttl: float,
+        tags: Set[str],
+    ) -> "asyncio.Task[None]":
+        task = asyncio.ensure_future(self._load_async(key, load, loader, ttl, stale_ttl, tags))
+        # The event loop only keeps weak references to tasks
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _load_async(
+        self,
+        key: Hashable,
+        load: _Load,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: float,
+        stale_ttl: float,
+        tags: Set[str],
+    ) -> None:
+        try:
+            load.value = await loader()
+        except Exception as e:
+            load.error = e
+            logger.warning(f"Loading {key!r} for the response cache failed: {e}")
+        except BaseException as e:
+            # Cancelled: waiters must not hang, so they see the cancellation as the load's error
+            load.error = e
+            self._finish_load(key, load, ttl, stale_ttl, tags)
+            raise
+        self._finish_load(key, load, ttl, stale_ttl, tags)
+
+    def _finish_load(self, key: Hashable, load: _Load, ttl: float, stale_ttl: float, tags: Set[str]) -> None:
+        with self._lock:
+            if self._loads.get(key) is load:
+                del self._loads[key]
+            if load.error is None and not load.invalidated:
+                self._store_locked(key, _Entry(load.value, ttl, stale_ttl, tags))
+        load.finish()
+
+    def _store_locked(self, key: Hashable, entry: _Entry) -> None:
+        self._remove_locked(key)
+        self._entries[key] = entry
+        for tag in entry.tags:
+            self._tags.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._remove_locked(next(iter(self._entries)))
+
+    def _remove_locked(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry.tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def invalidate(self, key: Hashable) -> None:
+        """
+        Drop a single entry and discard any load of it that is in progress.
+
+        Args:
+            key: Cache key
+        """
+        with self._lock:
+            self._invalidate_locked(key)
+
+    def _invalidate_locked(self, key: Hashable) -> None:
+        self._remove_locked(key)
+        load = self._loads.pop(key, None)
+        if load is not None:
+            load.invalidated = True
+        self._stats["invalidations"] += 1
+
+    def invalidate_tags(self, *tags: str) -> int:
+        """
+        Drop every entry carrying any of the given tags.
+
+        Args:
+            *tags: Tags to invalidate, e.g. ``"match:123"``
+
+        Returns:
+            int: Number of entries dropped
+        """
+        with self._lock:
+            keys = set()
+            for tag in tags:
+                keys.update(self._tags.get(tag, ()))
+            # Loads still in progress must not store what they fetched before the write
+            keys.update(key for key, load in self._loads.items() if load.tags.intersection(tags))
+            for key in keys:
+                self._invalidate_locked(key)
+            return len(keys)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            for load in self._loads.values():
+                load.invalidated = True
+            self._entries.clear()
+            self._loads.clear()
+            self._tags.clear()
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Get cache metrics.
+
+        Returns:
+            Dict[str, Any]: Entry count, hit, stale hit, miss and coalesced counts,
+                background refreshes, invalidations and the hit ratio
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+            stats["max_entries"] = self.max_entries
+        lookups = stats["hits"] + stats["stale_hits"] + stats["misses"] + stats["coalesced"]
+        stats["hit_ratio"] = (stats["hits"] + stats["stale_hits"]) / lookups if lookups else 0.0
+        return stats
@@ -0,0 +1,306 @@
+"""
+Conditional, compressed and content-negotiated responses for the gateway.
+
+A :class:`JsonBody` serialises its data once and remembers the bytes, their
+strong ETag and each compressed variant, so a body kept in the response cache
+is hashed and compressed at most once however often it is served.
+:func:`json_response` answers ``If-None-Match`` with 304 and negotiates gzip
+or, when the optional ``brotli`` package is installed, brotli compression.
+
+Clients that send ``Accept: application/msgpack`` (or ``application/cbor``)
+get the body in that format instead of JSON, when the optional ``msgpack``
+(or ``cbor2``) package is installed. Each format is serialised at most once
+per body too. The negotiation itself (:func:`render`) works on raw header
+values, so the ASGI gateway shares it.
+"""
+
+import gzip
+import hashlib
+import os
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, Union
+
+from flask import Response, current_app, has_app_context, request
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.datastructures import MIMEAccept
+from werkzeug.http import parse_accept_header, parse_etags
+
+from fogis_api_client.gateway.json_provider import GatewayJSONProvider, dumps_bytes
+
+try:
+    import brotli
+except ImportError:
+    # Brotli is optional; gzip is always available
+    brotli = None
+
+try:
+    import msgpack
+except ImportError:
+    # MessagePack is optional; see the gateway extra
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:
+    # CBOR is optional
+    cbor2 = None
+
+# Bodies smaller than this are not worth compressing
+COMPRESSION_MIN_SIZE = int(os.environ.get("GATEWAY_COMPRESSION_MIN_SIZE", "1024"))
+
+_ENCODERS = {"gzip": lambda body: gzip.compress(body, compresslevel=6)}
+if brotli is not None:
+    _ENCODERS["br"] = lambda body: brotli.compress(body, quality=5)
+
+JSON = "application/json"
+
+# Serialisers of the formats offered besides JSON, by media type. Values that are
+# not native types are converted the way Flask's JSON provider converts them.
+_SERIALISERS: Dict[str, Callable[[Any], bytes]] = {}
+if msgpack is not None:
+    _SERIALISERS["application/msgpack"] = lambda data: msgpack.packb(
+        data, default=DefaultJSONProvider.default, use_bin_type=True
+    )
+if cbor2 is not None:
+    _SERIALISERS["application/cbor"] = lambda data: cbor2.dumps(
+        data, default=lambda encoder, value: encoder.encode(DefaultJSONProvider.default(value))
+    )
+
+# Other media types clients send for the same formats
+MEDIA_TYPE_ALIASES = {"application/x-msgpack": "application/msgpack", "application/vnd.msgpack": "application/msgpack"}
+
+# Responses vary by Accept only when there is more than one format to choose from
+VARY = "Accept, Accept-Encoding" if _SERIALISERS else "Accept-Encoding"
+
+
+def dumps_json_bytes(data: Any) -> bytes:
+    """
+    Serialise data the way the gateway does.
+
+    Args:
+        data: JSON-serialisable data
+
+    Returns:
+        bytes: JSON, using the Flask app's JSON provider when there is an app context
+            and the configured fast backend otherwise
+    """
+    if has_app_context():
+        provider = current_app.json
+        if isinstance(provider, GatewayJSONProvider):
+            return provider.dumps_bytes(data)
+        return provider.dumps(data).encode("utf-8")
+    return dumps_bytes(data)
+
+
+def dumps_json(data: Any) -> str:
+    """
+    Serialise data the way the gateway does.
+
+    Args:
+        data: JSON-serialisable data
+
+    Returns:
+        str: JSON text, using the Flask app's JSON provider when there is an app context
+            and the configured fast backend otherwise
+    """
+    if has_app_context():
+        return current_app.json.dumps(data)
+    return dumps_bytes(data).decode("utf-8")
+
+
+class JsonBody:
+    """
+    JSON data together with its serialised bytes, ETag and compressed variants.
+    """
+
+    def __init__(self, data: Any) -> None:
+        """
+        Wrap response data.
+
+        Args:
+            data: JSON-serialisable response data
+        """
+        self.data = data
+        self._body: Optional[bytes] = None
+        self._etag: Optional[str] = None
+        self._formats: Dict[str, bytes] = {}
+        self._encoded: Dict[Tuple[str, str], bytes] = {}
+        self._derived: Dict[Hashable, Any] = {}
+
+    @property
+    def body(self) -> bytes:
+        """The serialised JSON bytes."""
+        if self._body is None:
+            self._body = dumps_json_bytes(self.data) + b"\n"
+        return self._body
+
+    @property
+    def etag(self) -> str:
+        """Strong entity tag of the uncompressed body, without quotes."""
+        if self._etag is None:
+            self._etag = hashlib.sha256(self.body).hexdigest()[:32]
+        return self._etag
+
+    def derived(self, key: Hashable, build: Callable[[Any], Any]) -> Any:
+        """
+        Get a value computed from the data, computing it only once per body.
+
+        Args:
+            key: Identifies the derived value, e.g. a sort order
+            build: Computes the value from the data
+
+        Returns:
+            The derived value
+        """
+        if key not in self._derived:
+            self._derived[key] = build(self.data)
+        return self._derived[key]
+
+    def serialised(self, media_type: str = JSON) -> bytes:
+        """
+        Get the data serialised in a format.
+
+        Args:
+            media_type: ``application/json``, or a media type from :func:`negotiate_media_type`
+
+        Returns:
+            bytes: The serialised data
+        """
+        if media_type == JSON:
+            return self.body
+        if media_type not in self._formats:
+            self._formats[media_type] = _SERIALISERS[media_type](self.data)
+        return self._formats[media_type]
+
+    def encoded(self, encoding: str, media_type: str = JSON) -> bytes:
+        """
+        Get the body compressed with a content coding.
+
+        Args:
+            encoding: ``gzip`` or ``br``
+            media_type: Format of the body
+
+        Returns:
+            bytes: The compressed body
+        """
+        key = (media_type, encoding)
+        if key not in self._encoded:
+            self._encoded[key] = _ENCODERS[encoding](self.serialised(media_type))
+        return self._encoded[key]
+
+
+def negotiate_media_type(accept: Optional[str]) -> str:
+    """
+    Choose the response format for a request's Accept header.
+
+    Args:
+        accept: Value of the Accept request header
+
+    Returns:
+        str: ``application/json``, unless the client prefers an installed binary format
+    """
+    if not accept or not _SERIALISERS:
+        return JSON
+    offered = [JSON] + list(_SERIALISERS) + [alias for alias, target in MEDIA_TYPE_ALIASES.items() if target in _SERIALISERS]
+    best = parse_accept_header(accept, MIMEAccept).best_match(offered, default=JSON)
+    return MEDIA_TYPE_ALIASES.get(best, best)
+
+
+def serialise(data: Any, media_type: str) -> bytes:
+    """
+    Serialise data that is not kept in a :class:`JsonBody`, such as a list page.
+
+    Args:
+        data: The data
+        media_type: A media type from :func:`negotiate_media_type` other than JSON
+
+    Returns:
+        bytes: The serialised data
+    """
+    return _SERIALISERS[media_type](data)
+
+
+def _negotiate_encoding(size: int, accept_encoding: Optional[str]) -> Optional[str]:
+    if size < COMPRESSION_MIN_SIZE or not accept_encoding:
+        return None
+    accepted = parse_accept_header(accept_encoding)
+    for encoding in ("br", "gzip"):
+        if encoding in _ENCODERS and accepted[encoding] > 0:
+            return encoding
+    return None
+
+
+def _etag_matches(etag: str, if_none_match: Optional[str]) -> bool:
+    if not if_none_match:
+        return False
+    etags = parse_etags(if_none_match)
+    if etags.star_tag:
+        return True
+    # Other formats and compressed variants carry suffixes; any variant of the same body is current
+    return any(tag.split("-", 1)[0] == etag for tag in etags.as_set(include_weak=True))
+
+
+def render(
+    payload: Union[JsonBody, Any],
+    accept_encoding: Optional[str] = None,
+    if_none_match: Optional[str] = None,
+    status: int = 200,
+    accept: Optional[str] = None,
+) -> Tuple[int, Dict[str, str], bytes]:
+    """
+    Render a body for a request's Accept, Accept-Encoding and If-None-Match headers.
+
+    Args:
+        payload: A JsonBody, or data to wrap in one
+        accept_encoding: Value of the Accept-Encoding request header
+        if_none_match: Value of the If-None-Match request header
+        status: HTTP status code
+        accept: Value of the Accept request header
+
+    Returns:
+        The status code (304 when the client's copy is current), response headers
+        (with Content-Type unless 304) and body
+    """
+    if not isinstance(payload, JsonBody):
+        payload = JsonBody(payload)
+
+    media_type = negotiate_media_type(accept)
+    data = payload.serialised(media_type)
+    encoding = _negotiate_encoding(len(data), accept_encoding)
+    variant = [payload.etag]
+    if media_type != JSON:
+        variant.append(media_type.split("/")[1])
+    if encoding is not None:
+        variant.append(encoding)
+    headers = {"ETag": f'"{"-".join(variant)}"', "Vary": VARY}
+
+    if status == 200 and _etag_matches(payload.etag, if_none_match):
+        return 304, headers, b""
+
+    headers["Content-Type"] = media_type
+    if encoding is None:
+        return status, headers, data
+    headers["Content-Encoding"] = encoding
+    return status, headers, payload.encoded(encoding, media_type)
+
+
+def json_response(payload: Union[JsonBody, Any], status: int = 200) -> Response:
+    """
+    Build a JSON (or negotiated binary) response with a strong ETag, conditional 304 and compression.
+
+    Args:
+        payload: A JsonBody, or data to wrap in one
+        status: HTTP status code
+
+    Returns:
+        Response: The response for the current request
+    """
+    status, headers, body = render(
+        payload,
+        request.headers.get("Accept-Encoding"),
+        request.headers.get("If-None-Match"),
+        status,
+        request.headers.get("Accept"),
+    )
+    if status == 304:
+        return Response(status=304, headers=headers)
+    return Response(body, status=status, headers=headers)
@@ -0,0 +1,421 @@
+"""
+FOGIS calls behind the gateway's routes, shared by the Flask and the ASGI gateway.
+
+:class:`GatewayService` owns what both gateways keep around the FOGIS API
+client: the client (or the pool of them), the response cache, the read and
+write routes with their caching and invalidation, the raw protocol proxy, the
+warm-up steps and the hand-off to the next process. Its methods block; the
+Flask gateway calls them on its request threads and the ASGI gateway runs them
+on its upstream executors, so both serve the same data in the same way. Reads
+that are a single ``MatchWebMetoder.aspx`` call (see ``ReadRoute.call``) the
+ASGI gateway may instead send from its event loop, with the same client's
+session, keys, tags and decoding.
+"""
+
+import logging
+import os
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from fogis_api_client.gateway.handoff import Handoff, handoff_from_env
+from fogis_api_client.gateway.mdk_proxy import MdkCall, RawResponse, route_tag
+from fogis_api_client.gateway.pool import GatewayClientPool
+from fogis_api_client.gateway.response_cache import ResponseCache, route_ttls
+from fogis_api_client.gateway.responses import JsonBody
+from fogis_api_client.gateway.warmup import fogis_host_urls, preconnect, team_ids_playing_on
+from fogis_api_client.public_api_client import PublicApiClient, WebMethodCall
+
+logger = logging.getLogger(__name__)
+
+
+class ReadRoute(NamedTuple):
+    """A read route: its FOGIS call, whether its responses are cached and the tag writes invalidate them by."""
+
+    fetch: Callable[..., Any]
+    cached: bool = True
+    tag: Optional[str] = None
+    # Describes the fetch as a single MatchWebMetoder read, so the ASGI gateway can send it with httpx
+    call: Optional[Callable[..., WebMethodCall]] = None
+
+
+# Read routes by name, shared by the routes themselves and POST /batch. The fetch and the call are
+# called with a FOGIS API client and the route's parameters; the tag is formatted with the parameters.
+# Cached responses are also tagged route:<name>, for writes that cannot tell which of them they changed.
+READ_ROUTES: Dict[str, ReadRoute] = {
+    "matches": ReadRoute(lambda api: api.fetch_matches_list_json(), tag="matches", call=lambda api: api.matches_list_call()),
+    "match": ReadRoute(lambda api, match_id: api.fetch_match_json(match_id), tag="match:{match_id}"),
+    "match_result": ReadRoute(
+        lambda api, match_id: api.fetch_match_result_json(match_id),
+        cached=False,
+        call=lambda api, match_id: api.match_result_call(match_id),
+    ),
+    "match_events": ReadRoute(
+        lambda api, match_id: api.fetch_match_events_json(match_id),
+        tag="match:{match_id}",
+        call=lambda api, match_id: api.match_events_call(match_id),
+    ),
+    "match_officials": ReadRoute(lambda api, match_id: api.fetch_match_officials_json(match_id), cached=False),
+    "team_players": ReadRoute(
+        lambda api, team_id: api.fetch_team_players_json(team_id), call=lambda api, team_id: api.team_players_call(team_id)
+    ),
+    "team_officials": ReadRoute(
+        lambda api, team_id: api.fetch_team_officials_json(team_id),
+        call=lambda api, team_id: api.team_officials_call(team_id),
+    ),
+}
+
+
+def _report_match_event(api: PublicApiClient, match_id: int, event: Dict[str, Any]) -> Any:
+    # The event names its match itself when the caller left it out
+    if "matchid" not in event:
+        event = dict(event, matchid=match_id)
+    return api.report_match_event(event)
+
+
+# Write routes by name, each called with a FOGIS API client, the match it writes to and its arguments
+WRITE_ROUTES: Dict[str, Callable[..., Any]] = {
+    "report_match_event": _report_match_event,
+    "clear_match_events": lambda api, match_id: api.clear_match_events(match_id),
+    "finish_match_report": lambda api, match_id: api.mark_reporting_finished(match_id),
+}
+
+
+class GatewayService:
+    """
+    The FOGIS clients, response cache and route logic of a gateway process.
+    """
+
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        pool_size: int = 1,
+        pool_timeout: float = 30.0,
+        response_cache: Optional[ResponseCache] = None,
+        handoff: Optional[Handoff] = None,
+        mdk_proxy_enabled: bool = False,
+        warmup_enabled: bool = False,
+    ) -> None:
+        """
+        Initialize the service and create its clients, without logging in.
+
+        Args:
+            username: FOGIS username
+            password: FOGIS password
+            pool_size: Clients to pool; with 1, every call shares one client
+            pool_timeout: Seconds a call waits for a pooled client
+            response_cache: Cache for read responses, or None to always call FOGIS
+            handoff: Hand-off of warm state between processes; loads the previous process's cache
+            mdk_proxy_enabled: Whether the raw FOGIS protocol is proxied
+            warmup_enabled: Whether warm-up steps run at start-up
+        """
+        self.username = username
+        self.password = password
+        self.pool_size = pool_size
+        self.pool_timeout = pool_timeout
+        self.response_cache = response_cache
+        self.handoff = handoff
+        self.session_store = handoff.session_store if handoff is not None else None
+        self.mdk_proxy_enabled = mdk_proxy_enabled
+        self.warmup_enabled = warmup_enabled
+        # Seconds each cached read route stays fresh, overridable with e.g. GATEWAY_CACHE_TTL_MATCHES
+        self.ttls = route_ttls()
+
+        self.client: Optional[PublicApiClient] = None
+        self.client_initialized = False
+        # With a pool size over 1 each call borrows its own client from a pool instead of sharing
+        # the single client (whose authentication state is locked)
+        self.client_pool: Optional[GatewayClientPool[PublicApiClient]] = None
+        self.init_clients()
+
+        if handoff is not None and response_cache is not None:
+            handoff.load(response_cache)
+
+    def _new_client(self) -> PublicApiClient:
+        return PublicApiClient(username=self.username, password=self.password, session_store=self.session_store)
+
+    def init_clients(self) -> None:
+        """
+        Create the FOGIS API client, and the client pool if enabled, without logging in.
+        """
+        try:
+            self.client = self._new_client()
+            self.client_initialized = True
+            self.client_pool = None
+            if self.pool_size > 1:
+                self.client_pool = GatewayClientPool(self._new_client, size=self.pool_size, checkout_timeout=self.pool_timeout)
+        except Exception as e:
+            logger.error(f"Failed to initialize PublicApiClient: {e}")
+            self.client_initialized = False
+
+    @contextmanager
+    def fogis_client(self) -> Iterator[PublicApiClient]:
+        """
+        Borrow a FOGIS API client for a call.
+
+        Yields:
+            PublicApiClient: A pooled client, or the shared client when pooling is disabled
+        """
+        if self.client_pool is None:
+            yield self.client
+            return
+        with self.client_pool.lease() as pooled:
+            yield pooled
+
+    @staticmethod
+    def read_key(route: str, **params: Any) -> Tuple[Hashable, ...]:
+        """
+        Identify the response of a read route.
+
+        Args:
+            route: Route name, a key of READ_ROUTES
+            **params: The route's parameters
+
+        Returns:
+            Tuple: The route name followed by the parameter values
+        """
+        return (route,) + tuple(params.values())
+
+    def peek(self, key: Hashable) -> Any:
+        """
+        Get a fresh cached response without calling FOGIS or waiting for a call in progress.
+
+        Args:
+            key: Cache key, see read_key and MdkCall.key
+
+        Returns:
+            The cached response, or None
+        """
+        if self.response_cache is None:
+            return None
+        return self.response_cache.peek(key)
+
+    def fetch(self, route: str, **params: Any) -> JsonBody:
+        """
+        Fetch the response body of a read route from FOGIS, bypassing the response cache.
+
+        Args:
+            route: Route name, a key of READ_ROUTES
+            **params: The route's parameters
+
+        Returns:
+            JsonBody: The freshly fetched data
+        """
+        with self.fogis_client() as api:
+            return JsonBody(READ_ROUTES[route].fetch(api, **params))
+
+    def read(self, route: str, **params: Any) -> JsonBody:
+        """
+        Get the response body of a read route, through the response cache if the route is cached.
+
+        Args:
+            route: Route name, a key of READ_ROUTES
+            **params: The route's parameters
+
+        Returns:
+            JsonBody: The cached or freshly fetched data, serialised once per cache entry
+        """
+        if self.response_cache is None or not READ_ROUTES[route].cached:
+            return self.fetch(route, **params)
+        return self.response_cache.get(
+            self.read_key(route, **params),
+            lambda: self.fetch(route, **params),
+            self.ttls[route],
+            tags=self.tags(route, **params),
+        )
+
+    @staticmethod
+    def tags(route: str, **params: Any) -> List[str]:
+        """
+        Get the tags a cached response of a read route is invalidated by.
+
+        Args:
+            route: Route name, a key of READ_ROUTES
+            **params: The route's parameters
+
+        Returns:
+            List[str]: The route's ``route:<name>`` tag, and its own tag formatted with the parameters if it has one
+        """
+        tag = READ_ROUTES[route].tag
+        return [route_tag(route), tag.format(**params)] if tag else [route_tag(route)]
+
+    def web_method_call(self, route: str, **params: Any) -> Optional[WebMethodCall]:
+        """
+        Describe a read route as the single ``MatchWebMetoder.aspx`` read it makes.
+
+        Args:
+            route: Route name, a key of READ_ROUTES
+            **params: The route's parameters
+
+        Returns:
+            WebMethodCall: The read, sent with the shared client's session; None if the route
+                makes other calls or there is no client
+        """
+        call = READ_ROUTES[route].call
+        if call is None or self.client is None:
+            return None
+        return call(self.client, **params)
+
+    def write(self, route: str, match_id: int, *args: Any) -> Any:
+        """
+        Write to a match in FOGIS and drop the cached responses the write may have changed.
+
+        Args:
+            route: Route name, a key of WRITE_ROUTES
+            match_id: The match written to
+            *args: The route's further arguments
+
+        Returns:
+            FOGIS's response
+        """
+        with self.fogis_client() as api:
+            result = WRITE_ROUTES[route](api, match_id, *args)
+        self.invalidate_match(match_id)
+        return result
+
+    def invalidate_match(self, match_id: int) -> None:
+        """
+        Drop cached responses that a write to a match may have changed.
+
+        Args:
+            match_id: The match that was written to
+        """
+        if self.response_cache is not None:
+            self.response_cache.invalidate_tags(f"match:{match_id}", "matches")
+
+    def filter_matches(self, match_filter: Any) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Fetch the matches a filter selects.
+
+        Args:
+            match_filter: A MatchListFilter, see fogis_api_client.gateway.filters
+
+        Returns:
+            The matches and the report of which filters FOGIS and the gateway applied
+        """
+        with self.fogis_client() as api:
+            return match_filter.fetch_filtered_matches_with_report(api)
+
+    def proxy_mdk_call(self, call: MdkCall) -> RawResponse:
+        """
+        Forward a raw FOGIS protocol call, reads through the response cache.
+
+        Args:
+            call: The parsed call
+
+        Returns:
+            RawResponse: FOGIS's response bytes, cached or fresh
+        """
+
+        def load() -> RawResponse:
+            with self.fogis_client() as api:
+                return call.forward(api)
+
+        if not call.is_read:
+            raw = load()
+            self.invalidate_call(call)
+            return raw
+        if self.response_cache is None:
+            return load()
+        return self.response_cache.get(call.key, load, self.ttls[call.route], tags=call.tags)
+
+    def invalidate_call(self, call: MdkCall) -> None:
+        """
+        Drop cached responses that a proxied write may have changed.
+
+        Args:
+            call: The write that was forwarded
+        """
+        if self.response_cache is not None:
+            self.response_cache.invalidate_tags(*call.invalidates())
+
+    def warm_clients(self) -> Dict[str, int]:
+        """Log in every client up front."""
+        if self.client_pool is not None:
+            return {"clients": self.client_pool.prefill(lambda api: api.login())}
+        self.client.login()
+        return {"clients": 1}
+
+    def warm_connections(self) -> Dict[str, int]:
+        """Fill the connection pool with keep-alive connections to FOGIS and its OAuth server."""
+        with self.fogis_client() as api:
+            connections = self.client_pool.size if self.client_pool is not None else 1
+            return {"connections": preconnect(api.session, fogis_host_urls(), connections)}
+
+    def warm_rosters(
+        self, read: Optional[Callable[..., JsonBody]] = None, map_func: Callable[..., Iterable[Any]] = map
+    ) -> Dict[str, int]:
+        """
+        Prefetch the match list and the players of teams playing today into the response cache.
+
+        Args:
+            read: Reads a route like the gateway's own requests do, read by default
+            map_func: Maps the roster reads over the team ids, e.g. an executor's map to run them concurrently
+        """
+        read = read or self.read
+        team_ids = team_ids_playing_on(read("matches").data)
+        list(map_func(lambda team_id: read("team_players", team_id=team_id), team_ids))
+        return {"teams": len(team_ids)}
+
+    def warmup_steps(
+        self, read: Optional[Callable[..., JsonBody]] = None, map_func: Callable[..., Iterable[Any]] = map
+    ) -> List[Tuple[str, Callable[[], Any]]]:
+        """
+        Get the start-up warm-up steps, none unless warm-up is enabled.
+
+        Args:
+            read: Reads a route, see warm_rosters
+            map_func: Maps the roster reads, see warm_rosters
+
+        Returns:
+            The named steps, for fogis_api_client.gateway.warmup.Warmup
+        """
+        if not self.warmup_enabled:
+            return []
+        return [
+            ("login", self.warm_clients),
+            ("connections", self.warm_connections),
+            ("prefetch", lambda: self.warm_rosters(read, map_func)),
+        ]
+
+    def hand_off(self) -> None:
+        """
+        Save the session and hot cache entries for the next process, if a hand-off is configured.
+        """
+        if self.handoff is None:
+            return
+        if self.response_cache is not None:
+            self.handoff.save(self.response_cache)
+        if self.client_pool is None:
+            self.handoff.save_session(self.client)
+        else:
+            self.handoff.save_pooled_session(self.client_pool)
+
+
+def gateway_service_from_env() -> GatewayService:
+    """
+    Create the gateway service configured by the environment.
+
+    Reads FOGIS_USERNAME and FOGIS_PASSWORD, GATEWAY_CLIENT_POOL_SIZE and GATEWAY_CLIENT_POOL_TIMEOUT,
+    GATEWAY_RESPONSE_CACHE, GATEWAY_RESPONSE_CACHE_SIZE and GATEWAY_RESPONSE_CACHE_STALE_TTL,
+    GATEWAY_MDK_PROXY, GATEWAY_WARMUP and the hand-off settings (see handoff_from_env).
+
+    Returns:
+        GatewayService: The configured service
+    """
+    response_cache = None
+    if os.environ.get("GATEWAY_RESPONSE_CACHE", "1") == "1":
+        response_cache = ResponseCache(
+            max_entries=int(os.environ.get("GATEWAY_RESPONSE_CACHE_SIZE", "512")),
+            stale_ttl=float(os.environ.get("GATEWAY_RESPONSE_CACHE_STALE_TTL", "60")),
+        )
+    return GatewayService(
+        username=os.environ.get("FOGIS_USERNAME", "test_user"),
+        password=os.environ.get("FOGIS_PASSWORD", "test_pass"),
+        pool_size=int(os.environ.get("GATEWAY_CLIENT_POOL_SIZE", "1")),
+        pool_timeout=float(os.environ.get("GATEWAY_CLIENT_POOL_TIMEOUT", "30")),
+        response_cache=response_cache,
+        handoff=handoff_from_env(),
+        mdk_proxy_enabled=os.environ.get("GATEWAY_MDK_PROXY", "0") == "1",
+        warmup_enabled=os.environ.get("GATEWAY_WARMUP", "0") == "1",
+    )
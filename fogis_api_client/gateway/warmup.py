@@ -0,0 +1,190 @@
+"""
+Start-up warm-up and readiness for the gateway.
+
+The gateway logs in lazily, so without warm-up the first request after a
+deploy pays for the login, the TLS handshakes and an uncached match list.
+:class:`Warmup` runs named steps once in the background, such as logging in,
+opening pooled connections and prefetching, and tells the ``/ready`` route
+when they are done.
+
+Readiness means warm-up has run, not that every step succeeded: a failed step
+is reported, but does not keep every gateway out of rotation while FOGIS is
+down.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+import requests
+
+from fogis_api_client.internal.fogis_oauth_manager import FogisOAuthManager
+from fogis_api_client.public_api_client import PublicApiClient
+
+logger = logging.getLogger(__name__)
+
+
+class Warmup:
+    """
+    Runs warm-up steps once and tracks whether the gateway is ready.
+    """
+
+    def __init__(self, steps: Sequence[Tuple[str, Callable[[], Any]]] = ()) -> None:
+        """
+        Initialize the warm-up.
+
+        Args:
+            steps: ``(name, step)`` pairs, run in order; with no steps the gateway is ready at once
+        """
+        self.steps = list(steps)
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+        self._results: Dict[str, Dict[str, Any]] = {name: {"status": "pending"} for name, _ in self.steps}
+        if not self.steps:
+            self._done.set()
+
+    @property
+    def ready(self) -> bool:
+        """Whether every step has run."""
+        return self._done.is_set()
+
+    def run(self) -> bool:
+        """
+        Run the steps in the calling thread.
+
+        Returns:
+            bool: Whether every step succeeded
+        """
+        self._started_at = time.monotonic()
+        succeeded = True
+        for name, step in self.steps:
+            self._results[name] = {"status": "running"}
+            started = time.monotonic()
+            try:
+                detail = step()
+            except Exception as e:
+                succeeded = False
+                logger.warning(f"Warm-up step {name} failed: {e}")
+                self._results[name] = {"status": "failed", "error": str(e)}
+            else:
+                self._results[name] = {"status": "ok"}
+                if detail is not None:
+                    self._results[name]["detail"] = detail
+            self._results[name]["duration"] = round(time.monotonic() - started, 3)
+        self._finished_at = time.monotonic()
+        self._done.set()
+        logger.info(f"Warm-up finished in {self._finished_at - self._started_at:.2f}s")
+        return succeeded
+
+    def start(self) -> None:
+        """Run the steps on a background thread, once."""
+        with self._lock:
+            if self._thread is not None or self.ready:
+                return
+            self._thread = threading.Thread(target=self.run, name="gateway-warmup", daemon=True)
+            self._thread.start()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for warm-up to finish.
+
+        Args:
+            timeout: Seconds to wait, or None to wait indefinitely
+
+        Returns:
+            bool: Whether the gateway is ready
+        """
+        return self._done.wait(timeout)
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Get the warm-up status.
+
+        Returns:
+            Dict[str, Any]: Whether the gateway is ready, the state, the duration and each step's outcome
+        """
+        if self.ready:
+            state = "ready"
+        elif self._started_at is None:
+            state = "pending"
+        else:
+            state = "warming_up"
+        duration = None
+        if self._started_at is not None:
+            duration = round((self._finished_at or time.monotonic()) - self._started_at, 3)
+        return {
+            "ready": self.ready,
+            "state": state,
+            "duration": duration,
+            "steps": [dict(self._results[name], name=name) for name, _ in self.steps],
+        }
+
+
+def fogis_host_urls() -> List[str]:
+    """Root URLs of the FOGIS web service and its OAuth server, for :func:`preconnect`."""
+    urls = []
+    for url in (PublicApiClient.BASE_URL, FogisOAuthManager.TOKEN_URL):
+        parts = urlsplit(url)
+        urls.append(f"{parts.scheme}://{parts.netloc}/")
+    return urls
+
+
+def preconnect(session: requests.Session, urls: Iterable[str], connections: int = 1, timeout: float = 10.0) -> int:
+    """
+    Open keep-alive connections to hosts ahead of the first request.
+
+    Each URL is requested ``connections`` times concurrently, so that many
+    connections are left in the session's connection pool. Any response status
+    will do; only the connection matters.
+
+    Args:
+        session: Session whose connection pool to fill
+        urls: One URL per host
+        connections: Connections to open per host
+        timeout: Seconds to wait for each request
+
+    Returns:
+        int: Number of requests that got a response
+    """
+    targets = [url for url in urls for _ in range(connections)]
+
+    def touch(url: str) -> bool:
+        try:
+            session.head(url, timeout=timeout, allow_redirects=False).close()
+            return True
+        except requests.RequestException as e:
+            logger.debug(f"Pre-connect to {url} failed: {e}")
+            return False
+
+    with ThreadPoolExecutor(max_workers=max(1, len(targets))) as executor:
+        return sum(executor.map(touch, targets))
+
+
+def team_ids_playing_on(matches: Iterable[Dict[str, Any]], day: Optional[date] = None) -> List[int]:
+    """
+    Find the match-specific team ids (matchlagid) of the matches played on a day.
+
+    Args:
+        matches: Matches from the match list
+        day: The day, defaults to today
+
+    Returns:
+        List[int]: Team ids, without duplicates
+    """
+    prefix = (day or date.today()).isoformat()
+    team_ids: List[int] = []
+    for match in matches:
+        if not str(match.get("datum", "")).startswith(prefix):
+            continue
+        for field in ("matchlag1id", "matchlag2id"):
+            team_id = match.get(field)
+            if team_id and int(team_id) not in team_ids:
+                team_ids.append(int(team_id))
+    return team_ids
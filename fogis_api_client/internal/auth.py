@@ -6,17 +6,23 @@ OAuth 2.0 PKCE flow (new) and ASP.NET form authentication (legacy fallback).
 """
 
 import logging
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, Optional, Tuple
 from urllib.parse import parse_qs, urlparse
 
 import requests
 from bs4 import BeautifulSoup
 
+from fogis_api_client.internal.form_parser import extract_first_form, extract_hidden_inputs
+
 # Import will be handled dynamically to avoid circular imports
 # from fogis_oauth_manager import FogisOAuthManager
 
 logger = logging.getLogger(__name__)
 
+OAUTH_HOST = "auth.fogis.se"
+FOGIS_HOST = "fogis.svenskfotboll.se"
+FOGIS_AUTH_COOKIE = "FogisMobilDomarKlient.ASPXAUTH"
+
 
 class FogisAuthenticationError(Exception):
     """Exception raised when FOGIS authentication fails."""
@@ -73,9 +79,13 @@ def authenticate(session: requests.Session, username: str, password: str, base_u
         response.raise_for_status()
 
         # Check if we were redirected to OAuth
-        if "auth.fogis.se" in response.url:
+        if OAUTH_HOST in response.url:
             logger.info("Detected OAuth redirect - using OAuth 2.0 PKCE flow")
-            return _handle_oauth_authentication(session, username, password, response.url)
+            return _handle_oauth_authentication(session, username, password, response.url, login_page=response)
+        elif _is_signed_in_page(session, response):
+            # The SSO cookies were still valid and the authorization server sent us straight back
+            logger.info("OAuth SSO session still valid - signed in without credentials")
+            return _extract_session_cookies(session, authentication_path="silent")
         else:
             logger.info("No OAuth redirect detected - using ASP.NET form authentication")
             return _handle_aspnet_authentication(session, username, password, response, login_url)
@@ -147,15 +157,94 @@ def _extract_oauth_parameters(oauth_url: str) -> Dict[str, str]:
         raise FogisOAuthAuthenticationError(f"Failed to extract OAuth parameters: {e}")
 
 
-def _handle_oauth_authentication(session: requests.Session, username: str, password: str, oauth_url: str) -> Dict[str, Any]:
+def _session_has_cookie(session: requests.Session, name: Optional[str] = None, domain: Optional[str] = None) -> bool:
+    """Check the session cookie jar for a cookie by name and/or domain suffix."""
+    try:
+        return any(
+            (name is None or cookie.name == name) and (domain is None or cookie.domain.lstrip(".").endswith(domain))
+            for cookie in session.cookies
+        )
+    except TypeError:
+        # Not a real cookie jar (e.g. a mocked session)
+        return False
+
+
+def _is_signed_in_page(session: requests.Session, response: requests.Response) -> bool:
+    """Check whether a response is a FOGIS page served to an authenticated session."""
+    url = getattr(response, "url", None)
+    if not isinstance(url, str) or FOGIS_HOST not in url or "Login.aspx" in url:
+        return False
+    return _session_has_cookie(session, name=FOGIS_AUTH_COOKIE)
+
+
+def _try_silent_authentication(
+    session: requests.Session, oauth_url: str, login_page: Optional[requests.Response]
+) -> Tuple[Optional[Dict[str, Any]], Optional[requests.Response]]:
+    """
+    Try to complete the OAuth flow using the SSO cookies of the authorization server.
+
+    When the ``auth.fogis.se`` SSO session is still alive, the authorization
+    endpoint answers with the authorization response instead of a login
+    form: either a redirect back to FOGIS, or (with ``response_mode=form_post``)
+    a self-submitting form. Submitting that form signs us in to FOGIS without
+    posting any credentials.
+
+    Args:
+        session: The requests session holding the SSO cookies
+        oauth_url: The OAuth authorization URL
+        login_page: The authorization endpoint response, if already fetched
+
+    Returns:
+        Tuple of the session cookies (or None if silent authentication was not
+        possible) and the authorization endpoint response, which the full flow
+        can reuse as its login page
+    """
+    if login_page is None:
+        login_page = session.get(oauth_url, allow_redirects=True, timeout=(10, 30))
+        login_page.raise_for_status()
+        if _is_signed_in_page(session, login_page):
+            return _extract_session_cookies(session, authentication_path="silent"), login_page
+
+    form = extract_first_form(login_page.text)
+    if form is None:
+        return None, login_page
+
+    form_action, form_method, form_data = form
+    if FOGIS_HOST not in form_action or not ({"code", "id_token"} & set(form_data)):
+        # An ordinary login form: the SSO session is gone
+        return None, login_page
+
+    logger.debug("Authorization server returned an authorization response, submitting it to FOGIS")
+    response = session.post(form_action, data=form_data, allow_redirects=True, timeout=(10, 30))
+    response.raise_for_status()
+    if _is_signed_in_page(session, response):
+        return _extract_session_cookies(session, authentication_path="silent"), login_page
+
+    logger.info("Silent re-authentication was not accepted by FOGIS")
+    return None, None
+
+
+def _handle_oauth_authentication(
+    session: requests.Session,
+    username: str,
+    password: str,
+    oauth_url: str,
+    login_page: Optional[requests.Response] = None,
+) -> Dict[str, Any]:
     """
     Handle OAuth 2.0 PKCE authentication flow.
 
+    If the session still holds SSO cookies for ``auth.fogis.se``, a silent
+    re-authentication without posting credentials is tried first. The result
+    records which path was taken in ``authentication_path`` (``"silent"`` or
+    ``"full"``).
+
     Args:
         session: The requests session
         username: FOGIS username
         password: FOGIS password
         oauth_url: The OAuth authorization URL we were redirected to
+        login_page: The response for ``oauth_url``, if it has already been fetched
 
     Returns:
         Dict containing OAuth tokens
@@ -191,13 +280,20 @@ def _handle_oauth_authentication(session: requests.Session, username: str, passw
             # Store the OAuth parameters in the manager for later use
             oauth_manager.set_oauth_parameters(oauth_params)
 
+            if _session_has_cookie(session, domain=OAUTH_HOST):
+                result, login_page = _try_silent_authentication(session, oauth_url, login_page)
+                if result is not None:
+                    logger.info("OAuth silent re-authentication successful")
+                    return result
+                logger.debug("Silent re-authentication not possible, posting credentials")
+
             # Continue with the OAuth flow using the existing session
-            return _handle_oauth_login_form(session, username, password, oauth_manager)
+            return _handle_oauth_login_form(session, username, password, oauth_manager, login_page)
 
         # If we're at a different OAuth endpoint, handle accordingly
         elif "/Account/LogIn" in parsed_url.path:
             logger.debug("At OAuth login form")
-            return _handle_oauth_login_form(session, username, password, oauth_manager)
+            return _handle_oauth_login_form(session, username, password, oauth_manager, login_page)
 
         else:
             raise FogisOAuthAuthenticationError(f"Unexpected OAuth URL: {oauth_url}")
@@ -229,6 +325,17 @@ def _get_oauth_login_page(session: requests.Session, oauth_manager) -> requests.
     return session.get(login_url, allow_redirects=True, timeout=10)
 
 
+def _parse_oauth_login_form(page: str, username: str, password: str) -> Tuple[str, str, Dict[str, str]]:
+    """Extract form data from OAuth login page, using BeautifulSoup only if the fast path fails."""
+    form = extract_first_form(page)
+    if form is None:
+        logger.debug("OAuth login page layout not recognised, parsing it with BeautifulSoup")
+        return _extract_form_data(BeautifulSoup(page, "html.parser"), username, password)
+
+    form_action, form_method, form_data = form
+    return _build_form_submission(form_action, form_method, form_data, username, password)
+
+
 def _extract_form_data(soup: BeautifulSoup, username: str, password: str) -> Tuple[str, str, Dict[str, str]]:
     """Extract form data from OAuth login page."""
     form = soup.find("form")
@@ -238,14 +345,6 @@ def _extract_form_data(soup: BeautifulSoup, username: str, password: str) -> Tup
     form_action = form.get("action", "")
     form_method = form.get("method", "post").lower()
 
-    # Build the form submission URL
-    if form_action.startswith("/"):
-        form_url = f"https://auth.fogis.se{form_action}"
-    elif form_action.startswith("http"):
-        form_url = form_action
-    else:
-        form_url = "https://auth.fogis.se/Account/Login"
-
     # Extract all form fields
     form_data = {}
     for input_field in form.find_all("input"):
@@ -254,6 +353,21 @@ def _extract_form_data(soup: BeautifulSoup, username: str, password: str) -> Tup
         if field_name:
             form_data[field_name] = field_value
 
+    return _build_form_submission(form_action, form_method, form_data, username, password)
+
+
+def _build_form_submission(
+    form_action: str, form_method: str, form_data: Dict[str, str], username: str, password: str
+) -> Tuple[str, str, Dict[str, str]]:
+    """Build the OAuth login form submission URL and data."""
+    # Build the form submission URL
+    if form_action.startswith("/"):
+        form_url = f"https://auth.fogis.se{form_action}"
+    elif form_action.startswith("http"):
+        form_url = form_action
+    else:
+        form_url = "https://auth.fogis.se/Account/Login"
+
     # Set credentials
     form_data["Username"] = username
     form_data["Password"] = password
@@ -263,7 +377,7 @@ def _extract_form_data(soup: BeautifulSoup, username: str, password: str) -> Tup
     return form_url, form_method, form_data
 
 
-def _extract_session_cookies(session: requests.Session) -> Dict[str, Any]:
+def _extract_session_cookies(session: requests.Session, authentication_path: str = "full") -> Dict[str, Any]:
     """Extract ASP.NET session cookies from OAuth session."""
     cookies = {}
     for cookie in session.cookies:
@@ -275,12 +389,19 @@ def _extract_session_cookies(session: requests.Session) -> Dict[str, Any]:
         result = cookies.copy()
         result["oauth_authenticated"] = True
         result["authentication_method"] = "oauth_hybrid"
+        result["authentication_path"] = authentication_path
         return result
     else:
         raise FogisOAuthAuthenticationError("OAuth login successful but no session cookies established")
 
 
-def _handle_oauth_login_form(session: requests.Session, username: str, password: str, oauth_manager) -> Dict[str, Any]:
+def _handle_oauth_login_form(
+    session: requests.Session,
+    username: str,
+    password: str,
+    oauth_manager,
+    login_page: Optional[requests.Response] = None,
+) -> Dict[str, Any]:
     """
     Handle the OAuth login form submission.
 
@@ -289,14 +410,14 @@ def _handle_oauth_login_form(session: requests.Session, username: str, password:
         username: FOGIS username
         password: FOGIS password
         oauth_manager: The OAuth manager instance
+        login_page: The login page response, if already fetched
 
     Returns:
         Dict containing OAuth tokens
     """
     try:
-        current_response = _get_oauth_login_page(session, oauth_manager)
-        soup = BeautifulSoup(current_response.text, "html.parser")
-        form_url, form_method, form_data = _extract_form_data(soup, username, password)
+        current_response = login_page if login_page is not None else _get_oauth_login_page(session, oauth_manager)
+        form_url, form_method, form_data = _parse_oauth_login_form(current_response.text, username, password)
 
         logger.debug(f"Submitting OAuth login form to {form_url}")
 
@@ -360,17 +481,17 @@ def _handle_aspnet_authentication(
     """
     logger.debug("Using ASP.NET form authentication")
 
-    # Parse the HTML to extract all hidden form fields
-    soup = BeautifulSoup(response.text, "html.parser")
-
-    # Extract all hidden form fields
-    form_data = {}
-    hidden_inputs = soup.find_all("input", {"type": "hidden"})
-    for inp in hidden_inputs:
-        name = inp.get("name", "")
-        value = inp.get("value", "")
-        if name:
-            form_data[name] = value
+    # Extract all hidden form fields, parsing the full page only if the fast path fails
+    form_data = extract_hidden_inputs(response.text)
+    if form_data is None:
+        logger.debug("Login page layout not recognised, parsing it with BeautifulSoup")
+        form_data = {}
+        soup = BeautifulSoup(response.text, "html.parser")
+        for inp in soup.find_all("input", {"type": "hidden"}):
+            name = inp.get("name", "")
+            value = inp.get("value", "")
+            if name:
+                form_data[name] = value
 
     # Verify we have the required tokens
     if "__VIEWSTATE" not in form_data:
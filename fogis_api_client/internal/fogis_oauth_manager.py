@@ -9,6 +9,7 @@ import base64
 import hashlib
 import logging
 import secrets
+import time
 import urllib.parse
 from typing import Any, Dict, Optional, Tuple
 from urllib.parse import parse_qs, urlparse
@@ -51,6 +52,7 @@ class FogisOAuthManager:
         self.access_token: Optional[str] = None
         self.refresh_token: Optional[str] = None
         self.token_expires_in: Optional[int] = None
+        self.token_expires_at: Optional[float] = None
         self.code_verifier: Optional[str] = None
         self.state: Optional[str] = None
         self.nonce: Optional[str] = None
@@ -129,8 +131,6 @@ class FogisOAuthManager:
         state = secrets.token_urlsafe(32)
 
         # Generate nonce for OpenID Connect (timestamp-based like FOGIS expects)
-        import time
-
         timestamp = int(time.time() * 10000000)  # .NET ticks format
         nonce_part1 = secrets.token_hex(16)
         nonce_part2 = secrets.token_hex(16)
@@ -241,7 +241,7 @@ class FogisOAuthManager:
                 # Store tokens
                 self.access_token = token_response.get("access_token")
                 self.refresh_token = token_response.get("refresh_token")
-                self.token_expires_in = token_response.get("expires_in")
+                self._set_token_expiry(token_response.get("expires_in"))
 
                 # Update session headers with access token
                 self.session.headers["Authorization"] = f"Bearer {self.access_token}"
@@ -290,7 +290,7 @@ class FogisOAuthManager:
                 self.access_token = token_response.get("access_token")
                 if "refresh_token" in token_response:
                     self.refresh_token = token_response["refresh_token"]
-                self.token_expires_in = token_response.get("expires_in")
+                self._set_token_expiry(token_response.get("expires_in"))
 
                 # Update session headers
                 self.session.headers["Authorization"] = f"Bearer {self.access_token}"
@@ -305,6 +305,11 @@ class FogisOAuthManager:
             self.logger.error(f"Error refreshing token: {e}")
             return False
 
+    def _set_token_expiry(self, expires_in: Optional[int]) -> None:
+        """Record the token lifetime and the absolute time at which it runs out."""
+        self.token_expires_in = expires_in
+        self.token_expires_at = time.time() + expires_in if expires_in else None
+
     def is_authenticated(self) -> bool:
         """
         Check if the manager has valid authentication.
@@ -333,6 +338,7 @@ class FogisOAuthManager:
         self.access_token = None
         self.refresh_token = None
         self.token_expires_in = None
+        self.token_expires_at = None
         self.code_verifier = None
         self.state = None
         self.nonce = None
@@ -0,0 +1,106 @@
+"""
+Fast extraction of login form fields.
+
+Both login flows only need a handful of values from the login page: the
+ASP.NET hidden inputs (``__VIEWSTATE``, ``__EVENTVALIDATION``, ...) and the
+action and inputs of the OAuth login form. Building a full BeautifulSoup tree
+for that is the slowest part of a login on small containers, so this module
+scans the markup for ``<form>`` and ``<input>`` tags with a targeted
+tokenizer instead.
+
+The extractors return None whenever the page does not look the way they
+expect (missing fields, unclosed or nested forms); callers then fall back to
+BeautifulSoup.
+"""
+
+import html
+import re
+from typing import Dict, Optional, Tuple
+
+# Markup whose contents are not part of the form and may contain text that looks like tags
+_IGNORED_MARKUP = re.compile(
+    r"<!--.*?-->|<(script|style|textarea|template)\b[^>]*>.*?</\1\s*>",
+    re.DOTALL | re.IGNORECASE,
+)
+_INPUT_TAG = re.compile(r"""<input\b((?:[^>"']|"[^"]*"|'[^']*')*)>""", re.IGNORECASE)
+_FORM_OPEN = re.compile(r"""<form\b((?:[^>"']|"[^"]*"|'[^']*')*)>""", re.IGNORECASE)
+_FORM_CLOSE = re.compile(r"</form\s*>", re.IGNORECASE)
+_ATTRIBUTE = re.compile(r"""([^\s=/>"']+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>"']+)))?""")
+
+ASPNET_REQUIRED_FIELDS = ("__VIEWSTATE", "__EVENTVALIDATION")
+
+
+def _parse_attributes(source: str) -> Dict[str, str]:
+    """Parse the attributes of a single tag, decoding character references."""
+    attributes: Dict[str, str] = {}
+    for match in _ATTRIBUTE.finditer(source):
+        name = match.group(1).lower()
+        if name in attributes:
+            # Like HTML parsers, the first occurrence of an attribute wins
+            continue
+        value = next((group for group in match.group(2, 3, 4) if group is not None), "")
+        attributes[name] = html.unescape(value)
+    return attributes
+
+
+def _iter_inputs(markup: str):
+    for match in _INPUT_TAG.finditer(markup):
+        yield _parse_attributes(match.group(1))
+
+
+def extract_hidden_inputs(page: str, required: Tuple[str, ...] = ASPNET_REQUIRED_FIELDS) -> Optional[Dict[str, str]]:
+    """
+    Extract all named hidden inputs from a page.
+
+    Args:
+        page: The page HTML
+        required: Field names that must be present
+
+    Returns:
+        Optional[Dict[str, str]]: Field names mapped to values, or None if a
+            required field is missing
+    """
+    markup = _IGNORED_MARKUP.sub("", page)
+    fields: Dict[str, str] = {}
+    for attributes in _iter_inputs(markup):
+        name = attributes.get("name")
+        if name and attributes.get("type", "").lower() == "hidden":
+            fields[name] = attributes.get("value", "")
+
+    if any(name not in fields for name in required):
+        return None
+    return fields
+
+
+def extract_first_form(page: str) -> Optional[Tuple[str, str, Dict[str, str]]]:
+    """
+    Extract the action, method and inputs of the first form on a page.
+
+    Args:
+        page: The page HTML
+
+    Returns:
+        Optional[Tuple[str, str, Dict[str, str]]]: ``(action, method, fields)``
+            with the method lower-cased, or None if there is no well-formed form
+    """
+    markup = _IGNORED_MARKUP.sub("", page)
+    opening = _FORM_OPEN.search(markup)
+    if opening is None:
+        return None
+    closing = _FORM_CLOSE.search(markup, opening.end())
+    if closing is None:
+        return None
+
+    body = markup[opening.end() : closing.start()]
+    if _FORM_OPEN.search(body):
+        # Nested forms are invalid HTML; let a real parser decide what they mean
+        return None
+
+    form = _parse_attributes(opening.group(1))
+    fields: Dict[str, str] = {}
+    for attributes in _iter_inputs(body):
+        name = attributes.get("name")
+        if name:
+            fields[name] = attributes.get("value", "")
+
+    return form.get("action", ""), form.get("method", "post").lower(), fields
@@ -0,0 +1,166 @@
+"""
+Background keep-alive for FOGIS sessions.
+
+FOGIS expires idle ASP.NET sessions, and the first request after that pays
+for a rejected call, a full login and a retry. :class:`SessionKeeper` probes
+the session at a fixed interval and logs in again as soon as FOGIS rejects
+it, so foreground requests always find a live session. A probe that fails
+for another reason (a network error or a 5xx) leaves the session alone and
+is retried at the next interval, since logging in again would discard a
+session that may well still be valid.
+
+The status it reports uses the same fields as the standalone session keeper
+tool (``session_keeper_status.json``).
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _format_duration(seconds: float) -> str:
+    """Format a duration as ``"1h 2m 3s"``."""
+    hours, remainder = divmod(int(seconds), 3600)
+    minutes, seconds = divmod(remainder, 60)
+    return f"{hours}h {minutes}m {seconds}s"
+
+
+class SessionKeeper:
+    """
+    Background thread that keeps a client's session alive.
+
+    Each check calls ``client.check_session()``. When FOGIS rejected the
+    session the keeper calls ``client.refresh_authentication()``, which logs
+    in again under the client's authentication lock.
+    """
+
+    def __init__(self, client: Any, check_interval: float = 300, status_file: Optional[str] = None) -> None:
+        """
+        Initialize the session keeper.
+
+        Args:
+            client: The PublicApiClient whose session should be kept alive
+            check_interval: Seconds between session checks
+            status_file: Optional path to write the status to as JSON after every check
+        """
+        if check_interval <= 0:
+            raise ValueError("check_interval must be positive")
+
+        self.client = client
+        self.check_interval = check_interval
+        self.status_file = status_file
+
+        self.successful_checks = 0
+        self.failed_checks = 0
+        self.relogins = 0
+        self.start_time: Optional[float] = None
+        self.last_activity: Optional[float] = None
+
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the background thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def check_now(self) -> bool:
+        """
+        Probe the session once and log in again if FOGIS rejected it.
+
+        Returns:
+            bool: True if the session is alive after the check, False if it is
+                not or FOGIS could not be reached
+        """
+        accepted = self.client.check_session()
+        if accepted:
+            self.successful_checks += 1
+            self.last_activity = time.time()
+            logger.debug(f"Session check successful (total: {self.successful_checks})")
+            return True
+
+        self.failed_checks += 1
+        if accepted is None:
+            logger.warning("Session check inconclusive, keeping the session and retrying at the next check")
+            return False
+
+        logger.warning("Session was rejected, attempting to re-login")
+        if self.client.refresh_authentication():
+            self.relogins += 1
+            self.last_activity = time.time()
+            logger.info(f"Re-login successful (total relogins: {self.relogins})")
+            return True
+
+        logger.error("Re-login failed, will retry at the next check")
+        return False
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Get the current keeper statistics.
+
+        Returns:
+            Dict[str, Any]: running, successful_checks, failed_checks, relogins,
+                runtime, last_activity, check_interval and has_cookies
+        """
+        now = time.time()
+        return {
+            "running": self.running,
+            "successful_checks": self.successful_checks,
+            "failed_checks": self.failed_checks,
+            "relogins": self.relogins,
+            "runtime": _format_duration(now - self.start_time) if self.start_time else "unknown",
+            "last_activity": (f"{_format_duration(now - self.last_activity)} ago" if self.last_activity else "unknown"),
+            "check_interval": self.check_interval,
+            "has_cookies": bool(self.client.get_cookies()),
+        }
+
+    def _write_status_file(self) -> None:
+        directory = os.path.dirname(os.path.abspath(self.status_file))
+        try:
+            fd, tmp_path = tempfile.mkstemp(prefix=".status-", dir=directory)
+            with os.fdopen(fd, "w") as f:
+                json.dump(self.status(), f, indent=2)
+            os.replace(tmp_path, self.status_file)
+        except OSError as e:
+            logger.error(f"Failed to write session keeper status file: {e}")
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.check_interval):
+            try:
+                self.check_now()
+            except Exception as e:
+                self.failed_checks += 1
+                logger.error(f"Unexpected error during session check: {e}")
+
+            if self.status_file:
+                self._write_status_file()
+
+    def start(self) -> None:
+        """Start the background keep-alive thread (no-op if already running)."""
+        if self.running:
+            return
+        self._stop_event.clear()
+        self.start_time = time.time()
+        self.last_activity = self.start_time
+        self._thread = threading.Thread(target=self._run, name="fogis-session-keeper", daemon=True)
+        self._thread.start()
+        logger.info(f"Session keeper started (check interval: {self.check_interval}s)")
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        """
+        Stop the background keep-alive thread.
+
+        Args:
+            timeout: Seconds to wait for the thread to exit
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        logger.info("Session keeper stopped")
@@ -0,0 +1,154 @@
+"""
+Proactive OAuth token refresh.
+
+Without a scheduler an access token is only refreshed after a request has
+already failed with 401, so that request pays for a failed call, a refresh and
+a retry. :class:`TokenRefreshScheduler` refreshes the token in the background
+once a configurable fraction of its lifetime has passed, with random jitter so
+that many workers started together do not refresh in lockstep.
+"""
+
+import logging
+import random
+import threading
+import time
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TokenRefreshScheduler:
+    """
+    Background thread that keeps a client's OAuth access token fresh.
+
+    The scheduler calls ``client.refresh_authentication()``, which refreshes the
+    token under the client's authentication lock and falls back to a full login
+    if the refresh token is rejected.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        refresh_fraction: float = 0.75,
+        jitter: float = 0.1,
+        retry_interval: float = 30.0,
+        idle_interval: float = 60.0,
+    ) -> None:
+        """
+        Initialize the scheduler.
+
+        Args:
+            client: The PublicApiClient whose tokens should be refreshed
+            refresh_fraction: Fraction of the token lifetime after which to refresh
+            jitter: Relative random spread applied to the refresh point (0.1 = ±10%)
+            retry_interval: Seconds to wait before retrying a failed refresh
+            idle_interval: Seconds between checks while there is no token to refresh
+        """
+        if not 0 < refresh_fraction < 1:
+            raise ValueError("refresh_fraction must be between 0 and 1")
+        if not 0 <= jitter < 1:
+            raise ValueError("jitter must be between 0 and 1")
+
+        self.client = client
+        self.refresh_fraction = refresh_fraction
+        self.jitter = jitter
+        self.retry_interval = retry_interval
+        self.idle_interval = idle_interval
+
+        self.refresh_count = 0
+        self.failure_count = 0
+        self.last_refresh: Optional[float] = None
+
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the background thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def next_refresh_delay(self, now: Optional[float] = None) -> Optional[float]:
+        """
+        Compute how long to wait before the next refresh.
+
+        Args:
+            now: Current time, defaults to ``time.time()``
+
+        Returns:
+            Optional[float]: Seconds until the refresh is due, or None if the
+                client has no OAuth token with a known lifetime
+        """
+        tokens = self.client.oauth_tokens
+        if self.client.authentication_method != "oauth" or not tokens:
+            return None
+
+        expires_in = tokens.get("expires_in")
+        expires_at = self.client.token_expires_at
+        if not expires_in or not expires_at:
+            return None
+
+        now = time.time() if now is None else now
+        obtained_at = expires_at - expires_in
+        spread = random.uniform(1 - self.jitter, 1 + self.jitter)
+        # Never aim past the point where the token is actually gone
+        refresh_at = min(obtained_at + expires_in * self.refresh_fraction * spread, expires_at - 1)
+        return max(0.0, refresh_at - now)
+
+    def refresh_now(self) -> bool:
+        """
+        Refresh the client's authentication immediately.
+
+        Returns:
+            bool: True if the refresh (or fallback login) succeeded
+        """
+        if self.client.refresh_authentication():
+            self.refresh_count += 1
+            self.last_refresh = time.time()
+            logger.debug("Proactive token refresh succeeded")
+            return True
+
+        self.failure_count += 1
+        logger.warning("Proactive token refresh failed, will retry")
+        return False
+
+    def _run(self) -> None:
+        while True:
+            observed_expiry = self.client.token_expires_at
+            delay = self.next_refresh_delay()
+            if self._stop_event.wait(self.idle_interval if delay is None else delay):
+                return
+
+            if delay is None or self.client.token_expires_at != observed_expiry:
+                # No token yet, or a foreground request refreshed it meanwhile
+                continue
+
+            try:
+                refreshed = self.refresh_now()
+            except Exception as e:
+                logger.error(f"Unexpected error during proactive token refresh: {e}")
+                refreshed = False
+
+            if not refreshed and self._stop_event.wait(self.retry_interval):
+                return
+
+    def start(self) -> None:
+        """Start the background refresh thread (no-op if already running)."""
+        if self.running:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="fogis-token-refresh", daemon=True)
+        self._thread.start()
+        logger.info("Started proactive OAuth token refresh")
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        """
+        Stop the background refresh thread.
+
+        Args:
+            timeout: Seconds to wait for the thread to exit
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        logger.info("Stopped proactive OAuth token refresh")
@@ -1,4 +1,5 @@
-from typing import Any, Dict, List, Optional
+from enum import Enum
+from typing import Any, Dict, List, Optional, Tuple, Type
 
 from .enums import AgeCategory, FootballType, Gender, MatchStatus
 from .fogis_api_client import FogisApiClient
@@ -109,33 +110,57 @@ class MatchListFilter:
         if self._datum_till:
             payload_filter["datumTill"] = self._datum_till
 
-        # --- Conditionally add status, alderskategori, kon filters (same logic as before) ---
-        if self._status_include or self._status_exclude:
-            status_values: List[str] = []
-            if self._status_include:
-                status_values = [status.value for status in self._status_include]
-            elif self._status_exclude:
-                status_values = [status.value for status in self._status_exclude]
-            payload_filter["status"] = status_values
-
-        if self._alderskategori_include or self._alderskategori_exclude:
-            age_category_values: List[int] = []
-            if self._alderskategori_include:
-                age_category_values = [cat.value for cat in self._alderskategori_include]
-            elif self._alderskategori_exclude:
-                age_category_values = [cat.value for cat in self._alderskategori_exclude]
-            payload_filter["alderskategori"] = age_category_values
-
-        if self._kon_include or self._kon_exclude:
-            gender_values: List[int] = []
-            if self._kon_include:
-                gender_values = [gender.value for gender in self._kon_include]
-            elif self._kon_exclude:
-                gender_values = [gender.value for gender in self._kon_exclude]
-            payload_filter["kon"] = gender_values
+        # --- Statuses: only inclusions can be expressed server-side; exclusions are applied locally ---
+        if self._status_include:
+            payload_filter["status"] = [status.value for status in self._status_include]
+
+        # --- Categories: exclusions are sent as every other value of the category ---
+        age_categories = self._server_values(AgeCategory, self._alderskategori_include, self._alderskategori_exclude)
+        if age_categories is not None:
+            payload_filter["alderskategori"] = age_categories
+
+        genders = self._server_values(Gender, self._kon_include, self._kon_exclude)
+        if genders is not None:
+            payload_filter["kon"] = genders
 
         return payload_filter
 
+    @staticmethod
+    def _server_values(
+        enum_type: Type[Enum], include: Optional[List[Enum]], exclude: Optional[List[Enum]]
+    ) -> Optional[List[Any]]:
+        """Values to send for an include/exclude pair of category filters, or None if neither is set."""
+        if not include and not exclude:
+            return None
+        values = include if include else list(enum_type)
+        return [member.value for member in values if member not in (exclude or [])]
+
+    def filters_by_location(self) -> Tuple[List[str], List[str]]:
+        """
+        Tells which configured filters :meth:`build_payload` sends to FOGIS and which are only applied locally.
+
+        Filters sent to FOGIS are applied locally as well, as a safety net.
+
+        Returns:
+            Tuple[List[str], List[str]]: Builder method names of the server-side and the local-only filters
+        """
+        configured = {
+            "start_date": self._datum_fran,
+            "end_date": self._datum_till,
+            "include_statuses": self._status_include,
+            "exclude_statuses": self._status_exclude,
+            "include_age_categories": self._alderskategori_include,
+            "exclude_age_categories": self._alderskategori_exclude,
+            "include_genders": self._kon_include,
+            "exclude_genders": self._kon_exclude,
+            "include_football_types": self._fotbollstypid_include,
+            "exclude_football_types": self._fotbollstypid_exclude,
+        }
+        local_only = {"exclude_statuses", "include_football_types", "exclude_football_types"}
+        server = [name for name, value in configured.items() if value and name not in local_only]
+        local = [name for name, value in configured.items() if value and name in local_only]
+        return server, local
+
     def filter_matches(self, matches: List[Any]) -> List[Any]:
         """Applies the configured client-side filters to the list of matches."""
         filtered_matches = list(matches)  # Create a copy to avoid modifying original list
@@ -151,6 +176,8 @@ class MatchListFilter:
                         match.get("avbruten") and "avbruten" in status_filter_values,
                         match.get("uppskjuten") and "uppskjuten" in status_filter_values,
                         match.get("arslutresultat") and "genomford" in status_filter_values,
+                        "ej_startad" in status_filter_values
+                        and not any(match.get(flag) for flag in ("installd", "avbruten", "uppskjuten", "arslutresultat")),
                         # ... (add conditions for other statuses) ...
                     ]
                 )
@@ -209,6 +236,19 @@ class MatchListFilter:
 
         return filtered_matches
 
+    @staticmethod
+    def _matches_from_response(response: Any) -> List[Dict[str, Any]]:
+        """Extracts the match list from the different response formats of the match list endpoint."""
+        if isinstance(response, list):
+            return response
+        if isinstance(response, dict):
+            if "matchlista" in response:
+                return response["matchlista"]
+            # If response is a dict but doesn't have matchlista, treat as single match
+            return [response] if response else []
+        # None or an unexpected response format
+        return []
+
     def fetch_filtered_matches(self, api_client: FogisApiClient) -> List[Dict[str, Any]]:
         """
         Fetches matches from the API using FogisApiClient and applies the configured filters.
@@ -222,34 +262,39 @@ class MatchListFilter:
         Returns:
             A list of match dictionaries, filtered according to the configured criteria.
 
+        Raises:
+            FogisAPIRequestError: If the API request fails and fallback is not possible.
+            FogisDataError: If the response data is invalid.
+        """
+        matches, _ = self.fetch_filtered_matches_with_report(api_client)
+        return matches
+
+    def fetch_filtered_matches_with_report(
+        self, api_client: FogisApiClient
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, List[str]]]:
+        """
+        Fetches and filters matches like :meth:`fetch_filtered_matches`, and reports where each filter ran.
+
+        Args:
+            api_client: An instance of FogisApiClient to use for fetching matches.
+
+        Returns:
+            The filtered matches, and a dict with the builder method names of the filters that
+            ran on FOGIS (``server``) and of those that only ran locally (``local``). When the
+            server-side request fails and the fallback is used, every filter ran locally.
+
         Raises:
             FogisAPIRequestError: If the API request fails and fallback is not possible.
             FogisDataError: If the response data is invalid.
         """
         payload_filter = self.build_payload()  # Build server-side payload
+        server, local = self.filters_by_location()
 
         try:
-            # Use the correct parameter name for PublicApiClient
-            response = api_client.fetch_matches_list_json(
-                filter_params=payload_filter
-            )  # Fetch using API client and server-side filters
-
-            # Extract matches from response - handle different response formats
-            all_matches = []
-            if response is None:
-                return []
-            elif isinstance(response, list):
-                all_matches = response
-            elif isinstance(response, dict):
-                if "matchlista" in response:
-                    all_matches = response["matchlista"]
-                else:
-                    # If response is a dict but doesn't have matchlista, treat as single match
-                    all_matches = [response] if response else []
-            else:
-                # Unexpected response format
-                return []
+            # Positional: PublicApiClient names the parameter filter_params, FogisApiClient filter
+            response = api_client.fetch_matches_list_json(payload_filter)  # Fetch using API client and server-side filters
 
+            all_matches = self._matches_from_response(response)
         except Exception as e:
             # Fallback to basic fetch if server-side filtering fails
             try:
@@ -263,7 +308,8 @@ class MatchListFilter:
             except Exception:
                 # If both server-side and fallback fail, re-raise the original exception
                 raise e
+            server, local = [], server + local
 
         # Apply client-side filtering to the results
         filtered_matches = self.filter_matches(all_matches)
-        return filtered_matches
+        return filtered_matches, {"server": server, "local": local}
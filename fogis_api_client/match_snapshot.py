@@ -0,0 +1,297 @@
+"""
+Shared match-list snapshots for multi-worker deployments.
+
+A single refresher process writes the decoded match list with
+:func:`write_match_snapshot`. Worker processes open the file read-only with
+:class:`MatchListSnapshot`, which memory-maps it so every worker shares one
+physical copy through the page cache instead of holding its own decoded list.
+
+File layout (all integers little-endian)::
+
+    header   magic "FOGISNAP", version, flags, record count,
+             index offset, creation timestamp
+    records  one compact JSON document per match, in match-list order
+    index    (matchid, offset, length) entries sorted by matchid
+
+Refreshes never modify a published file: a new snapshot is written to a
+temporary file in the same directory and atomically renamed over the old one.
+Readers pick the new file up with :meth:`MatchListSnapshot.reload_if_changed`.
+"""
+
+import json
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_MAGIC = b"FOGISNAP"
+SNAPSHOT_VERSION = 1
+
+_HEADER = struct.Struct("<8sHHIQd")
+_INDEX_ENTRY = struct.Struct("<qQI")
+
+
+class MatchSnapshotError(Exception):
+    """Exception raised when a match snapshot cannot be written or read."""
+
+    pass
+
+
+def _encode_match(match: Dict[str, Any]) -> bytes:
+    """Encode a single match as compact UTF-8 JSON."""
+    return json.dumps(match, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def write_match_snapshot(path: str, matches: List[Dict[str, Any]]) -> int:
+    """
+    Atomically write a match list snapshot to ``path``.
+
+    The snapshot is written to a temporary file next to ``path``, flushed to
+    disk and renamed over the target, so readers only ever see complete files.
+
+    Args:
+        path: Destination file path
+        matches: Match dictionaries, as returned by ``fetch_matches_list_json``
+
+    Returns:
+        int: Number of matches written
+
+    Raises:
+        MatchSnapshotError: If a match has no integer ``matchid`` or the file
+            cannot be written
+    """
+    index: List[Tuple[int, int, int]] = []
+    records: List[bytes] = []
+    offset = _HEADER.size
+
+    for match in matches:
+        match_id = match.get("matchid") if isinstance(match, dict) else None
+        if isinstance(match_id, bool) or not isinstance(match_id, int):
+            raise MatchSnapshotError(f"Cannot snapshot match without an integer matchid: {match_id!r}")
+        record = _encode_match(match)
+        index.append((match_id, offset, len(record)))
+        records.append(record)
+        offset += len(record)
+
+    index.sort(key=lambda entry: entry[0])
+    header = _HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, 0, len(index), offset, time.time())
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".snapshot-", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(header)
+            for record in records:
+                f.write(record)
+            for entry in index:
+                f.write(_INDEX_ENTRY.pack(*entry))
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise MatchSnapshotError(f"Failed to write match snapshot {path}: {e}") from e
+
+    logger.info(f"Wrote match snapshot with {len(index)} matches to {path}")
+    return len(index)
+
+
+def refresh_match_snapshot(api_client: Any, path: str, filter_params: Optional[Dict[str, Any]] = None) -> int:
+    """
+    Fetch the current match list and publish it as a snapshot.
+
+    This is the job of the single refresher process; workers only read.
+
+    Args:
+        api_client: A logged-in (or lazily logging-in) FogisApiClient
+        path: Destination snapshot path
+        filter_params: Optional filter parameters for ``fetch_matches_list_json``
+
+    Returns:
+        int: Number of matches written
+    """
+    matches = api_client.fetch_matches_list_json(filter_params=filter_params)
+    return write_match_snapshot(path, matches)
+
+
+class _MappedSnapshot:
+    """A single opened and validated snapshot file."""
+
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            if stat.st_size < _HEADER.size:
+                raise MatchSnapshotError(f"Match snapshot {path} is truncated")
+            self.buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, _flags, count, index_offset, created_at = _HEADER.unpack_from(self.buffer, 0)
+        if magic != SNAPSHOT_MAGIC:
+            raise MatchSnapshotError(f"{path} is not a match snapshot")
+        if version != SNAPSHOT_VERSION:
+            raise MatchSnapshotError(f"Unsupported match snapshot version {version} in {path}")
+        if index_offset + count * _INDEX_ENTRY.size != len(self.buffer):
+            raise MatchSnapshotError(f"Match snapshot {path} is corrupt")
+
+        self.count = count
+        self.index_offset = index_offset
+        self.created_at = created_at
+        self.identity = (stat.st_dev, stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def entry(self, position: int) -> Tuple[int, int, int]:
+        return _INDEX_ENTRY.unpack_from(self.buffer, self.index_offset + position * _INDEX_ENTRY.size)
+
+    def find(self, match_id: int) -> Optional[Tuple[int, int]]:
+        """Binary search the on-disk index without decoding any records."""
+        low, high = 0, self.count - 1
+        while low <= high:
+            mid = (low + high) // 2
+            entry_id, offset, length = self.entry(mid)
+            if entry_id == match_id:
+                return offset, length
+            if entry_id < match_id:
+                low = mid + 1
+            else:
+                high = mid - 1
+        return None
+
+
+class MatchListSnapshot:
+    """
+    Read-only, memory-mapped view of a match list snapshot.
+
+    Records are decoded lazily, one match at a time, so a worker that looks up
+    a handful of matches never materialises the whole list.
+
+    Examples:
+        >>> snapshot = MatchListSnapshot("/var/lib/fogis/matches.snap")
+        >>> match = snapshot.get(123456)
+        >>> # Later, after the refresher has published a new file
+        >>> snapshot.reload_if_changed()
+        True
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Open a snapshot file.
+
+        Args:
+            path: Path to a file written by :func:`write_match_snapshot`
+
+        Raises:
+            MatchSnapshotError: If the file is missing, truncated or not a snapshot
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._snapshot = self._open()
+
+    def _open(self) -> _MappedSnapshot:
+        try:
+            return _MappedSnapshot(self.path)
+        except OSError as e:
+            raise MatchSnapshotError(f"Failed to open match snapshot {self.path}: {e}") from e
+
+    def reload_if_changed(self) -> bool:
+        """
+        Switch to a newer snapshot if the file on disk has been replaced.
+
+        The previous mapping is not closed explicitly; it is released once no
+        reader holds a reference to it, so concurrent lookups stay valid.
+
+        Returns:
+            bool: True if a new snapshot was loaded, False otherwise
+        """
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return False
+
+        identity = (stat.st_dev, stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            if identity == self._snapshot.identity:
+                return False
+            self._snapshot = self._open()
+        logger.debug(f"Reloaded match snapshot {self.path} ({self._snapshot.count} matches)")
+        return True
+
+    @property
+    def created_at(self) -> float:
+        """Unix timestamp at which the current snapshot was written."""
+        return self._snapshot.created_at
+
+    def __len__(self) -> int:
+        return self._snapshot.count
+
+    def __contains__(self, match_id: object) -> bool:
+        if not isinstance(match_id, int):
+            return False
+        return self._snapshot.find(match_id) is not None
+
+    def get_raw(self, match_id: int) -> Optional[bytes]:
+        """
+        Get the encoded JSON bytes for a match without decoding them.
+
+        Args:
+            match_id: The ID of the match
+
+        Returns:
+            Optional[bytes]: The UTF-8 JSON document, or None if not present
+        """
+        snapshot = self._snapshot
+        location = snapshot.find(int(match_id))
+        if location is None:
+            return None
+        offset, length = location
+        return snapshot.buffer[offset : offset + length]
+
+    def get(self, match_id: int, default: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get a single decoded match by ID.
+
+        Args:
+            match_id: The ID of the match
+            default: Value returned if the match is not in the snapshot
+
+        Returns:
+            Optional[Dict[str, Any]]: The match dictionary or ``default``
+        """
+        raw = self.get_raw(match_id)
+        if raw is None:
+            return default
+        return json.loads(raw)
+
+    def match_ids(self) -> List[int]:
+        """Return all match IDs in the snapshot, in ascending order."""
+        snapshot = self._snapshot
+        return [snapshot.entry(i)[0] for i in range(snapshot.count)]
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """Iterate over decoded matches in their original match-list order."""
+        snapshot = self._snapshot
+        locations = sorted(snapshot.entry(i)[1:] for i in range(snapshot.count))
+        for offset, length in locations:
+            yield json.loads(snapshot.buffer[offset : offset + length])
+
+    def matches(self) -> List[Dict[str, Any]]:
+        """Decode and return the full match list."""
+        return list(self)
+
+    def close(self) -> None:
+        """Release the current mapping."""
+        with self._lock:
+            self._snapshot.buffer.close()
+
+    def __enter__(self) -> "MatchListSnapshot":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -7,7 +7,9 @@ OAuth 2.0 PKCE authentication and ASP.NET form authentication fallback.
 
 import json
 import logging
-from typing import Any, Dict, List, Optional, Union
+import threading
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Union
 
 import requests
 
@@ -16,6 +18,9 @@ from fogis_api_client.internal.auth import (
     FogisOAuthAuthenticationError,
     authenticate,
 )
+from fogis_api_client.internal.session_keeper import SessionKeeper
+from fogis_api_client.internal.token_refresh import TokenRefreshScheduler
+from fogis_api_client.session_store import SessionStore, export_cookies, import_cookies
 
 
 # Custom exceptions
@@ -43,6 +48,61 @@ class FogisDataError(Exception):
         super().__init__(self.message)
 
 
+def _as_int(value: Any) -> Any:
+    return int(value) if isinstance(value, (str, int)) else value
+
+
+class WebMethodCall(NamedTuple):
+    """A ``MatchWebMetoder.aspx`` read: the method, its JSON payload and how its response is decoded."""
+
+    method: str
+    payload: Dict[str, Any]
+    decode: Callable[[Any], Any]
+    # What is fetched, for error messages
+    what: str
+
+
+def _unwrap(response_json: Any) -> Any:
+    """Get the data of a MatchWebMetoder response: its ``d`` value, decoded when FOGIS sent it as a JSON string."""
+    if "d" in response_json:
+        data = response_json["d"]
+        return json.loads(data) if isinstance(data, str) else data
+    # Fallback: direct response
+    return response_json
+
+
+def _decode_matches(response_json: Any) -> List[Dict[str, Any]]:
+    data = _unwrap(response_json)
+    if isinstance(data, dict) and "matchlista" in data:
+        return data["matchlista"]
+    return data if isinstance(data, list) else []
+
+
+def _decode_events(response_json: Any) -> List[Dict[str, Any]]:
+    data = _unwrap(response_json)
+    if isinstance(data, dict) and "events" in data:
+        return data["events"]
+    return data if isinstance(data, list) else []
+
+
+def _decode_team_officials(response_json: Any) -> List[Dict[str, Any]]:
+    data = _unwrap(response_json)
+    return data if isinstance(data, list) else []
+
+
+def _decode_team_players(response_json: Any) -> Dict[str, Any]:
+    data = _unwrap(response_json)
+    return data if isinstance(data, dict) else {"spelare": []}
+
+
+def _decode_match_result(response_json: Any) -> Dict[str, Any]:
+    data = _unwrap(response_json)
+    if isinstance(data, list):
+        # Return first result if multiple results
+        return data[0] if data else {}
+    return data if isinstance(data, dict) else {}
+
+
 class PublicApiClient:
     """
     Enhanced FOGIS API client with OAuth 2.0 PKCE support.
@@ -53,6 +113,8 @@ class PublicApiClient:
     """
 
     BASE_URL = "https://fogis.svenskfotboll.se/mdk"
+    # Seconds a request waits for another thread's re-authentication to finish
+    REAUTH_TIMEOUT = 60.0
 
     def __init__(
         self,
@@ -60,6 +122,7 @@ class PublicApiClient:
         password: Optional[str] = None,
         cookies: Optional[Dict[str, str]] = None,
         oauth_tokens: Optional[Dict[str, Any]] = None,
+        session_store: Optional[SessionStore] = None,
     ):
         """
         Initialize the FOGIS API client.
@@ -69,21 +132,36 @@ class PublicApiClient:
             password: FOGIS password
             cookies: Optional pre-existing session cookies (ASP.NET)
             oauth_tokens: Optional pre-existing OAuth tokens
+            session_store: Optional store used to persist the authenticated session
+                after login and to restore it when the client is created again
         """
         self.username = username
         self.password = password
         self.session = requests.Session()
         self.logger = logging.getLogger("fogis_api_client.api")
         self.base_url = self.BASE_URL
+        self.session_store = session_store
 
         # Authentication state
         self.cookies: Optional[Dict[str, str]] = None
         self.oauth_tokens: Optional[Dict[str, Any]] = None
         self.authentication_method: Optional[str] = None  # 'oauth' or 'aspnet'
+        self.session_restored = False
+        self.token_expires_at: Optional[float] = None
+        # How the last login completed: "silent" (OAuth SSO cookies) or "full" (credentials posted)
+        self.last_authentication_path: Optional[str] = None
+
+        # Serialises changes to the authentication state across threads. The
+        # generation is bumped whenever a new session or token set is installed.
+        self._auth_lock = threading.RLock()
+        self._auth_generation = 0
+        self._token_refresh: Optional[TokenRefreshScheduler] = None
+        self._session_keeper: Optional[SessionKeeper] = None
 
         # Initialize with provided authentication
         if oauth_tokens:
             self.oauth_tokens = oauth_tokens
+            self._record_token_expiry()
             self.authentication_method = "oauth"
             # Set OAuth authorization header
             if "access_token" in oauth_tokens:
@@ -102,13 +180,98 @@ class PublicApiClient:
         elif not (username and password):
             raise ValueError("Either username and password OR cookies/oauth_tokens must be provided")
 
+        # Reuse a session persisted by a previous process, if there is one
+        if self.session_store is not None and self.authentication_method is None:
+            self._restore_session()
+
+    def _restore_session(self) -> bool:
+        """
+        Restore a previously persisted session from the session store.
+
+        The restored session is trusted until the server rejects it, at which
+        point the client falls back to the full login flow.
+
+        Returns:
+            True if a saved session was restored, False otherwise
+        """
+        try:
+            state = self.session_store.load(self.username)
+        except Exception as e:
+            self.logger.warning(f"Could not load saved session: {e}")
+            return False
+
+        if not state or not state.get("authentication_method"):
+            return False
+
+        import_cookies(self.session.cookies, state.get("cookies", []))
+        self.authentication_method = state["authentication_method"]
+        self.cookies = state.get("session_cookies")
+        self.oauth_tokens = state.get("oauth_tokens")
+        self.token_expires_at = state.get("token_expires_at")
+        if self.oauth_tokens and "access_token" in self.oauth_tokens:
+            self.session.headers["Authorization"] = f"Bearer {self.oauth_tokens['access_token']}"
+
+        self.session_restored = True
+        self.logger.info(f"Restored saved {self.authentication_method} session, skipping login")
+        return True
+
+    def _persist_session(self) -> None:
+        """Save the current authentication state to the session store, if configured."""
+        if self.session_store is None or not self.username:
+            return
+
+        state = {
+            "authentication_method": self.authentication_method,
+            "session_cookies": self.cookies,
+            "oauth_tokens": self.oauth_tokens,
+            "token_expires_at": self.token_expires_at,
+            "cookies": export_cookies(self.session.cookies),
+            "saved_at": time.time(),
+        }
+        try:
+            self.session_store.save(self.username, state)
+            self.logger.debug("Saved authenticated session to session store")
+        except Exception as e:
+            self.logger.warning(f"Could not save session: {e}")
+
+    def save_session(self) -> None:
+        """
+        Save the current session to the session store, if one is configured.
+
+        Login and token refresh save it already; this also keeps cookies the
+        server renewed since, e.g. before the process exits.
+        """
+        if self.is_authenticated():
+            self._persist_session()
+
+    def _discard_saved_session(self) -> None:
+        """Remove a saved session that the server no longer accepts."""
+        self.session_restored = False
+        if self.session_store is None or not self.username:
+            return
+        try:
+            self.session_store.clear(self.username)
+        except Exception as e:
+            self.logger.warning(f"Could not clear saved session: {e}")
+
+    def _record_token_expiry(self, expires_at: Optional[float] = None) -> None:
+        """
+        Record the absolute time at which the current OAuth access token expires.
+
+        Without an explicit ``expires_at`` the token is assumed to have just been issued.
+        """
+        expires_in = (self.oauth_tokens or {}).get("expires_in")
+        if expires_at is None and expires_in:
+            expires_at = time.time() + expires_in
+        self.token_expires_at = expires_at
+
     def _check_existing_authentication(self) -> Optional[Union[Dict[str, str], Dict[str, Any]]]:
         """Check if already authenticated and return existing credentials."""
         if self.oauth_tokens and self.authentication_method == "oauth":
             self.logger.debug("Already authenticated with OAuth, using existing tokens")
             return self.oauth_tokens
-        elif self.cookies and self.authentication_method == "aspnet":
-            self.logger.debug("Already authenticated with ASP.NET, using existing cookies")
+        elif self.cookies and self.authentication_method in ("aspnet", "oauth_hybrid"):
+            self.logger.debug("Already authenticated with session cookies, using existing cookies")
             return self.cookies
         return None
 
@@ -130,6 +293,7 @@ class PublicApiClient:
         else:
             # Pure OAuth authentication with tokens
             self.oauth_tokens = auth_result
+            self._record_token_expiry()
             self.authentication_method = "oauth"
             self.logger.info("OAuth authentication successful")
             return self.oauth_tokens
@@ -145,6 +309,12 @@ class PublicApiClient:
             FogisLoginError: If login fails
             FogisAPIRequestError: If there is an error during the login request
         """
+        # Only one thread logs in at a time; the others find the new session when they get the lock
+        with self._auth_lock:
+            return self._login_locked()
+
+    def _login_locked(self) -> Union[Dict[str, str], Dict[str, Any]]:
+        """Log in; the caller must hold ``_auth_lock``."""
         # Check if already authenticated
         existing_auth = self._check_existing_authentication()
         if existing_auth is not None:
@@ -161,19 +331,24 @@ class PublicApiClient:
             auth_result = authenticate(self.session, self.username, self.password, self.BASE_URL)
 
             # Process authentication result
+            self.last_authentication_path = auth_result.get("authentication_path", "full")
             if "oauth_authenticated" in auth_result:
-                return self._handle_oauth_authentication_result(auth_result)
+                credentials = self._handle_oauth_authentication_result(auth_result)
             elif "aspnet_authenticated" in auth_result:
                 # Traditional ASP.NET authentication
                 self.cookies = {k: v for k, v in auth_result.items() if not k.startswith("aspnet")}
                 self.authentication_method = "aspnet"
                 self.logger.info("ASP.NET authentication successful")
-                return self.cookies
+                credentials = self.cookies
             else:
                 # Unknown authentication result
                 self.logger.error("Unknown authentication result format")
                 raise FogisLoginError("Authentication completed but result format is unknown")
 
+            self._auth_generation += 1
+            self._persist_session()
+            return credentials
+
         except FogisOAuthAuthenticationError as e:
             error_msg = f"OAuth authentication failed: {e}"
             self.logger.error(error_msg)
@@ -193,9 +368,17 @@ class PublicApiClient:
         """
         Refresh authentication tokens/session.
 
+        The refresh runs under the client's authentication lock, so concurrent
+        callers never observe a half-updated token set.
+
         Returns:
             True if refresh was successful, False otherwise
         """
+        with self._auth_lock:
+            return self._refresh_authentication_locked()
+
+    def _refresh_authentication_locked(self) -> bool:
+        """Refresh authentication; the caller must hold ``_auth_lock``."""
         if self.authentication_method == "oauth" and self.oauth_tokens:
             # Try to refresh OAuth tokens
             try:
@@ -209,36 +392,194 @@ class PublicApiClient:
 
                 # Attempt refresh
                 if oauth_manager.refresh_access_token():
-                    # Update stored tokens
-                    self.oauth_tokens.update(
-                        {
-                            "access_token": oauth_manager.access_token,
-                            "refresh_token": oauth_manager.refresh_token,
-                            "expires_in": oauth_manager.token_expires_in,
-                        }
-                    )
+                    # Swap in the new token set in one assignment
+                    self.oauth_tokens = {
+                        **self.oauth_tokens,
+                        "access_token": oauth_manager.access_token,
+                        "refresh_token": oauth_manager.refresh_token,
+                        "expires_in": oauth_manager.token_expires_in,
+                    }
+                    self._record_token_expiry(oauth_manager.token_expires_at)
+                    self._auth_generation += 1
                     self.logger.info("OAuth tokens refreshed successfully")
+                    self._persist_session()
                     return True
                 else:
                     self.logger.error("OAuth token refresh failed")
-                    return False
 
             except Exception as e:
                 self.logger.error(f"Error refreshing OAuth tokens: {e}")
-                return False
 
-        elif self.authentication_method == "aspnet":
-            # For ASP.NET, we need to re-authenticate
-            try:
-                self.cookies = None
-                self.login()
-                return True
-            except Exception as e:
-                self.logger.error(f"Error re-authenticating ASP.NET session: {e}")
-                return False
+        if self.authentication_method in ("oauth", "aspnet", "oauth_hybrid"):
+            # Session cookies cannot be refreshed, and a rejected refresh token
+            # leaves nothing to refresh with, so fall back to a full login
+            return self._relogin()
 
         return False
 
+    def _reauthenticate(self, observed_generation: int) -> bool:
+        """
+        Re-authenticate after a request signed with ``observed_generation`` was rejected.
+
+        Only one thread re-authenticates at a time. Threads that were rejected
+        with the same session wait for it (up to ``REAUTH_TIMEOUT`` seconds)
+        and then reuse the new session instead of logging in again.
+
+        Args:
+            observed_generation: The authentication generation the rejected request was sent with
+
+        Returns:
+            True if a usable session is available, False otherwise
+
+        Raises:
+            FogisAPIRequestError: If waiting for another thread's re-authentication timed out
+        """
+        if not self._auth_lock.acquire(timeout=self.REAUTH_TIMEOUT):
+            raise FogisAPIRequestError("Timed out waiting for re-authentication")
+        try:
+            if self._auth_generation != observed_generation:
+                self.logger.debug("Session was already replaced by another request, replaying")
+                return self.is_authenticated()
+            return self._refresh_authentication_locked()
+        finally:
+            self._auth_lock.release()
+
+    def _relogin(self) -> bool:
+        """
+        Discard the rejected session and run the full login flow again.
+
+        Returns:
+            True if the new login succeeded, False otherwise
+        """
+        if not (self.username and self.password):
+            self.logger.error("Session was rejected and no credentials are available to log in again")
+            self._discard_saved_session()
+            return False
+
+        self.cookies = None
+        self.oauth_tokens = None
+        self.token_expires_at = None
+        self.authentication_method = None
+        self.session.headers.pop("Authorization", None)
+        self._discard_saved_session()
+
+        try:
+            self.login()
+            return True
+        except Exception as e:
+            self.logger.error(f"Error re-authenticating: {e}")
+            return False
+
+    def start_token_refresh(self, refresh_fraction: float = 0.75, jitter: float = 0.1) -> TokenRefreshScheduler:
+        """
+        Start refreshing OAuth access tokens in the background before they expire.
+
+        Args:
+            refresh_fraction: Fraction of the token lifetime after which to refresh
+            jitter: Relative random spread applied to the refresh point (0.1 = ±10%)
+
+        Returns:
+            TokenRefreshScheduler: The running scheduler
+
+        Examples:
+            >>> client = PublicApiClient(username="your_username", password="your_password")
+            >>> client.login()
+            >>> client.start_token_refresh(refresh_fraction=0.8)
+        """
+        self.stop_token_refresh()
+        self._token_refresh = TokenRefreshScheduler(self, refresh_fraction=refresh_fraction, jitter=jitter)
+        self._token_refresh.start()
+        return self._token_refresh
+
+    def stop_token_refresh(self) -> None:
+        """Stop the background token refresh, if it is running."""
+        if self._token_refresh is not None:
+            self._token_refresh.stop()
+            self._token_refresh = None
+
+    def validate_cookies(self) -> bool:
+        """
+        Check whether the current session is still accepted by FOGIS.
+
+        This is a cheap probe: it requests the dashboard page without reading
+        the body and only checks whether FOGIS redirected to the login page.
+
+        Returns:
+            True if the session is still valid, False otherwise (including when
+            FOGIS could not be reached, see check_session)
+        """
+        return self.check_session() is True
+
+    def check_session(self) -> Optional[bool]:
+        """
+        Probe the current session, telling a rejected session from an unreachable FOGIS.
+
+        Requests the dashboard page without reading the body, like validate_cookies.
+
+        Returns:
+            True if FOGIS accepted the session, False if there is no session or
+            FOGIS rejected it (401 or a redirect to the login page), None if the
+            probe failed for another reason, such as a network error or a 5xx
+        """
+        if not self.is_authenticated():
+            return False
+
+        try:
+            response = self.session.get(f"{self.BASE_URL}/", stream=True, timeout=30)
+            try:
+                if self._is_session_rejected(response):
+                    return False
+                if response.status_code == 200:
+                    return True
+                self.logger.info(f"Session validation inconclusive: status {response.status_code}")
+                return None
+            finally:
+                response.close()
+        except requests.exceptions.RequestException as e:
+            self.logger.info(f"Session validation failed: {e}")
+            return None
+
+    def start_session_keeper(self, check_interval: float = 300, status_file: Optional[str] = None) -> SessionKeeper:
+        """
+        Keep the session alive in the background, logging in again when it expires.
+
+        Args:
+            check_interval: Seconds between session checks
+            status_file: Optional path to write the keeper status to as JSON
+
+        Returns:
+            SessionKeeper: The running keeper
+
+        Examples:
+            >>> client = PublicApiClient(username="your_username", password="your_password")
+            >>> client.login()
+            >>> client.start_session_keeper(check_interval=300)
+            >>> client.get_session_keeper_status()["successful_checks"]
+            0
+        """
+        self.stop_session_keeper()
+        self._session_keeper = SessionKeeper(self, check_interval=check_interval, status_file=status_file)
+        self._session_keeper.start()
+        return self._session_keeper
+
+    def stop_session_keeper(self) -> None:
+        """Stop the background session keeper, if it is running."""
+        if self._session_keeper is not None:
+            self._session_keeper.stop()
+
+    def get_session_keeper_status(self) -> Dict[str, Any]:
+        """
+        Get the session keeper statistics.
+
+        Returns:
+            Dictionary with running, successful_checks, failed_checks, relogins,
+            runtime, last_activity, check_interval and has_cookies, or just
+            ``{"running": False}`` if the keeper was never started
+        """
+        if self._session_keeper is None:
+            return {"running": False}
+        return self._session_keeper.status()
+
     def is_authenticated(self) -> bool:
         """
         Check if the client is currently authenticated.
@@ -265,6 +606,7 @@ class PublicApiClient:
             "has_oauth_tokens": self.oauth_tokens is not None,
             "has_aspnet_cookies": self.cookies is not None,
             "oauth_token_info": (self.oauth_tokens.get("expires_in") if self.oauth_tokens else None),
+            "last_authentication_path": self.last_authentication_path,
         }
 
     def _ensure_authenticated(self) -> None:
@@ -278,6 +620,65 @@ class PublicApiClient:
             self.logger.info("Not authenticated, performing automatic login...")
             self.login()
 
+    @staticmethod
+    def is_session_rejected(status_code: int, url: str) -> bool:
+        """
+        Check whether FOGIS rejected the session used for a request.
+
+        An expired session shows up either as a 401 or as a redirect to the
+        ASP.NET login page / OAuth authorization server.
+
+        Args:
+            status_code: The response's status code
+            url: The URL the response came from, or redirects to
+
+        Returns:
+            True if the session was rejected
+        """
+        return status_code == 401 or "Login.aspx" in url or "auth.fogis.se" in url
+
+    @staticmethod
+    def _is_session_rejected(response: requests.Response) -> bool:
+        """Check whether FOGIS rejected the session used for a request, see is_session_rejected."""
+        url = getattr(response, "url", None)
+        return PublicApiClient.is_session_rejected(response.status_code, url if isinstance(url, str) else "")
+
+    @property
+    def auth_generation(self) -> int:
+        """Counter bumped whenever a new session or token set is installed."""
+        return self._auth_generation
+
+    def reauthenticate(self, observed_generation: int) -> bool:
+        """
+        Re-authenticate after a request sent with another HTTP client was rejected.
+
+        For requests made with this client's session cookies outside its own
+        session, such as by the gateway's asyncio transport. Concurrent callers
+        rejected with the same session share one re-authentication.
+
+        Args:
+            observed_generation: auth_generation when the rejected request was sent
+
+        Returns:
+            True if a usable session is available, False otherwise
+        """
+        return self._reauthenticate(observed_generation)
+
+    def api_headers(self) -> Dict[str, str]:
+        """
+        Get the headers FOGIS expects on ``MatchWebMetoder.aspx`` calls.
+
+        Returns:
+            Dict[str, str]: Headers as sent by FOGIS's own web client
+        """
+        return {
+            "Content-Type": "application/json; charset=UTF-8",
+            "Accept": "application/json, text/javascript, */*; q=0.01",
+            "Origin": "https://fogis.svenskfotboll.se",
+            "Referer": f"{self.BASE_URL}/",
+            "X-Requested-With": "XMLHttpRequest",
+        }
+
     def _make_authenticated_request(self, method: str, url: str, **kwargs) -> requests.Response:
         """
         Make an authenticated request to the FOGIS API with proper headers and error handling.
@@ -297,13 +698,7 @@ class PublicApiClient:
         self._ensure_authenticated()
 
         # Prepare FOGIS-specific headers (same as original implementation)
-        api_headers = {
-            "Content-Type": "application/json; charset=UTF-8",
-            "Accept": "application/json, text/javascript, */*; q=0.01",
-            "Origin": "https://fogis.svenskfotboll.se",
-            "Referer": f"{self.BASE_URL}/",
-            "X-Requested-With": "XMLHttpRequest",
-        }
+        api_headers = self.api_headers()
 
         # Merge with any provided headers
         if "headers" in kwargs:
@@ -312,12 +707,13 @@ class PublicApiClient:
 
         # Make the request
         try:
+            generation = self._auth_generation
             response = self.session.request(method, url, **kwargs)
 
             # Check for authentication errors
-            if response.status_code == 401:
-                self.logger.warning("Received 401 Unauthorized, attempting to refresh authentication")
-                if self.refresh_authentication():
+            if self._is_session_rejected(response):
+                self.logger.warning("Session was rejected, attempting to refresh authentication")
+                if self._reauthenticate(generation):
                     # Retry the request
                     response = self.session.request(method, url, **kwargs)
                 else:
@@ -331,22 +727,59 @@ class PublicApiClient:
         except requests.exceptions.RequestException as e:
             raise FogisAPIRequestError(f"Request failed: {e}")
 
-    # Placeholder for additional API methods
-    def fetch_matches_list_json(self, filter_params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    def post_match_web_method(self, method: str, body: bytes) -> requests.Response:
         """
-        Fetch the list of matches for the logged-in referee.
+        POST a raw JSON body to a ``MatchWebMetoder.aspx`` method.
+
+        Used by the gateway's proxy for tools that speak the FOGIS protocol
+        directly; the response is returned with its ``d`` envelope undecoded.
 
         Args:
-            filter_params: Optional filter parameters
+            method: Method name, e.g. ``GetMatchhandelselista``
+            body: JSON request body
 
         Returns:
-            List of match dictionaries
+            Response object
+
+        Raises:
+            FogisAPIRequestError: If the request fails
         """
-        self.logger.info("Fetching matches list...")
+        url = f"{self.BASE_URL}/MatchWebMetoder.aspx/{method}"
+        return self._make_authenticated_request("POST", url, data=body)
+
+    def _call_web_method(self, call: WebMethodCall) -> Any:
+        """
+        Make a ``MatchWebMetoder.aspx`` read and decode its response.
+
+        Args:
+            call: The read
 
-        # Use the correct FOGIS API endpoint
-        matches_url = f"{self.BASE_URL}/MatchWebMetoder.aspx/GetMatcherAttRapportera"
+        Returns:
+            The decoded data
+
+        Raises:
+            FogisAPIRequestError: If the request fails or the response is not JSON
+        """
+        url = f"{self.BASE_URL}/MatchWebMetoder.aspx/{call.method}"
+        response = self._make_authenticated_request("POST", url, json=call.payload)
+
+        if response.status_code != 200:
+            raise FogisAPIRequestError(f"Failed to fetch {call.what}: {response.status_code}")
+        try:
+            return call.decode(response.json())
+        except json.JSONDecodeError as e:
+            raise FogisAPIRequestError(f"Failed to parse API response: {e}")
+
+    def matches_list_call(self, filter_params: Optional[Dict[str, Any]] = None) -> WebMethodCall:
+        """
+        Describe the read behind fetch_matches_list_json.
+
+        Args:
+            filter_params: Optional filter parameters
 
+        Returns:
+            WebMethodCall: The read
+        """
         # Build the default payload with the same structure as the working implementation
         from datetime import datetime, timedelta
 
@@ -370,48 +803,42 @@ class PublicApiClient:
             payload_filter.update(filter_params)
 
         # Wrap the filter in the expected payload structure
-        payload = {"filter": payload_filter}
+        return WebMethodCall("GetMatcherAttRapportera", {"filter": payload_filter}, _decode_matches, "matches")
 
-        response = self._make_authenticated_request("POST", matches_url, json=payload)
+    def match_events_call(self, match_id: Union[int, str]) -> WebMethodCall:
+        """Describe the read behind fetch_match_events_json."""
+        return WebMethodCall("GetMatchhandelselista", {"matchid": _as_int(match_id)}, _decode_events, "match events")
 
-        if response.status_code == 200:
-            try:
-                response_json = response.json()
+    def match_result_call(self, match_id: Union[int, str]) -> WebMethodCall:
+        """Describe the read behind fetch_match_result_json."""
+        return WebMethodCall("GetMatchresultatlista", {"matchid": _as_int(match_id)}, _decode_match_result, "match result")
 
-                # FOGIS API returns data in a 'd' key (same as original implementation)
-                if "d" in response_json:
-                    # The 'd' value is a JSON string that needs to be parsed again
-                    if isinstance(response_json["d"], str):
-                        parsed_data = json.loads(response_json["d"])
+    def team_players_call(self, team_id: Union[int, str]) -> WebMethodCall:
+        """Describe the read behind fetch_team_players_json."""
+        return WebMethodCall(
+            "GetMatchdeltagareListaForMatchlag", {"matchlagid": _as_int(team_id)}, _decode_team_players, "team players"
+        )
 
-                        # Extract matches from the response
-                        if isinstance(parsed_data, dict) and "matchlista" in parsed_data:
-                            return parsed_data["matchlista"]
-                        elif isinstance(parsed_data, list):
-                            return parsed_data
-                        else:
-                            return []
-                    else:
-                        # 'd' is already parsed
-                        if isinstance(response_json["d"], dict) and "matchlista" in response_json["d"]:
-                            return response_json["d"]["matchlista"]
-                        elif isinstance(response_json["d"], list):
-                            return response_json["d"]
-                        else:
-                            return []
-                else:
-                    # Fallback: direct response parsing
-                    if isinstance(response_json, dict) and "matchlista" in response_json:
-                        return response_json["matchlista"]
-                    elif isinstance(response_json, list):
-                        return response_json
-                    else:
-                        return []
+    def team_officials_call(self, matchlagid: Union[int, str]) -> WebMethodCall:
+        """Describe the read behind fetch_team_officials_json."""
+        return WebMethodCall(
+            "GetMatchlagledareListaForMatchlag", {"matchlagid": _as_int(matchlagid)}, _decode_team_officials, "team officials"
+        )
 
-            except json.JSONDecodeError as e:
-                raise FogisAPIRequestError(f"Failed to parse API response: {e}")
-        else:
-            raise FogisAPIRequestError(f"Failed to fetch matches: {response.status_code}")
+    # Placeholder for additional API methods
+    def fetch_matches_list_json(self, filter_params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Fetch the list of matches for the logged-in referee.
+
+        Args:
+            filter_params: Optional filter parameters
+
+        Returns:
+            List of match dictionaries
+        """
+        self.logger.info("Fetching matches list...")
+
+        return self._call_web_method(self.matches_list_call(filter_params))
 
     def hello_world(self) -> str:
         """
@@ -526,49 +953,7 @@ class PublicApiClient:
             self.logger.info("Not authenticated, performing automatic login...")
             self.login()
 
-        # Use correct FOGIS API endpoint for events
-        events_url = f"{self.BASE_URL}/MatchWebMetoder.aspx/GetMatchhandelselista"
-        match_id_int = int(match_id) if isinstance(match_id, (str, int)) else match_id
-        payload = {"matchid": match_id_int}
-
-        response = self._make_authenticated_request("POST", events_url, json=payload)
-
-        if response.status_code == 200:
-            try:
-                response_json = response.json()
-
-                # FOGIS API returns data in a 'd' key
-                if "d" in response_json:
-                    if isinstance(response_json["d"], str):
-                        import json
-
-                        parsed_data = json.loads(response_json["d"])
-                        if isinstance(parsed_data, list):
-                            return parsed_data
-                        elif isinstance(parsed_data, dict) and "events" in parsed_data:
-                            return parsed_data["events"]
-                        else:
-                            return []
-                    else:
-                        if isinstance(response_json["d"], list):
-                            return response_json["d"]
-                        elif isinstance(response_json["d"], dict) and "events" in response_json["d"]:
-                            return response_json["d"]["events"]
-                        else:
-                            return []
-                else:
-                    # Fallback: direct response parsing
-                    if isinstance(response_json, list):
-                        return response_json
-                    elif isinstance(response_json, dict) and "events" in response_json:
-                        return response_json["events"]
-                    else:
-                        return []
-
-            except json.JSONDecodeError as e:
-                raise FogisAPIRequestError(f"Failed to parse API response: {e}")
-        else:
-            raise FogisAPIRequestError(f"Failed to fetch match events: {response.status_code}")
+        return self._call_web_method(self.match_events_call(match_id))
 
     def get_match_officials(self, match_id: Union[int, str]) -> Dict[str, List[Dict[str, Any]]]:
         """
@@ -637,34 +1022,7 @@ class PublicApiClient:
             self.logger.info("Not authenticated, performing automatic login...")
             self.login()
 
-        # Use the working team officials endpoint
-        officials_url = f"{self.BASE_URL}/MatchWebMetoder.aspx/GetMatchlagledareListaForMatchlag"
-        matchlagid_int = int(matchlagid) if isinstance(matchlagid, (str, int)) else matchlagid
-        payload = {"matchlagid": matchlagid_int}
-
-        response = self._make_authenticated_request("POST", officials_url, json=payload)
-
-        if response.status_code == 200:
-            try:
-                response_json = response.json()
-
-                # FOGIS API returns data in a 'd' key
-                if "d" in response_json:
-                    if isinstance(response_json["d"], str):
-                        import json
-
-                        parsed_data = json.loads(response_json["d"])
-                        return parsed_data if isinstance(parsed_data, list) else []
-                    else:
-                        return response_json["d"] if isinstance(response_json["d"], list) else []
-                else:
-                    # Fallback: direct response parsing
-                    return response_json if isinstance(response_json, list) else []
-
-            except json.JSONDecodeError as e:
-                raise FogisAPIRequestError(f"Failed to parse API response: {e}")
-        else:
-            raise FogisAPIRequestError(f"Failed to fetch team officials: {response.status_code}")
+        return self._call_web_method(self.team_officials_call(matchlagid))
 
     def fetch_team_players_json(self, team_id: Union[int, str]) -> Dict[str, Any]:
         """
@@ -686,34 +1044,7 @@ class PublicApiClient:
             self.logger.info("Not authenticated, performing automatic login...")
             self.login()
 
-        # Use the working team players endpoint
-        players_url = f"{self.BASE_URL}/MatchWebMetoder.aspx/GetMatchdeltagareListaForMatchlag"
-        team_id_int = int(team_id) if isinstance(team_id, (str, int)) else team_id
-        payload = {"matchlagid": team_id_int}
-
-        response = self._make_authenticated_request("POST", players_url, json=payload)
-
-        if response.status_code == 200:
-            try:
-                response_json = response.json()
-
-                # FOGIS API returns data in a 'd' key
-                if "d" in response_json:
-                    if isinstance(response_json["d"], str):
-                        import json
-
-                        parsed_data = json.loads(response_json["d"])
-                        return parsed_data if isinstance(parsed_data, dict) else {"spelare": []}
-                    else:
-                        return response_json["d"] if isinstance(response_json["d"], dict) else {"spelare": []}
-                else:
-                    # Fallback: direct response parsing
-                    return response_json if isinstance(response_json, dict) else {"spelare": []}
-
-            except json.JSONDecodeError as e:
-                raise FogisAPIRequestError(f"Failed to parse API response: {e}")
-        else:
-            raise FogisAPIRequestError(f"Failed to fetch team players: {response.status_code}")
+        return self._call_web_method(self.team_players_call(team_id))
 
     def fetch_match_result_json(self, match_id: Union[int, str]) -> Dict[str, Any]:
         """
@@ -732,52 +1063,7 @@ class PublicApiClient:
             self.logger.info("Not authenticated, performing automatic login...")
             self.login()
 
-        # Use correct FOGIS API endpoint for result
-        result_url = f"{self.BASE_URL}/MatchWebMetoder.aspx/GetMatchresultatlista"
-        match_id_int = int(match_id) if isinstance(match_id, (str, int)) else match_id
-        payload = {"matchid": match_id_int}
-
-        response = self._make_authenticated_request("POST", result_url, json=payload)
-
-        if response.status_code == 200:
-            try:
-                response_json = response.json()
-
-                # FOGIS API returns data in a 'd' key
-                if "d" in response_json:
-                    if isinstance(response_json["d"], str):
-                        import json
-
-                        parsed_data = json.loads(response_json["d"])
-                        if isinstance(parsed_data, dict):
-                            return parsed_data
-                        elif isinstance(parsed_data, list) and len(parsed_data) > 0:
-                            # Return first result if multiple results
-                            return parsed_data[0]
-                        else:
-                            return {}
-                    else:
-                        if isinstance(response_json["d"], dict):
-                            return response_json["d"]
-                        elif isinstance(response_json["d"], list) and len(response_json["d"]) > 0:
-                            # Return first result if multiple results
-                            return response_json["d"][0]
-                        else:
-                            return {}
-                else:
-                    # Fallback: direct response parsing
-                    if isinstance(response_json, dict):
-                        return response_json
-                    elif isinstance(response_json, list) and len(response_json) > 0:
-                        # Return first result if multiple results
-                        return response_json[0]
-                    else:
-                        return {}
-
-            except json.JSONDecodeError as e:
-                raise FogisAPIRequestError(f"Failed to parse API response: {e}")
-        else:
-            raise FogisAPIRequestError(f"Failed to fetch match result: {response.status_code}")
+        return self._call_web_method(self.match_result_call(match_id))
 
     # New convenience methods for improved API experience
     def fetch_complete_match(
@@ -1329,6 +1615,72 @@ class PublicApiClient:
         else:
             raise FogisAPIRequestError(f"Failed to save match event: {response.status_code}")
 
+    def report_match_event(self, event_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Report a match event to FOGIS, filling in the fields FOGIS requires.
+
+        Rarely used fields get the defaults FOGIS expects and ID, minute and score
+        fields given as strings are sent as integers, as FogisApiClient.report_match_event
+        does, before the event is saved with :meth:`save_match_event`.
+
+        Args:
+            event_data: Data for the event to report. Must include at minimum:
+                - matchid: The ID of the match
+                - matchhandelsetypid: The event type code
+                - matchminut: The minute when the event occurred
+                - matchlagid: The ID of the team associated with the event
+
+        Returns:
+            Dict[str, Any]: Response from the API, typically containing success status
+                and the ID of the created event
+
+        Raises:
+            FogisLoginError: If not logged in
+            FogisAPIRequestError: If there's an error with the API request
+            ValueError: If a numeric field is not a number
+
+        Examples:
+            >>> client = PublicApiClient(username="your_username", password="your_password")
+            >>> event = {"matchid": 123456, "matchhandelsetypid": 6, "matchminut": 35, "matchlagid": 78910}
+            >>> response = client.report_match_event(event)
+        """
+        # Create a copy to avoid modifying the original
+        event_data_copy = dict(event_data)
+
+        defaults: Dict[str, Any] = {
+            "sekund": 0,
+            "planpositionx": "-1",
+            "planpositiony": "-1",
+            "relateradTillMatchhandelseID": 0,
+        }
+        # Only substitutions name a second player
+        if event_data_copy.get("matchhandelsetypid") != 17:
+            defaults.update(spelareid2=-1, matchdeltagareid2=-1)
+        for field, default in defaults.items():
+            if event_data_copy.get(field) is None:
+                event_data_copy[field] = default
+
+        # FOGIS requires these fields to be integers, not strings
+        for field in [
+            "matchid",
+            "matchhandelsetypid",
+            "matchminut",
+            "matchlagid",
+            "spelareid",
+            "assisterandeid",
+            "period",
+            "hemmamal",
+            "bortamal",
+            "sekund",
+            "relateradTillMatchhandelseID",
+            "spelareid2",
+            "matchdeltagareid2",
+        ]:
+            if isinstance(event_data_copy.get(field), str):
+                event_data_copy[field] = int(event_data_copy[field])
+
+        return self.save_match_event(event_data_copy)
+
     def delete_match_event(self, event_id: Union[str, int]) -> bool:  # noqa: C901
         """
         Delete a specific event from a match.
@@ -0,0 +1,270 @@
+"""
+Pluggable persistence for authenticated FOGIS sessions.
+
+Logging in is the most expensive thing the client does, so a restarted worker
+should reuse a session that is still alive instead of running the full login
+flow again. A :class:`SessionStore` saves the state produced by
+``PublicApiClient.login()`` (cookie jar, OAuth tokens and authentication
+method) and hands it back on startup.
+
+:class:`FileSessionStore` encrypts every session at rest with Fernet
+(AES-128-CBC + HMAC-SHA256) from the optional ``cryptography`` package::
+
+    pip install fogis-api-client-timmyBird[session-store]
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from http.cookiejar import Cookie, CookieJar
+from typing import Any, Dict, List, Optional
+
+try:
+    from cryptography.fernet import Fernet, InvalidToken
+except ImportError:
+    # Encryption is optional, only needed for FileSessionStore
+    Fernet = None
+    InvalidToken = None
+
+logger = logging.getLogger(__name__)
+
+
+class SessionStoreError(Exception):
+    """Exception raised when a session cannot be saved or restored."""
+
+    pass
+
+
+def export_cookies(jar: CookieJar) -> List[Dict[str, Any]]:
+    """
+    Serialize every cookie in a jar, including its domain and path.
+
+    Keeping the domain matters: the OAuth SSO cookies live on ``auth.fogis.se``
+    and must not be sent to ``fogis.svenskfotboll.se`` or vice versa.
+
+    Args:
+        jar: The cookie jar to export (e.g. ``requests.Session().cookies``)
+
+    Returns:
+        List[Dict[str, Any]]: JSON-serializable cookie records
+    """
+    return [
+        {
+            "name": cookie.name,
+            "value": cookie.value,
+            "domain": cookie.domain,
+            "path": cookie.path,
+            "secure": cookie.secure,
+            "expires": cookie.expires,
+        }
+        for cookie in jar
+    ]
+
+
+def import_cookies(jar: Any, cookies: List[Dict[str, Any]]) -> int:
+    """
+    Load cookie records produced by :func:`export_cookies` into a jar.
+
+    Cookies that have already expired are skipped.
+
+    Args:
+        jar: The ``requests`` cookie jar to populate
+        cookies: Cookie records to load
+
+    Returns:
+        int: Number of cookies loaded
+    """
+    now = time.time()
+    loaded = 0
+    for record in cookies:
+        expires = record.get("expires")
+        if expires is not None and expires <= now:
+            continue
+        domain = record.get("domain") or ""
+        jar.set_cookie(
+            Cookie(
+                version=0,
+                name=record["name"],
+                value=record.get("value"),
+                port=None,
+                port_specified=False,
+                domain=domain,
+                domain_specified=bool(domain),
+                domain_initial_dot=domain.startswith("."),
+                path=record.get("path") or "/",
+                path_specified=True,
+                secure=bool(record.get("secure")),
+                expires=expires,
+                discard=expires is None,
+                comment=None,
+                comment_url=None,
+                rest={},
+            )
+        )
+        loaded += 1
+    return loaded
+
+
+class SessionStore:
+    """
+    Base class for session stores.
+
+    Subclasses implement :meth:`load`, :meth:`save` and :meth:`clear`. Sessions
+    are keyed by account (the FOGIS username), so one store can serve many
+    clients.
+    """
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a previously saved session.
+
+        Args:
+            key: The account key (FOGIS username)
+
+        Returns:
+            Optional[Dict[str, Any]]: The saved session state, or None
+        """
+        raise NotImplementedError
+
+    def save(self, key: str, state: Dict[str, Any]) -> None:
+        """
+        Save session state for an account, replacing any previous state.
+
+        Args:
+            key: The account key (FOGIS username)
+            state: JSON-serializable session state
+        """
+        raise NotImplementedError
+
+    def clear(self, key: str) -> None:
+        """
+        Remove the saved session for an account, if any.
+
+        Args:
+            key: The account key (FOGIS username)
+        """
+        raise NotImplementedError
+
+
+class MemorySessionStore(SessionStore):
+    """In-process session store, mainly useful for tests and short-lived pools."""
+
+    def __init__(self) -> None:
+        self._sessions: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            data = self._sessions.get(key)
+        return json.loads(data) if data is not None else None
+
+    def save(self, key: str, state: Dict[str, Any]) -> None:
+        data = json.dumps(state)
+        with self._lock:
+            self._sessions[key] = data
+
+    def clear(self, key: str) -> None:
+        with self._lock:
+            self._sessions.pop(key, None)
+
+
+class FileSessionStore(SessionStore):
+    """
+    Encrypted, file-based session store.
+
+    Each account is stored in its own file, named after a hash of the account
+    key so usernames do not leak through the file system. Files are written
+    atomically and are readable only by the owning user.
+
+    Examples:
+        >>> key = generate_session_key()  # store this secret, e.g. in an env var
+        >>> store = FileSessionStore("/var/lib/fogis/sessions", encryption_key=key)
+        >>> client = FogisApiClient(username="user", password="pass", session_store=store)
+    """
+
+    def __init__(self, directory: str, encryption_key: Any) -> None:
+        """
+        Initialize the file session store.
+
+        Args:
+            directory: Directory to keep session files in (created if missing)
+            encryption_key: A Fernet key, as returned by :func:`generate_session_key`
+
+        Raises:
+            ImportError: If the optional ``cryptography`` package is not installed
+            ValueError: If the encryption key is missing or malformed
+        """
+        if Fernet is None:
+            raise ImportError(
+                "FileSessionStore requires the 'cryptography' package. "
+                "Install it with: pip install fogis-api-client-timmyBird[session-store]"
+            )
+        if not encryption_key:
+            raise ValueError("An encryption key is required for FileSessionStore")
+
+        self.directory = directory
+        self._fernet = Fernet(encryption_key)
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{digest}.session")
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                token = f.read()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            raise SessionStoreError(f"Failed to read session file: {e}") from e
+
+        try:
+            return json.loads(self._fernet.decrypt(token))
+        except (InvalidToken, ValueError):
+            # Wrong key or a damaged file; treat it as no saved session.
+            logger.warning("Discarding unreadable saved session")
+            self.clear(key)
+            return None
+
+    def save(self, key: str, state: Dict[str, Any]) -> None:
+        token = self._fernet.encrypt(json.dumps(state).encode("utf-8"))
+        fd, tmp_path = tempfile.mkstemp(prefix=".session-", dir=self.directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(token)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise SessionStoreError(f"Failed to write session file: {e}") from e
+
+    def clear(self, key: str) -> None:
+        try:
+            os.unlink(self._path(key))
+        except FileNotFoundError:
+            pass
+
+
+def generate_session_key() -> bytes:
+    """
+    Generate a new encryption key for :class:`FileSessionStore`.
+
+    Returns:
+        bytes: A URL-safe base64-encoded 32-byte key
+
+    Raises:
+        ImportError: If the optional ``cryptography`` package is not installed
+    """
+    if Fernet is None:
+        raise ImportError("Generating session keys requires the 'cryptography' package")
+    return Fernet.generate_key()
@@ -15,7 +15,7 @@ except ImportError:
     CORS = None
 
 from fogis_api_client.fogis_api_client import FogisApiClient
-from fogis_api_client.match_list_filter import MatchListFilter
+from fogis_api_client.gateway.filters import FilterRequestError, filter_report_headers, match_filter_from_request
 from fogis_api_client_swagger import get_swagger_blueprint, spec
 
 # Configure logging
@@ -35,14 +35,30 @@ debug_mode = os.environ.get("FLASK_DEBUG", "0") == "1"
 client: Optional[FogisApiClient] = None
 client_initialized = False
 
+
+def init_clients() -> None:
+    """
+    Create the FOGIS API client without logging in.
+    """
+    global client, client_initialized
+    # Login will happen automatically when needed (lazy login)
+    try:
+        client = FogisApiClient(fogis_username, fogis_password)
+        client_initialized = True
+    except Exception as e:
+        logger.error(f"Failed to initialize FogisApiClient: {e}")
+        client_initialized = False
+
+
+def init_worker() -> None:
+    """
+    Prepare a worker process forked by the production server (fogis_api_client.cli.serve).
+    """
+    init_clients()
+
+
 # Initialize the Fogis API client but don't login yet
-# Login will happen automatically when needed (lazy login)
-try:
-    client = FogisApiClient(fogis_username, fogis_password)
-    client_initialized = True
-except Exception as e:
-    logger.error(f"Failed to initialize FogisApiClient: {e}")
-    client_initialized = False
+init_clients()
 
 # Log startup information
 logger.info("Starting FOGIS API Gateway...")
@@ -147,7 +163,7 @@ def matches():
             filter_data["datumTill"] = to_date
 
         # Fetch matches with server-side filtering
-        matches_response = client.fetch_matches_list_json(filter_params=filter_data)
+        matches_response = client.fetch_matches_list_json(filter_data)
 
         # Extract the actual match list from the response
         if isinstance(matches_response, dict) and "matchlista" in matches_response:
@@ -530,30 +546,19 @@ def finish_match_report(match_id):
 def filtered_matches():
     """
     Endpoint to fetch matches with specific filters.
+
+    The body is mapped onto the MatchListFilter builder methods, see
+    fogis_api_client.gateway.filters. Date ranges and categories are sent to
+    FOGIS; the X-Filters-Server and X-Filters-Local headers name the filters
+    applied by FOGIS and by the gateway.
     """
     try:
-        filter_data = request.json or {}
-
-        # Create a MatchListFilter with the provided filter data
-        match_filter = MatchListFilter()
-
-        # Apply filter parameters if they exist
-        if "from_date" in filter_data:
-            match_filter.from_date = filter_data["from_date"]
-        if "to_date" in filter_data:
-            match_filter.to_date = filter_data["to_date"]
-        if "status" in filter_data:
-            match_filter.status = filter_data["status"]
-        if "age_category" in filter_data:
-            match_filter.age_category = filter_data["age_category"]
-        if "gender" in filter_data:
-            match_filter.gender = filter_data["gender"]
-        if "football_type" in filter_data:
-            match_filter.football_type = filter_data["football_type"]
-
-        # Fetch filtered matches
-        matches_list = match_filter.fetch_filtered_matches(client)
-        return jsonify(matches_list)
+        match_filter = match_filter_from_request(request.json)
+    except FilterRequestError as e:
+        return jsonify({"error": str(e)}), 400
+    try:
+        matches_list, report = match_filter.fetch_filtered_matches_with_report(client)
+        return jsonify(matches_list), 200, filter_report_headers(report)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
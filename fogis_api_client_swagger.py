@@ -242,13 +242,48 @@ spec.path(
     },
 )
 
+# Matches change stream endpoint
+spec.path(
+    path="/matches/stream",
+    operations={
+        "get": {
+            "summary": "Stream changes to the matches list",
+            "description": "Server-sent events: a snapshot of the list, then added, changed and removed events "
+            "per match. Send Last-Event-ID (or last_event_id) when reconnecting to receive only missed events.",
+            "parameters": [
+                {
+                    "name": "Last-Event-ID",
+                    "in": "header",
+                    "description": "ID of the last event received",
+                    "schema": {"type": "string"},
+                },
+                {
+                    "name": "last_event_id",
+                    "in": "query",
+                    "description": "ID of the last event received, for clients that cannot set headers",
+                    "schema": {"type": "string"},
+                },
+            ],
+            "responses": {
+                "200": {
+                    "description": "Event stream",
+                    "content": {"text/event-stream": {"schema": {"type": "string"}}},
+                },
+            },
+        }
+    },
+)
+
 # Filtered matches endpoint
 spec.path(
     path="/matches/filter",
     operations={
         "post": {
             "summary": "Get filtered matches list",
-            "description": "Returns a filtered list of matches based on provided criteria",
+            "description": (
+                "Returns a filtered list of matches based on provided criteria. Enum filters take a value, "
+                "a member name or a list of them."
+            ),
             "requestBody": {
                 "description": "Filter parameters",
                 "required": True,
@@ -257,31 +292,47 @@ spec.path(
                         "schema": {
                             "type": "object",
                             "properties": {
-                                "from_date": {
+                                "start_date": {
                                     "type": "string",
                                     "format": "date",
-                                    "description": "Start date for filtering matches",
+                                    "description": "First match date, sent to FOGIS (alias: from_date)",
                                 },
-                                "to_date": {
+                                "end_date": {
                                     "type": "string",
                                     "format": "date",
-                                    "description": "End date for filtering matches",
+                                    "description": "Last match date, sent to FOGIS (alias: to_date)",
                                 },
-                                "status": {
-                                    "type": "string",
-                                    "description": "Match status (e.g., 'upcoming', 'completed')",
+                                "include_statuses": {
+                                    "oneOf": [{"type": "string"}, {"type": "integer"}, {"type": "array"}],
+                                    "description": "Statuses to keep, such as 'completed', sent to FOGIS (alias: status)",
                                 },
-                                "age_category": {
-                                    "type": "string",
-                                    "description": "Age category for filtering matches",
+                                "exclude_statuses": {
+                                    "oneOf": [{"type": "string"}, {"type": "integer"}, {"type": "array"}],
+                                    "description": "Statuses to drop, applied by the gateway",
                                 },
-                                "gender": {
-                                    "type": "string",
-                                    "description": "Gender for filtering matches",
+                                "include_age_categories": {
+                                    "oneOf": [{"type": "string"}, {"type": "integer"}, {"type": "array"}],
+                                    "description": "Age categories to keep, sent to FOGIS (alias: age_category)",
                                 },
-                                "football_type": {
-                                    "type": "string",
-                                    "description": "Type of football (e.g., 'indoor', 'outdoor')",
+                                "exclude_age_categories": {
+                                    "oneOf": [{"type": "string"}, {"type": "integer"}, {"type": "array"}],
+                                    "description": "Age categories to drop, sent to FOGIS as the remaining categories",
+                                },
+                                "include_genders": {
+                                    "oneOf": [{"type": "string"}, {"type": "integer"}, {"type": "array"}],
+                                    "description": "Genders to keep, sent to FOGIS (alias: gender)",
+                                },
+                                "exclude_genders": {
+                                    "oneOf": [{"type": "string"}, {"type": "integer"}, {"type": "array"}],
+                                    "description": "Genders to drop, sent to FOGIS as the remaining genders",
+                                },
+                                "include_football_types": {
+                                    "oneOf": [{"type": "string"}, {"type": "integer"}, {"type": "array"}],
+                                    "description": "Football types to keep, applied by the gateway (alias: football_type)",
+                                },
+                                "exclude_football_types": {
+                                    "oneOf": [{"type": "string"}, {"type": "integer"}, {"type": "array"}],
+                                    "description": "Football types to drop, applied by the gateway",
                                 },
                             },
                         }
@@ -291,6 +342,16 @@ spec.path(
             "responses": {
                 "200": {
                     "description": "List of filtered matches",
+                    "headers": {
+                        "X-Filters-Server": {
+                            "description": "Filters sent to FOGIS, comma-separated",
+                            "schema": {"type": "string"},
+                        },
+                        "X-Filters-Local": {
+                            "description": "Filters applied only by the gateway, comma-separated",
+                            "schema": {"type": "string"},
+                        },
+                    },
                     "content": {
                         "application/json": {
                             "schema": {
@@ -943,6 +1004,144 @@ spec.path(
     },
 )
 
+# Batch endpoint
+spec.path(
+    path="/batch",
+    operations={
+        "post": {
+            "summary": "Run several reads in one request",
+            "description": "Runs read operations concurrently and returns a result per operation, in order",
+            "requestBody": {
+                "required": True,
+                "content": {
+                    "application/json": {
+                        "schema": {
+                            "type": "object",
+                            "required": ["operations"],
+                            "properties": {
+                                "operations": {
+                                    "type": "array",
+                                    "items": {
+                                        "type": "object",
+                                        "required": ["route"],
+                                        "properties": {
+                                            "id": {"type": "string", "description": "Echoed in the result"},
+                                            "route": {
+                                                "type": "string",
+                                                "description": "Route name (matches, match, match_result, match_events, "
+                                                "match_officials, team_players, team_officials) or path such as "
+                                                "/match/123/events",
+                                            },
+                                            "params": {
+                                                "type": "object",
+                                                "description": 'Route parameters, e.g. {"match_id": 123}',
+                                            },
+                                        },
+                                    },
+                                },
+                                "timeout": {
+                                    "type": "number",
+                                    "description": "Seconds to wait for the whole batch",
+                                },
+                            },
+                        }
+                    }
+                },
+            },
+            "responses": {
+                "200": {
+                    "description": "Results; each has its own status (200, 400, 500, 503 or 504) and data or error",
+                    "content": {
+                        "application/json": {
+                            "schema": {
+                                "type": "object",
+                                "properties": {
+                                    "results": {
+                                        "type": "array",
+                                        "items": {
+                                            "type": "object",
+                                            "properties": {
+                                                "id": {"type": "string"},
+                                                "route": {"type": "string"},
+                                                "status": {"type": "integer"},
+                                                "data": {},
+                                                "error": {"type": "string"},
+                                            },
+                                        },
+                                    }
+                                },
+                            }
+                        }
+                    },
+                },
+                "400": {
+                    "description": "Malformed batch",
+                    "content": {
+                        "application/json": {
+                            "schema": {"$ref": "#/components/schemas/Error"},
+                        }
+                    },
+                },
+            },
+        }
+    },
+)
+
+spec.path(
+    path="/mdk/MatchWebMetoder.aspx/{method}",
+    operations={
+        "post": {
+            "summary": "Proxy a raw FOGIS protocol call",
+            "description": "Forwards a MatchWebMetoder.aspx call through the gateway's session and returns "
+            "FOGIS's response unchanged. Read methods are cached; write methods invalidate what they change. "
+            "Enabled with GATEWAY_MDK_PROXY=1",
+            "parameters": [
+                {
+                    "name": "method",
+                    "in": "path",
+                    "required": True,
+                    "schema": {"type": "string"},
+                    "description": "FOGIS method, e.g. GetMatchhandelselista or SparaMatchhandelse",
+                }
+            ],
+            "requestBody": {
+                "required": True,
+                "content": {"application/json": {"schema": {"type": "object"}}},
+            },
+            "responses": {
+                "200": {
+                    "description": "FOGIS's response, with its d envelope",
+                    "content": {"application/json": {"schema": {"type": "object", "properties": {"d": {}}}}},
+                },
+                "400": {
+                    "description": "Body is not a JSON object",
+                    "content": {
+                        "application/json": {
+                            "schema": {"$ref": "#/components/schemas/Error"},
+                        }
+                    },
+                },
+                "404": {
+                    "description": "Method not proxied, or the proxy is disabled",
+                    "content": {
+                        "application/json": {
+                            "schema": {"$ref": "#/components/schemas/Error"},
+                        }
+                    },
+                },
+                "502": {
+                    "description": "FOGIS call failed",
+                    "content": {
+                        "application/json": {
+                            "schema": {"$ref": "#/components/schemas/Error"},
+                        }
+                    },
+                },
+            },
+        }
+    },
+)
+
 # Authentication endpoints
 
 # Login endpoint
@@ -3,10 +3,11 @@ import os
 import signal
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
 from datetime import datetime
-from typing import Optional
 
-from flask import Flask, jsonify, request
+from flask import Flask, Response, g, jsonify, request
 
 try:
     from flask_cors import CORS  # Import CORS for development
@@ -15,8 +16,18 @@ except ImportError:
     CORS = None
 
 from auth_routes import register_auth_routes
-from fogis_api_client.match_list_filter import MatchListFilter
-from fogis_api_client.public_api_client import PublicApiClient
+from fogis_api_client.client_pool import ClientPoolError
+from fogis_api_client.gateway import json_response
+from fogis_api_client.gateway.admission import AdmissionError, admission_from_env, caller_key, route_class, split_capacity
+from fogis_api_client.gateway.batch import BatchError, parse_batch, run_batch
+from fogis_api_client.gateway.change_feed import FeedFullError, MatchFeed
+from fogis_api_client.gateway.filters import FilterRequestError, filter_report_headers, match_filter_from_request
+from fogis_api_client.gateway.handoff import Drain
+from fogis_api_client.gateway.json_provider import GatewayJSONProvider
+from fogis_api_client.gateway.listing import ListQueryError, is_list_query, list_response
+from fogis_api_client.gateway.mdk_proxy import MdkCall, MdkProxyError
+from fogis_api_client.gateway.service import gateway_service_from_env
+from fogis_api_client.gateway.warmup import Warmup
 from fogis_api_client_swagger import get_swagger_blueprint, spec
 
 # Configure logging
@@ -28,30 +39,101 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # Get environment variables
-fogis_username = os.environ.get("FOGIS_USERNAME", "test_user")
-fogis_password = os.environ.get("FOGIS_PASSWORD", "test_pass")
 debug_mode = os.environ.get("FLASK_DEBUG", "0") == "1"
+graceful_timeout = float(os.environ.get("GATEWAY_GRACEFUL_TIMEOUT", "30"))
+# Threads serving requests in each worker (see fogis_api_client.cli.serve)
+worker_threads = int(os.environ.get("GATEWAY_THREADS", "8"))
+# Each /matches/stream subscriber holds a thread while connected, so only a quarter of them may stream
+stream_max_subscribers = int(os.environ.get("GATEWAY_STREAM_MAX_SUBSCRIBERS", max(1, worker_threads // 4)))
+
+# The FOGIS clients, response cache and route logic, shared with the ASGI gateway. Login will
+# happen automatically when needed (lazy login). With GATEWAY_SNAPSHOT_DIR set, sessions and hot
+# cache entries outlive the process.
+service = gateway_service_from_env()
+
+# Runs the operations of POST /batch requests concurrently
+batch_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("GATEWAY_BATCH_CONCURRENCY", "8")), thread_name_prefix="gateway-batch"
+)
 
-# Initialize the Fogis API client but don't login yet
-# Login will happen automatically when needed (lazy login)
-client: Optional[PublicApiClient] = None
-client_initialized = False
 
-try:
-    client = PublicApiClient(username=fogis_username, password=fogis_password)
-    client_initialized = True
-except Exception as e:
-    logger.error(f"Failed to initialize PublicApiClient: {e}")
-    client_initialized = False
+# GET /matches/stream subscribers share this poller: one upstream list fetch per interval
+match_feed = MatchFeed(
+    lambda: service.fetch("matches").data,
+    interval=float(os.environ.get("GATEWAY_STREAM_INTERVAL", "60")),
+    history=int(os.environ.get("GATEWAY_STREAM_HISTORY", "1000")),
+    max_sync_subscribers=stream_max_subscribers,
+)
+stream_heartbeat = float(os.environ.get("GATEWAY_STREAM_HEARTBEAT", "15"))
+
+# With GATEWAY_WARMUP=1, /ready reports ready once these have run; otherwise right away
+warmup = Warmup(service.warmup_steps(map_func=batch_executor.map))
+
+
+def init_worker() -> None:
+    """
+    Prepare a worker process forked by the production server (fogis_api_client.cli.serve).
+
+    The app is imported once before forking and nothing logs in at import, so each
+    worker creates its own clients here, sharing no session or connection with the
+    other workers, and then starts the warm-up.
+    """
+    service.init_clients()
+    warmup.start()
+
+
+# Counts requests in flight, so shutdown can wait for them
+drain = Drain()
+
+
+def drain_and_hand_off(timeout: float) -> bool:
+    """
+    Turn new requests away, wait for those in flight and save warm state for the next process.
+
+    Args:
+        timeout: Longest time in seconds to wait for requests in flight
+
+    Returns:
+        bool: True if every request finished before the deadline
+    """
+    drain.begin()
+    # Streams never finish on their own; end them so the drain is not held up until the deadline
+    match_feed.stop()
+    drained = drain.wait(timeout)
+    if not drained:
+        logger.warning(f"{drain.in_flight} requests still in flight after {timeout}s, shutting down anyway")
+    service.hand_off()
+    return drained
+
+
+def begin_shutdown() -> None:
+    """
+    Start shutting down as soon as the process is told to exit: turn new requests away and end open streams.
+    """
+    drain.begin()
+    match_feed.stop()
+
+
+def shutdown_worker() -> None:
+    """
+    Stop the background work of a worker process that is exiting, and hand off its warm state.
+    """
+    match_feed.stop()
+    batch_executor.shutdown(wait=False)
+    # The server has drained the worker already
+    drain_and_hand_off(0)
+
 
 # Log startup information
 logger.info("Starting FOGIS API Gateway...")
-logger.info(f"FOGIS_USERNAME: {fogis_username}")
+logger.info(f"FOGIS_USERNAME: {service.username}")
 logger.info(f"Debug mode: {debug_mode}")
 logger.info(f"Python version: {sys.version}")
 
 # Initialize the Flask app
 app = Flask(__name__)
+# Encodes with orjson or msgspec when installed; see GATEWAY_JSON
+app.json = GatewayJSONProvider(app)
 if CORS:
     CORS(app)  # Enable CORS for all routes if available
 
@@ -62,6 +144,114 @@ app.register_blueprint(swagger_ui_blueprint, url_prefix=SWAGGER_URL)
 # Register authentication routes
 register_auth_routes(app)
 
+# Bounds the requests in flight per route class; the rest are shed with 503. The limits fit the
+# threads left over from streams, with some held back for writes. A waiting request would hold
+# its thread, so by default none wait: a read over the limit is shed at once rather than taking
+# a thread that a write needs.
+admission = admission_from_env(split_capacity(worker_threads - stream_max_subscribers), queue_size=0)
+
+
+@app.before_request
+def track_request():
+    """
+    Count the request in flight, or turn it away when the gateway is shutting down.
+    """
+    if not drain.enter():
+        return jsonify({"error": "Gateway is shutting down"}), 503, {"Retry-After": "1", "Connection": "close"}
+    g.drain = drain
+
+
+@app.teardown_request
+def finish_request(error=None):
+    """
+    Count the request as finished.
+    """
+    tracked = g.pop("drain", None)
+    if tracked is not None:
+        tracked.leave()
+
+
+@app.before_request
+def admit_request():
+    """
+    Wait for capacity for the request's route class, or shed it.
+    """
+    if admission is None:
+        return
+    ticket = (admission, route_class(request.method, request.path), caller_key(request.headers.get("Authorization")))
+    admission.acquire(*ticket[1:])
+    g.admission = ticket
+
+
+@app.teardown_request
+def release_request(error=None):
+    """
+    Give back the capacity taken by admit_request.
+    """
+    ticket = g.pop("admission", None)
+    if ticket is not None:
+        controller, name, caller = ticket
+        controller.release(name, caller)
+
+
+@app.errorhandler(AdmissionError)
+def request_shed(error):
+    """
+    Tell the caller to retry when the gateway is saturated or the caller is at its quota.
+    """
+    logger.warning(f"Request shed: {error}")
+    return jsonify({"error": str(error)}), error.status, {"Retry-After": "1"}
+
+
+@app.errorhandler(ClientPoolError)
+def client_pool_exhausted(error):
+    """
+    Tell the caller to retry when every pooled client stayed busy for the whole checkout timeout.
+    """
+    logger.warning(f"Client pool saturated: {error}")
+    return jsonify({"error": str(error)}), 503, {"Retry-After": "1"}
+
+
+@app.errorhandler(FeedFullError)
+def stream_full(error):
+    """
+    Turn a /matches/stream subscriber away when the threads allowed to stream are all taken.
+    """
+    logger.warning(f"Stream subscriber turned away: {error}")
+    return jsonify({"error": str(error)}), error.status, {"Retry-After": str(int(stream_heartbeat))}
+
+
+@app.errorhandler(ListQueryError)
+def invalid_list_query(error):
+    """
+    Reject invalid projection or pagination parameters on list endpoints.
+    """
+    return jsonify({"error": str(error)}), 400
+
+
+@app.errorhandler(BatchError)
+def invalid_batch(error):
+    """
+    Reject a malformed POST /batch body.
+    """
+    return jsonify({"error": str(error)}), 400
+
+
+@app.errorhandler(FilterRequestError)
+def invalid_filter(error):
+    """
+    Reject an invalid POST /matches/filter body.
+    """
+    return jsonify({"error": str(error)}), 400
+
+
+@app.errorhandler(MdkProxyError)
+def invalid_mdk_call(error):
+    """
+    Reject a proxied FOGIS call with an unknown method or a body that is not a JSON object.
+    """
+    return jsonify({"error": str(error)}), error.status
+
 
 # Add endpoint to serve the OpenAPI specification
 @app.route("/api/swagger.json")
@@ -131,7 +321,7 @@ def debug():
     debug_data = {
         "timestamp": datetime.now().isoformat(),
         "service": "fogis-api-client",
-        "client_initialized": client_initialized,
+        "client_initialized": service.client_initialized,
         "network": {
             "hostname": hostname,
             "ip_addresses": ip_addresses,
@@ -173,11 +363,11 @@ def health():
         current_time = datetime.now().isoformat()
 
         # Check if the client is initialized
-        client_status = "available" if client_initialized else "unavailable"
+        client_status = "available" if service.client_initialized else "unavailable"
 
         # Build minimal health response
         health_data = {
-            "status": "healthy" if client_initialized else "degraded",
+            "status": "healthy" if service.client_initialized else "degraded",
             "timestamp": current_time,
             "service": "fogis-api-client",
             "version": "1.0.0",
@@ -185,6 +375,14 @@ def health():
                 "fogis_client": client_status,
             },
         }
+        if service.client_pool is not None:
+            health_data["client_pool"] = service.client_pool.metrics()
+        if service.response_cache is not None:
+            health_data["response_cache"] = service.response_cache.metrics()
+        if admission is not None:
+            health_data["admission"] = admission.metrics()
+        health_data["match_feed"] = match_feed.metrics()
+        health_data["ready"] = warmup.ready
 
         # Single optimized log entry
         duration = time.time() - start_time
@@ -207,26 +405,79 @@ def health():
         )
 
 
+@app.route("/ready")
+def ready():
+    """
+    Readiness check for load balancers.
+
+    Returns 200 once start-up warm-up has run (immediately when GATEWAY_WARMUP is off),
+    and 503 before that. Unlike /health, this is meant to gate traffic.
+    """
+    status = warmup.status()
+    if status["ready"]:
+        return jsonify(status)
+    return jsonify(status), 503, {"Retry-After": "1"}
+
+
 @app.route("/matches")
 def matches():
     """
     Endpoint to fetch matches list from Fogis API Client.
+
+    Query Parameters:
+    - fields (str): Comma separated fields to return for each match (default: all)
+    - sort_by (str): Field to order by (default: matchid)
+    - order (str): Sort order, 'asc' or 'desc' (default: asc)
+    - limit (int): Maximum number of matches to return (default: all)
+    - cursor (str): X-Next-Cursor header of the previous page
     """
     try:
-        matches_list = client.fetch_matches_list_json()
-        return jsonify(matches_list)
+        matches_list = service.read("matches")
+        if is_list_query():
+            return list_response(matches_list, id_field="matchid")
+        return json_response(matches_list)
+    except (ClientPoolError, ListQueryError):
+        raise
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
+@app.route("/matches/stream")
+def matches_stream():
+    """
+    Server-sent event stream of changes to the matches list.
+
+    The first event is a snapshot of the list; after it come added, changed and removed
+    events, one per match. Reconnecting clients send the Last-Event-ID header (or the
+    last_event_id query parameter) to receive only the events they missed.
+    """
+    last_event_id = request.headers.get("Last-Event-ID") or request.args.get("last_event_id")
+    events = match_feed.subscribe(last_event_id, heartbeat=stream_heartbeat)
+
+    def generate():
+        yield f"retry: {int(stream_heartbeat * 1000)}\n\n"
+        with closing(events):
+            for event in events:
+                yield match_feed.format(event)
+
+    response = Response(
+        generate(), mimetype="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+    # Closed explicitly so a disconnecting client stops counting as a subscriber right away
+    response.call_on_close(events.close)
+    return response
+
+
 @app.route("/match/<match_id>")
 def match(match_id):
     """
     Endpoint to fetch match details from Fogis API Client.
     """
     try:
-        match_data = client.fetch_match_json(int(match_id))
-        return jsonify(match_data)
+        match_data = service.read("match", match_id=int(match_id))
+        return json_response(match_data)
+    except ClientPoolError:
+        raise
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -237,8 +488,10 @@ def match_result(match_id):
     Endpoint to fetch result information for a specific match.
     """
     try:
-        result_data = client.fetch_match_result_json(int(match_id))
-        return jsonify(result_data)
+        result_data = service.read("match_result", match_id=int(match_id))
+        return json_response(result_data)
+    except ClientPoolError:
+        raise
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -247,11 +500,16 @@ def match_result(match_id):
 def match_events(match_id):
     """
     Endpoint to fetch events for a specific match.
+
+    Accepts the same fields, sort_by, order, limit and cursor parameters as /matches.
     """
     try:
-        # Use the dedicated method for fetching match events
-        events_data = client.fetch_match_events_json(int(match_id))
-        return jsonify(events_data)
+        events_data = service.read("match_events", match_id=int(match_id))
+        if is_list_query():
+            return list_response(events_data, id_field="matchhandelseid")
+        return json_response(events_data)
+    except (ClientPoolError, ListQueryError):
+        raise
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -266,14 +524,10 @@ def report_match_event(match_id):
         return jsonify({"error": "No event data provided"}), 400
 
     try:
-        event_data = request.json
-
-        # Add match_id to the event data if not already present
-        if "matchid" not in event_data:
-            event_data["matchid"] = int(match_id)
-
-        result = client.report_match_event(event_data)
-        return jsonify(result)
+        # The match id is added to the event data if not already present
+        return jsonify(service.write("report_match_event", int(match_id), request.json))
+    except ClientPoolError:
+        raise
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -284,8 +538,9 @@ def clear_match_events(match_id):
     Endpoint to clear all events for a match.
     """
     try:
-        result = client.clear_match_events(int(match_id))
-        return jsonify(result)
+        return jsonify(service.write("clear_match_events", int(match_id)))
+    except ClientPoolError:
+        raise
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -296,8 +551,10 @@ def match_officials(match_id):
     Endpoint to fetch officials information for a specific match.
     """
     try:
-        officials_data = client.fetch_match_officials_json(int(match_id))
-        return jsonify(officials_data)
+        officials_data = service.read("match_officials", match_id=int(match_id))
+        return json_response(officials_data)
+    except ClientPoolError:
+        raise
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -308,8 +565,10 @@ def team_players(team_id):
     Endpoint to fetch player information for a specific team.
     """
     try:
-        players_data = client.fetch_team_players_json(int(team_id))
-        return jsonify(players_data)
+        players_data = service.read("team_players", team_id=int(team_id))
+        return json_response(players_data)
+    except ClientPoolError:
+        raise
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -318,10 +577,16 @@ def team_players(team_id):
 def team_officials(team_id):
     """
     Endpoint to fetch officials information for a specific team.
+
+    Accepts the same fields, sort_by, order, limit and cursor parameters as /matches.
     """
     try:
-        officials_data = client.fetch_team_officials_json(int(team_id))
-        return jsonify(officials_data)
+        officials_data = service.read("team_officials", team_id=int(team_id))
+        if is_list_query():
+            return list_response(officials_data, id_field="personid")
+        return json_response(officials_data)
+    except (ClientPoolError, ListQueryError):
+        raise
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -332,8 +597,9 @@ def finish_match_report(match_id):
     Endpoint to mark a match report as completed/finished.
     """
     try:
-        result = client.mark_reporting_finished(int(match_id))
-        return jsonify(result)
+        return jsonify(service.write("finish_match_report", int(match_id)))
+    except ClientPoolError:
+        raise
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -342,39 +608,70 @@ def finish_match_report(match_id):
 def filtered_matches():
     """
     Endpoint to fetch matches with specific filters.
+
+    The body is mapped onto the MatchListFilter builder methods, see
+    fogis_api_client.gateway.filters. Date ranges and categories are sent to
+    FOGIS; the X-Filters-Server and X-Filters-Local headers name the filters
+    applied by FOGIS and by the gateway.
     """
+    match_filter = match_filter_from_request(request.json)
     try:
-        filter_data = request.json or {}
-
-        # Create a MatchListFilter with the provided filter data
-        match_filter = MatchListFilter()
-
-        # Apply filter parameters if they exist
-        if "from_date" in filter_data:
-            match_filter.from_date = filter_data["from_date"]
-        if "to_date" in filter_data:
-            match_filter.to_date = filter_data["to_date"]
-        if "status" in filter_data:
-            match_filter.status = filter_data["status"]
-        if "age_category" in filter_data:
-            match_filter.age_category = filter_data["age_category"]
-        if "gender" in filter_data:
-            match_filter.gender = filter_data["gender"]
-        if "football_type" in filter_data:
-            match_filter.football_type = filter_data["football_type"]
-
-        # Fetch filtered matches
-        matches_list = match_filter.fetch_filtered_matches(client)
-        return jsonify(matches_list)
+        matches_list, report = service.filter_matches(match_filter)
+        return jsonify(matches_list), 200, filter_report_headers(report)
+    except ClientPoolError:
+        raise
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
+@app.route("/batch", methods=["POST"])
+def batch():
+    """
+    Endpoint to run several read operations concurrently in one request.
+
+    Request Body:
+    - operations (list): Reads to run, each with an optional id, a route (a route name such as
+      "match_events" with params {"match_id": 123}, or a path such as "/match/123/events")
+    - timeout (float): Seconds to wait for the whole batch (default and maximum: GATEWAY_BATCH_TIMEOUT)
+
+    Returns a result per operation, in order, with its own status and either data or error.
+    """
+    operations, timeout = parse_batch(request.get_json(silent=True))
+    results = run_batch(operations, lambda route, params: service.read(route, **params), batch_executor, timeout)
+    return json_response({"results": results})
+
+
+@app.route("/mdk/MatchWebMetoder.aspx/<method>", methods=["POST"])
+def mdk_proxy(method):
+    """
+    Endpoint that proxies the raw FOGIS protocol for legacy tools (GATEWAY_MDK_PROXY=1).
+
+    The body is forwarded through the gateway's authenticated session and FOGIS's
+    response bytes are returned untouched; read methods are cached and write
+    methods invalidate what they change, see fogis_api_client.gateway.mdk_proxy.
+    """
+    if not service.mdk_proxy_enabled:
+        return jsonify({"error": "Not found"}), 404
+    call = MdkCall(method, request.get_data())
+    try:
+        raw = service.proxy_mdk_call(call)
+    except ClientPoolError:
+        raise
+    except Exception as e:
+        logger.warning(f"Proxied call to {method} failed: {e}")
+        return jsonify({"error": str(e)}), 502
+    return Response(raw.body, content_type=raw.content_type)
+
+
 def signal_handler(sig, frame):
     """
     Handle SIGTERM and SIGINT signals to gracefully shut down the server.
+
+    The server's main thread runs this, so no new connections are accepted while the
+    requests in flight finish (up to GATEWAY_GRACEFUL_TIMEOUT seconds) on their threads.
     """
-    print("Shutting down...")
+    logger.info("Shutting down...")
+    drain_and_hand_off(graceful_timeout)
     sys.exit(0)
 
 
@@ -383,6 +680,9 @@ if __name__ == "__main__":
     signal.signal(signal.SIGTERM, signal_handler)
     signal.signal(signal.SIGINT, signal_handler)
 
+    # Warm up in the background; /ready turns 200 when done
+    warmup.start()
+
     # Log that we're about to start the Flask app
     logger.info("Starting Flask app on 0.0.0.0:8080")
     logger.info(f"Debug mode: {debug_mode}")
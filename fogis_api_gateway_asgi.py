@@ -0,0 +1,585 @@
+"""
+ASGI variant of the FOGIS API gateway.
+
+Serves the same routes as ``fogis_api_gateway.py`` (including the ``/auth``
+routes and the OpenAPI spec) as a plain ASGI application. Both gateways call
+the same route logic, in ``fogis_api_client.gateway.service`` and
+``fogis_api_client.gateway.auth``, so they cannot drift apart.
+
+Every downstream request is a coroutine, so requests waiting on slow FOGIS
+calls hold no thread. With httpx installed, reads that are a single FOGIS call
+and the raw protocol proxy are sent from the event loop by an asyncio HTTP
+client sharing the FOGIS client's session (GATEWAY_UPSTREAM_TRANSPORT=httpx,
+the default then), at most GATEWAY_UPSTREAM_CONCURRENCY at a time. Logins,
+writes and the remaining reads run on bounded executors, as every call does
+with GATEWAY_UPSTREAM_TRANSPORT=threads. Identical concurrent reads are
+coalesced, and fresh cached responses are answered without leaving the event
+loop.
+
+Run it with any ASGI server, for example:
+
+    uvicorn fogis_api_gateway_asgi:app --host 0.0.0.0 --port 8080
+
+or ``python fogis_api_gateway_asgi.py`` when uvicorn is installed.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import signal
+import threading
+import time
+from datetime import datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, Iterator, List, Optional, Tuple, Union
+from urllib.parse import parse_qsl, urlsplit
+
+from werkzeug.exceptions import MethodNotAllowed, NotFound
+from werkzeug.routing import Map, RequestRedirect, Rule
+
+from auth_routes import auth_cache_from_env
+from fogis_api_client.client_pool import ClientPoolError
+from fogis_api_client.gateway import JsonBody, auth
+from fogis_api_client.gateway.admission import READ, WRITE, AdmissionError, admission_from_env, caller_key, route_class
+from fogis_api_client.gateway.async_client import AsyncFogisClient
+from fogis_api_client.gateway.batch import BatchError, parse_batch, run_batch_async
+from fogis_api_client.gateway.change_feed import MatchFeed
+from fogis_api_client.gateway.filters import FilterRequestError, filter_report_headers, match_filter_from_request
+from fogis_api_client.gateway.handoff import on_signal
+from fogis_api_client.gateway.listing import ListQueryError, is_list_query, list_page
+from fogis_api_client.gateway.mdk_proxy import MdkCall, MdkProxyError, RawResponse
+from fogis_api_client.gateway.responses import VARY, dumps_json_bytes, negotiate_media_type, render
+from fogis_api_client.gateway.service import READ_ROUTES, gateway_service_from_env
+from fogis_api_client.gateway.warmup import Warmup
+from fogis_api_client_swagger import spec
+
+logger = logging.getLogger(__name__)
+
+# Get environment variables
+upstream_concurrency = int(os.environ.get("GATEWAY_UPSTREAM_CONCURRENCY", "32"))
+upstream_write_concurrency = int(os.environ.get("GATEWAY_UPSTREAM_WRITE_CONCURRENCY", max(1, upstream_concurrency // 4)))
+# httpx sends reads from the event loop, threads runs every call on the executors; httpx if installed by default
+upstream_transport = os.environ.get("GATEWAY_UPSTREAM_TRANSPORT")
+
+# The FOGIS clients, response cache and route logic, shared with the Flask gateway
+service = gateway_service_from_env()
+
+upstream = AsyncFogisClient(
+    max_concurrency=upstream_concurrency,
+    max_write_concurrency=upstream_write_concurrency,
+    native=upstream_transport == "httpx" if upstream_transport else None,
+)
+
+# Bounds the requests in flight per route class; the rest wait briefly, costing no thread, or are
+# shed with 503. Writes have an executor of their own, so reads cannot take their capacity; reads
+# may be twice their executor, as cache hits and coalesced calls do not use it.
+admission = admission_from_env({READ: 2 * upstream_concurrency, WRITE: upstream_write_concurrency})
+
+auth_cache = auth_cache_from_env()
+
+
+async def read(route: str, **params: Any) -> JsonBody:
+    """
+    Get the response body of a read route, answering fresh cached responses on the event loop.
+
+    Identical concurrent calls to FOGIS are coalesced.
+
+    Args:
+        route: Route name, a key of fogis_api_client.gateway.service.READ_ROUTES
+        **params: The route's parameters
+
+    Returns:
+        JsonBody: The cached or freshly fetched data
+    """
+    key = service.read_key(route, **params)
+    body = service.peek(key)
+    if body is not None:
+        return body
+    call = service.web_method_call(route, **params) if upstream.native else None
+    if call is None:
+        return await upstream.call(key, lambda: service.read(route, **params))
+
+    async def load() -> JsonBody:
+        return JsonBody(await upstream.read(service.client, call))
+
+    return await cached(key, load, route, service.tags(route, **params), READ_ROUTES[route].cached)
+
+
+async def cached(
+    key: Hashable, load: Callable[[], Awaitable[Any]], route: str, tags: List[str], cacheable: bool = True
+) -> Any:
+    """
+    Load a response from the event loop through the response cache, or coalesced if it is not cached.
+
+    Args:
+        key: Cache key
+        load: Returns the coroutine that calls FOGIS
+        route: The read route whose TTL the response uses
+        tags: Tags used to invalidate the response
+        cacheable: Whether the response may be cached
+
+    Returns:
+        The cached or freshly loaded response
+    """
+    if service.response_cache is None or not cacheable:
+        return await upstream.call_async(key, load)
+    return await service.response_cache.get_async(key, load, service.ttls[route], tags=tags)
+
+
+# GET /matches/stream subscribers share this poller: one upstream list fetch per interval
+match_feed = MatchFeed(
+    lambda: service.fetch("matches").data,
+    interval=float(os.environ.get("GATEWAY_STREAM_INTERVAL", "60")),
+    history=int(os.environ.get("GATEWAY_STREAM_HISTORY", "1000")),
+)
+stream_heartbeat = float(os.environ.get("GATEWAY_STREAM_HEARTBEAT", "15"))
+
+
+# Event loop of the running server, set at lifespan startup, on which warm-up runs its reads
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _read(route: str, **params: Any) -> JsonBody:
+    # Warm-up runs on its own thread; reads go through the server's loop like any request
+    return asyncio.run_coroutine_threadsafe(read(route, **params), _loop).result()
+
+
+# With GATEWAY_WARMUP=1, /ready reports ready once these have run; otherwise right away
+warmup = Warmup(service.warmup_steps(read=_read))
+
+
+def init_worker() -> None:
+    """
+    Prepare a worker process forked by the production server (fogis_api_client.cli.serve).
+
+    Each worker creates its own clients; the warm-up starts with the lifespan startup.
+    """
+    service.init_clients()
+
+
+def end_streams_on_exit() -> None:
+    """
+    Stop the change feed as soon as the server is told to exit.
+
+    The server waits for open connections before the lifespan shutdown, and
+    /matches/stream responses only end when the feed stops.
+    """
+    # Signal handlers can only be installed from the main thread
+    if threading.current_thread() is not threading.main_thread():
+        return
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        on_signal(signum, match_feed.stop)
+
+
+async def proxy_mdk_call(call: MdkCall) -> RawResponse:
+    """
+    Forward a raw FOGIS protocol call, answering fresh cached reads on the event loop.
+
+    Args:
+        call: The parsed call
+
+    Returns:
+        RawResponse: FOGIS's response bytes, cached or fresh
+    """
+    if not call.is_read:
+        if not upstream.native:
+            return await upstream.write(service.proxy_mdk_call, call)
+        raw = await call.forward_async(upstream, service.client)
+        service.invalidate_call(call)
+        return raw
+    raw = service.peek(call.key)
+    if raw is not None:
+        return raw
+    if not upstream.native:
+        return await upstream.call(call.key, lambda: service.proxy_mdk_call(call))
+    return await cached(call.key, lambda: call.forward_async(upstream, service.client), call.route, call.tags)
+
+
+class Request:
+    """The parts of an ASGI HTTP request the routes use."""
+
+    def __init__(self, scope: Dict[str, Any], body: bytes) -> None:
+        self.method: str = scope["method"]
+        self.path: str = scope["path"]
+        self.args: Dict[str, str] = dict(parse_qsl(scope.get("query_string", b"").decode("latin-1")))
+        self.headers: Dict[str, str] = {
+            name.decode("latin-1").lower(): value.decode("latin-1") for name, value in scope["headers"]
+        }
+        self.body = body
+        host = self.headers.get("host", "localhost")
+        self.base_url = f"{scope.get('scheme', 'http')}://{host}{scope.get('root_path', '')}{self.path}"
+
+    @property
+    def is_json(self) -> bool:
+        """Whether the body is declared as JSON."""
+        mimetype = self.headers.get("content-type", "").split(";")[0].strip()
+        return mimetype == "application/json" or (mimetype.startswith("application/") and mimetype.endswith("+json"))
+
+    def json(self) -> Any:
+        """The JSON body, or None if it is empty or invalid."""
+        try:
+            return json.loads(self.body) if self.body else None
+        except ValueError:
+            return None
+
+
+Body = Union[bytes, Iterator[str], AsyncIterator[str]]
+Reply = Tuple[int, Dict[str, str], Body]
+Handler = Callable[..., Awaitable[Reply]]
+
+
+def json_reply(data: Any, status: int = 200, headers: Optional[Dict[str, str]] = None) -> Reply:
+    """A plain JSON reply."""
+    return status, dict(headers or {}, **{"Content-Type": "application/json"}), dumps_json_bytes(data) + b"\n"
+
+
+def body_reply(request: Request, body: JsonBody) -> Reply:
+    """A JSON (or negotiated binary) reply with ETag, conditional 304 and compression, as on the Flask gateway."""
+    headers = request.headers
+    return render(body, headers.get("accept-encoding"), headers.get("if-none-match"), 200, headers.get("accept"))
+
+
+def list_reply(request: Request, body: JsonBody, id_field: str) -> Reply:
+    """A full body reply, or a projected and paginated page when list parameters are given."""
+    if not is_list_query(request.args):
+        return body_reply(request, body)
+    media_type = negotiate_media_type(request.headers.get("accept"))
+    chunks, headers = list_page(body, id_field, request.args, request.base_url, media_type)
+    headers["Content-Type"] = media_type
+    headers["Vary"] = VARY
+    return 200, headers, chunks
+
+
+# Routes are matched like the Flask gateway's, with the same path syntax
+url_map = Map()
+_handlers: Dict[str, Handler] = {}
+
+
+def route(method: str, path: str) -> Callable[[Handler], Handler]:
+    """Register a handler for a method and a path with ``<name>`` parameters."""
+
+    def register(handler: Handler) -> Handler:
+        url_map.add(Rule(path, methods=[method], endpoint=handler.__name__))
+        _handlers[handler.__name__] = handler
+        return handler
+
+    return register
+
+
+@route("GET", "/")
+async def index(request: Request) -> Reply:
+    return json_reply({"status": "ok", "message": "FOGIS API Gateway"})
+
+
+@route("GET", "/api/swagger.json")
+async def get_swagger(request: Request) -> Reply:
+    return json_reply(spec.to_dict())
+
+
+@route("GET", "/health")
+async def health(request: Request) -> Reply:
+    health_data = {
+        "status": "healthy" if service.client_initialized else "degraded",
+        "timestamp": datetime.now().isoformat(),
+        "service": "fogis-api-client",
+        "version": "1.0.0",
+        "server": "asgi",
+        "dependencies": {"fogis_client": "available" if service.client_initialized else "unavailable"},
+        "upstream": upstream.metrics(),
+    }
+    if service.client_pool is not None:
+        health_data["client_pool"] = service.client_pool.metrics()
+    if service.response_cache is not None:
+        health_data["response_cache"] = service.response_cache.metrics()
+    if admission is not None:
+        health_data["admission"] = admission.metrics()
+    health_data["match_feed"] = match_feed.metrics()
+    health_data["ready"] = warmup.ready
+    return json_reply(health_data)
+
+
+@route("GET", "/ready")
+async def ready(request: Request) -> Reply:
+    status = warmup.status()
+    if status["ready"]:
+        return json_reply(status)
+    return json_reply(status, 503, {"Retry-After": "1"})
+
+
+@route("GET", "/matches")
+async def matches(request: Request) -> Reply:
+    body = await read("matches")
+    return list_reply(request, body, "matchid")
+
+
+@route("GET", "/matches/stream")
+async def matches_stream(request: Request) -> Reply:
+    last_event_id = request.headers.get("last-event-id") or request.args.get("last_event_id")
+
+    async def generate() -> AsyncIterator[str]:
+        yield f"retry: {int(stream_heartbeat * 1000)}\n\n"
+        events = match_feed.subscribe_async(last_event_id, heartbeat=stream_heartbeat)
+        try:
+            async for event in events:
+                yield match_feed.format(event)
+        finally:
+            await events.aclose()
+
+    return 200, {"Content-Type": "text/event-stream", "Cache-Control": "no-cache", "X-Accel-Buffering": "no"}, generate()
+
+
+@route("GET", "/match/<match_id>")
+async def match(request: Request, match_id: str) -> Reply:
+    body = await read("match", match_id=int(match_id))
+    return body_reply(request, body)
+
+
+@route("GET", "/match/<match_id>/result")
+async def match_result(request: Request, match_id: str) -> Reply:
+    return body_reply(request, await read("match_result", match_id=int(match_id)))
+
+
+@route("GET", "/match/<match_id>/events")
+async def match_events(request: Request, match_id: str) -> Reply:
+    body = await read("match_events", match_id=int(match_id))
+    return list_reply(request, body, "matchhandelseid")
+
+
+@route("POST", "/match/<match_id>/events")
+async def report_match_event(request: Request, match_id: str) -> Reply:
+    event_data = request.json() if request.is_json else None
+    if not event_data:
+        return json_reply({"error": "No event data provided"}, 400)
+    return json_reply(await upstream.write(service.write, "report_match_event", int(match_id), event_data))
+
+
+@route("POST", "/match/<match_id>/events/clear")
+async def clear_match_events(request: Request, match_id: str) -> Reply:
+    return json_reply(await upstream.write(service.write, "clear_match_events", int(match_id)))
+
+
+@route("GET", "/match/<match_id>/officials")
+async def match_officials(request: Request, match_id: str) -> Reply:
+    return body_reply(request, await read("match_officials", match_id=int(match_id)))
+
+
+@route("GET", "/team/<team_id>/players")
+async def team_players(request: Request, team_id: str) -> Reply:
+    body = await read("team_players", team_id=int(team_id))
+    return body_reply(request, body)
+
+
+@route("GET", "/team/<team_id>/officials")
+async def team_officials(request: Request, team_id: str) -> Reply:
+    body = await read("team_officials", team_id=int(team_id))
+    return list_reply(request, body, "personid")
+
+
+@route("POST", "/match/<match_id>/finish")
+async def finish_match_report(request: Request, match_id: str) -> Reply:
+    return json_reply(await upstream.write(service.write, "finish_match_report", int(match_id)))
+
+
+@route("POST", "/matches/filter")
+async def filtered_matches(request: Request) -> Reply:
+    match_filter = match_filter_from_request(request.json())
+    matches_list, report = await upstream.run(service.filter_matches, match_filter)
+    return json_reply(matches_list, 200, filter_report_headers(report))
+
+
+@route("POST", "/batch")
+async def batch(request: Request) -> Reply:
+    operations, timeout = parse_batch(request.json())
+    results = await run_batch_async(operations, lambda route, params: read(route, **params), timeout)
+    return body_reply(request, JsonBody({"results": results}))
+
+
+@route("POST", "/mdk/MatchWebMetoder.aspx/<method>")
+async def mdk_proxy(request: Request, method: str) -> Reply:
+    if not service.mdk_proxy_enabled:
+        return json_reply({"error": "Not found"}, 404)
+    call = MdkCall(method, request.body)
+    try:
+        raw = await proxy_mdk_call(call)
+    except ClientPoolError:
+        raise
+    except Exception as e:
+        logger.warning(f"Proxied call to {method} failed: {e}")
+        return json_reply({"error": str(e)}, 502)
+    return 200, {"Content-Type": raw.content_type}, raw.body
+
+
+async def auth_reply(request: Request, handler: Callable[[Any, Any], Tuple[Dict[str, Any], int]]) -> Reply:
+    """Answer an /auth route with its handler from fogis_api_client.gateway.auth, as the Flask blueprint does."""
+    if not request.is_json:
+        data, status = auth.NOT_JSON
+    else:
+        data, status = await upstream.run(handler, auth_cache, request.json())
+    return json_reply(data, status)
+
+
+@route("POST", "/auth/login")
+async def auth_login(request: Request) -> Reply:
+    return await auth_reply(request, auth.login)
+
+
+@route("POST", "/auth/validate")
+async def auth_validate(request: Request) -> Reply:
+    return await auth_reply(request, auth.validate)
+
+
+@route("POST", "/auth/logout")
+async def auth_logout(request: Request) -> Reply:
+    return await auth_reply(request, auth.logout)
+
+
+@route("POST", "/auth/refresh")
+async def auth_refresh(request: Request) -> Reply:
+    return await auth_reply(request, auth.refresh)
+
+
+async def dispatch(request: Request) -> Reply:
+    """
+    Admit a request, route it to its handler and turn errors into JSON replies.
+
+    Args:
+        request: The request
+
+    Returns:
+        Reply: Status, headers and body
+    """
+    controller = admission
+    if controller is None:
+        return await _route_request(request)
+    name = route_class(request.method, request.path)
+    caller = caller_key(request.headers.get("authorization"))
+    try:
+        async with controller.admit_async(name, caller):
+            return await _route_request(request)
+    except AdmissionError as e:
+        logger.warning(f"Request shed: {e}")
+        return json_reply({"error": str(e)}, e.status, {"Retry-After": "1"})
+
+
+async def _route_request(request: Request) -> Reply:
+    try:
+        endpoint, params = url_map.bind("localhost").match(request.path, request.method)
+    except RequestRedirect as e:
+        return json_reply({"error": "Moved"}, 308, {"Location": urlsplit(e.new_url).path})
+    except MethodNotAllowed as e:
+        return json_reply({"error": "Method not allowed"}, 405, {"Allow": ", ".join(e.valid_methods or [])})
+    except NotFound:
+        return json_reply({"error": "Not found"}, 404)
+    try:
+        return await _handlers[endpoint](request, **params)
+    except (BatchError, FilterRequestError, ListQueryError) as e:
+        return json_reply({"error": str(e)}, 400)
+    except MdkProxyError as e:
+        return json_reply({"error": str(e)}, e.status)
+    except ClientPoolError as e:
+        logger.warning(f"Client pool saturated: {e}")
+        return json_reply({"error": str(e)}, 503, {"Retry-After": "1"})
+    except Exception as e:
+        return json_reply({"error": str(e)}, 500)
+
+
+async def _lifespan(receive: Callable, send: Callable) -> None:
+    global _loop
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            logger.info("Starting FOGIS API Gateway (ASGI)...")
+            _loop = asyncio.get_running_loop()
+            end_streams_on_exit()
+            warmup.start()
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            match_feed.stop()
+            await upstream.aclose()
+            upstream.close(wait=False)
+            # The server has finished the requests in flight by now
+            service.hand_off()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def _send_stream(body: AsyncIterator[str], receive: Callable, send: Callable) -> None:
+    # Long-lived streams end when the client disconnects, which only receive() reports
+    async def wait_for_disconnect() -> None:
+        while (await receive())["type"] != "http.disconnect":
+            pass
+
+    disconnected = asyncio.ensure_future(wait_for_disconnect())
+    try:
+        while True:
+            piece = asyncio.ensure_future(body.__anext__())
+            await asyncio.wait({piece, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+            if not piece.done():
+                piece.cancel()
+                await asyncio.wait({piece})
+                break
+            try:
+                text = piece.result()
+            except StopAsyncIteration:
+                await send({"type": "http.response.body", "body": b""})
+                break
+            await send({"type": "http.response.body", "body": text.encode("utf-8"), "more_body": True})
+    finally:
+        disconnected.cancel()
+        await body.aclose()
+
+
+async def app(scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+    """
+    The ASGI application.
+
+    Args:
+        scope: Connection scope
+        receive: Receives request messages
+        send: Sends response messages
+    """
+    if scope["type"] == "lifespan":
+        await _lifespan(receive, send)
+        return
+    if scope["type"] != "http":
+        return
+
+    chunks = []
+    while True:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body"):
+            break
+    request = Request(scope, b"".join(chunks))
+
+    start_time = time.perf_counter()
+    status, headers, body = await dispatch(request)
+    raw_headers = [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers.items()]
+    if isinstance(body, bytes):
+        raw_headers.append((b"content-length", str(len(body)).encode("latin-1")))
+    await send({"type": "http.response.start", "status": status, "headers": raw_headers})
+
+    if request.method == "HEAD":
+        await send({"type": "http.response.body", "body": b""})
+    elif isinstance(body, bytes):
+        await send({"type": "http.response.body", "body": body})
+    elif hasattr(body, "__aiter__"):
+        await _send_stream(body, receive, send)
+    else:
+        for piece in body:
+            await send({"type": "http.response.body", "body": piece.encode("utf-8"), "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+    logger.debug(f"{request.method} {request.path} {status} ({time.perf_counter() - start_time:.3f}s)")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        handlers=[logging.StreamHandler()],
+    )
+    try:
+        import uvicorn
+    except ImportError:
+        raise SystemExit("The ASGI gateway needs an ASGI server: pip install 'fogis-api-client-timmyBird[gateway]'")
+    uvicorn.run(app, host="0.0.0.0", port=8080, log_level="info")
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmark JSON serialisation of the Flask gateway's ``/matches`` route.
+
+The gateway is driven in-process through Flask's test client, with its FOGIS
+client replaced by a fake that returns a synthetic match list at once, so the
+time measured is the gateway's own: routing, serialisation and response
+building.
+
+Each scenario is run with Flask's default JSON provider (the standard library
+encoder, as before ``GatewayJSONProvider``) and with the gateway provider on
+every installed backend:
+
+- ``uncached``: response cache disabled, so every request serialises the list
+- ``cached``: response cache enabled, so the serialised bytes are reused
+- ``page``: ``/matches?limit=100`` pages from the cached list
+
+Usage:
+    python scripts/benchmark_gateway_json.py [--matches N] [--requests N]
+
+Options:
+    --matches N   Matches in the list (default: 2000)
+    --requests N  Requests per scenario (default: 200)
+
+Each cell shows milliseconds per request and the speed-up over the first row.
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+from typing import Any, Dict, List
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from flask.json.provider import DefaultJSONProvider  # noqa: E402
+
+import fogis_api_gateway  # noqa: E402
+from fogis_api_client.gateway import ResponseCache  # noqa: E402
+from fogis_api_client.gateway.json_provider import GatewayJSONProvider, available_backends  # noqa: E402
+
+TEAMS = ["IFK Göteborg", "Örgryte IS", "Hammarby IF", "Malmö FF", "AIK", "Djurgårdens IF", "BK Häcken", "IF Elfsborg"]
+
+
+def make_matches(count: int) -> List[Dict[str, Any]]:
+    """Build a match list shaped like the FOGIS match list."""
+    matches = []
+    for i in range(count):
+        home, away = TEAMS[i % len(TEAMS)], TEAMS[(i * 3 + 1) % len(TEAMS)]
+        matches.append(
+            {
+                "matchid": 6000000 + i,
+                "matchnr": f"{i:06d}",
+                "datum": f"2025-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+                "tid": f"{12 + i % 9}:00",
+                "lag1namn": home,
+                "lag2namn": away,
+                "matchlag1id": 100000 + 2 * i,
+                "matchlag2id": 100001 + 2 * i,
+                "anlaggningnamn": f"{home} Arena, plan {i % 4 + 1}",
+                "tavlingnamn": "Division 2 Västra Götaland, Herrar",
+                "tavlingAlderskategori": 4,
+                "tavlingKonId": 2,
+                "fotbollstypid": 1,
+                "installd": False,
+                "avbruten": False,
+                "uppskjuten": False,
+                "arslutresultat": i % 3 == 0,
+                "goalsLag1": i % 4,
+                "goalsLag2": i % 3,
+                "domaruppdraglista": [
+                    {"personid": 500000 + i, "personnamn": "Åsa Öberg", "domarrollnamn": "Huvuddomare"},
+                    {"personid": 600000 + i, "personnamn": "Erik Ärlig", "domarrollnamn": "Assisterande domare"},
+                ],
+            }
+        )
+    return matches
+
+
+class FastClient:
+    """Stands in for PublicApiClient, returning the match list at once."""
+
+    def __init__(self, matches: List[Dict[str, Any]]) -> None:
+        self.matches = matches
+
+    def fetch_matches_list_json(self, filter_params: Any = None) -> List[Dict[str, Any]]:
+        return self.matches
+
+
+def run(path: str, requests: int, cached: bool) -> float:
+    """Time requests to a path and return the mean milliseconds per request."""
+    fogis_api_gateway.service.response_cache = ResponseCache(max_entries=16) if cached else None
+    http = fogis_api_gateway.app.test_client()
+    assert http.get(path).status_code == 200
+    start = time.perf_counter()
+    for _ in range(requests):
+        http.get(path)
+    return (time.perf_counter() - start) / requests * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark JSON serialisation of the gateway's /matches route")
+    parser.add_argument("--matches", type=int, default=2000, help="Matches in the list (default: 2000)")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario (default: 200)")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    app = fogis_api_gateway.app
+    fogis_api_gateway.service.client = FastClient(make_matches(args.matches))
+    fogis_api_gateway.admission = None
+    scenarios = [("uncached", "/matches", False), ("cached", "/matches", True), ("page", "/matches?limit=100", True)]
+    providers = [("before (stdlib, Flask default)", DefaultJSONProvider(app))]
+    providers += [(f"after ({backend})", GatewayJSONProvider(app, backend)) for backend in available_backends()]
+
+    print(f"/matches with {args.matches} matches, {args.requests} requests per scenario, ms per request")
+    print(f"  {'provider':<32}" + "".join(f"{name:>16}" for name, _, _ in scenarios))
+    baseline: Dict[str, float] = {}
+    for label, provider in providers:
+        app.json = provider
+        row = f"  {label:<32}"
+        for name, path, cached in scenarios:
+            ms = run(path, args.requests, cached)
+            baseline.setdefault(name, ms)
+            row += f"{ms:9.2f} ({baseline[name] / ms:3.1f}x)"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Benchmark total login wall time against the mock FOGIS server.
+
+Runs the ASP.NET and the OAuth login flows repeatedly, once with the fast
+login form extractor and once forcing the BeautifulSoup fallback, and prints
+the median and p95 wall time of a complete ``authenticate()`` call.
+
+The mock login pages are tiny, so the parse cost is also measured on its own
+for a page carrying a production-sized ``__VIEWSTATE``.
+
+The OAuth flow checks for the real ``auth.fogis.se`` and
+``fogis.svenskfotboll.se`` hosts, so requests to those hosts are routed to the
+local mock server by a transport adapter that keeps the public URLs visible
+to the client.
+
+Usage:
+    python scripts/benchmark_login.py [--iterations N] [--port PORT]
+
+Options:
+    --iterations N  Logins per flow and parser (default: 50)
+    --port PORT     First port for the mock servers (default: 5051)
+    --viewstate-kb  Size of the __VIEWSTATE in the parse-only benchmark (default: 40)
+"""
+
+import argparse
+import base64
+import logging
+import os
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List
+from unittest.mock import patch
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from fogis_api_client.internal import auth  # noqa: E402
+from fogis_api_client.internal.form_parser import extract_hidden_inputs  # noqa: E402
+from integration_tests.mock_fogis_server import MockFogisServer  # noqa: E402
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+FOGIS_BASE_URL = "https://fogis.svenskfotboll.se/mdk"
+USERNAME = "test_user"
+PASSWORD = "test_password"
+
+# The mock serves the authorization server under /oauth/* instead of /connect/*
+_OAUTH_PATHS = {"/connect/authorize": "/oauth/authorize"}
+
+
+class MockRoutingAdapter(HTTPAdapter):
+    """Send requests for the real FOGIS hosts to a local mock server."""
+
+    def __init__(self, mock_url: str) -> None:
+        super().__init__()
+        self.mock_netloc = urlsplit(mock_url).netloc
+
+    def _public_url(self, url: str) -> str:
+        parts = urlsplit(url)
+        if parts.netloc != self.mock_netloc:
+            return url
+        path = next((public for public, mock in _OAUTH_PATHS.items() if parts.path == mock), parts.path)
+        host = "auth.fogis.se" if path.startswith(("/oauth", "/connect")) else "fogis.svenskfotboll.se"
+        return urlunsplit(("https", host, path, parts.query, parts.fragment))
+
+    def send(self, request, **kwargs):
+        public_url = request.url
+        parts = urlsplit(public_url)
+        routed = request.copy()
+        routed.url = urlunsplit(("http", self.mock_netloc, _OAUTH_PATHS.get(parts.path, parts.path), parts.query, ""))
+
+        response = super().send(routed, **kwargs)
+        response.url = public_url
+        response.request = request
+        if "Location" in response.headers:
+            response.headers["Location"] = self._public_url(response.headers["Location"])
+        return response
+
+
+def _start_mock_server(port: int, oauth_mode: bool) -> str:
+    server = MockFogisServer(host="localhost", port=port, oauth_mode=oauth_mode)
+    server.run(threaded=True)
+    url = server.get_url()
+    for _ in range(50):
+        try:
+            requests.get(f"{url}/health", timeout=1)
+            return url
+        except requests.exceptions.ConnectionError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Mock server on port {port} did not start")
+
+
+def _login(mock_url: str) -> Dict:
+    session = requests.Session()
+    adapter = MockRoutingAdapter(mock_url)
+    session.mount("https://fogis.svenskfotboll.se/", adapter)
+    session.mount("https://auth.fogis.se/", adapter)
+    return auth.authenticate(session, USERNAME, PASSWORD, FOGIS_BASE_URL)
+
+
+def _time_logins(mock_url: str, iterations: int) -> List[float]:
+    _login(mock_url)  # warm-up
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        _login(mock_url)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def _run(mock_url: str, iterations: int, force_fallback: bool) -> List[float]:
+    if not force_fallback:
+        return _time_logins(mock_url, iterations)
+    with patch.object(auth, "extract_hidden_inputs", return_value=None), patch.object(
+        auth, "extract_first_form", return_value=None
+    ):
+        return _time_logins(mock_url, iterations)
+
+
+def _time_parsing(viewstate_kb: int, iterations: int) -> Dict[str, List[float]]:
+    viewstate = base64.b64encode(os.urandom(viewstate_kb * 768)).decode("ascii")
+    page = (
+        '<html><head><script src="/WebResource.axd"></script></head><body>'
+        '<form method="post" action="./Login.aspx?ReturnUrl=%2fmdk%2f" id="aspnetForm">'
+        f'<input type="hidden" name="__VIEWSTATE" id="__VIEWSTATE" value="{viewstate}" />'
+        '<input type="hidden" name="__EVENTVALIDATION" id="__EVENTVALIDATION" value="/wEdAAW" />'
+        '<input type="text" name="ctl00$MainContent$UserName" />'
+        '<input type="password" name="ctl00$MainContent$Password" />'
+        "</form></body></html>"
+    )
+    parsers = {
+        "fast parser": lambda: extract_hidden_inputs(page),
+        "BeautifulSoup": lambda: BeautifulSoup(page, "html.parser").find_all("input", {"type": "hidden"}),
+    }
+    timings: Dict[str, List[float]] = {}
+    for label, parse in parsers.items():
+        timings[label] = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            parse()
+            timings[label].append(time.perf_counter() - start)
+    return timings
+
+
+def _report(label: str, timings: List[float]) -> None:
+    ordered = sorted(timings)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    print(f"  {label:<14} median {statistics.median(ordered) * 1000:7.2f} ms   p95 {p95 * 1000:7.2f} ms")
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark FOGIS login wall time against the mock server")
+    parser.add_argument("--iterations", type=int, default=50, help="Logins per flow and parser (default: 50)")
+    parser.add_argument("--port", type=int, default=5051, help="First port for the mock servers (default: 5051)")
+    parser.add_argument(
+        "--viewstate-kb", type=int, default=40, help="Size of the __VIEWSTATE in the parse-only benchmark (default: 40)"
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Run the benchmark."""
+    args = parse_args()
+    for name in ("werkzeug", "fogis_api_client", "integration_tests"):
+        logging.getLogger(name).setLevel(logging.ERROR)
+
+    flows: Dict[str, Callable[[], str]] = {
+        "ASP.NET": lambda: _start_mock_server(args.port, oauth_mode=False),
+        "OAuth": lambda: _start_mock_server(args.port + 1, oauth_mode=True),
+    }
+    for flow, start_server in flows.items():
+        mock_url = start_server()
+        print(f"{flow} login ({args.iterations} iterations)")
+        for label, force_fallback in (("fast parser", False), ("BeautifulSoup", True)):
+            _report(label, _run(mock_url, args.iterations, force_fallback))
+
+    print(f"Login page parsing only ({args.viewstate_kb} KB __VIEWSTATE, {args.iterations} iterations)")
+    for label, timings in _time_parsing(args.viewstate_kb, args.iterations).items():
+        _report(label, timings)
+
+
+if __name__ == "__main__":
+    main()
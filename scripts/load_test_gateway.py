@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Compare the Flask and the ASGI gateway under many concurrent slow upstream calls.
+
+Both gateways are started in-process with their FOGIS client replaced by a
+fake whose calls sleep for ``--delay`` seconds, the way a slow FOGIS response
+ties up the caller. The ASGI gateway is measured twice: with its httpx
+transport, against a fake FOGIS that answers after the same delay without a
+thread (needs httpx), and with its thread transport, against the fake client.
+The response cache is disabled, so every request needs an upstream call.
+
+The first run requests ``--keys`` different teams, by default one per
+request, so no two calls are identical and the gateways' raw concurrency is
+measured. A second run spreads the requests over ``--coalesced-keys`` teams,
+so identical concurrent calls can be coalesced by the ASGI gateway; it is
+reported separately.
+
+For each gateway and run the script prints throughput, median and p95
+latency, errors, the number of upstream calls made and the peak number of
+threads in the process.
+
+The Flask gateway runs on Werkzeug's threaded server (what ``app.run`` uses).
+The ASGI gateway needs uvicorn (``pip install 'fogis-api-client-timmyBird[gateway]'``).
+
+Usage:
+    python scripts/load_test_gateway.py [--requests N] [--concurrency N] [--delay S]
+
+Options:
+    --requests N              Total requests per gateway (default: 2000)
+    --concurrency N           Requests in flight at the same time (default: 500)
+    --delay S                 Seconds each upstream call takes (default: 0.2)
+    --keys N                  Different teams requested in the first run, at least the
+                              concurrency (default: one per request)
+    --coalesced-keys N        Different teams requested in the second run, 0 to skip it
+                              (default: 50)
+    --upstream-concurrency N  Upstream calls in flight in the ASGI gateway (default: 32)
+    --port PORT               First port to listen on (default: 5071)
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import fogis_api_gateway  # noqa: E402
+import fogis_api_gateway_asgi  # noqa: E402
+from fogis_api_client.gateway.async_client import AsyncFogisClient  # noqa: E402
+from fogis_api_client.public_api_client import PublicApiClient  # noqa: E402
+
+try:
+    import httpx
+except ImportError:
+    # Without httpx only the ASGI gateway's thread transport is measured
+    httpx = None
+
+logger = logging.getLogger(__name__)
+
+
+class SlowClient:
+    """Stands in for PublicApiClient with a fixed upstream latency."""
+
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def fetch_team_players_json(self, team_id: int) -> Dict[str, Any]:
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return {"spelare": [{"lagspelareid": team_id * 100 + i, "namn": f"Player {i}"} for i in range(20)]}
+
+
+class SlowFogis:
+    """Stands in for FOGIS itself, for the ASGI gateway's httpx transport, with a fixed latency."""
+
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+        self.calls = 0
+
+    async def handle(self, request: Any) -> Any:
+        self.calls += 1
+        team_id = json.loads(request.content)["matchlagid"]
+        await asyncio.sleep(self.delay)
+        players = [{"lagspelareid": team_id * 100 + i, "namn": f"Player {i}"} for i in range(20)]
+        return httpx.Response(200, json={"d": json.dumps({"spelare": players})})
+
+
+class ThreadPeak:
+    """Samples the number of live threads in the background."""
+
+    def __init__(self) -> None:
+        self.peak = threading.active_count()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self) -> None:
+        while not self._stop.wait(0.01):
+            self.peak = max(self.peak, threading.active_count())
+
+    def __enter__(self) -> "ThreadPeak":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+def _start_flask(port: int) -> Callable[[], None]:
+    from werkzeug.serving import make_server
+
+    server = make_server("127.0.0.1", port, fogis_api_gateway.app, threaded=True)
+    server.socket.listen(4096)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server.shutdown
+
+
+def _start_asgi(port: int) -> Callable[[], None]:
+    import uvicorn
+
+    server = uvicorn.Server(
+        uvicorn.Config(fogis_api_gateway_asgi.app, host="127.0.0.1", port=port, log_level="error", backlog=4096)
+    )
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+
+    def stop() -> None:
+        server.should_exit = True
+        thread.join()
+
+    return stop
+
+
+async def _get(port: int, path: str) -> Tuple[int, float]:
+    start = time.perf_counter()
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: 127.0.0.1:{port}\r\nConnection: close\r\n\r\n".encode("ascii"))
+    await writer.drain()
+    status_line = await reader.readline()
+    await reader.read()
+    writer.close()
+    return int(status_line.split()[1]), time.perf_counter() - start
+
+
+async def _load(port: int, requests: int, concurrency: int, keys: int) -> Tuple[float, List[float], int]:
+    slots = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def one(i: int) -> None:
+        nonlocal errors
+        async with slots:
+            try:
+                status, latency = await _get(port, f"/team/{i % keys}/players")
+            except OSError:
+                errors += 1
+                return
+            if status != 200:
+                errors += 1
+            latencies.append(latency)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[one(i) for i in range(requests)])
+    return time.perf_counter() - start, latencies, errors
+
+
+def _run(
+    label: str, start_server: Callable[[int], Callable[[], None]], port: int, keys: int, args: argparse.Namespace
+) -> None:
+    slow = SlowClient(args.delay)
+    fogis_api_gateway.service.client = slow
+    fogis_api_gateway.service.response_cache = None
+    fogis_api_gateway_asgi.service.response_cache = None
+    if label == "ASGI":
+        # Upstream calls are real HTTP requests, answered by the fake FOGIS
+        upstream = SlowFogis(args.delay)
+        fogis_api_gateway_asgi.service.client = PublicApiClient(cookies={"ASP.NET_SessionId": "load-test"})
+        fogis_api_gateway_asgi.upstream = AsyncFogisClient(
+            max_concurrency=args.upstream_concurrency, native=True, http_transport=httpx.MockTransport(upstream.handle)
+        )
+    else:
+        upstream = slow
+        fogis_api_gateway_asgi.service.client = slow
+        fogis_api_gateway_asgi.upstream = AsyncFogisClient(max_concurrency=args.upstream_concurrency, native=False)
+    # Measure the servers themselves; with admission control most of the load would be shed
+    fogis_api_gateway.admission = None
+    fogis_api_gateway_asgi.admission = None
+
+    stop = start_server(port)
+    try:
+        with ThreadPeak() as threads:
+            elapsed, latencies, errors = asyncio.run(_load(port, args.requests, args.concurrency, keys))
+    finally:
+        stop()
+
+    ordered = sorted(latencies) or [0.0]
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    print(
+        f"  {label:<12} {args.requests / elapsed:8.1f} req/s   median {statistics.median(ordered) * 1000:7.1f} ms   "
+        f"p95 {p95 * 1000:7.1f} ms   errors {errors:4d}   upstream calls {upstream.calls:5d}   "
+        f"peak threads {threads.peak:4d}"
+    )
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Load test the Flask and ASGI FOGIS API gateways")
+    parser.add_argument("--requests", type=int, default=2000, help="Total requests per gateway (default: 2000)")
+    parser.add_argument("--concurrency", type=int, default=500, help="Requests in flight at the same time (default: 500)")
+    parser.add_argument("--delay", type=float, default=0.2, help="Seconds each upstream call takes (default: 0.2)")
+    parser.add_argument(
+        "--keys", type=int, default=None, help="Different teams requested in the first run (default: one per request)"
+    )
+    parser.add_argument(
+        "--coalesced-keys", type=int, default=50, help="Different teams requested in the second run, 0 to skip (default: 50)"
+    )
+    parser.add_argument(
+        "--upstream-concurrency", type=int, default=32, help="Upstream threads of the ASGI gateway (default: 32)"
+    )
+    parser.add_argument("--port", type=int, default=5071, help="First port to listen on (default: 5071)")
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Run the load test."""
+    args = parse_args()
+    logging.basicConfig(level=logging.ERROR)
+    for name in ("werkzeug", "fogis_api_gateway", "fogis_api_client"):
+        logging.getLogger(name).setLevel(logging.ERROR)
+
+    # Fewer keys than requests in flight would measure coalescing rather than concurrency
+    keys = max(args.keys or args.requests, args.concurrency)
+    try:
+        import uvicorn  # noqa: F401
+    except ImportError:
+        uvicorn = None
+
+    print(f"{args.requests} requests, {args.concurrency} concurrent, {args.delay * 1000:.0f} ms upstream latency")
+    runs = [(f"{keys} distinct resources, no identical calls", keys)]
+    if args.coalesced_keys:
+        runs.append((f"{args.coalesced_keys} distinct resources, identical calls coalesced", args.coalesced_keys))
+    for number, (title, run_keys) in enumerate(runs):
+        port = args.port + 3 * number
+        print(title)
+        _run("Flask", _start_flask, port, run_keys, args)
+        if uvicorn is None:
+            print("  ASGI         skipped: uvicorn is not installed")
+            continue
+        if httpx is None:
+            print("  ASGI         skipped: httpx is not installed")
+        else:
+            _run("ASGI", _start_asgi, port + 1, run_keys, args)
+        _run("ASGI/threads", _start_asgi, port + 2, run_keys, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -43,6 +43,17 @@ setup_kwargs = {
             "mypy",
             "types-requests",
         ],
+        "session-store": [
+            "cryptography",
+        ],
+        "gateway": [
+            "brotli",
+            "gunicorn",
+            "httpx",
+            "msgpack",
+            "orjson",
+            "uvicorn",
+        ],
         "mock-server": [
             "flask",
             "flask-swagger-ui",
@@ -51,6 +62,11 @@ setup_kwargs = {
             "requests",
         ],
     },
+    "entry_points": {
+        "console_scripts": [
+            "fogis-gateway-serve=fogis_api_client.cli.serve:main",
+        ],
+    },
     "include_package_data": True,
 }
 
@@ -21,7 +21,8 @@ class TestApiGateway(unittest.TestCase):
 
         # Set up mock for the Fogis API client
         self.mock_fogis_client = MagicMock()
-        fogis_api_gateway.client = self.mock_fogis_client
+        fogis_api_gateway.service.client = self.mock_fogis_client
+        fogis_api_gateway.service.response_cache.clear()
 
         # Set up mock responses
         self.mock_fogis_client.hello_world.return_value = "Hello, brave new world!"
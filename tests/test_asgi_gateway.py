@@ -0,0 +1,355 @@
+"""
+Tests for the ASGI variant of the FOGIS API gateway.
+"""
+
+import asyncio
+import json
+import signal
+import threading
+import time
+from unittest.mock import MagicMock, create_autospec, patch
+
+import pytest
+
+import fogis_api_gateway_asgi as gateway
+from fogis_api_client.gateway.admission import READ, WRITE, AdmissionController
+from fogis_api_client.gateway.async_client import AsyncFogisClient
+from fogis_api_client.gateway.change_feed import MatchFeed
+from fogis_api_client.gateway.warmup import Warmup
+from fogis_api_client.public_api_client import FogisLoginError, PublicApiClient
+
+
+async def _request(method, path, body=None, headers=None, query=""):
+    sent = []
+    payload = json.dumps(body).encode("utf-8") if body is not None else b""
+    raw_headers = [(b"host", b"testserver")]
+    if body is not None:
+        raw_headers.append((b"content-type", b"application/json"))
+    raw_headers += [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()]
+    scope = {"type": "http", "method": method, "path": path, "query_string": query.encode(), "headers": raw_headers}
+    messages = [{"type": "http.request", "body": payload, "more_body": False}]
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    await gateway.app(scope, receive, send)
+    start = sent[0]
+    headers = {name.decode(): value.decode() for name, value in start["headers"]}
+    content = b"".join(message.get("body", b"") for message in sent[1:])
+    return start["status"], headers, content
+
+
+def request(method, path, body=None, headers=None, query=""):
+    return asyncio.run(_request(method, path, body, headers, query))
+
+
+@pytest.fixture
+def api(monkeypatch):
+    # Specced, so a route calling a method the client lacks fails here
+    mock = create_autospec(PublicApiClient, instance=True)
+    mock.fetch_matches_list_json.return_value = [{"matchid": 2}, {"matchid": 1}]
+    mock.fetch_match_json.return_value = {"matchid": 1}
+    mock.report_match_event.return_value = {"success": True}
+    # The mock stands in for the whole client, so every call must go through it on the executors
+    monkeypatch.setattr(gateway.upstream, "native", False)
+    original = gateway.service.client
+    gateway.service.client = mock
+    gateway.service.response_cache.clear()
+    try:
+        yield mock
+    finally:
+        gateway.service.client = original
+
+
+def test_index():
+    status, _, content = request("GET", "/")
+    assert status == 200
+    assert json.loads(content) == {"status": "ok", "message": "FOGIS API Gateway"}
+
+
+def test_swagger_spec_is_served():
+    status, _, content = request("GET", "/api/swagger.json")
+    assert status == 200
+    assert "paths" in json.loads(content)
+
+
+def test_matches_with_etag_and_304(api):
+    status, headers, content = request("GET", "/matches")
+    assert status == 200
+    assert json.loads(content) == [{"matchid": 2}, {"matchid": 1}]
+
+    status, _, content = request("GET", "/matches", headers={"If-None-Match": headers["etag"]})
+    assert status == 304
+    assert content == b""
+    api.fetch_matches_list_json.assert_called_once()
+
+
+def test_matches_pagination(api):
+    status, headers, content = request("GET", "/matches", query="limit=1")
+    assert status == 200
+    assert json.loads(content) == [{"matchid": 1}]
+    assert "x-next-cursor" in headers
+    assert headers["link"].startswith("<http://testserver/matches?")
+
+
+def test_write_invalidates_cached_match(api):
+    request("GET", "/match/1")
+    status, _, _ = request("POST", "/match/1/events", body={"eventtyp": 6})
+    request("GET", "/match/1")
+    assert status == 200
+    assert api.fetch_match_json.call_count == 2
+    assert api.report_match_event.call_args.args[0]["matchid"] == 1
+
+
+def test_concurrent_identical_reads_are_coalesced(api):
+    calls = []
+
+    def slow_fetch(match_id):
+        calls.append(match_id)
+        time.sleep(0.05)
+        return {"matchid": match_id}
+
+    api.fetch_match_json.side_effect = slow_fetch
+
+    async def many():
+        return await asyncio.gather(*[_request("GET", "/match/5") for _ in range(50)])
+
+    results = asyncio.run(many())
+    assert all(status == 200 for status, _, _ in results)
+    assert calls == [5]
+
+
+def test_slow_upstream_calls_do_not_need_a_thread_per_request(api):
+    peak = []
+    lock = threading.Lock()
+    active = []
+
+    def slow_fetch(team_id):
+        with lock:
+            active.append(team_id)
+            peak.append(len(active))
+        time.sleep(0.01)
+        with lock:
+            active.remove(team_id)
+        return []
+
+    api.fetch_team_players_json.side_effect = slow_fetch
+
+    async def many():
+        return await asyncio.gather(*[_request("GET", f"/team/{i}/players") for i in range(100)])
+
+    results = asyncio.run(many())
+    assert all(status == 200 for status, _, _ in results)
+    assert max(peak) <= gateway.upstream.max_concurrency
+
+
+def test_errors_become_json(api):
+    api.fetch_match_json.side_effect = RuntimeError("upstream down")
+    status, _, content = request("GET", "/match/9")
+    assert status == 500
+    assert json.loads(content) == {"error": "upstream down"}
+    assert request("GET", "/nowhere")[0] == 404
+    assert request("DELETE", "/matches")[0] == 405
+
+
+@patch("auth_routes.PublicApiClient")
+def test_auth_routes(mock_client):
+    mock_client.return_value.login.return_value = {"cookie": "value"}
+    gateway.auth_cache = gateway.auth_cache_from_env()
+
+    status, _, content = request("POST", "/auth/login", body={"username": "u", "password": "p"})
+    assert status == 200
+    token = json.loads(content)["token"]
+
+    status, _, content = request("POST", "/auth/validate", body={"token": token})
+    assert json.loads(content)["valid"] is True
+    mock_client.return_value.validate_cookies.assert_not_called()
+
+    mock_client.return_value.login.side_effect = FogisLoginError("bad")
+    assert request("POST", "/auth/login", body={"username": "x", "password": "y"})[0] == 401
+    assert request("POST", "/auth/logout", body={})[0] == 400
+
+
+def test_batch_runs_reads_concurrently(api):
+    api.fetch_match_json.side_effect = lambda match_id: {"matchid": match_id}
+
+    status, _, content = request(
+        "POST",
+        "/batch",
+        {"operations": [{"route": "/match/1"}, {"route": "match", "params": {"match_id": 2}}, {"route": "/nope"}]},
+    )
+    malformed, _, _ = request("POST", "/batch", {"operations": []})
+
+    results = json.loads(content)["results"]
+    assert status == 200
+    assert [result["status"] for result in results] == [200, 200, 400]
+    assert [result.get("data") for result in results[:2]] == [{"matchid": 1}, {"matchid": 2}]
+    assert malformed == 400
+
+
+def test_filtered_matches_pushes_filters_to_fogis(api):
+    api.fetch_matches_list_json.return_value = {"matchlista": [{"matchid": 1, "datum": "2025-05-02"}]}
+
+    status, headers, content = request(
+        "POST", "/matches/filter", {"start_date": "2025-05-01", "exclude_genders": "female", "football_type": "futsal"}
+    )
+    invalid, _, _ = request("POST", "/matches/filter", {"start_date": "2025-05-01", "end_date": "2025-04-01"})
+
+    assert status == 200
+    assert json.loads(content) == []
+    assert headers["x-filters-server"] == "start_date,exclude_genders"
+    assert headers["x-filters-local"] == "include_football_types"
+    api.fetch_matches_list_json.assert_called_once_with({"datumFran": "2025-05-01", "kon": [2, 4]})
+    assert invalid == 400
+
+
+def test_saturated_reads_are_shed_but_writes_are_admitted(api, monkeypatch):
+    controller = AdmissionController({READ: 1, WRITE: 1}, queue_size=0)
+    monkeypatch.setattr(gateway, "admission", controller)
+    controller.acquire(READ)
+
+    shed, headers, _ = request("GET", "/matches")
+    written, _, _ = request("POST", "/match/1/events", {"matchhandelsetypid": 6})
+    health, _, content = request("GET", "/health")
+
+    assert shed == 503
+    assert headers["retry-after"] == "1"
+    assert written == 200
+    assert health == 200
+    assert json.loads(content)["admission"]["classes"][READ]["shed_queue_full"] == 1
+    assert controller.metrics()["classes"][WRITE]["in_flight"] == 0
+
+
+def test_msgpack_is_negotiated(api):
+    msgpack = pytest.importorskip("msgpack")
+
+    status, headers, content = request("GET", "/matches", headers={"Accept": "application/msgpack"})
+    _, page_headers, page = request("GET", "/matches", headers={"Accept": "application/msgpack"}, query="limit=1")
+
+    assert status == 200
+    assert headers["content-type"] == "application/msgpack"
+    assert msgpack.unpackb(content) == [{"matchid": 2}, {"matchid": 1}]
+    assert page_headers["content-type"] == "application/msgpack"
+    assert msgpack.unpackb(page) == [{"matchid": 1}]
+
+
+def test_raw_fogis_protocol_is_proxied(api, monkeypatch):
+    monkeypatch.setattr(gateway.service, "mdk_proxy_enabled", True)
+    raw = b'{"d":"[{\\"matchhandelseid\\": 1}]"}'
+    api.post_match_web_method.return_value.content = raw
+    api.post_match_web_method.return_value.headers = {"Content-Type": "application/json; charset=utf-8"}
+    path = "/mdk/MatchWebMetoder.aspx/"
+
+    first = request("POST", path + "GetMatchhandelselista", {"matchid": 1})
+    second = request("POST", path + "GetMatchhandelselista", {"matchid": 1})
+    written, _, _ = request("POST", path + "SparaMatchhandelse", {"matchid": 1})
+    request("POST", path + "GetMatchhandelselista", {"matchid": 1})
+    unknown, _, _ = request("POST", path + "GetEverything", {})
+
+    assert first[0] == second[0] == written == 200
+    assert first[2] == second[2] == raw
+    assert first[1]["content-type"] == "application/json; charset=utf-8"
+    assert api.post_match_web_method.call_count == 3
+    assert unknown == 404
+
+
+def test_reads_and_proxied_calls_are_sent_from_the_event_loop(monkeypatch):
+    httpx = pytest.importorskip("httpx")
+    sent = []
+
+    def fogis(request):
+        sent.append(request.url.path.rsplit("/", 1)[-1])
+        return httpx.Response(200, json={"d": json.dumps({"spelare": [{"lagspelareid": 1}]})})
+
+    upstream = AsyncFogisClient(native=True, http_transport=httpx.MockTransport(fogis))
+    monkeypatch.setattr(gateway, "upstream", upstream)
+    monkeypatch.setattr(gateway.service, "client", PublicApiClient(cookies={"ASP.NET_SessionId": "session"}))
+    monkeypatch.setattr(gateway.service, "mdk_proxy_enabled", True)
+    gateway.service.response_cache.clear()
+    path = "/mdk/MatchWebMetoder.aspx/"
+
+    try:
+        first = request("GET", "/team/7/players")
+        second = request("GET", "/team/7/players")
+        proxied = request("POST", path + "GetMatchdeltagareListaForMatchlag", {"matchlagid": 7})
+        request("POST", path + "SparaMatchdeltagare", {"matchlagid": 7})
+        request("POST", path + "GetMatchdeltagareListaForMatchlag", {"matchlagid": 7})
+    finally:
+        upstream.close()
+
+    assert first[0] == second[0] == proxied[0] == 200
+    assert json.loads(first[2]) == json.loads(second[2]) == {"spelare": [{"lagspelareid": 1}]}
+    assert json.loads(json.loads(proxied[2])["d"]) == {"spelare": [{"lagspelareid": 1}]}
+    assert sent == ["GetMatchdeltagareListaForMatchlag"] * 2 + ["SparaMatchdeltagare", "GetMatchdeltagareListaForMatchlag"]
+    assert upstream.metrics()["calls"] == 0
+
+
+def test_matches_stream_ends_when_client_disconnects(monkeypatch):
+    feed = MatchFeed(MagicMock(return_value=[{"matchid": 7}]), interval=3600)
+    monkeypatch.setattr(gateway, "match_feed", feed)
+
+    async def follow():
+        sent = []
+        disconnect = asyncio.Event()
+        messages = [{"type": "http.request", "body": b"", "more_body": False}]
+
+        async def receive():
+            if messages:
+                return messages.pop(0)
+            await disconnect.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            sent.append(message)
+            if b"event: snapshot" in message.get("body", b""):
+                disconnect.set()
+
+        scope = {"type": "http", "method": "GET", "path": "/matches/stream", "query_string": b"", "headers": []}
+        await asyncio.wait_for(gateway.app(scope, receive, send), 5)
+        return sent
+
+    sent = asyncio.run(follow())
+
+    assert sent[0]["status"] == 200
+    assert (b"content-type", b"text/event-stream") in sent[0]["headers"]
+    assert any(b"event: snapshot" in message.get("body", b"") for message in sent[1:])
+    assert feed.metrics()["subscribers"] == 0
+    feed.stop()
+
+
+def test_ready_reports_warmup(monkeypatch):
+    warmup = Warmup([("login", lambda: None)])
+    monkeypatch.setattr(gateway, "warmup", warmup)
+
+    not_ready, headers, _ = request("GET", "/ready")
+    warmup.run()
+    ready, _, content = request("GET", "/ready")
+
+    assert not_ready == 503 and headers["retry-after"] == "1"
+    assert ready == 200 and json.loads(content)["state"] == "ready"
+
+
+def test_streams_end_as_soon_as_the_server_is_told_to_exit(monkeypatch):
+    feed = MagicMock()
+    monkeypatch.setattr(gateway, "match_feed", feed)
+    calls = []
+
+    def previous(signum, frame):
+        calls.append(signum)
+
+    originals = {signum: signal.signal(signum, previous) for signum in (signal.SIGINT, signal.SIGTERM)}
+    try:
+        gateway.end_streams_on_exit()
+        signal.getsignal(signal.SIGTERM)(signal.SIGTERM, None)
+
+        deadline = time.monotonic() + 5
+        while not feed.stop.called and time.monotonic() < deadline:
+            time.sleep(0.01)
+        feed.stop.assert_called_once_with()
+        assert calls == [signal.SIGTERM]
+    finally:
+        for signum, original in originals.items():
+            signal.signal(signum, original)
@@ -0,0 +1,129 @@
+"""
+Tests for the gateway's asyncio front end to FOGIS.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from fogis_api_client.gateway import async_client
+from fogis_api_client.gateway.async_client import AsyncFogisClient
+from fogis_api_client.public_api_client import FogisAPIRequestError, PublicApiClient
+
+httpx = pytest.importorskip("httpx")
+
+PLAYERS = {"spelare": [{"lagspelareid": 1, "namn": "Player"}]}
+
+
+def _upstream(handler):
+    return AsyncFogisClient(
+        max_concurrency=2, max_write_concurrency=1, native=True, http_transport=httpx.MockTransport(handler)
+    )
+
+
+def _read(upstream, api, call):
+    async def scenario():
+        try:
+            return await upstream.read(api, call)
+        finally:
+            await upstream.aclose()
+
+    try:
+        return asyncio.run(scenario())
+    finally:
+        upstream.close()
+
+
+def test_reads_share_the_session_and_decode_like_the_client():
+    api = PublicApiClient(cookies={"ASP.NET_SessionId": "session"})
+    api.session.headers["Authorization"] = "Bearer token"
+    sent = []
+
+    def handler(request):
+        sent.append(request)
+        return httpx.Response(200, json={"d": json.dumps(PLAYERS)}, headers={"Set-Cookie": ".ASPXAUTH=renewed; Path=/"})
+
+    assert _read(_upstream(handler), api, api.team_players_call("7")) == PLAYERS
+
+    request = sent[0]
+    assert request.url.path == "/mdk/MatchWebMetoder.aspx/GetMatchdeltagareListaForMatchlag"
+    assert json.loads(request.content) == {"matchlagid": 7}
+    assert "ASP.NET_SessionId=session" in request.headers["cookie"]
+    assert request.headers["authorization"] == "Bearer token"
+    assert request.headers["x-requested-with"] == "XMLHttpRequest"
+    # Cookies FOGIS sets land in the requests session, for its own calls and the next async ones
+    assert api.session.cookies.get(".ASPXAUTH") == "renewed"
+
+
+def test_rejected_session_is_renewed_once_and_the_read_retried(monkeypatch):
+    api = PublicApiClient(username="user", password="pass", cookies={"ASP.NET_SessionId": "expired"})
+    sent = []
+
+    def relogin():
+        api.session.cookies.set("ASP.NET_SessionId", "fresh")
+        api._auth_generation += 1
+        return True
+
+    monkeypatch.setattr(api, "_relogin", relogin)
+
+    def handler(request):
+        sent.append(request.headers["cookie"])
+        if "expired" in request.headers["cookie"]:
+            return httpx.Response(302, headers={"Location": "https://fogis.svenskfotboll.se/mdk/Login.aspx"})
+        return httpx.Response(200, json={"d": [{"matchhandelseid": 1}]})
+
+    upstream = _upstream(handler)
+    assert _read(upstream, api, api.match_events_call(1)) == [{"matchhandelseid": 1}]
+    assert ["expired" in cookie for cookie in sent] == [True, False]
+    assert upstream.metrics()["reauthentications"] == 1
+
+
+def test_failed_renewal_and_bad_responses_raise_request_errors(monkeypatch):
+    api = PublicApiClient(cookies={"ASP.NET_SessionId": "expired"})
+    monkeypatch.setattr(api, "_relogin", lambda: False)
+
+    with pytest.raises(FogisAPIRequestError, match="Authentication refresh failed"):
+        _read(_upstream(lambda request: httpx.Response(401)), api, api.match_result_call(1))
+    with pytest.raises(FogisAPIRequestError, match="Request failed"):
+        _read(_upstream(lambda request: httpx.Response(500)), api, api.match_result_call(1))
+    with pytest.raises(FogisAPIRequestError, match="Failed to parse API response"):
+        _read(_upstream(lambda request: httpx.Response(200, content=b"<html>")), api, api.match_result_call(1))
+
+
+def test_identical_reads_in_flight_are_coalesced():
+    api = PublicApiClient(cookies={"ASP.NET_SessionId": "session"})
+    requests_sent = []
+
+    async def handler(request):
+        requests_sent.append(request)
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json={"d": PLAYERS})
+
+    upstream = _upstream(handler)
+
+    async def scenario():
+        call = api.team_players_call(7)
+        results = await asyncio.gather(*[upstream.call_async("team", lambda: upstream.read(api, call)) for _ in range(5)])
+        await upstream.aclose()
+        return results
+
+    try:
+        assert asyncio.run(scenario()) == [PLAYERS] * 5
+    finally:
+        upstream.close()
+    assert len(requests_sent) == 1
+    assert upstream.metrics()["coalesced"] == 4
+
+
+def test_thread_transport_without_httpx(monkeypatch):
+    monkeypatch.setattr(async_client, "httpx", None)
+
+    upstream = AsyncFogisClient()
+    try:
+        assert not upstream.native
+        assert upstream.metrics()["transport"] == "threads"
+    finally:
+        upstream.close()
+    with pytest.raises(ValueError):
+        AsyncFogisClient(native=True)
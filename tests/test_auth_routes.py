@@ -1,10 +1,12 @@
 import json
+import time
 import unittest
 from unittest.mock import patch
 
 from flask import Flask
 
-from auth_routes import register_auth_routes
+from auth_routes import AuthCache, register_auth_routes
+from fogis_api_client.gateway import TTLCache
 from fogis_api_client.public_api_client import FogisLoginError
 
 
@@ -237,5 +239,91 @@ class TestAuthRoutes(unittest.TestCase):
         self.assertEqual(response.status_code, 400)
 
 
+class TestAuthCache(unittest.TestCase):
+    """Test cases for the per-token authentication cache."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.app = Flask(__name__)
+        self.app.config["TESTING"] = True
+        self.cache = AuthCache(ttl=60, invalid_ttl=60)
+        register_auth_routes(self.app, auth_cache=self.cache)
+        self.client = self.app.test_client()
+        self.token = {"FogisMobilDomarKlient.ASPXAUTH": "test_auth_cookie"}
+
+    def _post(self, path, body):
+        return self.client.post(path, data=json.dumps(body), content_type="application/json")
+
+    @patch("auth_routes.PublicApiClient")
+    def test_repeated_validation_is_answered_locally(self, mock_fogis_client):
+        """Only the first check of a token reaches FOGIS."""
+        mock_fogis_client.return_value.validate_cookies.return_value = True
+
+        for path in ["/auth/validate", "/auth/validate", "/auth/refresh"]:
+            self.assertEqual(self._post(path, {"token": self.token}).status_code, 200)
+
+        mock_fogis_client.assert_called_once_with(cookies=self.token)
+        mock_fogis_client.return_value.validate_cookies.assert_called_once()
+
+    @patch("auth_routes.PublicApiClient")
+    def test_clients_share_connection_pool(self, mock_fogis_client):
+        """Cached clients are mounted on the shared adapter."""
+        mock_fogis_client.return_value.validate_cookies.return_value = True
+        self._post("/auth/validate", {"token": self.token})
+        mock_fogis_client.return_value.session.mount.assert_any_call("https://", self.cache._adapter)
+
+    @patch("auth_routes.PublicApiClient")
+    def test_logged_in_token_validates_without_upstream_call(self, mock_fogis_client):
+        """A token issued by /auth/login is known to be valid."""
+        mock_fogis_client.return_value.login.return_value = self.token
+
+        login = self._post("/auth/login", {"username": "user", "password": "pass"})
+        validate = self._post("/auth/validate", {"token": login.get_json()["token"]})
+        again = self._post("/auth/login", {"username": "user", "password": "pass"})
+
+        self.assertTrue(validate.get_json()["valid"])
+        self.assertEqual(again.get_json()["token"], self.token)
+        mock_fogis_client.return_value.validate_cookies.assert_not_called()
+        mock_fogis_client.return_value.login.assert_called_once()
+
+    @patch("auth_routes.PublicApiClient")
+    def test_logout_forgets_token(self, mock_fogis_client):
+        """After logout the next validation goes upstream again."""
+        mock_fogis_client.return_value.validate_cookies.return_value = True
+        self._post("/auth/validate", {"token": self.token})
+        self._post("/auth/logout", {"token": self.token})
+        self._post("/auth/validate", {"token": self.token})
+
+        self.assertEqual(mock_fogis_client.return_value.validate_cookies.call_count, 2)
+
+    def test_fingerprint_does_not_depend_on_key_order(self):
+        """Equal tokens map to the same cache key without storing the token."""
+        key = self.cache.fingerprint({"a": "1", "b": "2"})
+        self.assertEqual(key, self.cache.fingerprint({"b": "2", "a": "1"}))
+        self.assertNotEqual(key, AuthCache().fingerprint({"a": "1", "b": "2"}))
+
+
+class TestTTLCache(unittest.TestCase):
+    """Test cases for the gateway TTL cache."""
+
+    def test_entries_expire(self):
+        cache = TTLCache(ttl=0.01)
+        cache.set("key", "value")
+        self.assertEqual(cache.get("key"), "value")
+        time.sleep(0.02)
+        self.assertIsNone(cache.get("key"))
+        self.assertEqual(len(cache), 0)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = TTLCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,259 @@
+"""
+Tests for the match change feed behind GET /matches/stream.
+"""
+
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+import fogis_api_gateway
+from fogis_api_client.gateway.change_feed import FeedFullError, MatchFeed
+from fogis_api_client.gateway.handoff import Drain
+
+
+def _feed(*lists, history=1000):
+    fetch = MagicMock(side_effect=[list(items) for items in lists])
+    return MatchFeed(fetch, interval=3600, history=history), fetch
+
+
+def _take(events, count):
+    return [next(event for event in events if event is not None) for _ in range(count)]
+
+
+def test_diff_reports_added_changed_and_removed():
+    feed, _ = _feed()
+    previous = {1: {"matchid": 1, "tid": "18:00"}, 2: {"matchid": 2}}
+    current = {1: {"matchid": 1, "tid": "19:00"}, 3: {"matchid": 3}}
+
+    assert feed.diff(previous, current) == [
+        ("changed", {"matchid": 1, "tid": "19:00"}),
+        ("added", {"matchid": 3}),
+        ("removed", {"matchid": 2}),
+    ]
+
+
+def test_first_poll_is_a_snapshot_and_later_polls_publish_changes():
+    feed, _ = _feed([{"matchid": 1}], [{"matchid": 1}, {"matchid": 2}], [{"matchid": 2}])
+
+    assert feed.poll_once() == []
+    assert [(event.type, event.data) for event in feed.poll_once()] == [("added", {"matchid": 2})]
+    assert [(event.type, event.data) for event in feed.poll_once()] == [("removed", {"matchid": 1})]
+
+
+def test_unchanged_list_publishes_nothing():
+    feed, _ = _feed([{"matchid": 1}], [{"matchid": 1}])
+    feed.poll_once()
+
+    assert feed.poll_once() == []
+
+
+def test_poll_errors_keep_the_previous_list():
+    feed, fetch = _feed([{"matchid": 1}])
+    feed.poll_once()
+    fetch.side_effect = RuntimeError("FOGIS is down")
+
+    assert feed.poll_once() == []
+    assert feed.metrics()["poll_errors"] == 1
+    assert feed.metrics()["matches"] == 1
+
+
+def test_subscriber_starts_with_snapshot():
+    feed, _ = _feed([{"matchid": 1}], [{"matchid": 1}, {"matchid": 2}])
+    feed.poll_once()
+    events = feed.subscribe(heartbeat=0.01)
+
+    (snapshot,) = _take(events, 1)
+    feed.poll_once()
+    (added,) = _take(events, 1)
+    events.close()
+
+    assert snapshot.type == "snapshot" and snapshot.data == [{"matchid": 1}]
+    assert added.type == "added" and added.data == {"matchid": 2}
+
+
+def test_reconnect_resumes_after_last_event_id():
+    feed, _ = _feed([], [{"matchid": 1}], [{"matchid": 1}, {"matchid": 2}], [{"matchid": 2}])
+    for _ in range(3):
+        feed.poll_once()
+    seen = feed.event_id(1)
+
+    events = feed.subscribe(seen, heartbeat=0.01)
+    missed = _take(events, 2)
+    events.close()
+
+    assert [(event.type, event.data) for event in missed] == [("added", {"matchid": 2}), ("removed", {"matchid": 1})]
+
+
+@pytest.mark.parametrize("last_event_id", ["someone-else-1", "garbage", None])
+def test_unknown_event_id_gets_a_snapshot(last_event_id):
+    feed, _ = _feed([{"matchid": 1}], [{"matchid": 2}])
+    feed.poll_once()
+    feed.poll_once()
+
+    events = feed.subscribe(last_event_id, heartbeat=0.01)
+    (first,) = _take(events, 1)
+    events.close()
+
+    assert first.type == "snapshot"
+    assert first.data == [{"matchid": 2}]
+
+
+def test_event_outside_history_gets_a_snapshot():
+    feed, _ = _feed([], [{"matchid": 1}], [{"matchid": 2}], history=1)
+    for _ in range(3):
+        feed.poll_once()
+
+    events = feed.subscribe(feed.event_id(1), heartbeat=0.01)
+    (first,) = _take(events, 1)
+    events.close()
+
+    assert first.type == "snapshot"
+
+
+def test_subscribers_share_one_poller():
+    fetch = MagicMock(return_value=[{"matchid": 1}])
+    feed = MatchFeed(fetch, interval=3600)
+    subscribers = [feed.subscribe(heartbeat=0.01) for _ in range(5)]
+
+    snapshots = [_take(events, 1)[0] for events in subscribers]
+
+    assert all(snapshot.type == "snapshot" for snapshot in snapshots)
+    assert fetch.call_count == 1
+    assert feed.metrics()["subscribers"] == 5
+    for events in subscribers:
+        events.close()
+    assert feed.metrics()["subscribers"] == 0
+    feed.stop()
+
+
+def test_poller_stops_without_subscribers():
+    fetch = MagicMock(return_value=[])
+    feed = MatchFeed(fetch, interval=0.01)
+    events = feed.subscribe(heartbeat=0.01)
+    _take(events, 1)
+    events.close()
+
+    deadline = time.monotonic() + 5
+    while feed.metrics()["polling"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not feed.metrics()["polling"]
+    calls = fetch.call_count
+    time.sleep(0.05)
+    assert fetch.call_count == calls
+
+
+def test_async_subscriber_is_woken_by_the_poller():
+    feed, _ = _feed([{"matchid": 1}], [{"matchid": 1, "tid": "19:00"}])
+    feed.poll_once()
+
+    async def follow():
+        received = []
+        events = feed.subscribe_async(heartbeat=5)
+        async for event in events:
+            received.append(event)
+            if len(received) == 1:
+                threading.Thread(target=feed.poll_once).start()
+            if len(received) == 2:
+                break
+        await events.aclose()
+        return received
+
+    snapshot, changed = asyncio.run(asyncio.wait_for(follow(), 5))
+
+    assert snapshot.type == "snapshot"
+    assert changed.type == "changed" and changed.data == {"matchid": 1, "tid": "19:00"}
+    assert feed.metrics()["subscribers"] == 0
+
+
+def test_stop_ends_every_subscription():
+    feed, _ = _feed([{"matchid": 1}])
+    feed.poll_once()
+    events = feed.subscribe(heartbeat=60)
+    _take(events, 1)
+    received = []
+    follower = threading.Thread(target=lambda: received.extend(events))
+    follower.start()
+
+    async def follow():
+        async for _ in feed.subscribe_async(heartbeat=60):
+            threading.Timer(0.05, feed.stop).start()
+        return "ended"
+
+    assert asyncio.run(asyncio.wait_for(follow(), 5)) == "ended"
+    follower.join(5)
+
+    assert not follower.is_alive() and received == []
+    assert feed.metrics()["subscribers"] == 0
+    assert list(feed.subscribe(heartbeat=60)) == []
+
+
+def test_thread_subscribers_are_capped():
+    feed = MatchFeed(MagicMock(return_value=[]), interval=3600, max_sync_subscribers=2)
+    first, second = feed.subscribe(), feed.subscribe()
+
+    with pytest.raises(FeedFullError):
+        feed.subscribe()
+    # Closing a subscription that was never iterated frees its place too
+    first.close()
+    first.close()
+    third = feed.subscribe()
+
+    assert feed.metrics()["sync_subscribers"] == 2
+    second.close()
+    third.close()
+    assert feed.metrics()["subscribers"] == 0
+    feed.stop()
+
+
+def test_stream_endpoint_turns_subscribers_away_when_full(monkeypatch):
+    feed = MatchFeed(MagicMock(return_value=[]), interval=3600, max_sync_subscribers=1)
+    monkeypatch.setattr(fogis_api_gateway, "match_feed", feed)
+    http = fogis_api_gateway.app.test_client()
+
+    streaming = http.get("/matches/stream", buffered=False)
+    turned_away = http.get("/matches/stream")
+    streaming.close()
+
+    assert turned_away.status_code == 503
+    assert turned_away.headers["Retry-After"]
+    assert feed.metrics()["sync_subscribers"] == 0
+    assert http.get("/matches/stream", buffered=False).status_code == 200
+    feed.stop()
+
+
+def test_draining_the_gateway_ends_streams(monkeypatch):
+    feed = MatchFeed(MagicMock(return_value=[{"matchid": 7}]), interval=3600)
+    monkeypatch.setattr(fogis_api_gateway, "match_feed", feed)
+    monkeypatch.setattr(fogis_api_gateway, "drain", Drain())
+    monkeypatch.setattr(fogis_api_gateway.service, "handoff", None)
+    response = fogis_api_gateway.app.test_client().get("/matches/stream", buffered=False)
+    chunks = []
+    reader = threading.Thread(target=lambda: chunks.extend(response.response))
+    reader.start()
+    deadline = time.monotonic() + 5
+    while len(chunks) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert fogis_api_gateway.drain_and_hand_off(5) is True
+    reader.join(5)
+    assert not reader.is_alive()
+    response.close()
+
+
+def test_stream_endpoint_sends_server_sent_events(monkeypatch):
+    feed = MatchFeed(MagicMock(return_value=[{"matchid": 7}]), interval=3600)
+    monkeypatch.setattr(fogis_api_gateway, "match_feed", feed)
+
+    response = fogis_api_gateway.app.test_client().get("/matches/stream", buffered=False)
+    chunks = iter(response.response)
+    retry, snapshot = next(chunks), next(chunks)
+    response.close()
+
+    assert response.mimetype == "text/event-stream"
+    assert response.headers["Cache-Control"] == "no-cache"
+    assert retry.startswith(b"retry: ")
+    assert snapshot == f'id: {feed.event_id(0)}\nevent: snapshot\ndata: [{{"matchid":7}}]\n\n'.encode()
+    feed.stop()
@@ -0,0 +1,168 @@
+"""
+Tests for the multi-account client pool.
+"""
+
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from fogis_api_client.client_pool import ClientPoolError, FairScheduler, FogisClientPool
+from fogis_api_client.session_store import MemorySessionStore
+
+
+def _login_result(username):
+    return {
+        "FogisMobilDomarKlient.ASPXAUTH": f"auth-{username}",
+        "oauth_authenticated": True,
+        "authentication_method": "oauth_hybrid",
+    }
+
+
+@pytest.fixture
+def mock_authenticate():
+    with patch("fogis_api_client.public_api_client.authenticate") as authenticate:
+        authenticate.side_effect = lambda session, username, password, base_url: _login_result(username)
+        yield authenticate
+
+
+def _pool(accounts=3, **kwargs):
+    pool = FogisClientPool(**kwargs)
+    for i in range(accounts):
+        pool.add_account(f"referee{i}", "secret")
+    return pool
+
+
+def test_login_is_lazy_and_happens_once(mock_authenticate):
+    pool = _pool()
+    assert mock_authenticate.call_count == 0
+
+    for _ in range(3):
+        assert pool.call("referee0", lambda client: client.login())["FogisMobilDomarKlient.ASPXAUTH"] == "auth-referee0"
+
+    assert mock_authenticate.call_count == 1
+    metrics = pool.metrics("referee0")
+    assert metrics["requests"] == 3
+    assert metrics["logins"] == 1
+    assert metrics["active"] is True
+    assert pool.metrics("referee1")["active"] is False
+
+
+def test_clients_share_connection_pool_but_not_cookies(mock_authenticate):
+    pool = _pool()
+    with pool.client("referee0") as first, pool.client("referee1") as second:
+        first.login()
+        second.login()
+        assert first.session.get_adapter("https://fogis.svenskfotboll.se") is pool._adapter
+        assert second.session.get_adapter("https://fogis.svenskfotboll.se") is pool._adapter
+        assert first.session.cookies.get("FogisMobilDomarKlient.ASPXAUTH") == "auth-referee0"
+        assert second.session.cookies.get("FogisMobilDomarKlient.ASPXAUTH") == "auth-referee1"
+
+
+def test_concurrent_logins_are_bounded(mock_authenticate):
+    pool = _pool(accounts=8, max_concurrent_logins=2, max_concurrent_requests=8)
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def slow_login(session, username, password, base_url):
+        with lock:
+            active.append(username)
+            peak.append(len(active))
+        time.sleep(0.02)
+        with lock:
+            active.remove(username)
+        return _login_result(username)
+
+    mock_authenticate.side_effect = slow_login
+    threads = [threading.Thread(target=pool.call, args=(name, lambda c: c.login())) for name in pool.accounts]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert mock_authenticate.call_count == 8
+    assert max(peak) <= 2
+
+
+def test_least_recently_used_idle_session_is_evicted(mock_authenticate):
+    store = MemorySessionStore()
+    pool = _pool(max_sessions=2, session_store=store)
+    pool.call("referee0", lambda c: c.login())
+    pool.call("referee1", lambda c: c.login())
+    pool.call("referee0", lambda c: None)
+    pool.call("referee2", lambda c: c.login())
+
+    assert pool.active_sessions == 2
+    assert pool.metrics("referee1")["active"] is False
+    assert pool.metrics("referee1")["evictions"] == 1
+    assert pool.metrics("referee0")["active"] is True
+
+    # The evicted account comes back from the session store without logging in
+    pool.call("referee1", lambda c: c.login())
+    assert mock_authenticate.call_count == 3
+
+
+def test_busy_session_is_not_evicted(mock_authenticate):
+    pool = _pool(max_sessions=1)
+    with pool.client("referee0"):
+        pool.call("referee1", lambda c: None)
+        assert pool.metrics("referee0")["active"] is True
+    assert pool.active_sessions == 1
+
+
+def test_evict_idle():
+    pool = _pool()
+    pool.call("referee0", lambda c: None)
+    assert pool.evict_idle(3600) == 0
+    assert pool.evict_idle(0) == 1
+    assert pool.active_sessions == 0
+
+
+def test_failures_are_counted():
+    pool = _pool()
+    with pytest.raises(RuntimeError):
+        pool.call("referee0", lambda c: (_ for _ in ()).throw(RuntimeError("boom")))
+    assert pool.metrics("referee0")["failures"] == 1
+
+
+def test_unknown_account():
+    with pytest.raises(ClientPoolError):
+        _pool().call("nobody", lambda c: None)
+    with pytest.raises(ClientPoolError):
+        _pool().metrics("nobody")
+
+
+def test_scheduler_serves_accounts_round_robin():
+    scheduler = FairScheduler(1)
+    assert scheduler.acquire("busy")
+    order = []
+
+    def wait(key):
+        scheduler.acquire(key)
+        order.append(key)
+        scheduler.release()
+
+    threads = []
+    for key in ["busy", "busy", "busy", "quiet"]:
+        thread = threading.Thread(target=wait, args=(key,))
+        thread.start()
+        threads.append(thread)
+        while scheduler.waiting < len(threads):
+            time.sleep(0.001)
+
+    scheduler.release()
+    for thread in threads:
+        thread.join()
+
+    assert order == ["busy", "quiet", "busy", "busy"]
+
+
+def test_scheduler_timeout():
+    scheduler = FairScheduler(1)
+    assert scheduler.acquire("a")
+    assert scheduler.acquire("b", timeout=0.01) is False
+    assert scheduler.waiting == 0
+    scheduler.release()
+    assert scheduler.acquire("b", timeout=0.01) is True
@@ -0,0 +1,124 @@
+"""
+Tests for single-flight re-authentication under concurrency.
+"""
+
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from fogis_api_client.public_api_client import FogisAPIRequestError, PublicApiClient
+
+API_URL = f"{PublicApiClient.BASE_URL}/MatchWebMetoder.aspx/GetMatcherAttRapportera"
+THREADS = 8
+
+
+def _response(status_code):
+    response = Mock()
+    response.status_code = status_code
+    response.url = API_URL
+    response.raise_for_status = Mock()
+    return response
+
+
+def _hybrid_login_result(value):
+    return {
+        "FogisMobilDomarKlient.ASPXAUTH": value,
+        "oauth_authenticated": True,
+        "authentication_method": "oauth_hybrid",
+    }
+
+
+def _expired_client():
+    client = PublicApiClient(username="referee", password="secret")
+    client.authentication_method = "oauth_hybrid"
+    client.cookies = {"FogisMobilDomarKlient.ASPXAUTH": "stale"}
+    return client
+
+
+@patch("fogis_api_client.public_api_client.authenticate")
+def test_concurrent_rejections_trigger_one_login(mock_authenticate):
+    client = _expired_client()
+    all_rejected = threading.Barrier(THREADS)
+
+    def request(method, url, **kwargs):
+        if (client.cookies or {}).get("FogisMobilDomarKlient.ASPXAUTH") == "fresh":
+            return _response(200)
+        all_rejected.wait(timeout=5)
+        return _response(401)
+
+    def login(*args):
+        time.sleep(0.05)
+        return _hybrid_login_result("fresh")
+
+    client.session.request = Mock(side_effect=request)
+    mock_authenticate.side_effect = login
+
+    results = []
+    errors = []
+
+    def worker():
+        try:
+            results.append(client._make_authenticated_request("POST", API_URL).status_code)
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert results == [200] * THREADS
+    assert mock_authenticate.call_count == 1
+    assert client._auth_generation == 1
+
+
+@patch("fogis_api_client.public_api_client.authenticate")
+def test_stale_generation_does_not_log_in_again(mock_authenticate):
+    mock_authenticate.return_value = _hybrid_login_result("fresh")
+    client = _expired_client()
+    generation = client._auth_generation
+
+    assert client._reauthenticate(generation) is True
+    assert client._reauthenticate(generation) is True
+    assert mock_authenticate.call_count == 1
+
+
+def test_waiting_for_reauthentication_times_out():
+    client = _expired_client()
+    client.REAUTH_TIMEOUT = 0.05
+    holding = threading.Event()
+    release = threading.Event()
+
+    def hold_lock():
+        with client._auth_lock:
+            holding.set()
+            release.wait(5)
+
+    holder = threading.Thread(target=hold_lock)
+    holder.start()
+    try:
+        assert holding.wait(5)
+        with pytest.raises(FogisAPIRequestError):
+            client._reauthenticate(client._auth_generation)
+    finally:
+        release.set()
+        holder.join()
+
+
+@patch("fogis_api_client.public_api_client.authenticate")
+def test_cold_start_logs_in_once(mock_authenticate):
+    mock_authenticate.side_effect = lambda *args: time.sleep(0.05) or _hybrid_login_result("fresh")
+    client = PublicApiClient(username="referee", password="secret")
+    client.session.request = Mock(return_value=_response(200))
+
+    threads = [threading.Thread(target=client._make_authenticated_request, args=("POST", API_URL)) for _ in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert mock_authenticate.call_count == 1
@@ -0,0 +1,115 @@
+"""
+Tests for the fast login form extractor.
+"""
+
+from unittest.mock import patch
+
+import pytest
+from bs4 import BeautifulSoup
+
+from fogis_api_client.internal.auth import _extract_form_data, _parse_oauth_login_form
+from fogis_api_client.internal.form_parser import extract_first_form, extract_hidden_inputs
+
+ASPNET_PAGE = """
+<html>
+<head>
+    <script>var html = '<input type="hidden" name="__FAKE" value="x" />';</script>
+</head>
+<body>
+    <!-- <input type="hidden" name="__COMMENTED" value="y" /> -->
+    <form method="post" action="./Login.aspx?ReturnUrl=%2fmdk%2f" id="aspnetForm">
+        <input type="hidden" name="__EVENTTARGET" id="__EVENTTARGET" value="" />
+        <input type="hidden" name="__VIEWSTATE" id="__VIEWSTATE"
+            value="/wEPDwUKLTM2&amp;NzE=" />
+        <input type='hidden' name='__VIEWSTATEGENERATOR' value='C2EE9ABB'>
+        <input type="hidden" name="__EVENTVALIDATION" value="a>b" />
+        <input type="text" name="ctl00$MainContent$UserName" />
+        <input type="password" name="ctl00$MainContent$Password" />
+        <input type="submit" name="ctl00$MainContent$LoginButton" value="Logga in" />
+    </form>
+</body>
+</html>
+"""
+
+OAUTH_PAGE = """
+<html>
+<body>
+    <form method="POST" action="/Account/Login?ReturnUrl=%2Fconnect%2Fauthorize%3Fclient_id%3Dfogis&amp;state=abc">
+        <input type="hidden" name="ReturnUrl" value="/connect/authorize?client_id=fogis&amp;state=abc" />
+        <input name="__RequestVerificationToken" type="hidden" value="token-value" />
+        <input type="text" name="Username" />
+        <input type="password" name="Password" />
+        <input type="checkbox" name="RememberMe" value="true" />
+        <input type="submit" value="Logga in" />
+    </form>
+    <form action="/other"><input name="other" value="1" /></form>
+</body>
+</html>
+"""
+
+
+def _soup_hidden_inputs(page):
+    soup = BeautifulSoup(page, "html.parser")
+    return {inp.get("name"): inp.get("value", "") for inp in soup.find_all("input", {"type": "hidden"}) if inp.get("name")}
+
+
+def test_hidden_inputs_match_beautifulsoup():
+    fields = extract_hidden_inputs(ASPNET_PAGE)
+    assert fields == _soup_hidden_inputs(ASPNET_PAGE)
+    assert fields["__VIEWSTATE"] == "/wEPDwUKLTM2&NzE="
+    assert fields["__EVENTVALIDATION"] == "a>b"
+    assert fields["__VIEWSTATEGENERATOR"] == "C2EE9ABB"
+
+
+def test_hidden_inputs_ignore_scripts_and_comments():
+    fields = extract_hidden_inputs(ASPNET_PAGE)
+    assert "__FAKE" not in fields
+    assert "__COMMENTED" not in fields
+
+
+def test_hidden_inputs_missing_required_field():
+    assert extract_hidden_inputs('<input type="hidden" name="__VIEWSTATE" value="v" />') is None
+
+
+def test_first_form_matches_beautifulsoup():
+    action, method, fields = extract_first_form(OAUTH_PAGE)
+    assert action == "/Account/Login?ReturnUrl=%2Fconnect%2Fauthorize%3Fclient_id%3Dfogis&state=abc"
+    assert method == "post"
+    assert fields == {
+        "ReturnUrl": "/connect/authorize?client_id=fogis&state=abc",
+        "__RequestVerificationToken": "token-value",
+        "Username": "",
+        "Password": "",
+        "RememberMe": "true",
+    }
+
+    expected = _extract_form_data(BeautifulSoup(OAUTH_PAGE, "html.parser"), "user", "pass")
+    assert _parse_oauth_login_form(OAUTH_PAGE, "user", "pass") == expected
+
+
+@pytest.mark.parametrize(
+    "page",
+    [
+        "<html><body>No form here</body></html>",
+        '<form action="/a"><input name="x" value="1" />',
+        '<form action="/a"><form action="/b"></form></form>',
+    ],
+)
+def test_unexpected_layout_returns_none(page):
+    assert extract_first_form(page) is None
+
+
+def test_unclosed_form_falls_back_to_beautifulsoup():
+    page = '<form action="/Account/Login"><input type="hidden" name="token" value="t" />'
+    with patch("fogis_api_client.internal.auth.BeautifulSoup", wraps=BeautifulSoup) as soup:
+        form_url, form_method, form_data = _parse_oauth_login_form(page, "user", "pass")
+
+    soup.assert_called_once()
+    assert form_url == "https://auth.fogis.se/Account/Login"
+    assert form_data == {"token": "t", "Username": "user", "Password": "pass", "RememberMe": "false"}
+
+
+def test_fast_path_skips_beautifulsoup():
+    with patch("fogis_api_client.internal.auth.BeautifulSoup") as soup:
+        _parse_oauth_login_form(OAUTH_PAGE, "user", "pass")
+    soup.assert_not_called()
@@ -0,0 +1,251 @@
+"""
+Tests for gateway admission control and load shedding.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+import pytest
+
+import fogis_api_gateway
+from fogis_api_client.gateway.admission import (
+    READ,
+    WRITE,
+    AdmissionController,
+    CallerQuotaError,
+    GatewaySaturatedError,
+    admission_from_env,
+    caller_key,
+    route_class,
+    split_capacity,
+)
+from fogis_api_client.gateway.async_client import AsyncFogisClient
+
+
+def _controller(reads=1, writes=1, queue_size=1, queue_timeout=5.0, caller_limit=0):
+    return AdmissionController({READ: reads, WRITE: writes}, queue_size, queue_timeout, caller_limit)
+
+
+@pytest.fixture
+def api(monkeypatch):
+    mock = MagicMock()
+    monkeypatch.setattr(fogis_api_gateway.service, "client", mock)
+    fogis_api_gateway.service.response_cache.clear()
+    return mock
+
+
+@pytest.mark.parametrize(
+    "method, path, expected",
+    [
+        ("GET", "/matches", READ),
+        ("GET", "/match/1/events", READ),
+        ("POST", "/matches/filter", READ),
+        ("POST", "/batch", READ),
+        ("POST", "/auth/login", READ),
+        ("POST", "/match/1/events", WRITE),
+        ("POST", "/match/1/events/clear", WRITE),
+        ("POST", "/match/1/finish", WRITE),
+        ("GET", "/health", None),
+        ("GET", "/matches/stream", None),
+        ("GET", "/api/docs/", None),
+    ],
+)
+def test_route_class(method, path, expected):
+    assert route_class(method, path) == expected
+
+
+def test_caller_key_hides_the_token():
+    key = caller_key("Bearer secret")
+
+    assert key == caller_key("Bearer secret") != caller_key("Bearer other")
+    assert "secret" not in key
+    assert caller_key(None) is None and caller_key("") is None
+
+
+def test_full_queue_is_shed_at_once():
+    controller = _controller(queue_size=0)
+    controller.acquire(READ)
+
+    with pytest.raises(GatewaySaturatedError):
+        controller.acquire(READ)
+    assert controller.metrics()["classes"][READ]["shed_queue_full"] == 1
+
+
+def test_waiting_request_is_shed_after_the_queue_timeout():
+    controller = _controller(queue_timeout=0.01)
+    controller.acquire(READ)
+
+    with pytest.raises(GatewaySaturatedError):
+        controller.acquire(READ)
+
+    metrics = controller.metrics()["classes"][READ]
+    assert metrics["shed_timeout"] == 1 and metrics["queued"] == 0 and metrics["in_flight"] == 1
+
+
+def test_waiting_request_is_admitted_when_capacity_frees_up():
+    controller = _controller()
+    controller.acquire(READ)
+    admitted = threading.Event()
+
+    def wait():
+        with controller.admit(READ):
+            admitted.set()
+
+    waiter = threading.Thread(target=wait)
+    waiter.start()
+    deadline = time.monotonic() + 5
+    while controller.metrics()["classes"][READ]["queued"] == 0 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    assert not admitted.is_set()
+    controller.release(READ)
+    waiter.join(5)
+
+    metrics = controller.metrics()["classes"][READ]
+    assert admitted.is_set()
+    assert metrics["admitted"] == 2 and metrics["queued_total"] == 1 and metrics["in_flight"] == 0
+
+
+def test_writes_have_capacity_while_reads_are_saturated():
+    controller = _controller(queue_size=0)
+    controller.acquire(READ)
+
+    with pytest.raises(GatewaySaturatedError):
+        controller.acquire(READ)
+    with controller.admit(WRITE):
+        assert controller.metrics()["classes"][WRITE]["in_flight"] == 1
+
+
+def test_default_limits_fit_the_capacity_and_hold_writes_back(monkeypatch):
+    monkeypatch.delenv("GATEWAY_MAX_READS", raising=False)
+    monkeypatch.delenv("GATEWAY_ADMISSION_QUEUE", raising=False)
+    monkeypatch.setenv("GATEWAY_MAX_WRITES", "3")
+
+    assert split_capacity(6) == {READ: 5, WRITE: 1}
+    assert split_capacity(32) == {READ: 24, WRITE: 8}
+    assert split_capacity(1) == {READ: 1, WRITE: 1}
+    controller = admission_from_env(split_capacity(6), queue_size=0)
+    assert (controller.limits, controller.queue_size) == ({READ: 5, WRITE: 3}, 0)
+
+
+def test_caller_quota():
+    controller = _controller(reads=10, caller_limit=2)
+    alice, bob = caller_key("Bearer alice"), caller_key("Bearer bob")
+    controller.acquire(READ, alice)
+    controller.acquire(READ, alice)
+
+    with pytest.raises(CallerQuotaError):
+        controller.acquire(READ, alice)
+    controller.acquire(READ, bob)
+    controller.acquire(READ)
+    controller.release(READ, alice)
+    controller.acquire(READ, alice)
+
+    metrics = controller.metrics()
+    assert metrics["callers"] == 2
+    assert metrics["classes"][READ]["shed_quota"] == 1
+    assert metrics["classes"][READ]["shed"] == 1
+
+
+def test_async_waiter_is_admitted_and_cancelled_waiters_leave_the_queue():
+    controller = _controller(queue_size=2)
+
+    async def scenario():
+        await controller.acquire_async(READ)
+        waiting = asyncio.ensure_future(controller.acquire_async(READ))
+        cancelled = asyncio.ensure_future(controller.acquire_async(READ))
+        await asyncio.sleep(0)
+        assert controller.metrics()["classes"][READ]["queued"] == 2
+        cancelled.cancel()
+        await asyncio.gather(cancelled, return_exceptions=True)
+        assert controller.metrics()["classes"][READ]["queued"] == 1
+        controller.release(READ)
+        await asyncio.wait_for(waiting, 5)
+        controller.release(READ)
+
+    asyncio.run(scenario())
+    metrics = controller.metrics()["classes"][READ]
+    assert metrics["in_flight"] == 0 and metrics["queued"] == 0 and metrics["admitted"] == 2
+
+
+def test_saturated_gateway_sheds_reads_with_retry_after(api, monkeypatch):
+    controller = _controller(queue_size=0)
+    monkeypatch.setattr(fogis_api_gateway, "admission", controller)
+    api.fetch_matches_list_json.return_value = []
+    api.report_match_event.return_value = {"success": True}
+    http = fogis_api_gateway.app.test_client()
+    controller.acquire(READ)
+
+    shed = http.get("/matches")
+    write = http.post("/match/1/events", json={"matchhandelsetypid": 6})
+    health = http.get("/health")
+
+    assert shed.status_code == 503
+    assert shed.headers["Retry-After"] == "1"
+    assert write.status_code == 200
+    assert health.json["admission"]["classes"][READ]["shed_queue_full"] == 1
+    assert health.json["admission"]["classes"][WRITE]["in_flight"] == 0
+    controller.release(READ)
+    assert http.get("/matches").status_code == 200
+
+
+def test_caller_at_quota_gets_429(api, monkeypatch):
+    controller = _controller(reads=10, caller_limit=1)
+    monkeypatch.setattr(fogis_api_gateway, "admission", controller)
+    api.fetch_matches_list_json.return_value = []
+    http = fogis_api_gateway.app.test_client()
+    controller.acquire(READ, caller_key("Bearer busy"))
+
+    limited = http.get("/matches", headers={"Authorization": "Bearer busy"})
+    other = http.get("/matches", headers={"Authorization": "Bearer calm"})
+
+    assert limited.status_code == 429
+    assert limited.headers["Retry-After"] == "1"
+    assert other.status_code == 200
+    assert controller.metrics()["callers"] == 1
+
+
+def test_a_write_gets_a_thread_while_slow_reads_saturate_the_worker(api, monkeypatch):
+    # A threaded worker, like gunicorn's gthread, with the gateway's default limits for its threads
+    threads = 8
+    monkeypatch.setattr(fogis_api_gateway, "admission", admission_from_env(split_capacity(threads - 2), queue_size=0))
+    release = threading.Event()
+    api.fetch_matches_list_json.side_effect = lambda: release.wait(5) and []
+    api.report_match_event.return_value = {"success": True}
+
+    def get(path):
+        return fogis_api_gateway.app.test_client().get(path).status_code
+
+    with ThreadPoolExecutor(max_workers=threads) as worker:
+        reads = [worker.submit(get, "/matches") for _ in range(4 * threads)]
+        write = worker.submit(
+            lambda: fogis_api_gateway.app.test_client().post("/match/1/events", json={"matchhandelsetypid": 6}).status_code
+        )
+
+        assert write.result(timeout=5) == 200
+        assert not release.is_set()
+        release.set()
+        statuses = [read.result(timeout=5) for read in reads]
+
+    assert set(statuses) == {200, 503}
+
+
+def test_upstream_writes_do_not_wait_behind_reads():
+    upstream = AsyncFogisClient(max_concurrency=2, max_write_concurrency=1)
+    release = threading.Event()
+
+    async def scenario():
+        reads = [asyncio.ensure_future(upstream.run(release.wait, 5)) for _ in range(6)]
+        written = await asyncio.wait_for(upstream.write(lambda: "written"), 5)
+        release.set()
+        await asyncio.gather(*reads)
+        return written
+
+    try:
+        assert asyncio.run(scenario()) == "written"
+        assert upstream.metrics()["writes"] == 1
+    finally:
+        release.set()
+        upstream.close()
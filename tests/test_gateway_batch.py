@@ -0,0 +1,158 @@
+"""
+Tests for the gateway's POST /batch endpoint.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+import pytest
+
+import fogis_api_gateway
+from fogis_api_client.client_pool import ClientPoolError
+from fogis_api_client.gateway.batch import BatchError, parse_batch, run_batch
+
+
+@pytest.fixture
+def http():
+    api = MagicMock()
+    api.fetch_match_json.side_effect = lambda match_id: {"matchid": match_id}
+    api.fetch_match_events_json.side_effect = lambda match_id: [{"matchhandelseid": match_id * 10}]
+    api.fetch_match_result_json.return_value = {"hemmamal": 2, "bortamal": 1}
+    api.fetch_team_players_json.return_value = {"spelare": []}
+    original = fogis_api_gateway.service.client
+    fogis_api_gateway.service.client = api
+    fogis_api_gateway.service.response_cache.clear()
+    try:
+        yield fogis_api_gateway.app.test_client()
+    finally:
+        fogis_api_gateway.service.client = original
+
+
+def test_parse_accepts_route_names_and_paths():
+    operations, timeout = parse_batch(
+        {
+            "operations": [
+                {"id": "a", "route": "match_events", "params": {"match_id": "7"}},
+                {"id": "b", "route": "/team/5/players"},
+                {"route": "/matches"},
+            ],
+            "timeout": 5,
+        }
+    )
+
+    assert [(op.id, op.route, op.params) for op in operations] == [
+        ("a", "match_events", {"match_id": 7}),
+        ("b", "team_players", {"team_id": 5}),
+        ("2", "matches", {}),
+    ]
+    assert timeout == 5
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [None, {}, {"operations": []}, {"operations": [{"route": "matches"}] * 1000}, {"operations": [], "timeout": -1}],
+)
+def test_parse_rejects_malformed_batches(payload):
+    with pytest.raises(BatchError):
+        parse_batch(payload)
+
+
+def test_invalid_operations_fail_alone():
+    operations, _ = parse_batch(
+        {"operations": [{"route": "/match/1/finish"}, {"route": "match"}, {"route": "match", "params": {"match_id": "x"}}]}
+    )
+
+    assert [op.error for op in operations] == [
+        "Unsupported route: /match/1/finish",
+        "Missing parameter: match_id",
+        "Parameter match_id must be an integer",
+    ]
+
+
+def test_operations_run_concurrently():
+    operations, _ = parse_batch({"operations": [{"route": "match", "params": {"match_id": i}} for i in range(4)]})
+    barrier = threading.Barrier(4, timeout=5)
+
+    def execute(route, params):
+        barrier.wait()  # only returns once all four are running at the same time
+        return params["match_id"]
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = run_batch(operations, execute, executor, timeout=5)
+
+    assert [result["data"] for result in results] == [0, 1, 2, 3]
+
+
+def test_per_operation_status_and_global_timeout():
+    operations, _ = parse_batch(
+        {
+            "operations": [
+                {"id": "ok", "route": "/match/1"},
+                {"id": "slow", "route": "/match/2"},
+                {"id": "busy", "route": "/match/3"},
+                {"id": "broken", "route": "/match/4"},
+            ]
+        }
+    )
+
+    def execute(route, params):
+        match_id = params["match_id"]
+        if match_id == 2:
+            time.sleep(1)
+        if match_id == 3:
+            raise ClientPoolError("No client available")
+        if match_id == 4:
+            raise ValueError("Upstream error")
+        return {"matchid": match_id}
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        start = time.monotonic()
+        results = run_batch(operations, execute, executor, timeout=0.2)
+        elapsed = time.monotonic() - start
+
+    assert elapsed < 0.9
+    assert [(result["id"], result["status"]) for result in results] == [
+        ("ok", 200),
+        ("slow", 504),
+        ("busy", 503),
+        ("broken", 500),
+    ]
+    assert results[0]["data"] == {"matchid": 1}
+    assert results[3]["error"] == "Upstream error"
+
+
+def test_batch_endpoint(http):
+    response = http.post(
+        "/batch",
+        json={
+            "operations": [
+                {"id": "match", "route": "/match/1"},
+                {"id": "events", "route": "match_events", "params": {"match_id": 1}},
+                {"id": "result", "route": "/match/1/result"},
+                {"id": "bad", "route": "/nope"},
+            ]
+        },
+    )
+
+    assert response.status_code == 200
+    results = {result["id"]: result for result in response.json["results"]}
+    assert results["match"]["data"] == {"matchid": 1}
+    assert results["events"]["data"] == [{"matchhandelseid": 10}]
+    assert results["result"]["data"] == {"hemmamal": 2, "bortamal": 1}
+    assert results["bad"]["status"] == 400
+
+
+def test_batch_shares_the_response_cache(http):
+    http.get("/match/1")
+    http.post("/batch", json={"operations": [{"route": "/match/1"}]})
+
+    fogis_api_gateway.service.client.fetch_match_json.assert_called_once_with(1)
+
+
+def test_malformed_batch_is_rejected(http):
+    response = http.post("/batch", json={"operations": "all"})
+
+    assert response.status_code == 400
+    assert "error" in response.json
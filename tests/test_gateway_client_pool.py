@@ -0,0 +1,104 @@
+"""
+Tests for the gateway's client pool.
+"""
+
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+import fogis_api_gateway
+from fogis_api_client.client_pool import ClientPoolError
+from fogis_api_client.gateway import GatewayClientPool
+
+
+def test_clients_are_created_lazily_and_reused():
+    factory = MagicMock(side_effect=lambda: MagicMock())
+    pool = GatewayClientPool(factory, size=2)
+    assert factory.call_count == 0
+
+    with pool.lease() as first:
+        pass
+    with pool.lease() as second:
+        pass
+
+    assert first is second
+    assert factory.call_count == 1
+    first.session.mount.assert_any_call("https://", pool._adapter)
+
+
+def test_concurrent_requests_get_different_clients():
+    pool = GatewayClientPool(MagicMock, size=2)
+    with pool.lease() as first, pool.lease() as second:
+        assert first is not second
+        assert pool.metrics()["in_use"] == 2
+        assert pool.metrics()["utilization"] == 1.0
+    assert pool.metrics()["idle"] == 2
+
+
+def test_checkout_times_out_when_saturated():
+    pool = GatewayClientPool(MagicMock, size=1)
+    with pool.lease():
+        with pytest.raises(ClientPoolError):
+            pool.checkout(timeout=0.01)
+
+    metrics = pool.metrics()
+    assert metrics["timeouts"] == 1
+    assert metrics["saturated_checkouts"] == 1
+    assert metrics["in_use"] == 0
+
+
+def test_waiting_thread_gets_released_client():
+    pool = GatewayClientPool(MagicMock, size=1)
+    held = pool.checkout()
+    got = []
+    waiter = threading.Thread(target=lambda: got.append(pool.checkout(timeout=5)))
+    waiter.start()
+    while pool.metrics()["waiting"] == 0:
+        time.sleep(0.001)
+
+    pool.checkin(held)
+    waiter.join()
+
+    assert got == [held]
+    assert pool.metrics()["max_wait"] > 0
+
+
+def test_failed_client_creation_frees_the_slot():
+    factory = MagicMock(side_effect=[RuntimeError("boom"), MagicMock()])
+    pool = GatewayClientPool(factory, size=1)
+    with pytest.raises(RuntimeError):
+        pool.checkout()
+    assert pool.checkout(timeout=0.01) is not None
+
+
+@pytest.fixture
+def gateway_with_pool():
+    pooled = MagicMock()
+    pooled.fetch_matches_list_json.return_value = [{"matchid": 1}]
+    pool = GatewayClientPool(lambda: pooled, size=1, checkout_timeout=0.01)
+    original = fogis_api_gateway.service.client_pool
+    fogis_api_gateway.service.client_pool = pool
+    fogis_api_gateway.service.response_cache.clear()
+    try:
+        yield pool, fogis_api_gateway.app.test_client()
+    finally:
+        fogis_api_gateway.service.client_pool = original
+
+
+def test_gateway_routes_use_pooled_client(gateway_with_pool):
+    pool, http = gateway_with_pool
+    response = http.get("/matches")
+    assert response.status_code == 200
+    assert response.json == [{"matchid": 1}]
+    assert pool.metrics()["checkouts"] == 1
+    assert http.get("/health").json["client_pool"]["size"] == 1
+
+
+def test_gateway_returns_503_when_pool_is_saturated(gateway_with_pool):
+    pool, http = gateway_with_pool
+    with pool.lease():
+        response = http.get("/matches")
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
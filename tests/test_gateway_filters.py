@@ -0,0 +1,125 @@
+"""
+Tests for mapping POST /matches/filter bodies onto MatchListFilter.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+import fogis_api_gateway
+from fogis_api_client.enums import AgeCategory, FootballType, Gender, MatchStatus
+from fogis_api_client.gateway.filters import FilterRequestError, filter_report_headers, match_filter_from_request
+from fogis_api_client.match_list_filter import MatchListFilter
+
+
+@pytest.fixture
+def api(monkeypatch):
+    mock = MagicMock()
+    monkeypatch.setattr(fogis_api_gateway.service, "client", mock)
+    return mock
+
+
+def test_body_is_mapped_onto_builder_methods():
+    match_filter = match_filter_from_request(
+        {
+            "start_date": "2025-05-01",
+            "end_date": "2025-05-31",
+            "include_statuses": ["installd", "POSTPONED"],
+            "exclude_age_categories": [4, "veterans"],
+            "include_genders": "female",
+        }
+    )
+
+    assert match_filter.build_payload() == {
+        "datumFran": "2025-05-01",
+        "datumTill": "2025-05-31",
+        "status": ["installd", "uppskjuten"],
+        "alderskategori": [1, 2, 3],
+        "kon": [3],
+    }
+    assert match_filter.filters_by_location() == (
+        ["start_date", "end_date", "include_statuses", "exclude_age_categories", "include_genders"],
+        [],
+    )
+
+
+def test_legacy_field_names_and_values_are_accepted():
+    match_filter = match_filter_from_request(
+        {"from_date": "2025-05-01", "to_date": "2025-05-02", "status": "upcoming", "football_type": "outdoor"}
+    )
+
+    assert match_filter.build_payload() == {"datumFran": "2025-05-01", "datumTill": "2025-05-02", "status": ["ej_startad"]}
+    assert match_filter._fotbollstypid_include == [FootballType.FOOTBALL]
+
+
+@pytest.mark.parametrize(
+    "body, message",
+    [
+        ([], "JSON object"),
+        ({"colour": "red"}, "Unknown filter: colour"),
+        ({"from_date": "2025-05-01", "start_date": "2025-05-01"}, "more than once"),
+        ({"start_date": "01/05/2025"}, "YYYY-MM-DD"),
+        ({"start_date": "2025-05-02", "end_date": "2025-05-01"}, "must not be after"),
+        ({"include_genders": []}, "must not be empty"),
+        ({"exclude_statuses": ["soon"]}, "Invalid exclude_statuses value 'soon'"),
+    ],
+)
+def test_invalid_bodies_are_rejected(body, message):
+    with pytest.raises(FilterRequestError, match=message):
+        match_filter_from_request(body)
+
+
+def test_local_only_filters_are_reported():
+    match_filter = (
+        MatchListFilter()
+        .exclude_statuses([MatchStatus.CANCELLED])
+        .exclude_football_types([FootballType.FUTSAL])
+        .exclude_genders([Gender.MIXED])
+    )
+
+    assert match_filter.build_payload() == {"kon": [2, 3]}
+    assert match_filter.filters_by_location() == (["exclude_genders"], ["exclude_statuses", "exclude_football_types"])
+
+
+def test_fallback_reports_every_filter_as_local():
+    client = MagicMock()
+    client.fetch_matches_list_json.side_effect = [RuntimeError("bad filter"), [{"matchid": 1, "tavlingAlderskategori": 4}]]
+    match_filter = MatchListFilter().start_date("2025-05-01").include_age_categories([AgeCategory.SENIOR])
+
+    matches, report = match_filter.fetch_filtered_matches_with_report(client)
+
+    assert matches == [{"matchid": 1, "tavlingAlderskategori": 4}]
+    assert report == {"server": [], "local": ["start_date", "include_age_categories"]}
+
+
+def test_not_started_matches_are_kept_locally():
+    matches = [{"matchid": 1}, {"matchid": 2, "installd": True}, {"matchid": 3, "arslutresultat": True}]
+
+    assert MatchListFilter().include_statuses([MatchStatus.NOT_STARTED]).filter_matches(matches) == [{"matchid": 1}]
+
+
+def test_report_headers():
+    assert filter_report_headers({"server": ["start_date", "end_date"], "local": []}) == {
+        "X-Filters-Server": "start_date,end_date",
+        "X-Filters-Local": "",
+    }
+
+
+def test_filter_endpoint_pushes_filters_and_reports_them(api):
+    api.fetch_matches_list_json.return_value = {"matchlista": [{"matchid": 1, "tavlingKonId": 3}]}
+    http = fogis_api_gateway.app.test_client()
+
+    response = http.post("/matches/filter", json={"from_date": "2025-05-01", "gender": ["female"]})
+
+    assert response.status_code == 200
+    assert response.json == [{"matchid": 1, "tavlingKonId": 3}]
+    assert response.headers["X-Filters-Server"] == "start_date,include_genders"
+    api.fetch_matches_list_json.assert_called_once_with({"datumFran": "2025-05-01", "kon": [3]})
+
+
+def test_filter_endpoint_rejects_invalid_body(api):
+    response = fogis_api_gateway.app.test_client().post("/matches/filter", json={"gender": "unknown"})
+
+    assert response.status_code == 400
+    assert "gender" in response.json["error"]
+    api.fetch_matches_list_json.assert_not_called()
@@ -0,0 +1,179 @@
+"""
+Tests for graceful shutdown and the hand-off of warm state between gateway processes.
+"""
+
+import glob
+import os
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+import fogis_api_gateway
+from fogis_api_client.gateway import ResponseCache
+from fogis_api_client.gateway.handoff import Drain, Handoff, handoff_from_env
+from fogis_api_client.gateway.mdk_proxy import RawResponse
+from fogis_api_client.gateway.pool import GatewayClientPool
+from fogis_api_client.gateway.responses import JsonBody
+from fogis_api_client.public_api_client import PublicApiClient
+from fogis_api_client.session_store import FileSessionStore, MemorySessionStore
+
+
+def _snapshots(directory):
+    return glob.glob(os.path.join(str(directory), "response-cache-*.jsonl"))
+
+
+def test_drain_waits_for_requests_in_flight():
+    drain = Drain()
+    assert drain.enter() and drain.enter()
+    drain.leave()
+    drain.begin()
+
+    assert not drain.enter()
+    assert drain.wait(0.01) is False
+    threading.Timer(0.05, drain.leave).start()
+    assert drain.wait(5) is True
+    assert drain.in_flight == 0
+
+
+def test_cache_entries_survive_the_hand_off(tmp_path):
+    cache = ResponseCache()
+    cache.put(("match", 1), JsonBody({"matchid": 1, "lag": "Örgryte IS"}), 300, tags=["match:1"])
+    cache.put(("mdk", "GetMatchhandelselista", '{"matchid":1}'), RawResponse(b'{"d":"[]"}'), 30, tags=["match:1"])
+    cache.put(("matches",), JsonBody([]), -5, stale_ttl=60)
+    cache.put(("expired",), JsonBody([]), -5, stale_ttl=1)
+    cache.put(("process-local", object()), JsonBody([]), 300)
+    etag = cache.peek(("match", 1)).etag
+
+    assert Handoff(str(tmp_path)).save(cache) == 3
+    restored = ResponseCache()
+    assert Handoff(str(tmp_path)).load(restored) == 3
+
+    assert restored.peek(("match", 1)).data == {"matchid": 1, "lag": "Örgryte IS"}
+    assert restored.peek(("match", 1)).etag == etag
+    assert restored.peek(("mdk", "GetMatchhandelselista", '{"matchid":1}')).body == b'{"d":"[]"}'
+    assert restored.peek(("matches",)) is None
+    assert restored.get(("matches",), MagicMock(return_value=JsonBody([1])), 60).data == []
+    assert restored.invalidate_tags("match:1") == 2
+    assert _snapshots(tmp_path) == []
+
+
+def test_snapshots_keep_the_hottest_entries_and_merge_across_workers(tmp_path, monkeypatch):
+    cache = ResponseCache()
+    for team_id in range(5):
+        cache.put(("team_players", team_id), JsonBody([team_id]), 300)
+    cache.peek(("team_players", 0))
+    handoff = Handoff(str(tmp_path), max_entries=2)
+    handoff.save(cache)
+    monkeypatch.setattr(os, "getpid", lambda: 99999)
+    other = ResponseCache()
+    other.put(("matches",), JsonBody([]), 60)
+    handoff.save(other)
+    with open(os.path.join(str(tmp_path), "response-cache-1.jsonl"), "wb") as damaged:
+        damaged.write(b"not json\n")
+
+    restored = ResponseCache()
+    assert handoff.load(restored) == 3
+
+    assert {key for key, *_ in restored.entries()} == {("team_players", 0), ("team_players", 4), ("matches",)}
+    assert _snapshots(tmp_path) == []
+
+
+def test_handoff_is_configured_by_the_environment(tmp_path, monkeypatch):
+    pytest.importorskip("cryptography")
+    from cryptography.fernet import Fernet
+
+    monkeypatch.delenv("GATEWAY_SNAPSHOT_DIR", raising=False)
+    assert handoff_from_env() is None
+
+    monkeypatch.setenv("GATEWAY_SNAPSHOT_DIR", str(tmp_path / "gateway"))
+    monkeypatch.setenv("GATEWAY_SNAPSHOT_ENTRIES", "10")
+    assert handoff_from_env().session_store is None
+
+    monkeypatch.setenv("GATEWAY_SESSION_KEY", Fernet.generate_key().decode())
+    handoff = handoff_from_env()
+    assert handoff.max_entries == 10
+    assert isinstance(handoff.session_store, FileSessionStore)
+
+
+def test_the_session_is_saved_for_the_next_process(tmp_path):
+    store = MemorySessionStore()
+    handoff = Handoff(str(tmp_path), session_store=store)
+    client = PublicApiClient(username="user", password="pass", session_store=store)
+    handoff.save_session(client)
+    assert store.load("user") is None
+
+    client.cookies = {"FogisMobilDomarKlient.ASPXAUTH": "cookie"}
+    client.authentication_method = "aspnet"
+    handoff.save_session(client)
+
+    successor = PublicApiClient(username="user", password="pass", session_store=store)
+    assert successor.session_restored
+    assert successor.cookies == {"FogisMobilDomarKlient.ASPXAUTH": "cookie"}
+
+
+def test_a_pooled_session_is_saved_from_an_idle_client(tmp_path):
+    store = MemorySessionStore()
+    handoff = Handoff(str(tmp_path), session_store=store)
+    pool = GatewayClientPool(lambda: PublicApiClient(username="user", password="pass", session_store=store), size=2)
+    busy = pool.checkout()
+    with pool.lease() as idle:
+        idle.cookies = {"FogisMobilDomarKlient.ASPXAUTH": "renewed"}
+        idle.authentication_method = "aspnet"
+
+    handoff.save_pooled_session(pool)
+    pool.checkin(busy)
+
+    assert pool.metrics()["in_use"] == 0
+    successor = PublicApiClient(username="user", password="pass", session_store=store)
+    assert successor.cookies == {"FogisMobilDomarKlient.ASPXAUTH": "renewed"}
+
+
+@pytest.fixture
+def gateway(tmp_path, monkeypatch):
+    monkeypatch.setattr(fogis_api_gateway.service, "client", MagicMock())
+    monkeypatch.setattr(fogis_api_gateway, "drain", Drain())
+    monkeypatch.setattr(fogis_api_gateway.service, "handoff", Handoff(str(tmp_path)))
+    fogis_api_gateway.service.response_cache.clear()
+    return fogis_api_gateway
+
+
+def test_shutdown_drains_requests_and_saves_the_cache(gateway, tmp_path):
+    started, release = threading.Event(), threading.Event()
+
+    def slow_matches():
+        started.set()
+        release.wait(5)
+        return [{"matchid": 1}]
+
+    gateway.service.client.fetch_matches_list_json.side_effect = slow_matches
+    http = gateway.app.test_client()
+    responses = []
+    request = threading.Thread(target=lambda: responses.append(http.get("/matches")))
+    request.start()
+    assert started.wait(5)
+
+    shutdown = threading.Thread(target=gateway.drain_and_hand_off, args=(5,))
+    shutdown.start()
+    deadline = time.monotonic() + 5
+    while not gateway.drain.draining and time.monotonic() < deadline:
+        time.sleep(0.001)
+    turned_away = gateway.app.test_client().get("/matches")
+    assert _snapshots(tmp_path) == []
+    release.set()
+    request.join(5)
+    shutdown.join(5)
+
+    assert turned_away.status_code == 503
+    assert turned_away.headers["Connection"] == "close"
+    assert responses[0].status_code == 200
+    restored = ResponseCache()
+    assert Handoff(str(tmp_path)).load(restored) == 1
+    assert restored.peek(("matches",)).data == [{"matchid": 1}]
+
+
+def test_shutdown_gives_up_on_requests_at_the_deadline(gateway):
+    gateway.drain.enter()
+
+    assert gateway.drain_and_hand_off(0.01) is False
@@ -0,0 +1,118 @@
+"""
+Tests for projection, cursor pagination and streaming on gateway list endpoints.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+import fogis_api_gateway
+from fogis_api_client.gateway import listing
+
+MATCHES = [
+    {"matchid": 3, "datum": "2025-05-02", "hemmalag": "C", "bortalag": "X"},
+    {"matchid": 1, "datum": "2025-05-01", "hemmalag": "A", "bortalag": "Y"},
+    {"matchid": 4, "datum": "2025-05-01", "hemmalag": "D", "bortalag": "Z"},
+    {"matchid": 2, "datum": "2025-05-03", "hemmalag": "B", "bortalag": "W"},
+    {"matchid": 10, "datum": None, "hemmalag": "E", "bortalag": "V"},
+]
+
+
+@pytest.fixture
+def http():
+    api = MagicMock()
+    api.fetch_matches_list_json.return_value = MATCHES
+    original = fogis_api_gateway.service.client
+    fogis_api_gateway.service.client = api
+    fogis_api_gateway.service.response_cache.clear()
+    try:
+        yield fogis_api_gateway.app.test_client()
+    finally:
+        fogis_api_gateway.service.client = original
+
+
+def _walk(http, query):
+    ids, url, pages = [], f"/matches?{query}", 0
+    while url:
+        response = http.get(url)
+        assert response.status_code == 200
+        ids += [match["matchid"] for match in response.json]
+        cursor = response.headers.get("X-Next-Cursor")
+        url = f"/matches?{query}&cursor={cursor}" if cursor else None
+        pages += 1
+    return ids, pages
+
+
+def test_field_projection(http):
+    response = http.get("/matches?fields=matchid,hemmalag")
+    assert response.json[0] == {"matchid": 1, "hemmalag": "A"}
+    assert all(set(match) == {"matchid", "hemmalag"} for match in response.json)
+
+
+def test_cursor_pagination_walks_every_item_once(http):
+    ids, pages = _walk(http, "limit=2")
+    assert ids == [1, 2, 3, 4, 10]
+    assert pages == 3
+
+
+def test_pagination_is_stable_with_ties_and_missing_values(http):
+    ids, _ = _walk(http, "limit=2&sort_by=datum")
+    assert ids == [1, 4, 3, 2, 10]
+
+
+def test_descending_pagination(http):
+    ids, _ = _walk(http, "limit=2&sort_by=datum&order=desc")
+    assert ids == [10, 2, 3, 4, 1]
+
+
+def test_link_header_points_to_next_page(http):
+    response = http.get("/matches?limit=2&fields=matchid")
+    assert response.headers["Link"].endswith('>; rel="next"')
+    assert "fields=matchid" in response.headers["Link"]
+    assert f"cursor={response.headers['X-Next-Cursor']}" in response.headers["Link"]
+
+
+def test_last_page_has_no_cursor(http):
+    response = http.get("/matches?limit=10")
+    assert "X-Next-Cursor" not in response.headers
+    assert len(response.json) == 5
+
+
+def test_list_is_sorted_once_per_cached_body(http):
+    http.get("/matches?limit=1")
+    body = fogis_api_gateway.service.response_cache.get(("matches",), MagicMock(), ttl=60)
+    items, _ = body.derived(("sorted", "matchid", "matchid"), MagicMock(side_effect=AssertionError))
+    assert [match["matchid"] for match in items] == [1, 2, 3, 4, 10]
+
+
+def test_response_is_streamed(http, monkeypatch):
+    monkeypatch.setattr(listing, "STREAM_BATCH_SIZE", 2)
+    response = http.get("/matches?fields=matchid", buffered=False)
+    assert response.is_streamed
+    chunks = list(response.response)
+    assert len(chunks) == 5
+    response.close()
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "limit=0",
+        "limit=abc",
+        "order=up",
+        "cursor=not-a-cursor",
+        "cursor=" + listing.encode_cursor("datum", False, ((0, 1.0), (0, 1.0))),
+        "cursor=" + listing.encode_cursor("matchid", False, ((0, {"x": 1}), (0, 1.0))),
+        "cursor=" + listing.encode_cursor("matchid", False, ((1, 5), (0, 1.0))),
+    ],
+)
+def test_invalid_query_is_rejected(http, query):
+    response = http.get(f"/matches?{query}")
+    assert response.status_code == 400
+    assert "error" in response.json
+
+
+def test_plain_request_keeps_full_response(http):
+    response = http.get("/matches")
+    assert response.json == MATCHES
+    assert "ETag" in response.headers
@@ -0,0 +1,140 @@
+"""
+Tests for ETags, conditional requests and compression in the gateway.
+"""
+
+import gzip
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import fogis_api_gateway
+from fogis_api_client.gateway import responses
+
+MATCHES = [{"matchid": i, "lag1namn": f"Team {i}", "lag2namn": "Opponent"} for i in range(200)]
+
+
+@pytest.fixture
+def http():
+    api = MagicMock()
+    api.fetch_matches_list_json.return_value = MATCHES
+    api.fetch_match_result_json.return_value = {"matchid": 1, "hemmamal": 2}
+    original = fogis_api_gateway.service.client
+    fogis_api_gateway.service.client = api
+    fogis_api_gateway.service.response_cache.clear()
+    try:
+        yield fogis_api_gateway.app.test_client()
+    finally:
+        fogis_api_gateway.service.client = original
+
+
+def test_get_returns_strong_etag(http):
+    first = http.get("/matches")
+    second = http.get("/matches")
+    assert first.status_code == 200
+    assert first.headers["ETag"].startswith('"') and not first.headers["ETag"].startswith("W/")
+    assert first.headers["ETag"] == second.headers["ETag"]
+    assert first.json == MATCHES
+
+
+def test_if_none_match_returns_304(http):
+    etag = http.get("/matches").headers["ETag"]
+    response = http.get("/matches", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.data == b""
+    assert response.headers["ETag"] == etag
+
+
+def test_changed_body_gets_new_etag(http):
+    etag = http.get("/match/1/result").headers["ETag"]
+    fogis_api_gateway.service.client.fetch_match_result_json.return_value = {"matchid": 1, "hemmamal": 3}
+    response = http.get("/match/1/result", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_large_body_is_gzipped_when_accepted(http):
+    plain = http.get("/matches")
+    compressed = http.get("/matches", headers={"Accept-Encoding": "gzip"})
+
+    assert "Content-Encoding" not in plain.headers
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert compressed.headers["Vary"] == responses.VARY
+    assert gzip.decompress(compressed.data) == plain.data
+    assert len(compressed.data) < len(plain.data)
+
+    # Any representation's ETag validates the same body
+    assert http.get("/matches", headers={"If-None-Match": compressed.headers["ETag"]}).status_code == 304
+
+
+def test_small_body_is_not_compressed(http):
+    response = http.get("/match/1/result", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in response.headers
+
+
+def test_brotli_is_preferred_when_available(http):
+    with patch.dict(responses._ENCODERS, {"br": lambda body: b"brotli:" + body}):
+        response = http.get("/matches", headers={"Accept-Encoding": "gzip, br"})
+    assert response.headers["Content-Encoding"] == "br"
+    assert response.headers["ETag"].endswith('-br"')
+
+
+def test_cached_body_is_compressed_once(http):
+    compress = MagicMock(side_effect=gzip.compress)
+    with patch.dict(responses._ENCODERS, {"gzip": compress}):
+        first = http.get("/matches", headers={"Accept-Encoding": "gzip"})
+        second = http.get("/matches", headers={"Accept-Encoding": "gzip"})
+    assert first.data == second.data
+    compress.assert_called_once()
+
+
+def test_msgpack_is_served_when_accepted(http):
+    msgpack = pytest.importorskip("msgpack")
+    plain = http.get("/matches")
+    packed = http.get("/matches", headers={"Accept": "application/msgpack"})
+    alias = http.get("/matches", headers={"Accept": "application/x-msgpack, application/json;q=0.5"})
+
+    assert plain.headers["Content-Type"] == "application/json"
+    assert packed.headers["Content-Type"] == "application/msgpack"
+    assert "Accept" in packed.headers["Vary"]
+    assert msgpack.unpackb(packed.data) == MATCHES
+    assert len(packed.data) < len(plain.data)
+    assert packed.headers["ETag"] == plain.headers["ETag"][:-1] + '-msgpack"'
+    assert alias.data == packed.data
+    assert http.get("/matches", headers={"Accept": "*/*"}).headers["Content-Type"] == "application/json"
+
+    # The ETag of one format validates the others, like compressed variants
+    conditional = http.get("/matches", headers={"Accept": "application/msgpack", "If-None-Match": packed.headers["ETag"]})
+    assert conditional.status_code == 304
+
+
+def test_cached_body_is_packed_once_per_format(http):
+    pytest.importorskip("msgpack")
+    packed = MagicMock(side_effect=responses._SERIALISERS["application/msgpack"])
+    with patch.dict(responses._SERIALISERS, {"application/msgpack": packed}):
+        for _ in range(3):
+            http.get("/matches", headers={"Accept": "application/msgpack", "Accept-Encoding": "gzip"})
+            http.get("/matches")
+
+    packed.assert_called_once_with(MATCHES)
+
+
+def test_msgpack_list_pages_and_batches(http):
+    msgpack = pytest.importorskip("msgpack")
+    headers = {"Accept": "application/msgpack"}
+
+    page = http.get("/matches?limit=2&fields=matchid", headers=headers)
+    batch = http.post("/batch", json={"operations": [{"route": "/match/1/result"}]}, headers=headers)
+
+    assert page.headers["Content-Type"] == "application/msgpack"
+    assert msgpack.unpackb(page.data) == [{"matchid": 0}, {"matchid": 1}]
+    assert page.headers["X-Next-Cursor"]
+    assert batch.headers["Content-Type"] == "application/msgpack"
+    assert msgpack.unpackb(batch.data)["results"][0]["data"] == {"matchid": 1, "hemmamal": 2}
+
+
+def test_cbor_is_served_when_accepted(http):
+    cbor2 = pytest.importorskip("cbor2")
+    response = http.get("/matches", headers={"Accept": "application/cbor"})
+
+    assert response.headers["Content-Type"] == "application/cbor"
+    assert cbor2.loads(response.data) == MATCHES
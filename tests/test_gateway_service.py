@@ -0,0 +1,79 @@
+"""
+Tests for the route logic shared by the Flask and the ASGI gateway.
+"""
+
+from unittest.mock import MagicMock, create_autospec
+
+import pytest
+
+import fogis_api_gateway
+import fogis_api_gateway_asgi
+from fogis_api_client.gateway import ResponseCache, auth
+from fogis_api_client.gateway.service import READ_ROUTES, GatewayService
+from fogis_api_client.public_api_client import PublicApiClient
+
+# Routes only the Flask gateway serves: the Swagger UI, its static files and the debug page
+FLASK_ONLY = {"/api/docs/", "/api/docs/<path:path>", "/static/<path:filename>", "/debug"}
+
+
+@pytest.fixture
+def service():
+    gateway_service = GatewayService("user", "pass", response_cache=ResponseCache())
+    gateway_service.client = MagicMock()
+    return gateway_service
+
+
+def _routes(url_map):
+    return {
+        (rule.rule, method)
+        for rule in url_map.iter_rules()
+        if rule.rule not in FLASK_ONLY
+        for method in rule.methods - {"HEAD", "OPTIONS"}
+    }
+
+
+def test_both_gateways_serve_the_same_routes():
+    assert _routes(fogis_api_gateway.app.url_map) == _routes(fogis_api_gateway_asgi.url_map)
+
+
+def test_cached_reads_are_tagged_by_match(service):
+    service.client.fetch_match_events_json.return_value = [{"matchhandelseid": 1}]
+    service.client.fetch_match_result_json.return_value = {"matchid": 1}
+
+    assert service.read("match_events", match_id=1).data == [{"matchhandelseid": 1}]
+    service.read("match_events", match_id=1)
+    service.read("match_result", match_id=1)
+    service.read("match_result", match_id=1)
+
+    assert service.client.fetch_match_events_json.call_count == 1
+    assert service.client.fetch_match_result_json.call_count == 2
+    assert service.peek(service.read_key("match_events", match_id=1)).data == [{"matchhandelseid": 1}]
+    assert service.response_cache.invalidate_tags("match:1") == 1
+    assert set(READ_ROUTES) >= {"matches", "match", "team_players"}
+
+
+def test_writes_name_their_match_and_invalidate_it(service):
+    # Specced, so a write calling a method the client lacks fails here
+    service.client = create_autospec(PublicApiClient, instance=True)
+    service.client.fetch_match_json.return_value = {"matchid": 1}
+    service.client.report_match_event.return_value = {"success": True}
+    service.read("match", match_id=1)
+
+    assert service.write("report_match_event", 1, {"matchhandelsetypid": 6}) == {"success": True}
+    service.write("report_match_event", 1, {"matchid": 2, "matchhandelsetypid": 6})
+    service.read("match", match_id=1)
+
+    events = [call.args[0] for call in service.client.report_match_event.call_args_list]
+    assert events == [{"matchhandelsetypid": 6, "matchid": 1}, {"matchid": 2, "matchhandelsetypid": 6}]
+    assert service.client.fetch_match_json.call_count == 2
+
+
+def test_auth_handlers_reject_missing_fields():
+    auth_cache = MagicMock()
+
+    assert auth.login(auth_cache, {"username": "u"})[1] == 400
+    assert auth.validate(auth_cache, None) == auth.MISSING_TOKEN
+    assert auth.refresh(auth_cache, {}) == auth.MISSING_TOKEN
+    auth_cache.validate.return_value = False
+    assert auth.refresh(auth_cache, {"token": {"cookie": "value"}})[1] == 401
+    auth_cache.login.assert_not_called()
@@ -0,0 +1,147 @@
+"""
+Tests for gateway start-up warm-up and the /ready endpoint.
+"""
+
+import threading
+from datetime import date
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+
+import fogis_api_gateway
+from fogis_api_client.gateway import GatewayClientPool
+from fogis_api_client.gateway.warmup import Warmup, fogis_host_urls, preconnect, team_ids_playing_on
+
+
+@pytest.fixture
+def api(monkeypatch):
+    mock = MagicMock()
+    monkeypatch.setattr(fogis_api_gateway.service, "client", mock)
+    fogis_api_gateway.service.response_cache.clear()
+    return mock
+
+
+def test_warmup_runs_steps_in_order_and_becomes_ready():
+    calls = []
+    warmup = Warmup([("login", lambda: calls.append("login")), ("prefetch", lambda: {"teams": 2})])
+
+    assert not warmup.ready
+    assert warmup.status()["state"] == "pending"
+    assert warmup.run()
+
+    status = warmup.status()
+    assert warmup.ready
+    assert status["state"] == "ready"
+    assert calls == ["login"]
+    assert [(step["name"], step["status"]) for step in status["steps"]] == [("login", "ok"), ("prefetch", "ok")]
+    assert status["steps"][1]["detail"] == {"teams": 2}
+
+
+def test_failed_step_is_reported_but_does_not_block_readiness():
+    def fail():
+        raise RuntimeError("FOGIS is down")
+
+    warmup = Warmup([("login", fail), ("prefetch", lambda: None)])
+
+    assert not warmup.run()
+    assert warmup.ready
+    steps = warmup.status()["steps"]
+    assert steps[0]["status"] == "failed" and steps[0]["error"] == "FOGIS is down"
+    assert steps[1]["status"] == "ok"
+
+
+def test_warmup_without_steps_is_ready_at_once():
+    assert Warmup().ready
+
+
+def test_start_runs_in_background_once():
+    release = threading.Event()
+    step = MagicMock(side_effect=lambda: release.wait(5))
+    warmup = Warmup([("slow", step)])
+
+    warmup.start()
+    warmup.start()
+    assert not warmup.wait(0.05)
+    assert warmup.status()["state"] == "warming_up"
+    release.set()
+
+    assert warmup.wait(5)
+    step.assert_called_once()
+
+
+def test_team_ids_playing_on_a_day():
+    matches = [
+        {"matchid": 1, "datum": "2025-05-01", "matchlag1id": 11, "matchlag2id": 12},
+        {"matchid": 2, "datum": "2025-05-01 18:00", "matchlag1id": 12, "matchlag2id": 13},
+        {"matchid": 3, "datum": "2025-05-02", "matchlag1id": 14, "matchlag2id": 15},
+    ]
+
+    assert team_ids_playing_on(matches, date(2025, 5, 1)) == [11, 12, 13]
+
+
+def test_preconnect_opens_connections_per_host_and_tolerates_errors():
+    def head(url, **kwargs):
+        if "auth.fogis.se" in url:
+            raise requests.ConnectionError("down")
+        return MagicMock()
+
+    session = MagicMock()
+    session.head.side_effect = head
+
+    assert preconnect(session, fogis_host_urls(), connections=3) == 3
+    assert session.head.call_count == 6
+
+
+def test_pool_prefill_creates_and_prepares_every_client():
+    factory = MagicMock(side_effect=lambda: MagicMock(spec=[]))
+    pool = GatewayClientPool(factory, size=3)
+    prepared = []
+
+    assert pool.prefill(prepared.append) == 3
+    with pool.lease(), pool.lease(), pool.lease():
+        pass
+
+    assert factory.call_count == 3
+    assert len(prepared) == 3
+    assert pool.metrics()["idle"] == 3
+    assert pool.prefill() == 0
+
+
+def test_ready_endpoint_gates_on_warmup(monkeypatch):
+    warmup = Warmup([("login", lambda: None)])
+    monkeypatch.setattr(fogis_api_gateway, "warmup", warmup)
+    http = fogis_api_gateway.app.test_client()
+
+    not_ready = http.get("/ready")
+    assert not_ready.status_code == 503
+    assert not_ready.headers["Retry-After"] == "1"
+    assert not_ready.json["ready"] is False
+    assert http.get("/health").json["ready"] is False
+
+    warmup.run()
+    ready = http.get("/ready")
+    assert ready.status_code == 200
+    assert ready.json["ready"] is True
+
+
+def test_prefetch_fills_the_response_cache(api):
+    today = date.today().isoformat()
+    api.fetch_matches_list_json.return_value = [
+        {"matchid": 1, "datum": today, "matchlag1id": 11, "matchlag2id": 12},
+        {"matchid": 2, "datum": "1999-01-01", "matchlag1id": 13, "matchlag2id": 14},
+    ]
+    api.fetch_team_players_json.return_value = {"spelare": []}
+
+    assert fogis_api_gateway.service.warm_rosters() == {"teams": 2}
+    http = fogis_api_gateway.app.test_client()
+    http.get("/matches")
+    http.get("/team/11/players")
+
+    api.fetch_matches_list_json.assert_called_once()
+    assert sorted(call.args[0] for call in api.fetch_team_players_json.call_args_list) == [11, 12]
+
+
+def test_warm_clients_logs_in(api):
+    assert fogis_api_gateway.service.warm_clients() == {"clients": 1}
+    api.login.assert_called_once()
@@ -3,6 +3,7 @@ from unittest.mock import Mock, patch
 
 # Import the Flask app from the API Gateway
 import fogis_api_client_http_wrapper
+from fogis_api_client.fogis_api_client import FogisApiClient
 
 
 class TestHttpWrapper(unittest.TestCase):
@@ -81,7 +82,7 @@ class TestHttpWrapper(unittest.TestCase):
         # Test with date range parameters
         response = self.client.get("/matches?from_date=2023-01-01&to_date=2023-12-31")
         self.assertEqual(response.status_code, 200)
-        mock_fetch.assert_called_with(filter_params={"datumFran": "2023-01-01", "datumTill": "2023-12-31"})
+        mock_fetch.assert_called_with({"datumFran": "2023-01-01", "datumTill": "2023-12-31"})
 
         # Reset mock for next test
         mock_fetch.reset_mock()
@@ -89,7 +90,7 @@ class TestHttpWrapper(unittest.TestCase):
         # Test with pagination parameters
         response = self.client.get("/matches?limit=10&offset=5")
         self.assertEqual(response.status_code, 200)
-        mock_fetch.assert_called_with(filter_params={})
+        mock_fetch.assert_called_with({})
 
         # Reset mock for next test
         mock_fetch.reset_mock()
@@ -97,7 +98,7 @@ class TestHttpWrapper(unittest.TestCase):
         # Test with sorting parameters
         response = self.client.get("/matches?sort_by=datum&order=desc")
         self.assertEqual(response.status_code, 200)
-        mock_fetch.assert_called_with(filter_params={})
+        mock_fetch.assert_called_with({})
 
     @patch("fogis_api_client_http_wrapper.client.fetch_match_json")
     def test_match_details_endpoint(self, mock_fetch):
@@ -402,25 +403,42 @@ class TestHttpWrapper(unittest.TestCase):
         self.assertEqual(response.json, {"success": True})
         mock_finish.assert_called_once_with("123")
 
-    @patch("fogis_api_client_http_wrapper.MatchListFilter")
-    def test_filtered_matches_endpoint(self, mock_filter_class):
-        """Test the /matches/filter endpoint."""
-        # Set up the mock
-        mock_filter_instance = mock_filter_class.return_value
-        mock_filter_instance.fetch_filtered_matches.return_value = [{"id": "1", "home_team": "Team A", "away_team": "Team B"}]
+    def test_filtered_matches_endpoint(self):
+        """Test that the /matches/filter endpoint sends its filters to FOGIS through the wrapper's client."""
+        # A real client, so a parameter it does not accept fails the test
+        fogis_client = FogisApiClient("user", "pass")
+        fogis_api_client_http_wrapper.client = fogis_client
+        matches = {
+            "matchlista": [
+                {"matchid": 1, "datum": "2023-01-02", "installd": False, "arslutresultat": False},
+                {"matchid": 2, "datum": "2023-01-03", "installd": True, "arslutresultat": False},
+            ]
+        }
 
         # Call the endpoint with filter data
         filter_data = {"from_date": "2023-01-01", "status": "upcoming"}
-        response = self.client.post("/matches/filter", json=filter_data)
+        with patch.object(fogis_client, "_api_request", return_value=matches) as api_request:
+            response = self.client.post("/matches/filter", json=filter_data)
 
         # Verify the response
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(response.json, [{"id": "1", "home_team": "Team A", "away_team": "Team B"}])
+        self.assertEqual([match["matchid"] for match in response.json], [1])
+        self.assertEqual(response.headers["X-Filters-Server"], "start_date,include_statuses")
+        self.assertEqual(response.headers["X-Filters-Local"], "")
 
-        # Verify that the filter properties were set correctly
-        self.assertEqual(mock_filter_instance.from_date, "2023-01-01")
-        self.assertEqual(mock_filter_instance.status, "upcoming")
-        mock_filter_instance.fetch_filtered_matches.assert_called_once_with(fogis_api_client_http_wrapper.client)
+        # Verify that the filters were sent to FOGIS in the request payload
+        api_request.assert_called_once()
+        payload_filter = api_request.call_args.args[1]["filter"]
+        self.assertEqual(payload_filter["datumFran"], "2023-01-01")
+        self.assertEqual(payload_filter["status"], ["ej_startad"])
+
+    def test_filtered_matches_endpoint_rejects_invalid_filter(self):
+        """Test that the /matches/filter endpoint rejects an invalid filter."""
+        response = self.client.post("/matches/filter", json={"status": "sometime"})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("status", response.json["error"])
+        fogis_api_client_http_wrapper.client.fetch_matches_list_json.assert_not_called()
 
 
 if __name__ == "__main__":
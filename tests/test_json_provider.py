@@ -0,0 +1,127 @@
+"""
+Tests for the gateway's JSON provider and backends.
+"""
+
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from flask import Flask, jsonify
+
+from fogis_api_client.gateway.json_provider import (
+    GatewayJSONProvider,
+    available_backends,
+    dumps_bytes,
+    make_encoder,
+    resolve_backend,
+)
+from fogis_api_client.gateway.listing import list_page
+from fogis_api_client.gateway.responses import JsonBody
+
+DATA = {"matchid": 1, "arena": "Gamla Ullevi", "lag": ["IFK Göteborg", "Örgryte IS"], "tid": None, "spelad": False}
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.json = GatewayJSONProvider(app)
+    return app
+
+
+@pytest.mark.parametrize("backend", available_backends())
+def test_backends_write_compact_json_with_sorted_keys(backend):
+    encode = make_encoder(backend)
+    expected = json.dumps(DATA, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+    assert json.loads(encode(DATA)) == DATA
+    assert encode(DATA) == expected.encode("utf-8")
+
+
+def test_every_backend_gives_the_same_bytes_for_non_ascii_text():
+    data = {"lag": "Örgryte IS", "domare": ["Åsa Öberg", "Erik Ärlig"], "ort": "Göteborg ⚽"}
+    # Integers beyond 64 bits make orjson and msgspec fall back to the standard library
+    big = dict(data, id=2**70)
+
+    encoded = {make_encoder(backend)(data) for backend in available_backends()}
+    fallback = {make_encoder(backend)(big) for backend in available_backends()}
+
+    assert encoded == {json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")}
+    assert len(fallback) == 1 and "Örgryte".encode("utf-8") in fallback.pop()
+    assert JsonBody(data).etag == JsonBody(dict(data)).etag
+
+
+@pytest.mark.parametrize("backend", available_backends())
+def test_backends_handle_what_flask_handles(backend):
+    encode = make_encoder(backend)
+    data = {"when": datetime(2025, 5, 1, 18, 0, tzinfo=timezone.utc), "fee": Decimal("1.5")}
+
+    assert json.loads(encode(data)) == {"when": "Thu, 01 May 2025 18:00:00 GMT", "fee": "1.5"}
+    assert encode({2: "two", 1: "one"}) == b'{"1":"one","2":"two"}'
+    assert json.loads(encode({"big": 2**70})) == {"big": 2**70}
+    with pytest.raises(TypeError):
+        encode({"unknown": object()})
+
+
+def test_unavailable_backend_falls_back():
+    assert resolve_backend("no-such-backend") == available_backends()[0]
+    assert resolve_backend("stdlib") == "stdlib"
+
+
+def test_provider_serialises_responses_and_requests(app):
+    @app.route("/echo", methods=["POST"])
+    def echo():
+        return jsonify(sent=app.json.loads(app.json.dumps(DATA)), received=app.json.loads(b'{"b":1,"a":2}'))
+
+    response = app.test_client().post("/echo")
+
+    assert response.mimetype == "application/json"
+    assert response.data.endswith(b"\n")
+    assert response.json == {"sent": DATA, "received": {"a": 2, "b": 1}}
+
+
+def test_provider_response_is_the_encoded_data(app):
+    with app.app_context():
+        response = app.json.response(DATA)
+
+    assert response.get_data() == make_encoder(app.json.backend)(DATA) + b"\n"
+
+
+def test_provider_pretty_prints_in_debug_mode(app):
+    app.debug = True
+    with app.app_context():
+        response = app.json.response(DATA)
+
+    assert b"\n  " in response.get_data()
+    assert json.loads(response.get_data()) == DATA
+
+
+def test_options_are_passed_to_the_default_provider(app):
+    assert app.json.dumps({"a": 1}, indent=2) == '{\n  "a": 1\n}'
+
+
+def test_json_body_is_encoded_once_with_the_fast_backend():
+    body = JsonBody([DATA])
+
+    assert body.body == dumps_bytes([DATA]) + b"\n"
+    assert body.body is body.body
+
+
+def test_list_pages_reuse_encoded_items(app):
+    items = [{"matchid": i, "lag": "Örgryte IS"} for i in range(10)]
+    body = JsonBody(items)
+
+    with app.test_request_context():
+        first, _ = list_page(body, "matchid", {"limit": "4"}, "http://localhost/matches")
+        first_page = "".join(first)
+        encoded = body.derived("encoded_items", dict)
+        cached = dict(encoded)
+        again, _ = list_page(body, "matchid", {"limit": "4"}, "http://localhost/matches")
+        projected, _ = list_page(body, "matchid", {"fields": "matchid"}, "http://localhost/matches")
+
+        assert "".join(again) == first_page
+        assert json.loads(first_page) == items[:4]
+        assert len(cached) == 4
+        assert all(encoded[key] is text for key, text in cached.items())
+        assert json.loads("".join(projected)) == [{"matchid": i} for i in range(10)]
+        assert len(encoded) == 4
@@ -65,7 +65,7 @@ class TestMatchListFilterFetchFilteredMatches(unittest.TestCase):
 
         # Verify
         self.mock_client.fetch_matches_list_json.assert_called_once_with(
-            filter_params={"datumFran": "2025-05-01", "datumTill": "2025-07-31"}
+            {"datumFran": "2025-05-01", "datumTill": "2025-07-31"}
         )
         self.assertEqual(result, self.sample_matches)
 
@@ -144,9 +144,9 @@ class TestMatchListFilterFetchFilteredMatches(unittest.TestCase):
 
         # Verify
         self.assertEqual(len(self.mock_client.fetch_matches_list_json.call_args_list), 2)
-        # First call should have filter_params
+        # First call should pass the server-side filter
         first_call = self.mock_client.fetch_matches_list_json.call_args_list[0]
-        self.assertIn("filter_params", first_call.kwargs)
+        self.assertEqual(first_call.args, ({"datumFran": "2025-05-01"},))
         # Second call should have no parameters (fallback)
         second_call = self.mock_client.fetch_matches_list_json.call_args_list[1]
         self.assertEqual(len(second_call.args), 0)
@@ -193,7 +193,7 @@ class TestMatchListFilterFetchFilteredMatches(unittest.TestCase):
             "alderskategori": [AgeCategory.SENIOR.value],
             "kon": [Gender.MALE.value],
         }
-        self.mock_client.fetch_matches_list_json.assert_called_once_with(filter_params=expected_payload)
+        self.mock_client.fetch_matches_list_json.assert_called_once_with(expected_payload)
 
         # Verify filtering - should only return matches that meet all criteria
         self.assertEqual(len(result), 1)
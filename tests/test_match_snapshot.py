@@ -0,0 +1,101 @@
+"""
+Tests for the memory-mapped match list snapshot.
+"""
+
+import os
+from unittest.mock import Mock
+
+import pytest
+
+from fogis_api_client.match_snapshot import (
+    MatchListSnapshot,
+    MatchSnapshotError,
+    refresh_match_snapshot,
+    write_match_snapshot,
+)
+
+MATCHES = [
+    {"matchid": 300, "lag1namn": "Malmö FF", "lag2namn": "AIK", "datum": "2025-05-01"},
+    {"matchid": 100, "lag1namn": "IFK Göteborg", "lag2namn": "Hammarby", "datum": "2025-05-02"},
+    {"matchid": 200, "lag1namn": "Djurgården", "lag2namn": "BK Häcken", "datum": "2025-05-03"},
+]
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    path = str(tmp_path / "matches.snap")
+    write_match_snapshot(path, MATCHES)
+    return path
+
+
+def test_lookup_by_matchid(snapshot_path):
+    with MatchListSnapshot(snapshot_path) as snapshot:
+        assert len(snapshot) == 3
+        assert snapshot.get(100) == MATCHES[1]
+        assert snapshot.get(999) is None
+        assert 200 in snapshot
+        assert 999 not in snapshot
+        assert snapshot.match_ids() == [100, 200, 300]
+
+
+def test_iteration_preserves_list_order(snapshot_path):
+    with MatchListSnapshot(snapshot_path) as snapshot:
+        assert snapshot.matches() == MATCHES
+
+
+def test_get_raw_returns_encoded_record(snapshot_path):
+    with MatchListSnapshot(snapshot_path) as snapshot:
+        raw = snapshot.get_raw(300)
+        assert raw.startswith(b"{")
+        assert "Malmö".encode("utf-8") in raw
+
+
+def test_empty_snapshot(tmp_path):
+    path = str(tmp_path / "empty.snap")
+    assert write_match_snapshot(path, []) == 0
+    with MatchListSnapshot(path) as snapshot:
+        assert len(snapshot) == 0
+        assert snapshot.matches() == []
+        assert snapshot.get(1) is None
+
+
+def test_reload_picks_up_replaced_file(snapshot_path):
+    snapshot = MatchListSnapshot(snapshot_path)
+    assert snapshot.reload_if_changed() is False
+
+    write_match_snapshot(snapshot_path, [{"matchid": 400, "lag1namn": "Nytt lag"}])
+    assert snapshot.reload_if_changed() is True
+    assert len(snapshot) == 1
+    assert snapshot.get(400)["lag1namn"] == "Nytt lag"
+    assert snapshot.get(100) is None
+    snapshot.close()
+
+
+def test_atomic_write_leaves_no_temporary_files(snapshot_path):
+    write_match_snapshot(snapshot_path, MATCHES[:1])
+    assert os.listdir(os.path.dirname(snapshot_path)) == ["matches.snap"]
+
+
+def test_write_rejects_match_without_id(tmp_path):
+    path = str(tmp_path / "bad.snap")
+    with pytest.raises(MatchSnapshotError):
+        write_match_snapshot(path, [{"lag1namn": "No id"}])
+    assert not os.path.exists(path)
+
+
+def test_open_rejects_foreign_file(tmp_path):
+    path = tmp_path / "not_a_snapshot"
+    path.write_bytes(b"x" * 64)
+    with pytest.raises(MatchSnapshotError):
+        MatchListSnapshot(str(path))
+
+
+def test_refresh_match_snapshot_uses_client(tmp_path):
+    client = Mock()
+    client.fetch_matches_list_json.return_value = MATCHES
+    path = str(tmp_path / "matches.snap")
+
+    assert refresh_match_snapshot(client, path, filter_params={"datumFran": "2025-05-01"}) == 3
+    client.fetch_matches_list_json.assert_called_once_with(filter_params={"datumFran": "2025-05-01"})
+    with MatchListSnapshot(path) as snapshot:
+        assert snapshot.get(200) == MATCHES[2]
@@ -0,0 +1,178 @@
+"""
+Tests for the raw FOGIS protocol proxy.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+import fogis_api_gateway
+from fogis_api_client.gateway.admission import READ, WRITE, route_class
+from fogis_api_client.gateway.mdk_proxy import MdkCall, MdkProxyError, UnknownMethodError
+from fogis_api_client.public_api_client import FogisAPIRequestError, PublicApiClient
+
+EVENTS = b'{"d":"[{\\"matchhandelseid\\": 1, \\"matchid\\": 42}]"}'
+PLAYERS = b'{"d":"{\\"spelare\\": []}"}'
+
+
+def _upstream(method, body):
+    response = MagicMock()
+    response.content = {"GetMatchhandelselista": EVENTS, "GetMatchdeltagareListaForMatchlag": PLAYERS}.get(
+        method, b'{"d":"{\\"success\\": true}"}'
+    )
+    response.headers = {"Content-Type": "application/json; charset=utf-8"}
+    return response
+
+
+@pytest.fixture
+def api(monkeypatch):
+    mock = MagicMock()
+    mock.post_match_web_method.side_effect = _upstream
+    mock.fetch_match_events_json.return_value = [{"matchhandelseid": 1}]
+    monkeypatch.setattr(fogis_api_gateway.service, "client", mock)
+    monkeypatch.setattr(fogis_api_gateway.service, "mdk_proxy_enabled", True)
+    fogis_api_gateway.service.response_cache.clear()
+    return mock
+
+
+@pytest.fixture
+def http():
+    return fogis_api_gateway.app.test_client()
+
+
+def _post(http, method, body):
+    return http.post(f"/mdk/MatchWebMetoder.aspx/{method}", data=body, content_type="application/json")
+
+
+def test_calls_are_parsed_and_keyed_by_content():
+    call = MdkCall("GetMatchhandelselista", b'{ "matchid": 42 }')
+
+    assert call.is_read and call.route == "match_events"
+    assert call.key == MdkCall("GetMatchhandelselista", b'{"matchid":42}').key
+    assert call.key != MdkCall("GetMatchhandelselista", b'{"matchid":43}').key
+    assert call.tags == ["mdk:GetMatchhandelselista", "match:42"]
+    with pytest.raises(UnknownMethodError):
+        MdkCall("GetEverything", b"{}")
+    with pytest.raises(MdkProxyError):
+        MdkCall("GetMatchhandelselista", b"[1]")
+
+
+@pytest.mark.parametrize(
+    "method, body, tags",
+    [
+        ("SparaMatchhandelse", b'{"matchid": 42, "matchhandelsetypid": 6}', ["match:42", "matches"]),
+        (
+            "RaderaMatchhandelse",
+            b'{"matchhandelseid": 7}',
+            ["mdk:GetMatchhandelselista", "route:match_events", "mdk:GetMatchresultatlista", "route:match_result"],
+        ),
+        ("ClearMatchEvents", b'{"matchid": 42}', ["match:42", "matches"]),
+        (
+            "SparaMatchresultatLista",
+            b'{"matchresultatListaJSON": [{"matchid": 42, "matchlag1mal": 2}, {"matchid": 42, "matchlag1mal": 1}]}',
+            ["match:42", "matches"],
+        ),
+        ("SparaMatchGodkannDomarrapport", b'{"matchid": 42}', ["match:42", "matches"]),
+        (
+            "SparaMatchdeltagare",
+            b'{"matchdeltagareid": 9, "trojnummer": 10}',
+            ["mdk:GetMatchdeltagareListaForMatchlag", "route:team_players"],
+        ),
+        (
+            "SparaMatchlagledare",
+            b'{"matchid": 42, "lagid": 5, "personid": 3}',
+            ["match:42", "matches", "mdk:GetMatchlagledareListaForMatchlag", "route:team_officials"],
+        ),
+    ],
+)
+def test_each_write_invalidates_what_it_may_change(method, body, tags):
+    assert MdkCall(method, body).invalidates() == tags
+
+
+def test_match_is_only_taken_from_a_nested_list_naming_one_match():
+    mixed = b'{"matchresultatListaJSON": [{"matchid": 42}, {"matchid": 43}]}'
+
+    assert MdkCall("SparaMatchresultatLista", mixed).match_id is None
+    assert MdkCall("SparaMatchresultatLista", mixed).invalidates() == [
+        "mdk:GetMatchresultatlista",
+        "route:match_result",
+        "mdk:GetMatcherAttRapportera",
+        "route:matches",
+    ]
+
+
+def test_reads_are_cached_and_forwarded_as_raw_bytes(api, http):
+    first = _post(http, "GetMatchhandelselista", b'{"matchid": 42}')
+    second = _post(http, "GetMatchhandelselista", b'{"matchid":42}')
+
+    assert first.status_code == second.status_code == 200
+    assert first.data == second.data == EVENTS
+    assert first.headers["Content-Type"] == "application/json; charset=utf-8"
+    api.post_match_web_method.assert_called_once_with("GetMatchhandelselista", b'{"matchid": 42}')
+
+
+def test_writes_pass_through_and_invalidate(api, http):
+    _post(http, "GetMatchhandelselista", b'{"matchid": 42}')
+    _post(http, "GetMatchdeltagareListaForMatchlag", b'{"matchlagid": 5}')
+    http.get("/match/42/events")
+
+    write = _post(http, "SparaMatchhandelse", b'{"matchid": 42, "matchhandelsetypid": 6}')
+    _post(http, "SparaMatchhandelse", b'{"matchid": 42, "matchhandelsetypid": 6}')
+    _post(http, "GetMatchhandelselista", b'{"matchid": 42}')
+    _post(http, "GetMatchdeltagareListaForMatchlag", b'{"matchlagid": 5}')
+    http.get("/match/42/events")
+
+    assert write.status_code == 200
+    methods = [call.args[0] for call in api.post_match_web_method.call_args_list]
+    assert methods.count("SparaMatchhandelse") == 2
+    assert methods.count("GetMatchhandelselista") == 2
+    assert methods.count("GetMatchdeltagareListaForMatchlag") == 1
+    assert api.fetch_match_events_json.call_count == 2
+
+
+def test_writes_without_a_match_invalidate_the_json_routes(api, http):
+    api.fetch_team_players_json.return_value = {"spelare": []}
+    http.get("/match/42/events")
+    http.get("/team/5/players")
+
+    _post(http, "RaderaMatchhandelse", b'{"matchhandelseid": 1}')
+    http.get("/match/42/events")
+    http.get("/team/5/players")
+    _post(http, "SparaMatchdeltagare", b'{"matchdeltagareid": 9}')
+    http.get("/team/5/players")
+
+    assert api.fetch_match_events_json.call_count == 2
+    assert api.fetch_team_players_json.call_count == 2
+
+
+def test_errors(api, http):
+    assert _post(http, "GetEverything", b"{}").status_code == 404
+    assert _post(http, "GetMatchhandelselista", b"not json").status_code == 400
+
+    api.post_match_web_method.side_effect = FogisAPIRequestError("Request failed: 500")
+    failed = _post(http, "GetMatchhandelselista", b'{"matchid": 1}')
+    assert failed.status_code == 502
+    assert "500" in failed.json["error"]
+
+
+def test_proxy_is_off_by_default(api, http, monkeypatch):
+    monkeypatch.setattr(fogis_api_gateway.service, "mdk_proxy_enabled", False)
+
+    assert _post(http, "GetMatchhandelselista", b'{"matchid": 42}').status_code == 404
+    api.post_match_web_method.assert_not_called()
+
+
+def test_proxied_writes_are_admitted_as_writes():
+    assert route_class("POST", "/mdk/MatchWebMetoder.aspx/SparaMatchhandelse") == WRITE
+    assert route_class("POST", "/mdk/MatchWebMetoder.aspx/GetMatchhandelselista") == READ
+
+
+def test_client_posts_the_raw_body(monkeypatch):
+    api = PublicApiClient(username="user", password="pass")
+    request = MagicMock(return_value="response")
+    monkeypatch.setattr(api, "_make_authenticated_request", request)
+
+    assert api.post_match_web_method("GetMatchhandelselista", b'{"matchid":1}') == "response"
+    request.assert_called_once_with(
+        "POST", f"{api.BASE_URL}/MatchWebMetoder.aspx/GetMatchhandelselista", data=b'{"matchid":1}'
+    )
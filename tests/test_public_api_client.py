@@ -328,3 +328,22 @@ def test_endpoint_urls_comprehensive():
     assert call_args[0][0] == "POST"
     assert "/MatchWebMetoder.aspx/GetMatchresultatlista" in call_args[0][1]
     assert call_args[1]["json"] == {"matchid": 123456}
+
+
+def test_report_match_event_fills_in_required_fields():
+    """Test that report_match_event sends the event as FOGIS requires it."""
+    client = PublicApiClient(username="test", password="test")
+    mock_response = Mock()
+    mock_response.status_code = 200
+    mock_response.json = Mock(return_value={"d": '{"success": true}'})
+    client._make_authenticated_request = Mock(return_value=mock_response)
+    event = {"matchid": "1", "matchhandelsetypid": 6, "matchminut": "35", "matchlagid": 7}
+
+    assert client.report_match_event(event) == {"success": True}
+
+    method, url = client._make_authenticated_request.call_args.args
+    sent = client._make_authenticated_request.call_args.kwargs["json"]
+    assert (method, url) == ("POST", f"{client.BASE_URL}/MatchWebMetoder.aspx/SparaMatchhandelse")
+    assert sent["matchid"] == 1 and sent["matchminut"] == 35
+    assert sent["sekund"] == 0 and sent["spelareid2"] == -1 and sent["planpositionx"] == "-1"
+    assert event["matchid"] == "1"
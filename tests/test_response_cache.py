@@ -0,0 +1,181 @@
+"""
+Tests for the gateway response cache.
+"""
+
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+import fogis_api_gateway
+from fogis_api_client.gateway import ResponseCache
+
+
+def test_fresh_entry_is_served_from_cache():
+    cache = ResponseCache()
+    loader = MagicMock(return_value={"matchid": 1})
+
+    assert cache.get("key", loader, ttl=60) == {"matchid": 1}
+    assert cache.get("key", loader, ttl=60) == {"matchid": 1}
+
+    loader.assert_called_once()
+    assert cache.metrics()["hit_ratio"] == 0.5
+
+
+def test_stale_entry_is_served_while_refreshing():
+    cache = ResponseCache(stale_ttl=60)
+    cache.get("key", lambda: "old", ttl=0)
+    refreshed = threading.Event()
+
+    def reload():
+        refreshed.set()
+        return "new"
+
+    assert cache.get("key", reload, ttl=60) == "old"
+    assert refreshed.wait(5)
+    deadline = time.monotonic() + 5
+    while cache.get("key", reload, ttl=60) != "new" and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert cache.get("key", reload, ttl=60) == "new"
+    assert cache.metrics()["refreshes"] == 1
+
+
+def test_expired_entry_is_reloaded():
+    cache = ResponseCache(stale_ttl=0)
+    cache.get("key", lambda: "old", ttl=0)
+    assert cache.get("key", lambda: "new", ttl=60) == "new"
+
+
+def test_concurrent_misses_share_one_load():
+    cache = ResponseCache()
+    release = threading.Event()
+    loader = MagicMock(side_effect=lambda: release.wait(5) and "value")
+    results = []
+
+    threads = [threading.Thread(target=lambda: results.append(cache.get("key", loader, ttl=60))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    while cache.metrics()["coalesced"] < 7:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["value"] * 8
+    loader.assert_called_once()
+
+
+def test_peek_returns_only_fresh_entries():
+    cache = ResponseCache()
+    assert cache.peek("key") is None
+
+    cache.get("key", lambda: "value", ttl=60)
+    cache.get("stale", lambda: "old", ttl=0)
+
+    assert cache.peek("key") == "value"
+    assert cache.peek("stale") is None
+
+
+def test_errors_are_not_cached():
+    cache = ResponseCache()
+    with pytest.raises(RuntimeError):
+        cache.get("key", MagicMock(side_effect=RuntimeError("down")), ttl=60)
+    assert cache.get("key", lambda: "value", ttl=60) == "value"
+
+
+def test_invalidate_tags_drops_only_tagged_entries():
+    cache = ResponseCache()
+    cache.get(("match", 1), lambda: "one", ttl=60, tags=["match:1"])
+    cache.get(("match", 2), lambda: "two", ttl=60, tags=["match:2"])
+
+    assert cache.invalidate_tags("match:1") == 1
+
+    assert cache.get(("match", 1), lambda: "one again", ttl=60) == "one again"
+    assert cache.get(("match", 2), lambda: "unused", ttl=60) == "two"
+
+
+def test_load_in_progress_is_not_stored_after_invalidation():
+    cache = ResponseCache()
+
+    def load_then_write():
+        cache.invalidate_tags("match:1")
+        return "before write"
+
+    assert cache.get(("match", 1), load_then_write, ttl=60, tags=["match:1"]) == "before write"
+    assert cache.get(("match", 1), lambda: "after write", ttl=60, tags=["match:1"]) == "after write"
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResponseCache(max_entries=2)
+    for key in ["a", "b", "c"]:
+        cache.get(key, lambda: key, ttl=60, tags=["all"])
+    assert cache.metrics()["entries"] == 2
+    assert cache.get("a", lambda: "reloaded", ttl=60) == "reloaded"
+
+
+def test_async_misses_share_one_load_with_threads():
+    cache = ResponseCache()
+    calls = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def load():
+        calls.append("thread")
+        started.set()
+        release.wait(5)
+        return "value"
+
+    async def load_async():
+        calls.append("async")
+        return "other"
+
+    thread = threading.Thread(target=cache.get, args=("key", load, 60))
+    thread.start()
+    assert started.wait(5)
+
+    async def scenario():
+        waiting = [asyncio.ensure_future(cache.get_async("key", load_async, ttl=60)) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        release.set()
+        return await asyncio.gather(*waiting)
+
+    assert asyncio.run(scenario()) == ["value"] * 3
+    thread.join(5)
+    assert calls == ["thread"]
+    assert cache.metrics()["coalesced"] == 3
+
+
+def test_async_stale_entry_is_refreshed_in_the_background():
+    cache = ResponseCache(stale_ttl=60)
+
+    async def value(result):
+        return result
+
+    async def scenario():
+        await cache.get_async("key", lambda: value("old"), ttl=0)
+        stale = await cache.get_async("key", lambda: value("new"), ttl=60)
+        await asyncio.sleep(0)
+        return stale, await cache.get_async("key", lambda: value("newer"), ttl=60)
+
+    assert asyncio.run(scenario()) == ("old", "new")
+    assert cache.metrics()["refreshes"] == 1
+
+
+def test_gateway_write_invalidates_cached_match():
+    api = MagicMock()
+    api.fetch_match_json.side_effect = [{"version": 1}, {"version": 2}]
+    api.report_match_event.return_value = {"success": True}
+    original = fogis_api_gateway.service.client
+    fogis_api_gateway.service.client = api
+    fogis_api_gateway.service.response_cache.clear()
+    http = fogis_api_gateway.app.test_client()
+    try:
+        assert http.get("/match/7").json == {"version": 1}
+        assert http.get("/match/7").json == {"version": 1}
+        assert http.post("/match/7/events", json={"eventtyp": 6}).status_code == 200
+        assert http.get("/match/7").json == {"version": 2}
+        assert api.fetch_match_json.call_count == 2
+    finally:
+        fogis_api_gateway.service.client = original
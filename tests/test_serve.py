@@ -0,0 +1,106 @@
+"""
+Tests for the gateway's production server entry point.
+"""
+
+import signal
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+import fogis_api_gateway
+from fogis_api_client.cli import serve
+from fogis_api_client.gateway.handoff import Drain
+
+
+def test_arguments_default_to_the_environment(monkeypatch):
+    monkeypatch.setenv("GATEWAY_WORKERS", "3")
+    monkeypatch.setenv("GATEWAY_THREADS", "4")
+    monkeypatch.setenv("GATEWAY_BIND", "127.0.0.1:9000")
+
+    args = serve.parse_args([])
+    overridden = serve.parse_args(["--workers", "5", "--graceful-timeout", "10"])
+
+    assert (args.app, args.bind, args.workers, args.threads) == ("fogis_api_gateway:app", "127.0.0.1:9000", 3, 4)
+    assert args.graceful_timeout == 30
+    assert (overridden.workers, overridden.graceful_timeout) == (5, 10)
+
+
+def test_wsgi_apps_run_on_threaded_workers_with_preloading():
+    module, app = serve.load_app("fogis_api_gateway:app")
+    options = serve.server_options(serve.parse_args(["--workers", "2", "--threads", "6"]), module, app)
+
+    assert app is fogis_api_gateway.app
+    assert options["worker_class"] == "gthread"
+    assert (options["workers"], options["threads"], options["preload_app"]) == (2, 6, True)
+
+
+def test_asgi_apps_run_on_uvicorn_workers():
+    module, app = serve.load_app("fogis_api_gateway_asgi:app")
+
+    assert serve.is_asgi(app)
+    assert serve.server_options(serve.parse_args([]), module, app)["worker_class"] == serve.ASGI_WORKER
+
+
+def test_worker_hooks_call_the_app_module():
+    module = SimpleNamespace(init_worker=MagicMock(), shutdown_worker=MagicMock())
+    options = serve.server_options(serve.parse_args([]), module, object())
+
+    options["post_fork"](None, None)
+    options["worker_exit"](None, None)
+    serve.server_options(serve.parse_args([]), SimpleNamespace(), object())["post_fork"](None, None)
+
+    module.init_worker.assert_called_once_with()
+    module.shutdown_worker.assert_called_once_with()
+
+
+def test_threaded_workers_begin_shutting_down_on_sigterm(monkeypatch):
+    started = threading.Event()
+    calls = []
+
+    def previous(signum, frame):
+        calls.append(signum)
+
+    module = SimpleNamespace(begin_shutdown=started.set)
+    original = signal.signal(signal.SIGTERM, previous)
+    try:
+        serve.server_options(serve.parse_args([]), module, object())["post_worker_init"](None)
+        signal.getsignal(signal.SIGTERM)(signal.SIGTERM, None)
+
+        assert started.wait(5)
+        assert calls == [signal.SIGTERM]
+    finally:
+        signal.signal(signal.SIGTERM, original)
+
+
+def test_begin_shutdown_ends_streams_and_turns_requests_away(monkeypatch):
+    monkeypatch.setattr(fogis_api_gateway, "match_feed", MagicMock())
+    monkeypatch.setattr(fogis_api_gateway, "drain", Drain())
+
+    fogis_api_gateway.begin_shutdown()
+
+    fogis_api_gateway.match_feed.stop.assert_called_once_with()
+    assert fogis_api_gateway.drain.draining
+
+
+def test_workers_create_their_own_clients(monkeypatch):
+    monkeypatch.setattr(fogis_api_gateway, "warmup", MagicMock())
+    inherited = fogis_api_gateway.service.client
+
+    try:
+        fogis_api_gateway.init_worker()
+
+        assert fogis_api_gateway.service.client is not inherited
+        assert fogis_api_gateway.service.client.session is not inherited.session
+        assert not fogis_api_gateway.service.client.is_authenticated()
+        fogis_api_gateway.warmup.start.assert_called_once_with()
+    finally:
+        fogis_api_gateway.service.client = inherited
+
+
+def test_missing_gunicorn_is_reported(monkeypatch):
+    monkeypatch.setattr(serve, "BaseApplication", None)
+
+    with pytest.raises(SystemExit, match="gateway extra"):
+        serve.main([])
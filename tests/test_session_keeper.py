@@ -0,0 +1,182 @@
+"""
+Tests for the built-in session keep-alive.
+"""
+
+import json
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from fogis_api_client.internal.session_keeper import SessionKeeper
+from fogis_api_client.public_api_client import PublicApiClient
+from fogis_api_client.session_store import MemorySessionStore
+
+
+def _client(valid=True, relogin=True):
+    client = Mock()
+    client.check_session.return_value = valid
+    client.refresh_authentication.return_value = relogin
+    client.get_cookies.return_value = {"ASP.NET_SessionId": "sid"}
+    return client
+
+
+def test_successful_check_updates_stats():
+    keeper = SessionKeeper(_client())
+    assert keeper.check_now() is True
+    assert keeper.successful_checks == 1
+    assert keeper.failed_checks == 0
+    assert keeper.last_activity is not None
+
+
+def test_failed_check_relogs_in():
+    client = _client(valid=False)
+    keeper = SessionKeeper(client)
+
+    assert keeper.check_now() is True
+    client.refresh_authentication.assert_called_once()
+    assert keeper.failed_checks == 1
+    assert keeper.relogins == 1
+
+
+def test_inconclusive_check_keeps_the_session():
+    client = _client(valid=None)
+    keeper = SessionKeeper(client)
+
+    assert keeper.check_now() is False
+    client.refresh_authentication.assert_not_called()
+    assert keeper.failed_checks == 1
+    assert keeper.relogins == 0
+
+
+def test_failed_relogin_is_reported():
+    keeper = SessionKeeper(_client(valid=False, relogin=False))
+    assert keeper.check_now() is False
+    assert keeper.relogins == 0
+    assert keeper.last_activity is None
+
+
+def test_status_fields():
+    keeper = SessionKeeper(_client(), check_interval=120)
+    status = keeper.status()
+    assert status == {
+        "running": False,
+        "successful_checks": 0,
+        "failed_checks": 0,
+        "relogins": 0,
+        "runtime": "unknown",
+        "last_activity": "unknown",
+        "check_interval": 120,
+        "has_cookies": True,
+    }
+
+    keeper.start_time = time.time() - 3723
+    keeper.last_activity = time.time() - 5
+    status = keeper.status()
+    assert status["runtime"] == "1h 2m 3s"
+    assert status["last_activity"] == "0h 0m 5s ago"
+
+
+def test_invalid_interval():
+    with pytest.raises(ValueError):
+        SessionKeeper(_client(), check_interval=0)
+
+
+def test_background_thread_writes_status_file(tmp_path):
+    client = _client()
+    checked = threading.Event()
+    client.check_session.side_effect = lambda: checked.set() or True
+    status_file = tmp_path / "status.json"
+
+    keeper = SessionKeeper(client, check_interval=0.01, status_file=str(status_file))
+    keeper.start()
+    try:
+        assert checked.wait(2)
+        assert keeper.running
+    finally:
+        keeper.stop()
+
+    assert not keeper.running
+    assert keeper.successful_checks >= 1
+    assert json.loads(status_file.read_text())["successful_checks"] >= 1
+
+
+class TestClientIntegration:
+    """Tests for the keeper API on PublicApiClient."""
+
+    def _authenticated_client(self):
+        client = PublicApiClient(username="referee", password="secret")
+        client.authentication_method = "oauth_hybrid"
+        client.cookies = {"FogisMobilDomarKlient.ASPXAUTH": "auth"}
+        return client
+
+    def _probe_response(self, url):
+        response = Mock()
+        response.status_code = 200
+        response.url = url
+        return response
+
+    def test_validate_cookies_accepts_dashboard(self):
+        client = self._authenticated_client()
+        response = self._probe_response("https://fogis.svenskfotboll.se/mdk/")
+        client.session.get = Mock(return_value=response)
+
+        assert client.validate_cookies() is True
+        response.close.assert_called_once()
+        assert client.session.get.call_args.kwargs["stream"] is True
+
+    def test_validate_cookies_detects_login_redirect(self):
+        client = self._authenticated_client()
+        client.session.get = Mock(
+            return_value=self._probe_response("https://fogis.svenskfotboll.se/mdk/Login.aspx?ReturnUrl=%2fmdk%2f")
+        )
+        assert client.validate_cookies() is False
+
+    def test_check_session_tells_outages_from_rejections(self):
+        client = self._authenticated_client()
+        response = self._probe_response("https://fogis.svenskfotboll.se/mdk/")
+        response.status_code = 503
+        client.session.get = Mock(return_value=response)
+        assert client.check_session() is None
+
+        response.status_code = 401
+        assert client.check_session() is False
+
+    def test_network_error_keeps_session_and_saved_session(self):
+        store = MemorySessionStore()
+        store.save(
+            "referee",
+            {"authentication_method": "aspnet", "session_cookies": {"ASP.NET_SessionId": "live"}, "cookies": []},
+        )
+        client = PublicApiClient(username="referee", password="secret", session_store=store)
+        client.session.get = Mock(side_effect=requests.exceptions.ConnectionError("FOGIS unreachable"))
+        keeper = SessionKeeper(client)
+
+        with patch.object(client, "login") as login:
+            assert keeper.check_now() is False
+        login.assert_not_called()
+        assert keeper.failed_checks == 1
+        assert client.is_authenticated()
+        assert client.cookies == {"ASP.NET_SessionId": "live"}
+        assert store.load("referee")["session_cookies"] == {"ASP.NET_SessionId": "live"}
+
+    def test_validate_cookies_without_session(self):
+        client = PublicApiClient(username="referee", password="secret")
+        client.session.get = Mock()
+        assert client.validate_cookies() is False
+        client.session.get.assert_not_called()
+
+    def test_start_and_stop_keeper(self):
+        client = self._authenticated_client()
+        assert client.get_session_keeper_status() == {"running": False}
+
+        keeper = client.start_session_keeper(check_interval=60)
+        try:
+            assert client.get_session_keeper_status()["running"] is True
+            assert client.get_session_keeper_status()["check_interval"] == 60
+        finally:
+            client.stop_session_keeper()
+        assert not keeper.running
+        assert client.get_session_keeper_status()["running"] is False
@@ -0,0 +1,135 @@
+"""
+Tests for session persistence across client restarts.
+"""
+
+import os
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from fogis_api_client.public_api_client import PublicApiClient
+from fogis_api_client.session_store import MemorySessionStore, export_cookies, import_cookies
+
+ASPNET_RESULT = {
+    "FogisMobilDomarKlient.ASPXAUTH": "auth_cookie",
+    "ASP.NET_SessionId": "session_id",
+    "aspnet_authenticated": "true",
+}
+
+
+def _login_side_effect(session, username, password, base_url):
+    session.cookies.set("FogisMobilDomarKlient.ASPXAUTH", "auth_cookie", domain="fogis.svenskfotboll.se")
+    return dict(ASPNET_RESULT)
+
+
+def _response(status_code=200, url="https://fogis.svenskfotboll.se/mdk/MatchWebMetoder.aspx/GetMatcherAttRapportera"):
+    response = Mock()
+    response.status_code = status_code
+    response.url = url
+    response.raise_for_status = Mock()
+    response.json.return_value = {"d": '{"matchlista": []}'}
+    return response
+
+
+def test_export_and_import_cookies_keep_domains():
+    source = requests.Session()
+    source.cookies.set("idsrv.session", "sso", domain="auth.fogis.se", path="/")
+    source.cookies.set("ASP.NET_SessionId", "sid", domain="fogis.svenskfotboll.se", path="/mdk")
+
+    target = requests.Session()
+    assert import_cookies(target.cookies, export_cookies(source.cookies)) == 2
+    assert target.cookies.get("idsrv.session", domain="auth.fogis.se") == "sso"
+    assert target.cookies.get("ASP.NET_SessionId", domain="fogis.svenskfotboll.se", path="/mdk") == "sid"
+
+
+def test_import_skips_expired_cookies():
+    jar = requests.Session().cookies
+    records = [{"name": "old", "value": "x", "domain": "fogis.svenskfotboll.se", "path": "/", "expires": 1}]
+    assert import_cookies(jar, records) == 0
+    assert len(jar) == 0
+
+
+@patch("fogis_api_client.public_api_client.authenticate", side_effect=_login_side_effect)
+def test_login_persists_and_restart_restores(mock_authenticate):
+    store = MemorySessionStore()
+
+    first = PublicApiClient(username="referee", password="secret", session_store=store)
+    first.login()
+    assert mock_authenticate.call_count == 1
+
+    restarted = PublicApiClient(username="referee", password="secret", session_store=store)
+    assert restarted.session_restored is True
+    assert restarted.is_authenticated()
+    assert restarted.authentication_method == "aspnet"
+    assert restarted.session.cookies.get("FogisMobilDomarKlient.ASPXAUTH") == "auth_cookie"
+
+    restarted.session.request = Mock(return_value=_response())
+    assert restarted.fetch_matches_list_json() == []
+    assert mock_authenticate.call_count == 1
+
+
+@patch("fogis_api_client.public_api_client.authenticate", side_effect=_login_side_effect)
+def test_rejected_restored_session_falls_back_to_login(mock_authenticate):
+    store = MemorySessionStore()
+    store.save(
+        "referee",
+        {"authentication_method": "aspnet", "session_cookies": {"ASP.NET_SessionId": "stale"}, "cookies": []},
+    )
+
+    client = PublicApiClient(username="referee", password="secret", session_store=store)
+    assert client.session_restored is True
+
+    login_redirect = _response(url="https://fogis.svenskfotboll.se/mdk/Login.aspx?ReturnUrl=%2fmdk%2f")
+    client.session.request = Mock(side_effect=[login_redirect, _response()])
+
+    assert client.fetch_matches_list_json() == []
+    mock_authenticate.assert_called_once()
+    assert client.session_restored is False
+    assert store.load("referee")["session_cookies"]["FogisMobilDomarKlient.ASPXAUTH"] == "auth_cookie"
+
+
+def test_failed_relogin_clears_saved_session():
+    store = MemorySessionStore()
+    store.save("referee", {"authentication_method": "oauth_hybrid", "session_cookies": {"a": "b"}, "cookies": []})
+    client = PublicApiClient(username="referee", password="secret", session_store=store)
+
+    with patch.object(client, "login", side_effect=Exception("bad credentials")):
+        assert client.refresh_authentication() is False
+    assert store.load("referee") is None
+
+
+class TestFileSessionStore:
+    """Tests for the encrypted file store."""
+
+    @pytest.fixture(autouse=True)
+    def _require_cryptography(self):
+        pytest.importorskip("cryptography")
+
+    def test_round_trip_is_encrypted(self, tmp_path):
+        from fogis_api_client.session_store import FileSessionStore, generate_session_key
+
+        store = FileSessionStore(str(tmp_path), encryption_key=generate_session_key())
+        store.save("referee", {"session_cookies": {"ASP.NET_SessionId": "very-secret-value"}})
+
+        files = os.listdir(tmp_path)
+        assert len(files) == 1
+        assert "referee" not in files[0]
+        assert b"very-secret-value" not in (tmp_path / files[0]).read_bytes()
+        assert store.load("referee") == {"session_cookies": {"ASP.NET_SessionId": "very-secret-value"}}
+
+        store.clear("referee")
+        assert store.load("referee") is None
+
+    def test_wrong_key_is_treated_as_missing(self, tmp_path):
+        from fogis_api_client.session_store import FileSessionStore, generate_session_key
+
+        FileSessionStore(str(tmp_path), encryption_key=generate_session_key()).save("referee", {"a": 1})
+        other = FileSessionStore(str(tmp_path), encryption_key=generate_session_key())
+        assert other.load("referee") is None
+
+    def test_requires_key(self, tmp_path):
+        from fogis_api_client.session_store import FileSessionStore
+
+        with pytest.raises(ValueError):
+            FileSessionStore(str(tmp_path), encryption_key=None)
@@ -0,0 +1,134 @@
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from fogis_api_client.fogis_api_client import FogisApiClient
+
+API_URL = f"{FogisApiClient.BASE_URL}/MatchWebMetoder.aspx/GetMatchhandelselista"
+
+
+def _api_response(url=API_URL, status_code=200):
+    response = MagicMock()
+    response.url = url
+    response.status_code = status_code
+    response.json.return_value = {"d": "[]"}
+    response.raise_for_status = lambda: None
+    return response
+
+
+def _dashboard_response(url=f"{FogisApiClient.BASE_URL}/", text="<html>Welcome</html>"):
+    response = MagicMock()
+    response.url = url
+    response.text = text
+    response.raise_for_status = lambda: None
+    return response
+
+
+class TestSessionValidityWindow(unittest.TestCase):
+    """Test cases for the cached session validity in FogisApiClient."""
+
+    def setUp(self):
+        self.cookies = {"FogisMobilDomarKlient.ASPXAUTH": "auth", "ASP.NET_SessionId": "sid"}
+        self.client = FogisApiClient(cookies=self.cookies)
+        self.client.session.get = MagicMock(side_effect=self._route_get)
+        self.dashboard_calls = 0
+
+    def _route_get(self, url, **kwargs):
+        if url == f"{FogisApiClient.BASE_URL}/":
+            self.dashboard_calls += 1
+            return _dashboard_response()
+        return _api_response()
+
+    def test_validated_session_is_trusted_within_window(self):
+        """Only the first request probes the dashboard."""
+        for _ in range(3):
+            self.assertEqual(self.client._api_request(API_URL, method="GET"), [])
+        self.assertEqual(self.dashboard_calls, 1)
+
+    def test_expired_window_probes_again(self):
+        """A session is probed again once the window has passed."""
+        self.client.session_validity_window = 0
+        self.client._api_request(API_URL, method="GET")
+        self.client._api_request(API_URL, method="GET")
+        self.assertEqual(self.dashboard_calls, 2)
+
+    def test_marked_session_skips_probe(self):
+        """No probe is needed right after the session was marked valid, e.g. by login()."""
+        client = FogisApiClient(username="referee", password="secret")
+        client.session.get = MagicMock(side_effect=self._route_get)
+        client.cookies = dict(self.cookies)
+        client._mark_session_valid()
+
+        client._api_request(API_URL, method="GET")
+        self.assertEqual(self.dashboard_calls, 0)
+
+    def test_login_redirect_invalidates_and_relogs_in(self):
+        """A login-page redirect clears the validity and triggers a re-login and retry."""
+        client = FogisApiClient(username="referee", password="secret", cookies=dict(self.cookies))
+        client._mark_session_valid()
+        redirect = _api_response(url=f"{FogisApiClient.BASE_URL}/Login.aspx?ReturnUrl=%2fmdk%2f")
+        client.session.get = MagicMock(side_effect=[redirect, _api_response()])
+
+        def login():
+            client.cookies = {"FogisMobilDomarKlient.ASPXAUTH": "fresh"}
+            client._mark_session_valid()
+            return client.cookies
+
+        with patch.object(client, "login", side_effect=login) as mock_login:
+            self.assertEqual(client._api_request(API_URL, method="GET"), [])
+
+        mock_login.assert_called_once()
+        retry_headers = client.session.get.call_args_list[1].kwargs["headers"]
+        self.assertEqual(retry_headers["Cookie"], "FogisMobilDomarKlient.ASPXAUTH=fresh")
+
+    def test_real_401_response_triggers_reauthentication(self):
+        """A real 401 response (which is falsy) still triggers re-authentication."""
+        client = FogisApiClient(username="referee", password="secret", cookies=dict(self.cookies))
+        client._mark_session_valid()
+
+        unauthorized = requests.Response()
+        unauthorized.status_code = 401
+        unauthorized.url = API_URL
+        client.session.get = MagicMock(side_effect=[unauthorized, _api_response()])
+
+        with patch.object(client, "login", return_value=self.cookies) as mock_login:
+            self.assertEqual(client._api_request(API_URL, method="GET"), [])
+        mock_login.assert_called_once()
+
+    def test_expired_session_clears_cookies_before_login(self):
+        """A failed probe makes login() run instead of returning the stale cookies."""
+        client = FogisApiClient(username="referee", password="secret", cookies=dict(self.cookies))
+        client.session.get = MagicMock(
+            side_effect=[_dashboard_response(url=f"{FogisApiClient.BASE_URL}/Login.aspx", text="Logga in"), _api_response()]
+        )
+
+        def login():
+            self.assertIsNone(client.cookies)
+            client.cookies = {"FogisMobilDomarKlient.ASPXAUTH": "fresh"}
+            return client.cookies
+
+        with patch.object(client, "login", side_effect=login) as mock_login:
+            client._api_request(API_URL, method="GET")
+        mock_login.assert_called_once()
+
+    def test_concurrent_requests_share_one_probe(self):
+        """Threads arriving with an unvalidated session trigger a single probe."""
+        results = []
+
+        def worker():
+            results.append(self.client._api_request(API_URL, method="GET"))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, [[]] * 8)
+        self.assertEqual(self.dashboard_calls, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+"""
+Tests for silent OAuth re-authentication with persisted SSO cookies.
+"""
+
+from unittest.mock import Mock, patch
+
+import requests
+
+from fogis_api_client.internal.auth import _handle_oauth_authentication, authenticate
+from fogis_api_client.public_api_client import PublicApiClient
+
+AUTHORIZE_URL = "https://auth.fogis.se/connect/authorize?client_id=fogis.mobildomarklient&state=abc"
+
+FORM_POST_PAGE = """
+<html><body onload="javascript:document.forms[0].submit()">
+<form method="post" action="https://fogis.svenskfotboll.se/mdk/signin-oidc">
+    <input type="hidden" name="code" value="auth-code" />
+    <input type="hidden" name="state" value="abc" />
+    <input type="hidden" name="session_state" value="xyz" />
+</form>
+</body></html>
+"""
+
+LOGIN_FORM_PAGE = """
+<html><body>
+<form method="post" action="/Account/Login?ReturnUrl=%2Fconnect%2Fauthorize">
+    <input type="hidden" name="__RequestVerificationToken" value="token" />
+    <input type="text" name="Username" />
+    <input type="password" name="Password" />
+</form>
+</body></html>
+"""
+
+
+def _page(url, text=""):
+    response = Mock()
+    response.url = url
+    response.text = text
+    response.raise_for_status = Mock()
+    return response
+
+
+def _session_with_sso_cookies():
+    session = requests.Session()
+    session.cookies.set("idsrv.session", "sso", domain="auth.fogis.se", path="/")
+    return session
+
+
+def _sign_in(session):
+    def post(url, data=None, **kwargs):
+        session.cookies.set("FogisMobilDomarKlient.ASPXAUTH", "new_auth", domain="fogis.svenskfotboll.se", path="/")
+        return _page("https://fogis.svenskfotboll.se/mdk/")
+
+    return post
+
+
+def test_form_post_response_signs_in_without_credentials():
+    session = _session_with_sso_cookies()
+    session.post = Mock(side_effect=_sign_in(session))
+
+    result = _handle_oauth_authentication(
+        session, "referee", "secret", AUTHORIZE_URL, login_page=_page(AUTHORIZE_URL, FORM_POST_PAGE)
+    )
+
+    assert result["authentication_path"] == "silent"
+    assert result["FogisMobilDomarKlient.ASPXAUTH"] == "new_auth"
+    session.post.assert_called_once()
+    url, data = session.post.call_args.args[0], session.post.call_args.kwargs["data"]
+    assert url == "https://fogis.svenskfotboll.se/mdk/signin-oidc"
+    assert data == {"code": "auth-code", "state": "abc", "session_state": "xyz"}
+    assert "Password" not in data
+
+
+@patch("fogis_api_client.internal.auth._handle_oauth_login_form")
+def test_expired_sso_session_falls_back_to_full_flow(mock_login_form):
+    session = _session_with_sso_cookies()
+    session.get = Mock()
+    session.post = Mock()
+    login_page = _page(AUTHORIZE_URL, LOGIN_FORM_PAGE)
+    mock_login_form.return_value = {"oauth_authenticated": True, "authentication_path": "full"}
+
+    result = _handle_oauth_authentication(session, "referee", "secret", AUTHORIZE_URL, login_page=login_page)
+
+    assert result["authentication_path"] == "full"
+    session.post.assert_not_called()
+    session.get.assert_not_called()
+    # The login page we already have is reused instead of being fetched again
+    assert mock_login_form.call_args.args[4] is login_page
+
+
+@patch("fogis_api_client.internal.auth._try_silent_authentication")
+@patch("fogis_api_client.internal.auth._handle_oauth_login_form")
+def test_no_sso_cookies_skips_silent_attempt(mock_login_form, mock_silent):
+    mock_login_form.return_value = {"oauth_authenticated": True}
+    _handle_oauth_authentication(requests.Session(), "referee", "secret", AUTHORIZE_URL)
+    mock_silent.assert_not_called()
+
+
+def test_full_login_records_full_path():
+    session = requests.Session()
+    session.post = Mock(side_effect=_sign_in(session))
+
+    result = _handle_oauth_authentication(
+        session, "referee", "secret", AUTHORIZE_URL, login_page=_page(AUTHORIZE_URL, LOGIN_FORM_PAGE)
+    )
+
+    assert result["authentication_path"] == "full"
+    assert session.post.call_args.kwargs["data"]["Password"] == "secret"
+
+
+def test_authenticate_detects_direct_redirect_back_to_fogis():
+    session = _session_with_sso_cookies()
+    session.cookies.set("FogisMobilDomarKlient.ASPXAUTH", "auth", domain="fogis.svenskfotboll.se", path="/")
+    session.get = Mock(return_value=_page("https://fogis.svenskfotboll.se/mdk/"))
+    session.post = Mock()
+
+    result = authenticate(session, "referee", "secret", "https://fogis.svenskfotboll.se/mdk")
+
+    assert result["authentication_path"] == "silent"
+    assert result["authentication_method"] == "oauth_hybrid"
+    session.post.assert_not_called()
+
+
+@patch("fogis_api_client.public_api_client.authenticate")
+def test_client_records_authentication_path(mock_authenticate):
+    mock_authenticate.return_value = {
+        "FogisMobilDomarKlient.ASPXAUTH": "auth",
+        "oauth_authenticated": True,
+        "authentication_method": "oauth_hybrid",
+        "authentication_path": "silent",
+    }
+    client = PublicApiClient(username="referee", password="secret")
+    client.login()
+
+    assert client.last_authentication_path == "silent"
+    assert client.cookies == {"FogisMobilDomarKlient.ASPXAUTH": "auth"}
+    assert client.get_authentication_info()["last_authentication_path"] == "silent"
@@ -0,0 +1,134 @@
+"""
+Tests for proactive OAuth token refresh.
+"""
+
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from fogis_api_client.internal.fogis_oauth_manager import FogisOAuthManager
+from fogis_api_client.internal.token_refresh import TokenRefreshScheduler
+from fogis_api_client.public_api_client import PublicApiClient
+
+TOKENS = {"access_token": "access", "refresh_token": "refresh", "expires_in": 3600}
+
+
+def _client(obtained_at=1000.0):
+    client = Mock()
+    client.authentication_method = "oauth"
+    client.oauth_tokens = dict(TOKENS)
+    client.token_expires_at = obtained_at + TOKENS["expires_in"]
+    return client
+
+
+def test_refresh_delay_is_fraction_of_lifetime_with_jitter():
+    scheduler = TokenRefreshScheduler(_client(), refresh_fraction=0.5, jitter=0.1)
+    for _ in range(50):
+        delay = scheduler.next_refresh_delay(now=1000.0)
+        assert 1620.0 <= delay <= 1980.0
+
+
+def test_refresh_delay_never_aims_past_expiry():
+    scheduler = TokenRefreshScheduler(_client(), refresh_fraction=0.95, jitter=0.5)
+    for _ in range(50):
+        assert scheduler.next_refresh_delay(now=1000.0) <= 3599.0
+    assert scheduler.next_refresh_delay(now=5000.0) == 0.0
+
+
+def test_no_delay_without_oauth_token():
+    client = _client()
+    client.authentication_method = "oauth_hybrid"
+    assert TokenRefreshScheduler(client).next_refresh_delay() is None
+
+    client = _client()
+    client.token_expires_at = None
+    assert TokenRefreshScheduler(client).next_refresh_delay() is None
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        TokenRefreshScheduler(_client(), refresh_fraction=1.0)
+    with pytest.raises(ValueError):
+        TokenRefreshScheduler(_client(), jitter=-0.1)
+
+
+def test_refresh_now_counts_outcomes():
+    client = _client()
+    client.refresh_authentication.side_effect = [True, False]
+    scheduler = TokenRefreshScheduler(client)
+
+    assert scheduler.refresh_now() is True
+    assert scheduler.refresh_now() is False
+    assert scheduler.refresh_count == 1
+    assert scheduler.failure_count == 1
+    assert scheduler.last_refresh is not None
+
+
+def test_background_thread_refreshes_due_token():
+    client = _client(obtained_at=time.time() - 3600)
+    refreshed = threading.Event()
+
+    def refresh():
+        client.token_expires_at = time.time() + 3600
+        refreshed.set()
+        return True
+
+    client.refresh_authentication.side_effect = refresh
+    scheduler = TokenRefreshScheduler(client)
+    scheduler.start()
+    try:
+        assert refreshed.wait(2)
+        assert scheduler.running
+    finally:
+        scheduler.stop()
+    assert not scheduler.running
+    assert scheduler.refresh_count == 1
+
+
+def test_manager_records_absolute_expiry():
+    manager = FogisOAuthManager()
+    before = time.time()
+    manager._set_token_expiry(600)
+    assert manager.token_expires_in == 600
+    assert before + 600 <= manager.token_expires_at <= time.time() + 600
+
+    manager.clear_tokens()
+    assert manager.token_expires_at is None
+
+
+def test_client_refresh_updates_expiry():
+    client = PublicApiClient(oauth_tokens=dict(TOKENS))
+    assert client.token_expires_at is not None
+    assert client.oauth_tokens == TOKENS
+
+    with patch("fogis_api_client.internal.fogis_oauth_manager.FogisOAuthManager") as manager_cls:
+        manager = manager_cls.return_value
+
+        def refresh_access_token():
+            manager.access_token = "new_access"
+            manager.refresh_token = "new_refresh"
+            manager.token_expires_in = 1800
+            manager.token_expires_at = 12345.0
+            return True
+
+        manager.refresh_access_token.side_effect = refresh_access_token
+
+        assert client.refresh_authentication() is True
+
+    assert client.oauth_tokens["access_token"] == "new_access"
+    assert client.token_expires_at == 12345.0
+
+
+def test_failed_refresh_falls_back_to_login():
+    client = PublicApiClient(username="referee", password="secret", oauth_tokens=dict(TOKENS))
+
+    with patch("fogis_api_client.internal.fogis_oauth_manager.FogisOAuthManager") as manager_cls, patch.object(
+        client, "login", return_value={}
+    ) as login:
+        manager_cls.return_value.refresh_access_token.return_value = False
+        assert client.refresh_authentication() is True
+
+    login.assert_called_once()
+    assert client.token_expires_at is None